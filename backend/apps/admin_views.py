@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from apps.profiles.models import UserProfile
+from apps.dashboard.search import SearchService
 
 
 def is_admin(user):
@@ -18,7 +19,7 @@ def is_admin(user):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_all_users(request):
-    """Get all users with their profile information"""
+    """Get all users with their profile information, optionally filtered by ?search="""
     if not is_admin(request.user):
         return Response(
             {"error": "You don't have permission to access this resource"},
@@ -27,6 +28,10 @@ def get_all_users(request):
     
     users = User.objects.all().select_related('profile').order_by('username')
     
+    search_query = request.GET.get('search', '')
+    if search_query:
+        users = SearchService.search_users(users, search_query).order_by('-search_rank', 'username')
+    
     users_data = []
     for user in users:
         profile = getattr(user, 'profile', None)
@@ -31,6 +31,7 @@ from apps.analytics_summary.models import (
     GlobalAnalyticsSummary,
     AnalyticsComparisonLog
 )
+from apps.analytics_summary.services import AdminStatsService
 from apps.profiles.models import UserProfile
 
 User = get_user_model()
@@ -253,19 +254,10 @@ class Command(BaseCommand):
         self.stdout.write(self.style.WARNING('\n[3/3] GLOBAL ANALYTICS'))
         self.stdout.write('-' * 70)
         
-        today = timezone.now().date()
-        
         with transaction.atomic():
-            summary, created = GlobalAnalyticsSummary.objects.get_or_create(
-                date=today
-            )
-            
-            # Global counts
-            summary.total_students = UserProfile.objects.filter(role='STUDENT').count()
-            summary.total_mentors = UserProfile.objects.filter(role='MENTOR').count()
+            # Headcounts and per-pillar submission counts for the admin dashboard
+            summary = AdminStatsService.publish()
             
-            # TODO: Aggregate actual submission data when available
-            summary.total_submissions = 0
             summary.new_students_today = 0
             summary.new_submissions_today = 0
             summary.reviews_completed_today = 0
@@ -277,7 +269,6 @@ class Command(BaseCommand):
             
             # Performance
             summary.avg_review_time_hours = 0.0
-            summary.pending_reviews_count = 0
             
             summary.save()
         
@@ -287,6 +278,13 @@ class Command(BaseCommand):
         self.stdout.write(
             f'  Total Mentors: {summary.total_mentors}'
         )
+        self.stdout.write(
+            f'  Submissions: {summary.pending_reviews_count} pending, '
+            f'{summary.approved_submissions} approved, {summary.rejected_submissions} rejected'
+        )
+        self.stdout.write(
+            f'  Active Users: {summary.active_users}'
+        )
         self.stdout.write(
             f'  Active Campuses: {summary.campuses_active}'
         )
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics_summary", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="globalanalyticssummary",
+            name="active_users",
+            field=models.IntegerField(
+                default=0, help_text="Users with at least one submission"
+            ),
+        ),
+        migrations.AddField(
+            model_name="globalanalyticssummary",
+            name="approved_submissions",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="globalanalyticssummary",
+            name="floor_wing_floors",
+            field=models.IntegerField(
+                default=0, help_text="Campus floors with a floor wing"
+            ),
+        ),
+        migrations.AddField(
+            model_name="globalanalyticssummary",
+            name="pillar_breakdown",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Pending/approved/rejected per submission type",
+            ),
+        ),
+        migrations.AddField(
+            model_name="globalanalyticssummary",
+            name="rejected_submissions",
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -187,6 +187,13 @@ class GlobalAnalyticsSummary(models.Model):
     avg_review_time_hours = models.FloatField(default=0.0)
     pending_reviews_count = models.IntegerField(default=0)
     
+    # Admin dashboard (published by AdminStatsService)
+    approved_submissions = models.IntegerField(default=0)
+    rejected_submissions = models.IntegerField(default=0)
+    active_users = models.IntegerField(default=0, help_text="Users with at least one submission")
+    floor_wing_floors = models.IntegerField(default=0, help_text="Campus floors with a floor wing")
+    pillar_breakdown = models.JSONField(default=dict, blank=True, help_text="Pending/approved/rejected per submission type")
+    
     # Metadata
     last_updated = models.DateTimeField(auto_now=True)
     
@@ -202,6 +209,11 @@ class GlobalAnalyticsSummary(models.Model):
     
     def __str__(self):
         return f"Global Analytics - {self.date}"
+    
+    @property
+    def is_stale(self):
+        """Check if data is older than 10 minutes"""
+        return (timezone.now() - self.last_updated).total_seconds() > 600
 
 
 class AnalyticsComparisonLog(models.Model):
@@ -0,0 +1,213 @@
+"""
+Admin statistics engine
+
+Computes the admin dashboard numbers with grouped aggregates and publishes
+them into today's GlobalAnalyticsSummary row.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from apps.analytics_summary.models import GlobalAnalyticsSummary
+from apps.profiles.models import UserProfile
+
+User = get_user_model()
+
+
+class AdminStatsService:
+    """Pending/approved/rejected counts per submission type, active users, headcounts"""
+
+    PENDING_STATUSES = ['draft', 'submitted', 'under_review']
+
+    @staticmethod
+    def submission_models():
+        from apps.clt.models import CLTSubmission
+        from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
+        from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
+
+        return {
+            'clt': CLTSubmission,
+            'hackathon': HackathonSubmission,
+            'bmc': BMCVideoSubmission,
+            'internship': InternshipSubmission,
+            'genai': GenAIProjectSubmission,
+            'linkedin_post': LinkedInPostVerification,
+            'linkedin_connection': LinkedInConnectionVerification,
+        }
+
+    @staticmethod
+    def compute():
+        """
+        Live admin stats
+        One conditional-count aggregate per submission model, one for
+        headcounts, one for floors and one for active users
+        """
+        models = AdminStatsService.submission_models()
+
+        pillars = {}
+        for name, model in models.items():
+            pillars[name] = model.objects.aggregate(
+                pending=Count('id', filter=Q(status__in=AdminStatsService.PENDING_STATUSES)),
+                approved=Count('id', filter=Q(status='approved')),
+                rejected=Count('id', filter=Q(status='rejected')),
+            )
+
+        headcounts = UserProfile.objects.aggregate(
+            students=Count('id', filter=Q(role='STUDENT')),
+            mentors=Count('id', filter=Q(role='MENTOR')),
+        )
+        floor_wing_floors = UserProfile.objects.filter(
+            role='FLOOR_WING'
+        ).values('campus', 'floor').distinct().count()
+
+        # Users with any submission, counted in the database
+        has_submission = Q()
+        for model in models.values():
+            has_submission |= Q(id__in=model.objects.values('user_id'))
+        active_users = User.objects.filter(has_submission).count()
+
+        return {
+            'total_students': headcounts['students'],
+            'total_mentors': headcounts['mentors'],
+            'floor_wing_floors': floor_wing_floors,
+            'pending': sum(counts['pending'] for counts in pillars.values()),
+            'approved': sum(counts['approved'] for counts in pillars.values()),
+            'rejected': sum(counts['rejected'] for counts in pillars.values()),
+            'active_users': active_users,
+            'pillars': pillars,
+        }
+
+    @staticmethod
+    @transaction.atomic
+    def publish(stats=None):
+        """Store stats in today's GlobalAnalyticsSummary row"""
+        stats = stats or AdminStatsService.compute()
+        summary, _ = GlobalAnalyticsSummary.objects.get_or_create(date=timezone.now().date())
+
+        summary.total_students = stats['total_students']
+        summary.total_mentors = stats['total_mentors']
+        summary.total_submissions = stats['pending'] + stats['approved'] + stats['rejected']
+        summary.pending_reviews_count = stats['pending']
+        summary.approved_submissions = stats['approved']
+        summary.rejected_submissions = stats['rejected']
+        summary.active_users = stats['active_users']
+        summary.floor_wing_floors = stats['floor_wing_floors']
+        summary.pillar_breakdown = stats['pillars']
+        summary.save()
+        return summary
+
+    @staticmethod
+    def from_summary(summary):
+        """Stats dict from a published GlobalAnalyticsSummary row"""
+        return {
+            'total_students': summary.total_students,
+            'total_mentors': summary.total_mentors,
+            'floor_wing_floors': summary.floor_wing_floors,
+            'pending': summary.pending_reviews_count,
+            'approved': summary.approved_submissions,
+            'rejected': summary.rejected_submissions,
+            'active_users': summary.active_users,
+            'pillars': summary.pillar_breakdown,
+        }
+
+    @staticmethod
+    def current():
+        """
+        Published stats when USE_ANALYTICS_SUMMARY is on and today's row is
+        fresh, else computed live
+        """
+        if settings.USE_ANALYTICS_SUMMARY:
+            summary = GlobalAnalyticsSummary.objects.filter(date=timezone.now().date()).first()
+            if summary and not summary.is_stale:
+                return AdminStatsService.from_summary(summary)
+        return AdminStatsService.compute()
+
+
+class CampusStatsService:
+    """Per-floor headcounts and submission stats for the admin campus and floor pages"""
+
+    @staticmethod
+    def submission_counts(group_by, **filters):
+        """
+        Submission counts across every pillar grouped by `group_by` + status
+        One UNION ALL of per-table GROUP BY queries
+        Returns: {group key: {status: count}}, key is a tuple of group_by values
+        """
+        querysets = [
+            model.objects.filter(**filters)
+            .order_by()
+            .values(*group_by, 'status')
+            .annotate(count=Count('id'))
+            for model in AdminStatsService.submission_models().values()
+        ]
+        counts = {}
+        for row in querysets[0].union(*querysets[1:], all=True):
+            key = tuple(row[field] for field in group_by)
+            statuses = counts.setdefault(key, {})
+            statuses[row['status']] = statuses.get(row['status'], 0) + row['count']
+        return counts
+
+    @staticmethod
+    def summarize(statuses):
+        """total/pending/approved/rejected/progress from {status: count}"""
+        total = sum(statuses.values())
+        approved = statuses.get('approved', 0)
+        return {
+            'total': total,
+            'pending': sum(statuses.get(s, 0) for s in AdminStatsService.PENDING_STATUSES),
+            'approved': approved,
+            'rejected': statuses.get('rejected', 0),
+            'progress_percentage': int((approved / total) * 100) if total else 0,
+        }
+
+    @staticmethod
+    def campus_floors(campus, floors):
+        """
+        Headcounts, floor wing and student submission stats for each floor
+        Three queries regardless of the number of floors
+        """
+        headcounts = {
+            row['floor']: row
+            for row in UserProfile.objects.filter(campus=campus, floor__in=floors)
+            .order_by()
+            .values('floor')
+            .annotate(
+                students=Count('id', filter=Q(role='STUDENT')),
+                mentors=Count('id', filter=Q(role='MENTOR')),
+            )
+        }
+
+        floor_wings = {}
+        for profile in UserProfile.objects.filter(
+            role='FLOOR_WING', campus=campus, floor__in=floors
+        ).select_related('user').order_by('id'):
+            floor_wings.setdefault(profile.floor, profile)
+
+        submissions = CampusStatsService.submission_counts(
+            ['user__profile__floor'],
+            user__profile__role='STUDENT',
+            user__profile__campus=campus,
+        )
+
+        return {
+            floor: {
+                'total_students': headcounts.get(floor, {}).get('students', 0),
+                'total_mentors': headcounts.get(floor, {}).get('mentors', 0),
+                'floor_wing': floor_wings.get(floor),
+                'submissions': CampusStatsService.summarize(submissions.get((floor,), {})),
+            }
+            for floor in floors
+        }
+
+    @staticmethod
+    def student_submission_totals(campus, floor):
+        """{user_id: submissions across all pillars} for students on a floor"""
+        counts = CampusStatsService.submission_counts(
+            ['user_id'],
+            user__profile__role='STUDENT',
+            user__profile__campus=campus,
+            user__profile__floor=floor,
+        )
+        return {user_id: sum(statuses.values()) for (user_id,), statuses in counts.items()}
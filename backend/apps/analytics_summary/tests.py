@@ -0,0 +1,125 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.clt.models import CLTSubmission
+from apps.cfc.models import HackathonSubmission
+from .models import GlobalAnalyticsSummary
+from .services import AdminStatsService
+
+User = get_user_model()
+
+
+def make_user(username, role, **profile_fields):
+    user = User.objects.create_user(username, password='x')
+    user.profile.role = role
+    for field, value in profile_fields.items():
+        setattr(user.profile, field, value)
+    user.profile.save()
+    return user
+
+
+class AdminStatsTests(TestCase):
+
+    def setUp(self):
+        self.admin = make_user('admin', 'ADMIN')
+        make_user('mentor', 'MENTOR')
+        make_user('wing', 'FLOOR_WING', campus='TECH', floor=1)
+        self.students = [make_user(f'student{i}', 'STUDENT') for i in range(3)]
+
+        for student, status in zip(self.students, ['submitted', 'approved', 'rejected']):
+            CLTSubmission.objects.create(
+                user=student, title='Course', description='d', platform='Udemy',
+                completion_date=date(2026, 1, 1), status=status
+            )
+        HackathonSubmission.objects.create(
+            user=self.students[0], hackathon_name='Hack', mode='online',
+            registration_date=date(2026, 1, 1), participation_date=date(2026, 1, 2), status='approved'
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_live_stats_use_grouped_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/profiles/admin/stats/').json()
+
+        self.assertEqual(response['totalStudents'], 3)
+        self.assertEqual(response['totalMentors'], 1)
+        self.assertEqual(response['totalFloors'], 1)
+        self.assertEqual(
+            (response['pendingSubmissions'], response['approvedSubmissions'], response['rejectedSubmissions']),
+            (1, 2, 1)
+        )
+        self.assertEqual(response['activeUsers'], 3)
+        # 7 pillar aggregates + headcounts + floors + active users, plus auth
+        self.assertLessEqual(len(queries.captured_queries), 12)
+
+    @override_settings(USE_ANALYTICS_SUMMARY=True)
+    def test_published_summary_is_served(self):
+        summary = AdminStatsService.publish()
+        self.assertEqual(summary.pillar_breakdown['hackathon'], {'pending': 0, 'approved': 1, 'rejected': 0})
+
+        GlobalAnalyticsSummary.objects.filter(pk=summary.pk).update(active_users=42)
+        response = self.client.get('/api/profiles/admin/stats/').json()
+        self.assertEqual(response['activeUsers'], 42)
+
+
+class CampusStatsTests(TestCase):
+
+    def setUp(self):
+        self.admin = make_user('admin', 'ADMIN')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def populate(self, students_per_floor):
+        for floor in [1, 2, 3, 4]:
+            mentor = make_user(f'mentor{floor}_{students_per_floor}', 'MENTOR', campus='TECH', floor=floor)
+            make_user(f'wing{floor}_{students_per_floor}', 'FLOOR_WING', campus='TECH', floor=floor)
+            for i in range(students_per_floor):
+                student = make_user(
+                    f's{floor}_{i}_{students_per_floor}', 'STUDENT',
+                    campus='TECH', floor=floor, assigned_mentor=mentor
+                )
+                CLTSubmission.objects.create(
+                    user=student, title='Course', description='d', platform='Udemy',
+                    completion_date=date(2026, 1, 1), status='approved' if i % 2 else 'submitted'
+                )
+                HackathonSubmission.objects.create(
+                    user=student, hackathon_name='Hack', mode='online', status='rejected',
+                    registration_date=date(2026, 1, 1), participation_date=date(2026, 1, 2)
+                )
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries), response.json()
+
+    def test_campus_and_floor_pages_use_constant_queries(self):
+        self.populate(2)
+        small_campus, _ = self.count_queries('/api/profiles/admin/campus/TECH/')
+        small_floor, _ = self.count_queries('/api/profiles/admin/campus/TECH/floor/1/')
+
+        self.populate(6)
+        large_campus, campus = self.count_queries('/api/profiles/admin/campus/TECH/')
+        large_floor, floor = self.count_queries('/api/profiles/admin/campus/TECH/floor/1/')
+
+        self.assertEqual(small_campus, large_campus)
+        self.assertEqual(small_floor, large_floor)
+        self.assertLessEqual(large_campus, 6)
+        self.assertLessEqual(large_floor, 8)
+
+        floor_one = campus['floors'][0]
+        self.assertEqual((floor_one['total_students'], floor_one['total_mentors']), (8, 2))
+        self.assertEqual(
+            floor_one['submissions'],
+            {'total': 16, 'pending': 4, 'approved': 4, 'rejected': 8, 'progress_percentage': 25}
+        )
+        self.assertTrue(floor_one['floor_wing_id'])
+        self.assertEqual({s['submissions'] for s in floor['students']}, {2})
+        self.assertEqual(sorted(m['assigned_students'] for m in floor['mentors']), [2, 6])
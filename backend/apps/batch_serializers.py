@@ -0,0 +1,110 @@
+"""
+Batch-loaded serializer fields
+
+A BatchMethodField names the key it needs from each object. Before a
+BatchListSerializer renders its rows it collects those keys from every row,
+including rows of nested serializers, and calls the serializer's
+`batch_<field_name>(keys)` method once. That method returns {key: value}
+from one `IN` query, so a list costs the same queries at any page size.
+
+Usage:
+    class TitleSerializer(serializers.ModelSerializer):
+        is_owned = BatchMethodField(key='pk', missing=False)
+
+        class Meta:
+            model = Title
+            fields = ['id', 'name', 'is_owned']
+            list_serializer_class = BatchListSerializer
+
+        def batch_is_owned(self, title_ids):
+            return {title_id: True for title_id in UserTitle.objects.filter(...).values_list('title_id', flat=True)}
+
+A serializer rendering a single object loads its one key on demand.
+"""
+from django.db import models
+from rest_framework import serializers
+
+
+class BatchMethodField(serializers.Field):
+    """
+    Read-only field whose values for a whole list come from one call to the
+    parent serializer's batch method
+
+    key: attribute path ('student_id', 'user.id') or callable giving an
+        object's key; objects whose key is None get `missing`
+    missing: value for keys the batch method does not return
+    """
+
+    def __init__(self, key='pk', method_name=None, missing=None, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+        self.key = key
+        self.method_name = method_name
+        self.missing = missing
+        self.loaded = {}
+
+    def bind(self, field_name, parent):
+        if self.method_name is None:
+            self.method_name = f'batch_{field_name}'
+        super().bind(field_name, parent)
+
+    def key_for(self, instance):
+        if callable(self.key):
+            return self.key(instance)
+        value = instance
+        for attr in self.key.split('.'):
+            value = getattr(value, attr, None)
+            if value is None:
+                return None
+        return value
+
+    def prime(self, instances):
+        """Load the values of every key not loaded yet with one batch call"""
+        keys = {self.key_for(instance) for instance in instances}
+        keys.discard(None)
+        keys -= self.loaded.keys()
+        if not keys:
+            return
+        values = getattr(self.parent, self.method_name)(sorted(keys))
+        for key in keys:
+            self.loaded[key] = values.get(key, self.missing)
+
+    def to_representation(self, instance):
+        key = self.key_for(instance)
+        if key is None:
+            return self.missing
+        if key not in self.loaded:
+            self.prime([instance])
+        return self.loaded[key]
+
+
+def prime_batch_fields(serializer, instances):
+    """Resolve the BatchMethodFields of a serializer and its nested serializers for many objects"""
+    if not instances:
+        return
+    for field in serializer.fields.values():
+        if isinstance(field, BatchMethodField):
+            field.prime(instances)
+        elif isinstance(field, serializers.ListSerializer):
+            # Nested many=True serializers prime themselves when they render
+            continue
+        elif isinstance(field, serializers.BaseSerializer):
+            nested = []
+            for instance in instances:
+                try:
+                    value = field.get_attribute(instance)
+                except (AttributeError, KeyError, models.ObjectDoesNotExist):
+                    continue
+                if value is not None:
+                    nested.append(value)
+            prime_batch_fields(field, nested)
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    """ListSerializer that primes the child's BatchMethodFields before rendering"""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        prime_batch_fields(self.child, items)
+        return [self.child.to_representation(item) for item in items]
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.utils import timezone
+from apps.file_storage_service import FileStorageService
 from django.db import transaction
 from django.core.cache import cache
 from django.db.models import Prefetch
@@ -84,7 +85,8 @@ class CLTSubmissionViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_400_BAD_REQUEST
                     )
                 
-                # Create file objects
+                # Create file objects, storing each distinct file once
+                storage = FileStorageService()
                 for file in files:
                     # Validate file size (10MB)
                     if file.size > 10 * 1024 * 1024:
@@ -96,7 +98,7 @@ class CLTSubmissionViewSet(viewsets.ModelViewSet):
                     
                     CLTFile.objects.create(
                         submission=submission,
-                        file=file,
+                        file=storage.save_content_addressed(file, 'clt_submissions'),
                         file_name=file.name,
                         file_size=file.size
                     )
@@ -150,11 +152,12 @@ class CLTSubmissionViewSet(viewsets.ModelViewSet):
         
         # Bulk create files in transaction
         created_files = []
+        storage = FileStorageService()
         with transaction.atomic():
             for file in files:
                 clt_file = CLTFile.objects.create(
                     submission=submission,
-                    file=file,
+                    file=storage.save_content_addressed(file, 'clt_submissions'),
                     file_name=file.name,
                     file_size=file.size,
                     file_type=request.data.get('file_type', 'evidence')
@@ -243,8 +246,7 @@ class CLTSubmissionViewSet(viewsets.ModelViewSet):
         try:
             file_obj = CLTFile.objects.get(id=file_id, submission=submission)
             with transaction.atomic():
-                file_obj.file.delete(save=False)  # Delete actual file from storage
-                file_obj.delete()  # Delete database record
+                file_obj.delete()  # Storage copy goes with its last reference (apps/filestore/signals.py)
             return Response({'message': 'File deleted successfully'}, status=status.HTTP_200_OK)
         except CLTFile.DoesNotExist:
             return Response(
@@ -299,9 +301,7 @@ class CLTSubmissionViewSet(viewsets.ModelViewSet):
             )
         
         with transaction.atomic():
-            # Delete all associated files
-            for file_obj in instance.files.all():
-                file_obj.file.delete(save=False)
+            # Cascades to the files; post_delete releases their stored copies
             instance.delete()
             cache.delete(f'clt_stats_{request.user.id}')
         
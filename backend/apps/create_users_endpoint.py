@@ -5,8 +5,7 @@ Can be called via POST request to initialize the database
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from django.contrib.auth.models import User
-from apps.profiles.models import UserProfile
+from apps.profiles.bulk_import import UserImportEngine
 
 
 @csrf_exempt
@@ -70,59 +69,14 @@ def create_production_users_endpoint(request):
         }
     ]
     
-    for user_data in users_data:
-        username = user_data['username']
-        email = user_data['email']
-        password = user_data['password']
-        role = user_data.pop('role')
-        
-        try:
-            # Check if user exists
-            user = User.objects.filter(username=username).first()
-            
-            if user:
-                # Update existing user
-                user.email = email
-                user.first_name = user_data['first_name']
-                user.last_name = user_data['last_name']
-                user.is_superuser = user_data.get('is_superuser', False)
-                user.is_staff = user_data.get('is_staff', False)
-                user.set_password(password)
-                user.save()
-                results['updated'].append(f"{username} ({email})")
-            else:
-                # Create new user
-                is_superuser = user_data.get('is_superuser', False)
-                is_staff = user_data.get('is_staff', False)
-                
-                if is_superuser:
-                    user = User.objects.create_superuser(
-                        username=username,
-                        email=email,
-                        password=password,
-                        first_name=user_data['first_name'],
-                        last_name=user_data['last_name']
-                    )
-                else:
-                    user = User.objects.create_user(
-                        username=username,
-                        email=email,
-                        password=password,
-                        first_name=user_data['first_name'],
-                        last_name=user_data['last_name'],
-                        is_staff=is_staff
-                    )
-                results['created'].append(f"{username} ({email})")
-            
-            # Create or update profile
-            profile, created = UserProfile.objects.get_or_create(user=user)
-            profile.role = role
-            profile.campus = 'TECH'
-            profile.floor = 2
-            profile.save()
-            
-        except Exception as e:
-            results['errors'].append(f"Error creating {username}: {str(e)}")
+    # Matched by username; existing users get their details and passwords reset
+    engine = UserImportEngine(campus='TECH', floor=2, match_on='username', workers=1, allow_privileges=True)
+    report = engine.run({'is_superuser': False, 'is_staff': False, **user_data} for user_data in users_data)
+    for row in report.rows:
+        if row['status'] == 'error':
+            results['errors'].append(f"Error creating {row['username']}: {row['error']}")
+        else:
+            results[row['status']].append(f"{row['username']} ({row['email']})")
     
     return JsonResponse({
         'success': True,
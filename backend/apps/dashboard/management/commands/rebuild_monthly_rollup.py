@@ -0,0 +1,34 @@
+"""
+Management command to rebuild the per-student monthly pillar rollup
+Run any time the rollup drifts (e.g. after queryset.update() calls that
+bypass signals); migration 0014 backfills it on deploy
+
+Usage:
+    python manage.py rebuild_monthly_rollup
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from apps.dashboard.monthly_rollup import MonthlyRollupService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the MonthlyPillarRollup table used by monthly reports'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows written per bulk insert (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        counts = MonthlyRollupService.rebuild(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rolled up {sum(counts.values())} student-months in {time.monotonic() - started:.2f}s'
+        ))
+        for model_type, count in counts.items():
+            self.stdout.write(f'  - {model_type}: {count}')
@@ -0,0 +1,34 @@
+"""
+Management command to rebuild the cross-pillar submission index
+Run any time the index drifts (e.g. after queryset.update() calls that
+bypass signals); migration 0013 backfills it on deploy
+
+Usage:
+    python manage.py rebuild_submission_index
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from apps.dashboard.submission_index import SubmissionIndexService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the SubmissionIndex table used by the mentor review queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows written per bulk insert (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        counts = SubmissionIndexService.rebuild(batch_size=options['batch_size'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {sum(counts.values())} submissions in {time.monotonic() - started:.2f}s'
+        ))
+        for model_type, count in counts.items():
+            self.stdout.write(f'  - {model_type}: {count}')
@@ -0,0 +1,95 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:53
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("dashboard", "0007_alter_notification_notification_type"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubmissionIndex",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "pillar",
+                    models.CharField(
+                        choices=[
+                            ("cfc", "CFC"),
+                            ("clt", "CLT"),
+                            ("iipc", "IIPC"),
+                            ("scd", "SCD"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "model_type",
+                    models.CharField(
+                        help_text="hackathon, bmc, internship, genai, clt, linkedin, leetcode",
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("approved", "Approved"),
+                            ("rejected", "Rejected"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                ("description", models.TextField(blank=True)),
+                (
+                    "submitted_at",
+                    models.DateTimeField(
+                        help_text="Submitted time, or creation time for drafts"
+                    ),
+                ),
+                ("evidence_url", models.URLField(blank=True, max_length=500)),
+                ("evidence_links", models.PositiveSmallIntegerField(default=0)),
+                ("reviewer_comments", models.TextField(blank=True)),
+                ("reviewed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="submission_index",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["student", "-submitted_at", "-id"],
+                        name="dashboard_s_student_c59f66_idx",
+                    ),
+                    models.Index(
+                        fields=["pillar", "status", "-submitted_at", "-id"],
+                        name="dashboard_s_pillar_7bcb57_idx",
+                    ),
+                ],
+                "unique_together": {("model_type", "object_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.db import migrations
+
+# Must stay in step with apps.dashboard.search
+SEARCH_CONFIG = "simple"
+SUBMISSION_TABLE = "dashboard_submissionindex"
+SUBMISSION_FTS_TABLE = "dashboard_submissionindex_fts"
+SUBMISSION_SEARCH_FIELDS = ["title", "description"]
+USER_TABLE = "auth_user"
+USER_FTS_TABLE = "dashboard_user_fts"
+USER_SEARCH_FIELDS = ["first_name", "last_name", "username"]
+
+
+def tsvector_sql(fields):
+    """Same expression SearchVector(*fields, config=SEARCH_CONFIG) compiles to"""
+    document = " || ' ' || ".join(f"COALESCE(\"{field}\", '')" for field in fields)
+    return f"to_tsvector('{SEARCH_CONFIG}'::regconfig, {document})"
+
+
+def fts5_sql(fts_table, content_table, fields):
+    """External-content FTS5 table plus triggers mirroring content_table"""
+    columns = ", ".join(fields)
+    new_values = ", ".join(f"new.{field}" for field in fields)
+    old_values = ", ".join(f"old.{field}" for field in fields)
+    return [
+        f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+        f"{columns}, content='{content_table}', content_rowid='id', tokenize='unicode61')",
+        f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {content_table} BEGIN "
+        f"INSERT INTO {fts_table}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {content_table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {content_table} BEGIN "
+        f"INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts_table}(rowid, {columns}) VALUES (new.id, {new_values}); END",
+        f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')",
+    ]
+
+
+def drop_fts5_sql(fts_table):
+    return [f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}" for suffix in ("ai", "ad", "au")] + [
+        f"DROP TABLE IF EXISTS {fts_table}"
+    ]
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        statements = [
+            f"CREATE INDEX IF NOT EXISTS {SUBMISSION_TABLE}_search_gin ON {SUBMISSION_TABLE} "
+            f"USING gin ({tsvector_sql(SUBMISSION_SEARCH_FIELDS)})",
+            f"CREATE INDEX IF NOT EXISTS dashboard_user_search_gin ON {USER_TABLE} "
+            f"USING gin ({tsvector_sql(USER_SEARCH_FIELDS)})",
+        ]
+    elif vendor == "sqlite":
+        statements = fts5_sql(SUBMISSION_FTS_TABLE, SUBMISSION_TABLE, SUBMISSION_SEARCH_FIELDS) + fts5_sql(
+            USER_FTS_TABLE, USER_TABLE, USER_SEARCH_FIELDS
+        )
+    else:
+        statements = []
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        statements = [
+            f"DROP INDEX IF EXISTS {SUBMISSION_TABLE}_search_gin",
+            "DROP INDEX IF EXISTS dashboard_user_search_gin",
+        ]
+    elif vendor == "sqlite":
+        statements = drop_fts5_sql(SUBMISSION_FTS_TABLE) + drop_fts5_sql(USER_FTS_TABLE)
+    else:
+        statements = []
+
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("dashboard", "0008_submissionindex"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def normalize_threads(apps, schema_editor):
+    """
+    Store every thread as (lower user id, higher user id), fold duplicate
+    threads of the same pair into the oldest one and link existing messages
+    """
+    MessageThread = apps.get_model("dashboard", "MessageThread")
+    Message = apps.get_model("dashboard", "Message")
+
+    canonical = {}
+    for thread in MessageThread.objects.order_by("created_at", "id"):
+        pair = tuple(sorted((thread.participant1_id, thread.participant2_id)))
+        if thread.participant1_id != pair[0]:
+            thread.participant1_id, thread.participant2_id = pair
+            thread.unread_count_p1, thread.unread_count_p2 = thread.unread_count_p2, thread.unread_count_p1
+
+        kept = canonical.get(pair)
+        if kept is None:
+            canonical[pair] = thread
+            continue
+
+        kept.unread_count_p1 += thread.unread_count_p1
+        kept.unread_count_p2 += thread.unread_count_p2
+        if thread.last_message_at > kept.last_message_at:
+            kept.last_message_id = thread.last_message_id
+            kept.last_message_at = thread.last_message_at
+        thread.delete()
+
+    for thread in canonical.values():
+        thread.save()
+
+    pairs = {
+        tuple(sorted(pair))
+        for pair in Message.objects.filter(thread__isnull=True).values_list("sender_id", "recipient_id").distinct()
+    }
+    for participant1_id, participant2_id in pairs:
+        thread = canonical.get((participant1_id, participant2_id))
+        if thread is None:
+            thread = MessageThread.objects.create(participant1_id=participant1_id, participant2_id=participant2_id)
+        Message.objects.filter(
+            models.Q(sender_id=participant1_id, recipient_id=participant2_id)
+            | models.Q(sender_id=participant2_id, recipient_id=participant1_id)
+        ).update(thread=thread)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dashboard", "0009_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="thread",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="messages",
+                to="dashboard.messagethread",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["thread", "-created_at", "-id"],
+                name="dashboard_m_thread__b72ae7_idx",
+            ),
+        ),
+        migrations.RunPython(normalize_threads, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="messagethread",
+            constraint=models.UniqueConstraint(
+                fields=("participant1", "participant2"),
+                name="unique_message_thread_pair",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="messagethread",
+            constraint=models.CheckConstraint(
+                check=models.Q(("participant1__lte", models.F("participant2"))),
+                name="message_thread_pair_ordered",
+            ),
+        ),
+    ]
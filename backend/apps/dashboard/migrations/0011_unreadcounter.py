@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("dashboard", "0010_message_thread_pairs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UnreadCounter",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="unread_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("notifications", models.IntegerField(default=0)),
+                (
+                    "profile_notifications",
+                    models.IntegerField(
+                        default=0,
+                        help_text="Announcement notifications from apps.profiles",
+                    ),
+                ),
+                ("messages", models.IntegerField(default=0)),
+                ("version", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:21
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("dashboard", "0011_unreadcounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyPillarRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("year", models.PositiveSmallIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                (
+                    "pillar",
+                    models.CharField(
+                        choices=[
+                            ("cfc", "CFC"),
+                            ("clt", "CLT"),
+                            ("iipc", "IIPC"),
+                            ("scd", "SCD"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "model_type",
+                    models.CharField(
+                        help_text="hackathon, bmc, internship, genai, clt, linkedin, linkedin_connection, leetcode",
+                        max_length=30,
+                    ),
+                ),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("approved", models.PositiveIntegerField(default=0)),
+                ("pending", models.PositiveIntegerField(default=0)),
+                (
+                    "qualified",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Approved and meeting the monthly requirement",
+                    ),
+                ),
+                (
+                    "problems_solved",
+                    models.PositiveIntegerField(
+                        default=0, help_text="LeetCode problems, for leetcode rows"
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_rollups",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-year", "-month"],
+                "unique_together": {("student", "year", "month", "model_type")},
+            },
+        ),
+    ]
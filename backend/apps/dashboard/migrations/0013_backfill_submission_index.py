@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def backfill_submission_index(apps, schema_editor):
+    # The review queue reads only SubmissionIndex; index submissions created before it existed
+    from apps.dashboard.submission_index import SubmissionIndexService
+
+    SubmissionIndex = apps.get_model('dashboard', 'SubmissionIndex')
+    fields = ['model_type', 'object_id'] + SubmissionIndexService.SYNCED_FIELDS
+    SubmissionIndex.objects.all().delete()
+    for model_type, (pillar, model_class) in SubmissionIndexService.indexed_models().items():
+        historical = apps.get_model(model_class._meta.app_label, model_class._meta.model_name)
+        rows = []
+        for sub in historical.objects.order_by().iterator(chunk_size=1000):
+            row = SubmissionIndexService.build(sub, model_type)
+            rows.append(SubmissionIndex(**{field: getattr(row, field) for field in fields}))
+        SubmissionIndex.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0012_monthlypillarrollup'),
+        ('cfc', '0004_hackathonregistration'),
+        ('clt', '0004_cltsubmission_duration'),
+        ('iipc', '0004_add_iipc_monthly_submission'),
+        ('scd', '0004_leetcodedailyactivity'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_submission_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def backfill_monthly_rollup(apps, schema_editor):
+    # Monthly reports read only MonthlyPillarRollup; count submissions made before it existed
+    from apps.dashboard.monthly_rollup import MonthlyRollupService
+
+    MonthlyRollupService.rebuild(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0013_backfill_submission_index'),
+        ('cfc', '0004_hackathonregistration'),
+        ('clt', '0004_cltsubmission_duration'),
+        ('iipc', '0004_add_iipc_monthly_submission'),
+        ('scd', '0004_leetcodedailyactivity'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_monthly_rollup, migrations.RunPython.noop),
+    ]
@@ -69,6 +69,7 @@ class Announcement(models.Model):
         if is_new:
             try:
                 from apps.profiles.models import UserProfile
+                from .unread import UnreadCounterService
                 import logging
                 logger = logging.getLogger(__name__)
                 
@@ -88,6 +89,7 @@ class Announcement(models.Model):
                     ))
                 if notifications:
                     Notification.objects.bulk_create(notifications)
+                    UnreadCounterService.record_created(Notification, [n.recipient_id for n in notifications])
                     logger.info(f"Successfully created {len(notifications)} notifications")
             except Exception as e:
                 logger.error(f"Failed to create notifications for announcement: {str(e)}")
@@ -171,10 +173,13 @@ class Notification(models.Model):
     
     def mark_as_read(self):
         """Mark notification as read"""
+        from .unread import UnreadCounterService
+        
         if not self.is_read:
             self.is_read = True
             self.read_at = timezone.now()
             self.save()
+            UnreadCounterService.adjust(self.recipient_id, notifications=-1)
 
 
 class Message(models.Model):
@@ -204,6 +209,9 @@ class Message(models.Model):
     # Parent message for threading
     parent_message = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
     
+    # Conversation this message belongs to; history is read through (thread, created_at)
+    thread = models.ForeignKey('MessageThread', on_delete=models.CASCADE, null=True, blank=True, related_name='messages')
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -214,6 +222,7 @@ class Message(models.Model):
             models.Index(fields=['sender', '-created_at']),
             models.Index(fields=['recipient', 'is_read']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['thread', '-created_at', '-id']),
         ]
     
     def __str__(self):
@@ -221,15 +230,21 @@ class Message(models.Model):
     
     def mark_as_read(self):
         """Mark message as read"""
+        from .unread import UnreadCounterService
+        
         if not self.is_read:
             self.is_read = True
             self.read_at = timezone.now()
             self.status = 'read'
             self.save()
+            UnreadCounterService.adjust(self.recipient_id, messages=-1)
 
 
 class MessageThread(models.Model):
-    """Conversation thread between mentor and student"""
+    """
+    Conversation thread between mentor and student
+    One row per pair of users: participant1 is always the lower user id
+    """
     
     participant1 = models.ForeignKey(User, on_delete=models.CASCADE, related_name='threads_as_participant1')
     participant2 = models.ForeignKey(User, on_delete=models.CASCADE, related_name='threads_as_participant2')
@@ -250,34 +265,153 @@ class MessageThread(models.Model):
             models.Index(fields=['participant1', '-last_message_at']),
             models.Index(fields=['participant2', '-last_message_at']),
         ]
+        constraints = [
+            models.UniqueConstraint(fields=['participant1', 'participant2'], name='unique_message_thread_pair'),
+            models.CheckConstraint(
+                check=models.Q(participant1__lte=models.F('participant2')),
+                name='message_thread_pair_ordered',
+            ),
+        ]
     
     def __str__(self):
         return f"Thread: {self.participant1.username} ↔ {self.participant2.username}"
     
+    @staticmethod
+    def pair_key(user_a, user_b):
+        """(participant1_id, participant2_id) for two users or user ids"""
+        a = getattr(user_a, 'pk', user_a)
+        b = getattr(user_b, 'pk', user_b)
+        return (a, b) if a <= b else (b, a)
+    
+    @classmethod
+    def for_users(cls, user_a, user_b):
+        """Get or create the thread between two users with one indexed lookup"""
+        participant1_id, participant2_id = cls.pair_key(user_a, user_b)
+        thread, _ = cls.objects.get_or_create(participant1_id=participant1_id, participant2_id=participant2_id)
+        return thread
+    
+    def unread_field(self, user):
+        """Name of the unread counter belonging to `user`"""
+        return 'unread_count_p1' if getattr(user, 'pk', user) == self.participant1_id else 'unread_count_p2'
+    
     def get_other_participant(self, user):
         """Get the other participant in the thread"""
-        if user == self.participant1:
+        if getattr(user, 'pk', user) == self.participant1_id:
             return self.participant2
         return self.participant1
     
     def get_unread_count(self, user):
         """Get unread count for a specific user"""
-        if user == self.participant1:
-            return self.unread_count_p1
-        return self.unread_count_p2
+        return getattr(self, self.unread_field(user))
     
     def increment_unread(self, user):
         """Increment unread count for a user"""
-        if user == self.participant1:
-            self.unread_count_p1 += 1
-        else:
-            self.unread_count_p2 += 1
-        self.save()
+        field = self.unread_field(user)
+        MessageThread.objects.filter(pk=self.pk).update(**{field: models.F(field) + 1})
+        setattr(self, field, getattr(self, field) + 1)
     
     def reset_unread(self, user):
         """Reset unread count for a user"""
-        if user == self.participant1:
-            self.unread_count_p1 = 0
-        else:
-            self.unread_count_p2 = 0
-        self.save()
+        field = self.unread_field(user)
+        MessageThread.objects.filter(pk=self.pk).update(**{field: 0})
+        setattr(self, field, 0)
+
+
+class SubmissionIndex(models.Model):
+    """
+    One denormalized row per reviewable submission across all pillars
+    Kept in sync by apps.dashboard.signals; backs the mentor review queue
+    """
+    
+    PILLAR_CHOICES = [
+        ('cfc', 'CFC'),
+        ('clt', 'CLT'),
+        ('iipc', 'IIPC'),
+        ('scd', 'SCD'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('approved', 'Approved'),
+        ('rejected', 'Rejected'),
+    ]
+    
+    pillar = models.CharField(max_length=10, choices=PILLAR_CHOICES)
+    model_type = models.CharField(max_length=20, help_text="hackathon, bmc, internship, genai, clt, linkedin, leetcode")
+    object_id = models.PositiveIntegerField()
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='submission_index')
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+    submitted_at = models.DateTimeField(help_text="Submitted time, or creation time for drafts")
+    
+    evidence_url = models.URLField(max_length=500, blank=True)
+    evidence_links = models.PositiveSmallIntegerField(default=0)
+    reviewer_comments = models.TextField(blank=True)
+    reviewed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ('model_type', 'object_id')
+        indexes = [
+            models.Index(fields=['student', '-submitted_at', '-id']),
+            models.Index(fields=['pillar', 'status', '-submitted_at', '-id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.model_type} #{self.object_id} - {self.student.username} ({self.status})"
+
+
+class UnreadCounter(models.Model):
+    """
+    Per-user unread totals, maintained on create and read by apps.dashboard.unread
+    `version` grows on every change; long-polling clients wait for it to move
+    """
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='unread_counter')
+    
+    notifications = models.IntegerField(default=0)
+    profile_notifications = models.IntegerField(default=0, help_text="Announcement notifications from apps.profiles")
+    messages = models.IntegerField(default=0)
+    
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user_id}: {self.notifications} notifications, {self.messages} messages (v{self.version})"
+
+
+class MonthlyPillarRollup(models.Model):
+    """
+    Per-student monthly submission counts, one row per (student, month, submission model)
+    Kept in sync by apps.dashboard.signals; backs the monthly reports and month pickers
+    """
+    
+    PILLAR_CHOICES = [
+        ('cfc', 'CFC'),
+        ('clt', 'CLT'),
+        ('iipc', 'IIPC'),
+        ('scd', 'SCD'),
+    ]
+    
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='monthly_rollups')
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    pillar = models.CharField(max_length=10, choices=PILLAR_CHOICES)
+    model_type = models.CharField(max_length=30, help_text="hackathon, bmc, internship, genai, clt, linkedin, linkedin_connection, leetcode")
+    
+    total = models.PositiveIntegerField(default=0)
+    approved = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+    qualified = models.PositiveIntegerField(default=0, help_text="Approved and meeting the monthly requirement")
+    problems_solved = models.PositiveIntegerField(default=0, help_text="LeetCode problems, for leetcode rows")
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        # The unique index also serves the (student, year, month) lookups
+        unique_together = ('student', 'year', 'month', 'model_type')
+        ordering = ['-year', '-month']
+    
+    def __str__(self):
+        return f"{self.student_id} {self.year}-{self.month:02d} {self.model_type}: {self.approved}/{self.total}"
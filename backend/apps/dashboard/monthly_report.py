@@ -5,15 +5,7 @@ from rest_framework import status
 from datetime import datetime
 import traceback
 
-from apps.clt.models import CLTSubmission
-try:
-    from apps.sri.models import SocialActivitySubmission
-    HAS_SRI_MODELS = True
-except ImportError:
-    HAS_SRI_MODELS = False
-from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
-from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
-from apps.scd.models import LeetCodeProfile
+from .monthly_rollup import MonthlyRollupService
 
 
 # Monthly task requirements
@@ -60,84 +52,42 @@ class MonthlyReportView(APIView):
                 month = now.month
                 year = now.year
             
-            # Create start and end dates for the month
-            start_date = datetime(year, month, 1)
-            if month == 12:
-                end_date = datetime(year + 1, 1, 1)
-            else:
-                end_date = datetime(year, month + 1, 1)
+            # All pillar counts for the month come from the rollup in one read
+            rows = MonthlyRollupService.month(user, year, month)
+            
+            def counts(*model_types, field='total'):
+                return sum(getattr(rows[t], field) for t in model_types if t in rows)
             
             # CLT Stats for the month
-            clt_submissions = CLTSubmission.objects.filter(
-                user=user,
-                created_at__gte=start_date,
-                created_at__lt=end_date
-            )
-            clt_completed = clt_submissions.filter(status='approved').count()
+            clt_completed = counts('clt', field='approved')
             clt_stats = {
-                'total': clt_submissions.count(),
+                'total': counts('clt'),
                 'completed': clt_completed,
-                'pending': clt_submissions.filter(status__in=['draft', 'submitted', 'under_review']).count(),
+                'pending': counts('clt', field='pending'),
                 'monthly_target': MONTHLY_REQUIREMENTS['clt'],
                 'percentage': min(100, round((clt_completed / MONTHLY_REQUIREMENTS['clt']) * 100)) if MONTHLY_REQUIREMENTS['clt'] > 0 else 0,
                 'status': 'completed' if clt_completed >= MONTHLY_REQUIREMENTS['clt'] else 'in-progress' if clt_completed > 0 else 'not-started',
             }
             
-            # SRI Stats for the month
-            if HAS_SRI_MODELS:
-                sri_submissions = SocialActivitySubmission.objects.filter(
-                    user=user,
-                    created_at__gte=start_date,
-                    created_at__lt=end_date
-                )
-                sri_completed = sri_submissions.filter(status='approved').count()
-                sri_stats = {
-                    'total': sri_submissions.count(),
-                    'completed': sri_completed,
-                    'pending': sri_submissions.filter(status__in=['draft', 'submitted', 'under_review']).count(),
-                    'monthly_target': MONTHLY_REQUIREMENTS['sri'],
-                    'percentage': 0,
-                    'status': 'not-applicable',
-                }
-            else:
-                sri_stats = {
-                    'total': 0,
-                    'completed': 0,
-                    'pending': 0,
-                    'monthly_target': MONTHLY_REQUIREMENTS['sri'],
-                    'percentage': 0,
-                    'status': 'not-applicable',
-                }
+            # SRI Stats for the month (not tracked monthly)
+            sri_stats = {
+                'total': 0,
+                'completed': 0,
+                'pending': 0,
+                'monthly_target': MONTHLY_REQUIREMENTS['sri'],
+                'percentage': 0,
+                'status': 'not-applicable',
+            }
             
             # CFC Stats for the month
-            hackathons = HackathonSubmission.objects.filter(
-                user=user,
-                created_at__gte=start_date,
-                created_at__lt=end_date
-            )
-            bmc_videos = BMCVideoSubmission.objects.filter(
-                user=user,
-                created_at__gte=start_date,
-                created_at__lt=end_date
-            )
-            internships = InternshipSubmission.objects.filter(
-                user=user,
-                created_at__gte=start_date,
-                created_at__lt=end_date
-            )
-            genai_projects = GenAIProjectSubmission.objects.filter(
-                user=user,
-                created_at__gte=start_date,
-                created_at__lt=end_date
-            )
-            
-            cfc_total = hackathons.count() + bmc_videos.count() + internships.count() + genai_projects.count()
-            cfc_completed = (
-                hackathons.filter(status='approved').count() +
-                bmc_videos.filter(status='approved').count() +
-                internships.filter(status='approved').count() +
-                genai_projects.filter(status='approved').count()
-            )
+            cfc_types = {
+                'hackathons': 'hackathon',
+                'bmc_videos': 'bmc',
+                'internships': 'internship',
+                'genai_projects': 'genai',
+            }
+            cfc_total = counts(*cfc_types.values())
+            cfc_completed = counts(*cfc_types.values(), field='approved')
             
             cfc_stats = {
                 'total': cfc_total,
@@ -147,42 +97,21 @@ class MonthlyReportView(APIView):
                 'percentage': min(100, round((cfc_completed / MONTHLY_REQUIREMENTS['cfc']) * 100)) if MONTHLY_REQUIREMENTS['cfc'] > 0 else 0,
                 'status': 'completed' if cfc_completed >= MONTHLY_REQUIREMENTS['cfc'] else 'in-progress' if cfc_completed > 0 else 'not-started',
                 'breakdown': {
-                    'hackathons': {
-                        'total': hackathons.count(),
-                        'completed': hackathons.filter(status='approved').count(),
-                    },
-                    'bmc_videos': {
-                        'total': bmc_videos.count(),
-                        'completed': bmc_videos.filter(status='approved').count(),
-                    },
-                    'internships': {
-                        'total': internships.count(),
-                        'completed': internships.filter(status='approved').count(),
-                    },
-                    'genai_projects': {
-                        'total': genai_projects.count(),
-                        'completed': genai_projects.filter(status='approved').count(),
-                    },
+                    name: {
+                        'total': counts(model_type),
+                        'completed': counts(model_type, field='approved'),
+                    }
+                    for name, model_type in cfc_types.items()
                 }
             }
             
             # IIPC Stats for the month
-            linkedin_posts = LinkedInPostVerification.objects.filter(
-                user=user,
-                created_at__gte=start_date,
-                created_at__lt=end_date
-            )
-            linkedin_connections = LinkedInConnectionVerification.objects.filter(
-                user=user,
-                created_at__gte=start_date,
-                created_at__lt=end_date
-            )
-            
-            iipc_total = linkedin_posts.count() + linkedin_connections.count()
-            iipc_completed = (
-                linkedin_posts.filter(status='approved').count() +
-                linkedin_connections.filter(status='approved').count()
-            )
+            iipc_types = {
+                'posts': 'linkedin',
+                'connections': 'linkedin_connection',
+            }
+            iipc_total = counts(*iipc_types.values())
+            iipc_completed = counts(*iipc_types.values(), field='approved')
             
             iipc_stats = {
                 'total': iipc_total,
@@ -192,36 +121,25 @@ class MonthlyReportView(APIView):
                 'percentage': min(100, round((iipc_completed / MONTHLY_REQUIREMENTS['iipc']) * 100)) if MONTHLY_REQUIREMENTS['iipc'] > 0 else 0,
                 'status': 'completed' if iipc_completed >= MONTHLY_REQUIREMENTS['iipc'] else 'in-progress' if iipc_completed > 0 else 'not-started',
                 'breakdown': {
-                    'posts': {
-                        'total': linkedin_posts.count(),
-                        'completed': linkedin_posts.filter(status='approved').count(),
-                    },
-                    'connections': {
-                        'total': linkedin_connections.count(),
-                        'completed': linkedin_connections.filter(status='approved').count(),
-                    },
+                    name: {
+                        'total': counts(model_type),
+                        'completed': counts(model_type, field='approved'),
+                    }
+                    for name, model_type in iipc_types.items()
                 }
             }
             
-            # SCD Stats for the month
-            leetcode_profiles = LeetCodeProfile.objects.filter(
-                user=user,
-                created_at__gte=start_date,
-                created_at__lt=end_date
-            )
-            scd_completed = leetcode_profiles.filter(
-                status='approved',
-                total_solved__gte=10
-            ).count()
+            # SCD Stats for the month (approved profiles with at least 10 problems)
+            scd_completed = counts('leetcode', field='qualified')
             
             scd_stats = {
-                'total': leetcode_profiles.count(),
+                'total': counts('leetcode'),
                 'completed': scd_completed,
-                'pending': leetcode_profiles.filter(status__in=['draft', 'pending']).count(),
+                'pending': counts('leetcode', field='pending'),
                 'monthly_target': MONTHLY_REQUIREMENTS['scd'],
                 'percentage': min(100, round((scd_completed / MONTHLY_REQUIREMENTS['scd']) * 100)) if MONTHLY_REQUIREMENTS['scd'] > 0 else 0,
                 'status': 'completed' if scd_completed >= MONTHLY_REQUIREMENTS['scd'] else 'in-progress' if scd_completed > 0 else 'not-started',
-                'total_problems_solved': sum(p.total_solved or 0 for p in leetcode_profiles),
+                'total_problems_solved': counts('leetcode', field='problems_solved'),
             }
             
             # Calculate overall progress
@@ -276,29 +194,7 @@ class AvailableMonthsView(APIView):
             user = request.user
             
             # Get all months where user has any activity
-            months_set = set()
-            
-            # Check CLT submissions
-            clt_dates = CLTSubmission.objects.filter(user=user).values_list('created_at', flat=True)
-            for date in clt_dates:
-                months_set.add((date.year, date.month))
-            
-            # Check CFC submissions
-            for model in [HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission]:
-                dates = model.objects.filter(user=user).values_list('created_at', flat=True)
-                for date in dates:
-                    months_set.add((date.year, date.month))
-            
-            # Check IIPC submissions
-            for model in [LinkedInPostVerification, LinkedInConnectionVerification]:
-                dates = model.objects.filter(user=user).values_list('created_at', flat=True)
-                for date in dates:
-                    months_set.add((date.year, date.month))
-            
-            # Check SCD submissions
-            scd_dates = LeetCodeProfile.objects.filter(user=user).values_list('created_at', flat=True)
-            for date in scd_dates:
-                months_set.add((date.year, date.month))
+            months_set = set(MonthlyRollupService.available_months(user))
             
             # Always include current month
             now = datetime.now()
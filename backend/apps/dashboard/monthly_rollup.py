@@ -0,0 +1,194 @@
+"""
+Per-student monthly rollup of pillar submissions
+
+Each save or delete of a rolled-up submission recounts the one
+(student, month, model) bucket it falls in, through the signals in
+apps.dashboard.signals. Bulk writes call refresh_many(). Migration 0014
+backfills existing submissions; run `manage.py rebuild_monthly_rollup` if
+the rollup drifts.
+Months are calendar months in TIME_ZONE, matching the reports' date ranges.
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from .models import MonthlyPillarRollup
+
+
+class MonthlyRollupService:
+    """Maintain and read MonthlyPillarRollup rows"""
+
+    PENDING_STATUSES = ['draft', 'submitted', 'under_review', 'pending']
+
+    COUNT_FIELDS = ['total', 'approved', 'pending', 'qualified', 'problems_solved']
+
+    # A LeetCode profile counts towards the SCD target once it has this many problems
+    SCD_MIN_PROBLEMS = 10
+
+    @staticmethod
+    def rolled_up_models():
+        """{model_type: (pillar, model class)} for every submission counted in monthly reports"""
+        from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
+        from apps.clt.models import CLTSubmission
+        from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
+        from apps.scd.models import LeetCodeProfile
+
+        return {
+            'clt': ('clt', CLTSubmission),
+            'hackathon': ('cfc', HackathonSubmission),
+            'bmc': ('cfc', BMCVideoSubmission),
+            'internship': ('cfc', InternshipSubmission),
+            'genai': ('cfc', GenAIProjectSubmission),
+            'linkedin': ('iipc', LinkedInPostVerification),
+            'linkedin_connection': ('iipc', LinkedInConnectionVerification),
+            'leetcode': ('scd', LeetCodeProfile),
+        }
+
+    @staticmethod
+    def model_type_for(model):
+        for model_type, (pillar, model_class) in MonthlyRollupService.rolled_up_models().items():
+            if model_class is model:
+                return model_type
+        return None
+
+    @staticmethod
+    def month_range(year, month):
+        """Aware [start, end) datetimes of a calendar month"""
+        start = timezone.make_aware(datetime(year, month, 1))
+        end = timezone.make_aware(datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1))
+        return start, end
+
+    @staticmethod
+    def bucket(created_at):
+        local = timezone.localtime(created_at)
+        return local.year, local.month
+
+    @staticmethod
+    def aggregates(model_type):
+        """Aggregate expressions producing one rollup row's counts"""
+        qualified = Q(status='approved')
+        if model_type == 'leetcode':
+            qualified &= Q(total_solved__gte=MonthlyRollupService.SCD_MIN_PROBLEMS)
+
+        aggregates = {
+            'total': Count('id'),
+            'approved': Count('id', filter=Q(status='approved')),
+            'pending': Count('id', filter=Q(status__in=MonthlyRollupService.PENDING_STATUSES)),
+            'qualified': Count('id', filter=qualified),
+        }
+        if model_type == 'leetcode':
+            aggregates['problems_solved'] = Sum('total_solved')
+        return aggregates
+
+    @staticmethod
+    def refresh_buckets(model_type, buckets):
+        """
+        Recount (student_id, year, month) buckets of one model from its table:
+        one grouped query per month, one upsert, and one delete for emptied buckets
+        """
+        pillar, model_class = MonthlyRollupService.rolled_up_models()[model_type]
+        by_month = defaultdict(set)
+        for student_id, year, month in buckets:
+            by_month[(year, month)].add(student_id)
+
+        rows, emptied = [], Q()
+        for (year, month), student_ids in sorted(by_month.items()):
+            start, end = MonthlyRollupService.month_range(year, month)
+            groups = {
+                group['user_id']: group
+                for group in model_class.objects.filter(
+                    user_id__in=student_ids, created_at__gte=start, created_at__lt=end
+                ).values('user_id').annotate(**MonthlyRollupService.aggregates(model_type)).order_by()
+            }
+            for student_id in sorted(student_ids):
+                group = groups.get(student_id)
+                if group is None:
+                    emptied |= Q(student_id=student_id, year=year, month=month)
+                    continue
+                rows.append(MonthlyPillarRollup(
+                    student_id=student_id, year=year, month=month, pillar=pillar, model_type=model_type,
+                    **{field: group.get(field) or 0 for field in MonthlyRollupService.COUNT_FIELDS}
+                ))
+
+        if rows:
+            MonthlyPillarRollup.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['student', 'year', 'month', 'model_type'],
+                update_fields=MonthlyRollupService.COUNT_FIELDS + ['updated_at'],
+            )
+        if emptied:
+            MonthlyPillarRollup.objects.filter(emptied, model_type=model_type).delete()
+
+    @staticmethod
+    def refresh_for(sub, model_type):
+        """Recount the bucket of one saved or deleted submission"""
+        MonthlyRollupService.refresh_many([sub], model_type)
+
+    @staticmethod
+    def refresh_many(subs, model_type):
+        """
+        Recount the buckets of several submissions, e.g. ones written with
+        bulk_update, which does not send post_save
+        """
+        MonthlyRollupService.refresh_buckets(model_type, {
+            (sub.user_id, *MonthlyRollupService.bucket(sub.created_at))
+            for sub in subs if sub.created_at is not None
+        })
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(batch_size=1000, apps=None):
+        """
+        Recreate every rollup row with one grouped query per submission model
+        Pass a migration's `apps` to read and write its historical models
+        Returns: {model_type: rows written}
+        """
+        tzinfo = timezone.get_current_timezone()
+        rollup_model = apps.get_model('dashboard', 'MonthlyPillarRollup') if apps else MonthlyPillarRollup
+        rollup_model.objects.all().delete()
+        counts = {}
+        for model_type, (pillar, model_class) in MonthlyRollupService.rolled_up_models().items():
+            if apps:
+                model_class = apps.get_model(model_class._meta.label)
+            groups = (
+                model_class.objects
+                .annotate(
+                    year=ExtractYear('created_at', tzinfo=tzinfo),
+                    month=ExtractMonth('created_at', tzinfo=tzinfo),
+                )
+                .values('user_id', 'year', 'month')
+                .annotate(**MonthlyRollupService.aggregates(model_type))
+                .order_by()
+            )
+            rows = [
+                rollup_model(
+                    student_id=group['user_id'], year=group['year'], month=group['month'],
+                    pillar=pillar, model_type=model_type,
+                    **{field: group.get(field) or 0 for field in MonthlyRollupService.COUNT_FIELDS}
+                )
+                for group in groups
+            ]
+            rollup_model.objects.bulk_create(rows, batch_size=batch_size)
+            counts[model_type] = len(rows)
+        return counts
+
+    @staticmethod
+    def month(student, year, month):
+        """{model_type: MonthlyPillarRollup} for one student and month, from one indexed read"""
+        return {
+            row.model_type: row
+            for row in MonthlyPillarRollup.objects.filter(student=student, year=year, month=month)
+        }
+
+    @staticmethod
+    def available_months(student):
+        """(year, month) pairs with any submission, most recent first"""
+        return list(
+            MonthlyPillarRollup.objects.filter(student=student)
+            .values_list('year', 'month').distinct().order_by('-year', '-month')
+        )
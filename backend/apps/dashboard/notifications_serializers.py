@@ -4,6 +4,7 @@ Serializers for Notifications, Messages, and Announcements
 
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from apps.batch_serializers import BatchListSerializer, BatchMethodField
 from .models import Notification, Message, MessageThread, Announcement
 
 
@@ -162,7 +163,7 @@ class AnnouncementSerializer(serializers.ModelSerializer):
     """Announcement serializer"""
     mentor = UserBasicSerializer(read_only=True)
     time_ago = serializers.SerializerMethodField()
-    is_read = serializers.SerializerMethodField()
+    is_read = BatchMethodField(missing=False)
     
     class Meta:
         model = Announcement
@@ -173,14 +174,16 @@ class AnnouncementSerializer(serializers.ModelSerializer):
             'job_stipend', 'application_url', 'application_deadline', 'required_skills'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = BatchListSerializer
     
-    def get_is_read(self, obj):
-        """Check if current user has read this announcement"""
+    def batch_is_read(self, announcement_ids):
+        """Check which of these announcements the current user has read"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             from apps.dashboard.models import AnnouncementRead
-            return AnnouncementRead.objects.filter(announcement=obj, user=request.user).exists()
-        return False
+            read = AnnouncementRead.objects.filter(announcement_id__in=announcement_ids, user=request.user)
+            return {announcement_id: True for announcement_id in read.values_list('announcement_id', flat=True)}
+        return {}
     
     def get_time_ago(self, obj):
         """Calculate time ago string"""
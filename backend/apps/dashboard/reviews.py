@@ -0,0 +1,222 @@
+"""
+Mentor review of pillar submissions
+
+Reviews are applied per submission model with bulk_update inside one
+transaction. Student notifications and the season rescoring of the
+affected students are enqueued in the outbox in that same transaction.
+"""
+import hashlib
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.outbox.services import OutboxService
+from .monthly_rollup import MonthlyRollupService
+from .submission_index import SubmissionIndexService
+
+
+class SubmissionReviewService:
+    """Approve, reject or request resubmission of one or many submissions"""
+
+    MAX_ITEMS = 500
+
+    STATUS_MAP = {
+        'approve': 'approved',
+        'reject': 'rejected',
+        'resubmit': 'under_review',
+    }
+
+    NOTIFICATION_TYPES = {
+        'approve': 'submission_approved',
+        'reject': 'submission_rejected',
+        'resubmit': 'submission_resubmit',
+    }
+
+    @staticmethod
+    def clean(item):
+        """
+        Validate one review request
+        Returns: (cleaned item, None) or (None, (error code, message))
+        """
+        submission_type = item.get('submission_type')
+        submission_id = item.get('submission_id')
+        action = item.get('action')
+        comment = item.get('comment') or ''
+
+        if not all([submission_id, submission_type, action]):
+            return None, ('invalid', 'Missing required fields')
+        models = SubmissionIndexService.indexed_models()
+        if submission_type not in models:
+            return None, ('invalid', 'Invalid submission type')
+        if action not in SubmissionReviewService.STATUS_MAP:
+            return None, ('invalid', 'Invalid action')
+        if action in ['reject', 'resubmit'] and not comment:
+            return None, ('invalid', 'Comment is required for rejection or resubmission request')
+        try:
+            submission_id = int(submission_id)
+        except (TypeError, ValueError):
+            return None, ('invalid', 'Invalid submission id')
+
+        return {
+            'submission_type': submission_type,
+            'submission_id': submission_id,
+            'action': action,
+            'comment': comment,
+            'pillar': item.get('pillar') or models[submission_type][0],
+        }, None
+
+    @staticmethod
+    def review_fields(model_class):
+        """Fields a review writes on this model; comment and reviewer names differ per pillar"""
+        names = {field.name for field in model_class._meta.get_fields()}
+        fields = ['status']
+        fields += [name for name in ['reviewer_comments', 'review_comments'] if name in names][:1]
+        fields += [name for name in ['reviewed_by', 'reviewer'] if name in names][:1]
+        fields += [name for name in ['reviewed_at', 'updated_at'] if name in names]
+        return fields
+
+    @staticmethod
+    def apply(submission, fields, reviewer, item, now):
+        values = {
+            'status': SubmissionReviewService.STATUS_MAP[item['action']],
+            'reviewer_comments': item['comment'],
+            'review_comments': item['comment'],
+            'reviewed_by': reviewer,
+            'reviewer': reviewer,
+            'reviewed_at': now,
+            'updated_at': now,
+        }
+        for field in fields:
+            setattr(submission, field, values[field])
+
+    @staticmethod
+    def build_notification(reviewer, submission, item):
+        """Notification fields telling the student about the review"""
+        action = item['action']
+        pillar = item['pillar']
+        submission_type = item['submission_type']
+
+        titles = {
+            'approve': f'✅ Submission Approved - {pillar.upper()}',
+            'reject': f'❌ Submission Rejected - {pillar.upper()}',
+            'resubmit': f'🔄 Resubmission Requested - {pillar.upper()}',
+        }
+        messages = {
+            'approve': f'Your {submission_type} submission has been approved by your mentor!',
+            'reject': f'Your {submission_type} submission needs revision. Please review the feedback.',
+            'resubmit': f'Your mentor has requested a resubmission for your {submission_type}.',
+        }
+
+        return {
+            'recipient_id': submission.user_id,
+            'sender_id': reviewer.id,
+            'notification_type': SubmissionReviewService.NOTIFICATION_TYPES[action],
+            'priority': 'high' if action == 'reject' else 'normal',
+            'title': titles[action],
+            'message': f"{messages[action]} {item['comment']}",
+            'related_pillar': pillar,
+            'related_submission_type': submission_type,
+            'related_submission_id': submission.id,
+            'action_url': f"/{pillar}",
+        }
+
+    @staticmethod
+    def batch_key(reviewer, reviewed, now):
+        """Idempotency key prefix shared by the outbox tasks of one review batch"""
+        digest = hashlib.sha1(
+            repr((reviewer.id, sorted(reviewed), now.isoformat())).encode()
+        ).hexdigest()[:20]
+        return f'review:{digest}'
+
+    @staticmethod
+    def enqueue_side_effects(reviewer, notifications, student_ids, reviewed, now):
+        """Outbox tasks for the notifications and the active season's rescoring"""
+        from apps.gamification.models import Season
+
+        key = SubmissionReviewService.batch_key(reviewer, reviewed, now)
+        tasks = [OutboxService.enqueue(
+            'dashboard.review_notifications',
+            {'notifications': notifications},
+            idempotency_key=f'{key}:notifications',
+        )]
+
+        season = Season.objects.filter(is_active=True).first()
+        if season and student_ids:
+            tasks.append(OutboxService.enqueue(
+                'gamification.rescore_students',
+                {'season_id': season.id, 'student_ids': sorted(student_ids)},
+                idempotency_key=f'{key}:rescore',
+            ))
+        return tasks
+
+    @staticmethod
+    def review_many(reviewer, items):
+        """
+        Apply a list of reviews in one transaction
+        Returns: (one result dict per item in request order, outbox tasks)
+            results are {'ok': True, 'status', ...} or {'ok': False, 'error', 'code', ...}
+        """
+        results = [None] * len(items)
+        by_type = defaultdict(list)
+
+        for index, item in enumerate(items):
+            cleaned, error = SubmissionReviewService.clean(item if isinstance(item, dict) else {})
+            if error:
+                results[index] = {
+                    'submission_type': item.get('submission_type') if isinstance(item, dict) else None,
+                    'submission_id': item.get('submission_id') if isinstance(item, dict) else None,
+                    'ok': False, 'code': error[0], 'error': error[1],
+                }
+                continue
+            by_type[cleaned['submission_type']].append((index, cleaned))
+
+        models = SubmissionIndexService.indexed_models()
+        now = timezone.now()
+        notifications = []
+        reviewed = []
+        affected_students = set()
+
+        with transaction.atomic():
+            for submission_type, entries in by_type.items():
+                model_class = models[submission_type][1]
+                fields = SubmissionReviewService.review_fields(model_class)
+                submissions = model_class.objects.select_for_update().in_bulk(
+                    [item['submission_id'] for _, item in entries]
+                )
+
+                changed = {}
+                for index, item in entries:
+                    submission = submissions.get(item['submission_id'])
+                    if submission is None:
+                        results[index] = {
+                            'submission_type': submission_type,
+                            'submission_id': item['submission_id'],
+                            'ok': False, 'code': 'not_found', 'error': 'Submission not found',
+                        }
+                        continue
+
+                    # A repeated id in one batch is applied in order, last one wins
+                    SubmissionReviewService.apply(submission, fields, reviewer, item, now)
+                    changed[submission.id] = submission
+                    affected_students.add(submission.user_id)
+                    notifications.append(SubmissionReviewService.build_notification(reviewer, submission, item))
+                    reviewed.append((submission_type, submission.id, item['action']))
+                    results[index] = {
+                        'submission_type': submission_type,
+                        'submission_id': submission.id,
+                        'ok': True, 'status': submission.status,
+                    }
+
+                if changed:
+                    model_class.objects.bulk_update(list(changed.values()), fields)
+                    SubmissionIndexService.sync_many(list(changed.values()), submission_type)
+                    MonthlyRollupService.refresh_many(list(changed.values()), submission_type)
+
+            tasks = []
+            if notifications:
+                tasks = SubmissionReviewService.enqueue_side_effects(
+                    reviewer, notifications, affected_students, reviewed, now
+                )
+
+        return results, tasks
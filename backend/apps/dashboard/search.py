@@ -0,0 +1,176 @@
+"""
+Database-side search over submissions and students
+
+PostgreSQL uses to_tsvector/to_tsquery backed by GIN expression indexes,
+SQLite uses FTS5 tables kept in sync by triggers (both created in migration
+0009_search_indexes). Other backends fall back to icontains.
+
+Every term is matched as a prefix and all terms must match, so "jo smi"
+finds "John Smith". Results carry a `search_rank` annotation, higher is better.
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+User = get_user_model()
+
+SUBMISSION_FTS_TABLE = 'dashboard_submissionindex_fts'
+USER_FTS_TABLE = 'dashboard_user_fts'
+
+# Columns covered by each index. Migration 0009_search_indexes builds the
+# PostgreSQL index expressions from copies of these lists, so the planner can
+# only use the GIN indexes while both stay identical
+SUBMISSION_SEARCH_FIELDS = ['title', 'description']
+USER_SEARCH_FIELDS = ['first_name', 'last_name', 'username']
+
+SEARCH_CONFIG = 'simple'
+MAX_TERMS = 8
+
+
+class SearchService:
+    """Ranked full-text matching for SubmissionIndex and User querysets"""
+
+    @staticmethod
+    def terms(query):
+        """Lowercase word tokens of a search string, at most MAX_TERMS"""
+        return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+    @staticmethod
+    def vendor():
+        return connection.vendor
+
+    # PostgreSQL
+
+    @staticmethod
+    def _pg_query(terms):
+        from django.contrib.postgres.search import SearchQuery
+        return SearchQuery(
+            ' & '.join(f'{term}:*' for term in terms),
+            search_type='raw',
+            config=SEARCH_CONFIG,
+        )
+
+    @staticmethod
+    def _pg_vector(*fields):
+        from django.contrib.postgres.search import SearchVector
+        return SearchVector(*fields, config=SEARCH_CONFIG)
+
+    # SQLite FTS5
+
+    @staticmethod
+    def _fts_match(terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    @staticmethod
+    def _fts_ids(table, match):
+        return RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [match])
+
+    @staticmethod
+    def _fts_rank(table, match, column):
+        """Correlated bm25 score of `column`'s row, 0 when it does not match"""
+        return RawSQL(
+            f'COALESCE((SELECT -bm25({table}) FROM {table} '
+            f'WHERE {table} MATCH %s AND rowid = {column}), 0)',
+            [match],
+            output_field=FloatField(),
+        )
+
+    # Public API
+
+    @staticmethod
+    def matching_user_ids(query):
+        """Subquery of user ids whose name or username matches"""
+        terms = SearchService.terms(query)
+        vendor = SearchService.vendor()
+
+        if vendor == 'postgresql':
+            return User.objects.annotate(
+                search_vector=SearchService._pg_vector(*USER_SEARCH_FIELDS)
+            ).filter(search_vector=SearchService._pg_query(terms)).values('id')
+
+        if vendor == 'sqlite':
+            return SearchService._fts_ids(USER_FTS_TABLE, SearchService._fts_match(terms))
+
+        matches = Q()
+        for term in terms:
+            matches &= Q(first_name__icontains=term) | Q(last_name__icontains=term) | Q(username__icontains=term)
+        return User.objects.filter(matches).values('id')
+
+    @staticmethod
+    def search_submissions(rows, query):
+        """
+        Filter a SubmissionIndex queryset to rows whose title or description,
+        or whose student's name, matches `query`, annotated with search_rank
+        """
+        terms = SearchService.terms(query)
+        if not terms:
+            return rows.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        vendor = SearchService.vendor()
+        student_ids = SearchService.matching_user_ids(query)
+        table = rows.model._meta.db_table
+
+        if vendor == 'postgresql':
+            from django.contrib.postgres.search import SearchRank
+            search_query = SearchService._pg_query(terms)
+            student_vector = SearchService._pg_vector(*[f'student__{field}' for field in USER_SEARCH_FIELDS])
+            return rows.annotate(
+                search_vector=SearchService._pg_vector(*SUBMISSION_SEARCH_FIELDS),
+            ).filter(
+                Q(search_vector=search_query) | Q(student_id__in=student_ids)
+            ).annotate(
+                search_rank=SearchRank('search_vector', search_query) + SearchRank(student_vector, search_query),
+            )
+
+        if vendor == 'sqlite':
+            match = SearchService._fts_match(terms)
+            return rows.filter(
+                Q(id__in=SearchService._fts_ids(SUBMISSION_FTS_TABLE, match)) | Q(student_id__in=student_ids)
+            ).annotate(
+                search_rank=(
+                    SearchService._fts_rank(SUBMISSION_FTS_TABLE, match, f'"{table}"."id"')
+                    + SearchService._fts_rank(USER_FTS_TABLE, match, f'"{table}"."student_id"')
+                )
+            )
+
+        matches = Q()
+        for term in terms:
+            matches &= Q(title__icontains=term) | Q(description__icontains=term)
+        return rows.filter(matches | Q(student_id__in=student_ids)).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    @staticmethod
+    def search_users(queryset, query):
+        """
+        Filter a User or UserProfile queryset to users whose name or
+        username matches `query`, annotated with search_rank
+        """
+        terms = SearchService.terms(query)
+        if not terms:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        # Users are matched on their own id, profiles on their user_id
+        is_user = queryset.model is User
+        id_field = 'id' if is_user else 'user_id'
+        prefix = '' if is_user else 'user__'
+        queryset = queryset.filter(**{f'{id_field}__in': SearchService.matching_user_ids(query)})
+
+        vendor = SearchService.vendor()
+        if vendor == 'postgresql':
+            from django.contrib.postgres.search import SearchRank
+            return queryset.annotate(search_rank=SearchRank(
+                SearchService._pg_vector(*[prefix + field for field in USER_SEARCH_FIELDS]),
+                SearchService._pg_query(terms),
+            ))
+
+        if vendor == 'sqlite':
+            column = f'"{queryset.model._meta.db_table}"."{id_field}"'
+            return queryset.annotate(search_rank=SearchService._fts_rank(
+                USER_FTS_TABLE, SearchService._fts_match(terms), column
+            ))
+
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -0,0 +1,48 @@
+from django.db.models.signals import post_save, post_delete
+
+from .monthly_rollup import MonthlyRollupService
+from .submission_index import SubmissionIndexService
+from .unread import UnreadCounterService
+
+
+def index_submission(sender, instance, **kwargs):
+    """Keep the submission's review-queue row in step with every save"""
+    SubmissionIndexService.sync(instance, SubmissionIndexService.model_type_for(sender))
+
+
+def unindex_submission(sender, instance, **kwargs):
+    SubmissionIndexService.remove(instance, SubmissionIndexService.model_type_for(sender))
+
+
+for model_type, (pillar, model_class) in SubmissionIndexService.indexed_models().items():
+    post_save.connect(index_submission, sender=model_class, dispatch_uid=f'submission_index_save_{model_type}')
+    post_delete.connect(unindex_submission, sender=model_class, dispatch_uid=f'submission_index_delete_{model_type}')
+
+
+def count_created_unread(sender, instance, created, **kwargs):
+    """A new unread notification or message raises the recipient's counter"""
+    if created and not instance.is_read:
+        UnreadCounterService.adjust(instance.recipient_id, **{UnreadCounterService.field_for(sender): 1})
+
+
+def count_deleted_unread(sender, instance, **kwargs):
+    # Never create a counter here: the recipient may be the user being deleted
+    if not instance.is_read:
+        UnreadCounterService.adjust(
+            instance.recipient_id, create=False, **{UnreadCounterService.field_for(sender): -1}
+        )
+
+
+for field, model_class in UnreadCounterService.counted_models().items():
+    post_save.connect(count_created_unread, sender=model_class, dispatch_uid=f'unread_counter_save_{field}')
+    post_delete.connect(count_deleted_unread, sender=model_class, dispatch_uid=f'unread_counter_delete_{field}')
+
+
+def rollup_submission(sender, instance, **kwargs):
+    """Recount the student's month for this submission model after a save or delete"""
+    MonthlyRollupService.refresh_for(instance, MonthlyRollupService.model_type_for(sender))
+
+
+for model_type, (pillar, model_class) in MonthlyRollupService.rolled_up_models().items():
+    post_save.connect(rollup_submission, sender=model_class, dispatch_uid=f'monthly_rollup_save_{model_type}')
+    post_delete.connect(rollup_submission, sender=model_class, dispatch_uid=f'monthly_rollup_delete_{model_type}')
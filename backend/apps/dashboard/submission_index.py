@@ -0,0 +1,162 @@
+"""
+Cross-pillar submission index for the mentor review queue
+
+Each reviewable submission model writes one SubmissionIndex row through
+the signals in apps.dashboard.signals. Migration 0013 backfills existing
+submissions; run `manage.py rebuild_submission_index` if the index drifts.
+"""
+from django.db import transaction
+
+from .models import SubmissionIndex
+
+
+class SubmissionIndexService:
+    """Build and store SubmissionIndex rows from submission instances"""
+
+    PENDING_STATUSES = ['draft', 'submitted', 'under_review', 'pending']
+
+    # Evidence fields, in the order the first one found becomes the primary link
+    EVIDENCE_FIELDS = [
+        'certificate_link', 'drive_link', 'github_repo', 'video_url',
+        'post_url', 'screenshot_url', 'profile_url',
+    ]
+
+    @staticmethod
+    def indexed_models():
+        """{model_type: (pillar, model class)} for every reviewable submission"""
+        from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
+        from apps.clt.models import CLTSubmission
+        from apps.iipc.models import LinkedInPostVerification
+        from apps.scd.models import LeetCodeProfile
+
+        return {
+            'hackathon': ('cfc', HackathonSubmission),
+            'bmc': ('cfc', BMCVideoSubmission),
+            'internship': ('cfc', InternshipSubmission),
+            'genai': ('cfc', GenAIProjectSubmission),
+            'clt': ('clt', CLTSubmission),
+            'linkedin': ('iipc', LinkedInPostVerification),
+            'leetcode': ('scd', LeetCodeProfile),
+        }
+
+    @staticmethod
+    def model_type_for(model):
+        for model_type, (pillar, model_class) in SubmissionIndexService.indexed_models().items():
+            if model_class is model:
+                return model_type
+        return None
+
+    @staticmethod
+    def normalize_status(status):
+        if status == 'approved':
+            return 'approved'
+        if status == 'rejected':
+            return 'rejected'
+        return 'pending'
+
+    @staticmethod
+    def describe(sub, model_type):
+        """Title and description shown in the review queue"""
+        if model_type == 'hackathon':
+            return sub.hackathon_name, f"{sub.mode.title()} hackathon participation"
+        if model_type == 'bmc':
+            return "Business Model Canvas Video", sub.description or "BMC video submission"
+        if model_type == 'internship':
+            return f"Internship at {sub.company}", sub.role
+        if model_type == 'genai':
+            return "GenAI Project", sub.problem_statement[:100]
+        if model_type == 'clt':
+            return sub.title, sub.description
+        if model_type == 'linkedin':
+            return "LinkedIn Post Verification", f"Post from {sub.post_date}"
+        if model_type == 'leetcode':
+            return f"LeetCode Profile - {sub.leetcode_username}", f"Total solved: {sub.total_solved}"
+        return '', ''
+
+    @staticmethod
+    def build(sub, model_type):
+        """Unsaved SubmissionIndex row for a submission"""
+        pillar = SubmissionIndexService.indexed_models()[model_type][0]
+        title, description = SubmissionIndexService.describe(sub, model_type)
+
+        links = [
+            getattr(sub, field) for field in SubmissionIndexService.EVIDENCE_FIELDS
+            if getattr(sub, field, None)
+        ]
+
+        return SubmissionIndex(
+            pillar=pillar,
+            model_type=model_type,
+            object_id=sub.id,
+            student_id=sub.user_id,
+            status=SubmissionIndexService.normalize_status(sub.status),
+            title=(title or '')[:255],
+            description=description or '',
+            submitted_at=sub.submitted_at or sub.created_at,
+            evidence_url=links[0] if links else '',
+            evidence_links=len(links),
+            reviewer_comments=getattr(sub, 'reviewer_comments', None) or getattr(sub, 'review_comments', '') or '',
+            reviewed_at=getattr(sub, 'reviewed_at', None),
+        )
+
+    SYNCED_FIELDS = [
+        'pillar', 'student_id', 'status', 'title', 'description', 'submitted_at',
+        'evidence_url', 'evidence_links', 'reviewer_comments', 'reviewed_at',
+    ]
+
+    @staticmethod
+    def sync(sub, model_type):
+        """Insert or refresh the index row of one submission"""
+        row = SubmissionIndexService.build(sub, model_type)
+        SubmissionIndex.objects.update_or_create(
+            model_type=model_type,
+            object_id=sub.id,
+            defaults={field: getattr(row, field) for field in SubmissionIndexService.SYNCED_FIELDS}
+        )
+
+    @staticmethod
+    def sync_many(subs, model_type):
+        """
+        Refresh the index rows of submissions written with bulk_update,
+        which does not send post_save
+        """
+        existing = dict(
+            SubmissionIndex.objects.filter(
+                model_type=model_type, object_id__in=[sub.id for sub in subs]
+            ).values_list('object_id', 'id')
+        )
+        to_create, to_update = [], []
+        for sub in subs:
+            row = SubmissionIndexService.build(sub, model_type)
+            if sub.id in existing:
+                row.id = existing[sub.id]
+                to_update.append(row)
+            else:
+                to_create.append(row)
+
+        if to_update:
+            SubmissionIndex.objects.bulk_update(to_update, SubmissionIndexService.SYNCED_FIELDS)
+        if to_create:
+            SubmissionIndex.objects.bulk_create(to_create)
+
+    @staticmethod
+    def remove(sub, model_type):
+        SubmissionIndex.objects.filter(model_type=model_type, object_id=sub.id).delete()
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(batch_size=1000):
+        """
+        Recreate the whole index from the submission tables
+        Returns: {model_type: rows indexed}
+        """
+        SubmissionIndex.objects.all().delete()
+        counts = {}
+        for model_type, (pillar, model_class) in SubmissionIndexService.indexed_models().items():
+            rows = [
+                SubmissionIndexService.build(sub, model_type)
+                for sub in model_class.objects.order_by().iterator(chunk_size=batch_size)
+            ]
+            SubmissionIndex.objects.bulk_create(rows, batch_size=batch_size)
+            counts[model_type] = len(rows)
+        return counts
@@ -0,0 +1,230 @@
+"""
+Seeded synthetic cohort for benchmarks, query-budget tests and local data
+
+SyntheticCohortGenerator writes N students, M mentors, one floor wing per
+floor, an admin and K submissions per pillar per student with bulk inserts,
+then rebuilds the derived tables the API reads (submission index, monthly
+rollup, season ranking). The same seed always produces the same cohort.
+
+Used by the QueryBudget tests in apps/dashboard/tests.py,
+`manage.py generate_cohort` and create_test_data.py.
+"""
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+
+class SyntheticCohort:
+    """Users and counts written by one SyntheticCohortGenerator run"""
+
+    def __init__(self, admin, floor_wings, mentors, students, season, submissions):
+        self.admin = admin
+        self.floor_wings = floor_wings
+        self.mentors = mentors
+        self.students = students
+        self.season = season
+        # {model_type: rows written}
+        self.submissions = submissions
+
+    def __str__(self):
+        return (
+            f"{len(self.students)} students, {len(self.mentors)} mentors, "
+            f"{len(self.floor_wings)} floor wings, {sum(self.submissions.values())} submissions"
+        )
+
+
+class SyntheticCohortGenerator:
+    """Bulk-create a reproducible cohort on one campus"""
+
+    # pillar -> model types; each student's K submissions of a pillar rotate over its models
+    PILLAR_MODELS = {
+        'clt': ['clt'],
+        'cfc': ['hackathon', 'bmc', 'internship', 'genai'],
+        'iipc': ['linkedin', 'linkedin_connection'],
+    }
+
+    REVIEW_STATUSES = ['submitted', 'submitted', 'under_review', 'approved', 'approved', 'rejected']
+    VERIFICATION_STATUSES = ['pending', 'pending', 'approved', 'approved', 'rejected']
+
+    def __init__(self, students=100, mentors=None, submissions_per_pillar=2, seed=0,
+                 campus='TECH', floors=(1, 2, 3, 4), prefix='synthetic', password=None, batch_size=1000):
+        self.student_count = students
+        self.mentor_count = mentors if mentors is not None else max(1, students // 20)
+        self.submissions_per_pillar = submissions_per_pillar
+        self.seed = seed
+        self.campus = campus
+        self.floors = list(floors)
+        self.prefix = prefix
+        # None leaves the accounts without a usable password
+        self.password = password
+        self.batch_size = batch_size
+
+    @transaction.atomic
+    def generate(self):
+        """Write the cohort and return a SyntheticCohort"""
+        from .monthly_rollup import MonthlyRollupService
+        from .submission_index import SubmissionIndexService
+
+        self.rng = random.Random(self.seed)
+        self.today = timezone.localdate()
+
+        admin = self.create_users('admin', 1, 'ADMIN')[0]
+        floor_wings = self.create_users('floorwing', len(self.floors), 'FLOOR_WING')
+        mentors = self.create_users('mentor', self.mentor_count, 'MENTOR')
+        students = self.create_users('student', self.student_count, 'STUDENT', mentors=mentors)
+
+        season = self.create_season_scores(students)
+        submissions = self.create_submissions(students)
+
+        SubmissionIndexService.rebuild(batch_size=self.batch_size)
+        MonthlyRollupService.rebuild(batch_size=self.batch_size)
+        return SyntheticCohort(admin, floor_wings, mentors, students, season, submissions)
+
+    def create_users(self, role_name, count, role, mentors=None):
+        """
+        Users with profiles and gamification records, spread over the floors
+        Students are assigned round-robin to a mentor on their floor
+        """
+        from django.contrib.auth.models import User
+        from apps.gamification.models import LegacyScore, VaultWallet
+        from apps.profiles.models import UserProfile
+
+        password = make_password(self.password)
+        users = User.objects.bulk_create([
+            User(
+                username=f'{self.prefix}_{role_name}_{i:05d}',
+                email=f'{self.prefix}_{role_name}_{i:05d}@example.com',
+                first_name=role_name.replace('_', ' ').title(),
+                last_name=f'{i:05d}',
+                password=password,
+                is_staff=role == 'ADMIN',
+            )
+            for i in range(count)
+        ], batch_size=self.batch_size)
+
+        mentors_by_floor = {}
+        for mentor in mentors or []:
+            mentors_by_floor.setdefault(mentor.profile.floor, []).append(mentor)
+
+        profiles = []
+        for i, user in enumerate(users):
+            floor = self.floors[i % len(self.floors)]
+            profile = UserProfile(user=user, role=role, campus=self.campus, floor=floor)
+            floor_mentors = mentors_by_floor.get(floor)
+            if floor_mentors:
+                profile.assigned_mentor = floor_mentors[(i // len(self.floors)) % len(floor_mentors)]
+            user.profile = profile
+            profiles.append(profile)
+
+        UserProfile.objects.bulk_create(profiles, batch_size=self.batch_size)
+        LegacyScore.objects.bulk_create([LegacyScore(student=user) for user in users], batch_size=self.batch_size)
+        VaultWallet.objects.bulk_create([VaultWallet(student=user) for user in users], batch_size=self.batch_size)
+        return users
+
+    def create_season_scores(self, students):
+        """Scores in the active season, created if there is none"""
+        from apps.gamification.models import Season, SeasonScore
+        from apps.gamification.services import SeasonRankingService
+
+        season = Season.objects.filter(is_active=True).first()
+        if season is None:
+            season = Season.objects.create(
+                name=f'{self.prefix.title()} Season',
+                season_number=(Season.objects.order_by('-season_number').values_list('season_number', flat=True).first() or 0) + 1,
+                start_date=self.today - timedelta(days=14),
+                end_date=self.today + timedelta(days=14),
+                is_active=True,
+            )
+
+        scores = []
+        for student in students:
+            clt, iipc, scd, cfc = (self.rng.randint(0, 100) for _ in range(4))
+            scores.append(SeasonScore(
+                student=student, season=season,
+                clt_score=clt, iipc_score=iipc, scd_score=scd, cfc_score=cfc,
+                total_score=clt + iipc + scd + cfc,
+            ))
+        SeasonScore.objects.bulk_create(scores, batch_size=self.batch_size)
+        SeasonRankingService.mark_stale(season.id)
+        return season
+
+    def build_submission(self, model_type, student, n):
+        """One unsaved submission of a model for a student; n numbers it within the student"""
+        from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
+        from apps.clt.models import CLTSubmission
+        from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
+
+        day = self.today - timedelta(days=self.rng.randint(0, 60))
+        status = self.rng.choice(self.REVIEW_STATUSES)
+        link = f'https://example.com/{student.username}/{model_type}/{n}'
+
+        if model_type == 'clt':
+            return CLTSubmission(
+                user=student, title=f'Course {n}', description='Synthetic course notes',
+                platform=self.rng.choice(['Udemy', 'Coursera', 'NPTEL']),
+                completion_date=day, status=status, drive_link=link,
+            )
+        if model_type == 'hackathon':
+            return HackathonSubmission(
+                user=student, hackathon_name=f'Hackathon {n}', mode=self.rng.choice(['online', 'offline', 'hybrid']),
+                registration_date=day - timedelta(days=7), participation_date=day,
+                certificate_link=link, status=status,
+            )
+        if model_type == 'bmc':
+            return BMCVideoSubmission(user=student, video_url=link, description=f'Pitch {n}', status=status)
+        if model_type == 'internship':
+            return InternshipSubmission(
+                user=student, company=f'Company {n}', role='Intern',
+                mode=self.rng.choice(['remote', 'onsite', 'hybrid']), duration='8 weeks',
+                completion_certificate_link=link, status=status,
+            )
+        if model_type == 'genai':
+            return GenAIProjectSubmission(
+                user=student, problem_statement=f'Synthetic problem statement {n}',
+                innovation_technology='LLM', github_repo=link, status=status,
+            )
+        status = self.rng.choice(self.VERIFICATION_STATUSES)
+        if model_type == 'linkedin':
+            return LinkedInPostVerification(
+                user=student, post_url=link, post_date=day,
+                character_count=self.rng.randint(200, 3000), hashtag_count=self.rng.randint(0, 8), status=status,
+            )
+        if model_type == 'linkedin_connection':
+            return LinkedInConnectionVerification(
+                user=student, profile_url=link, total_connections=self.rng.randint(50, 900), status=status,
+            )
+        raise ValueError(f'Unknown model type {model_type}')
+
+    def create_submissions(self, students):
+        """
+        K submissions per pillar per student, plus one LeetCode profile each
+        Returns: {model_type: rows written}
+        """
+        from apps.dashboard.monthly_rollup import MonthlyRollupService
+        from apps.scd.models import LeetCodeProfile
+
+        models = MonthlyRollupService.rolled_up_models()
+        rows = {}
+        for i, student in enumerate(students):
+            for pillar, model_types in self.PILLAR_MODELS.items():
+                for n in range(self.submissions_per_pillar):
+                    model_type = model_types[(i + n) % len(model_types)]
+                    rows.setdefault(model_type, []).append(self.build_submission(model_type, student, n))
+
+        rows['leetcode'] = []
+        for student in students:
+            easy, medium, hard = self.rng.randint(0, 200), self.rng.randint(0, 150), self.rng.randint(0, 40)
+            rows['leetcode'].append(LeetCodeProfile(
+                user=student, leetcode_username=student.username,
+                total_solved=easy + medium + hard, easy_solved=easy, medium_solved=medium, hard_solved=hard,
+                monthly_problems_count=self.rng.randint(0, 30), status=self.rng.choice(self.VERIFICATION_STATUSES),
+            ))
+
+        counts = {}
+        for model_type, objs in rows.items():
+            models[model_type][1].objects.bulk_create(objs, batch_size=self.batch_size)
+            counts[model_type] = len(objs)
+        return counts
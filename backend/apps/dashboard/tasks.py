@@ -0,0 +1,15 @@
+"""
+Outbox handlers for review side effects
+Enqueued by SubmissionReviewService
+"""
+from apps.outbox.services import OutboxService
+from .models import Notification
+from .unread import UnreadCounterService
+
+
+@OutboxService.register('dashboard.review_notifications')
+def send_review_notifications(payload):
+    notifications = Notification.objects.bulk_create([
+        Notification(**fields) for fields in payload['notifications']
+    ])
+    UnreadCounterService.record_created(Notification, [n.recipient_id for n in notifications])
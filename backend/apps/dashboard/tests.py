@@ -0,0 +1,695 @@
+import os
+import threading
+import time
+from datetime import date
+from importlib import import_module
+from unittest import skipUnless
+
+from django.apps import apps as django_apps
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.clt.models import CLTSubmission
+from apps.cfc.models import HackathonSubmission, InternshipSubmission
+from apps.scd.models import LeetCodeProfile
+from apps.gamification.models import Season, SeasonScore
+from apps.profiles.announcement_serializers import FloorAnnouncementSerializer
+from apps.profiles.models import FloorAnnouncement, UserProfile
+from apps.profiles.serializers import UserProfileSerializer
+from apps.mentor_views import SUBMISSIONS_PAGE_SIZE
+from .models import Announcement, AnnouncementRead, Message, MessageThread, MonthlyPillarRollup, Notification, SubmissionIndex, UnreadCounter
+from .monthly_rollup import MonthlyRollupService
+from .notifications_serializers import AnnouncementSerializer
+from .submission_index import SubmissionIndexService
+from .synthetic_cohort import SyntheticCohortGenerator
+from .unread import UnreadCounterService
+
+User = get_user_model()
+
+
+def make_user(username, role, **profile_fields):
+    user = User.objects.create_user(username, password='x', first_name=username.title())
+    user.profile.role = role
+    for field, value in profile_fields.items():
+        setattr(user.profile, field, value)
+    user.profile.save()
+    return user
+
+
+def make_clt(student, title, status='submitted'):
+    return CLTSubmission.objects.create(
+        user=student, title=title, description='Course notes', platform='Udemy',
+        completion_date=date(2026, 1, 1), status=status,
+        drive_link='https://drive.google.com/file/1'
+    )
+
+
+class MentorReviewQueueTests(TestCase):
+
+    def setUp(self):
+        self.mentor = make_user('mentor', 'MENTOR')
+        self.students = [make_user(f'student{i}', 'STUDENT', assigned_mentor=self.mentor) for i in range(3)]
+        self.other = make_user('outsider', 'STUDENT')
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def queue(self, pillar='all', **params):
+        return self.client.get(f'/api/mentor/pillar/{pillar}/submissions/', params).json()
+
+    def test_index_follows_save_review_and_delete(self):
+        submission = make_clt(self.students[0], 'Django Basics')
+        row = SubmissionIndex.objects.get(model_type='clt', object_id=submission.id)
+        self.assertEqual((row.pillar, row.status, row.evidence_links), ('clt', 'pending', 1))
+
+        self.client.post('/api/mentor/review/', {
+            'pillar': 'clt', 'submission_id': submission.id, 'submission_type': 'clt', 'action': 'approve'
+        })
+        row.refresh_from_db()
+        self.assertEqual(row.status, 'approved')
+
+        submission.delete()
+        self.assertFalse(SubmissionIndex.objects.exists())
+
+    def test_queue_pages_with_filters_in_constant_queries(self):
+        for i in range(7):
+            make_clt(self.students[i % 3], f'Course {i}')
+        HackathonSubmission.objects.create(
+            user=self.students[0], hackathon_name='Smart India', mode='offline', status='approved',
+            registration_date=date(2026, 1, 1), participation_date=date(2026, 1, 2)
+        )
+        make_clt(self.other, 'Not mine')
+
+        with CaptureQueriesContext(connection) as queries:
+            first = self.queue(limit=3)
+        self.assertLessEqual(len(queries.captured_queries), 4)
+        self.assertEqual(first['total'], 8)
+
+        seen = [s['id'] for s in first['submissions']]
+        cursor = first['next_cursor']
+        while cursor:
+            page = self.queue(limit=3, after=cursor)
+            seen.extend(s['id'] for s in page['submissions'])
+            cursor = page['next_cursor']
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(len(seen), 8)
+
+        self.assertEqual(self.queue('cfc')['submissions'][0]['title'], 'Smart India')
+        self.assertEqual(self.queue(status='approved')['total'], 1)
+        self.assertEqual(self.queue(search='course 6')['total'], 1)
+        self.assertEqual(self.queue(search='Student1')['total'], 2)
+        self.assertEqual(self.queue(student_id=self.other.id)['total'], 0)
+
+    def test_queue_without_paging_params_returns_everything(self):
+        for i in range(SUBMISSIONS_PAGE_SIZE + 5):
+            make_clt(self.students[i % 3], f'Course {i}')
+
+        queue = self.queue()
+        self.assertEqual(len(queue['submissions']), SUBMISSIONS_PAGE_SIZE + 5)
+        self.assertIsNone(queue['next_cursor'])
+        self.assertEqual(len(self.queue(after='')['submissions']), SUBMISSIONS_PAGE_SIZE)
+
+    def test_migration_backfills_existing_submissions(self):
+        backfill = import_module('apps.dashboard.migrations.0013_backfill_submission_index').backfill_submission_index
+        for i in range(3):
+            make_clt(self.students[i], f'Course {i}', status='approved')
+        expected = sorted(SubmissionIndex.objects.values_list('model_type', 'object_id', 'status', 'title'))
+        SubmissionIndex.objects.all().delete()
+
+        backfill(django_apps, None)
+
+        self.assertEqual(expected, sorted(SubmissionIndex.objects.values_list('model_type', 'object_id', 'status', 'title')))
+        self.assertEqual(len(self.queue()['submissions']), 3)
+
+    def test_rebuild_matches_signal_maintained_index(self):
+        for i in range(3):
+            make_clt(self.students[i], f'Course {i}', status='rejected')
+        before = sorted(SubmissionIndex.objects.values_list('model_type', 'object_id', 'status', 'title'))
+
+        counts = SubmissionIndexService.rebuild()
+
+        self.assertEqual(counts['clt'], 3)
+        self.assertEqual(before, sorted(SubmissionIndex.objects.values_list('model_type', 'object_id', 'status', 'title')))
+
+
+class SearchTests(TestCase):
+
+    def setUp(self):
+        self.mentor = make_user('mentor', 'MENTOR')
+        self.alice = make_user('alice', 'STUDENT', assigned_mentor=self.mentor, campus='TECH', floor=1)
+        self.alice.first_name, self.alice.last_name = 'Alice', 'Johnson'
+        self.alice.save()
+        self.bob = make_user('bob', 'STUDENT', assigned_mentor=self.mentor, campus='TECH', floor=1)
+        self.outsider = make_user('carol', 'STUDENT', campus='TECH', floor=2)
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+        make_clt(self.alice, 'Machine Learning Specialization')
+        make_clt(self.bob, 'Intro to Machines')
+        make_clt(self.outsider, 'Machine Learning Basics')
+        InternshipSubmission.objects.create(
+            user=self.bob, company='Zoho Corporation', role='Backend intern', mode='remote', duration='3 months'
+        )
+
+    def search(self, user=None, **params):
+        if user:
+            self.client.force_authenticate(user)
+        return self.client.get('/api/dashboard/search/', params)
+
+    def titles(self, data):
+        return [row['title'] for row in data['submissions']['results']]
+
+    def test_prefix_terms_rank_and_scope(self):
+        data = self.search(q='machine learn').json()
+        self.assertEqual(self.titles(data), ['Machine Learning Specialization'])
+
+        data = self.search(q='machin').json()
+        self.assertEqual(len(self.titles(data)), 2)
+        self.assertNotIn('Machine Learning Basics', self.titles(data))
+
+        self.assertEqual(self.titles(self.search(q='zoho').json()), ['Internship at Zoho Corporation'])
+
+    def test_student_names_match_submissions_and_students(self):
+        data = self.search(q='johns').json()
+        self.assertEqual(self.titles(data), ['Machine Learning Specialization'])
+        self.assertEqual([s['username'] for s in data['students']['results']], ['alice'])
+
+        wing = make_user('wing', 'FLOOR_WING', campus='TECH', floor=2)
+        data = self.search(user=wing, q='carol', type='students').json()
+        self.assertEqual([s['username'] for s in data['students']['results']], ['carol'])
+        self.assertNotIn('submissions', data)
+
+    def test_pagination_and_permissions(self):
+        first = self.search(q='machin', type='submissions', limit=1).json()['submissions']
+        self.assertEqual((first['total'], first['next_offset']), (2, 1))
+        second = self.search(q='machin', type='submissions', limit=1, offset=1).json()['submissions']
+        self.assertIsNone(second['next_offset'])
+        self.assertNotEqual(first['results'][0]['id'], second['results'][0]['id'])
+
+        self.assertEqual(self.search(q='').status_code, 400)
+        self.assertEqual(self.search(user=self.alice, q='machine').status_code, 403)
+
+    def test_index_follows_renames_and_deletes(self):
+        self.alice.last_name = 'Smith'
+        self.alice.save()
+        self.assertEqual(self.search(q='johnson').json()['students']['total'], 0)
+        self.assertEqual(self.search(q='smith').json()['students']['total'], 1)
+
+        CLTSubmission.objects.filter(user=self.alice).delete()
+        self.assertEqual(self.search(q='specialization').json()['submissions']['total'], 0)
+
+
+class BulkReviewTests(TestCase):
+
+    def setUp(self):
+        self.mentor = make_user('mentor', 'MENTOR')
+        self.students = [make_user(f'student{i}', 'STUDENT', assigned_mentor=self.mentor) for i in range(4)]
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1, is_active=True,
+            start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def bulk(self, reviews):
+        return self.client.post('/api/mentor/review/bulk/', {'reviews': reviews}, format='json')
+
+    def reviews(self, count, action='approve', comment=''):
+        submissions = [make_clt(self.students[i % 4], f'Course {i}') for i in range(count)]
+        return [
+            {'submission_type': 'clt', 'submission_id': sub.id, 'action': action, 'comment': comment}
+            for sub in submissions
+        ]
+
+    def test_applies_reviews_with_notifications_index_and_scores(self):
+        reviews = self.reviews(6)
+        reviews.append({'submission_type': 'clt', 'submission_id': 999, 'action': 'approve'})
+        reviews.append({'submission_type': 'clt', 'submission_id': reviews[0]['submission_id'], 'action': 'reject'})
+
+        data = self.bulk(reviews).json()
+
+        self.assertEqual((data['reviewed'], data['failed']), (6, 2))
+        self.assertEqual(data['results'][6]['code'], 'not_found')
+        self.assertEqual(data['results'][7]['code'], 'invalid')
+        self.assertEqual(len(data['task_ids']), 2)
+
+        self.assertEqual(CLTSubmission.objects.filter(status='approved', reviewed_by=self.mentor).count(), 6)
+        self.assertEqual(SubmissionIndex.objects.filter(status='approved').count(), 6)
+        self.assertEqual(Notification.objects.filter(notification_type='submission_approved').count(), 6)
+        self.assertEqual(
+            set(SeasonScore.objects.filter(season=self.season).values_list('student_id', 'clt_score')),
+            {(student.id, 100) for student in self.students}
+        )
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def count(reviews):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.bulk(reviews)
+            self.assertEqual(response.json()['failed'], 0)
+            return len(queries.captured_queries)
+
+        small = count(self.reviews(2, action='reject', comment='Add the certificate'))
+        SeasonScore.objects.all().delete()
+        large = count(self.reviews(40, action='reject', comment='Add the certificate'))
+        self.assertEqual(small, large)
+
+    def test_single_review_keeps_its_contract(self):
+        submission_id = self.reviews(1)[0]['submission_id']
+        response = self.client.post('/api/mentor/review/', {
+            'pillar': 'clt', 'submission_id': submission_id, 'submission_type': 'clt', 'action': 'reject'
+        })
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post('/api/mentor/review/', {
+            'pillar': 'clt', 'submission_id': 999, 'submission_type': 'clt', 'action': 'approve'
+        })
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.post('/api/mentor/review/', {
+            'pillar': 'clt', 'submission_id': submission_id, 'submission_type': 'clt', 'action': 'approve'
+        }).json()
+        self.assertEqual(response['status'], 'approved')
+        self.assertTrue(Notification.objects.filter(related_submission_id=submission_id).exists())
+
+
+class MessagingTests(TestCase):
+
+    def setUp(self):
+        self.mentor = make_user('mentor', 'MENTOR')
+        self.student = make_user('student', 'STUDENT', assigned_mentor=self.mentor)
+        self.client = APIClient()
+
+    def send(self, sender, recipient, text):
+        self.client.force_authenticate(sender)
+        return self.client.post('/api/mentor/messages/send/', {'recipient_id': recipient.id, 'message': text}).json()
+
+    def history(self, user, other, **params):
+        self.client.force_authenticate(user)
+        return self.client.get(f'/api/mentor/messages/thread/{other.id}/', params).json()
+
+    def test_both_directions_share_one_canonical_thread(self):
+        first = self.send(self.student, self.mentor, 'Hello')
+        second = self.send(self.mentor, self.student, 'Hi there')
+
+        self.assertEqual(first['thread_id'], second['thread_id'])
+        thread = MessageThread.objects.get()
+        self.assertLess(thread.participant1_id, thread.participant2_id)
+        self.assertEqual(thread.messages.count(), 2)
+        self.assertEqual((thread.get_unread_count(self.mentor), thread.get_unread_count(self.student)), (1, 1))
+        self.assertEqual(thread.last_message_id, second['message_id'])
+
+    def test_cursor_pages_cover_history_in_constant_queries(self):
+        for i in range(25):
+            self.send(self.student if i % 2 else self.mentor, self.mentor if i % 2 else self.student, f'm{i}')
+
+        seen, query_counts, cursor = [], [], None
+        while True:
+            params = {'limit': 10, **({'before': cursor} if cursor else {})}
+            with CaptureQueriesContext(connection) as queries:
+                page = self.history(self.mentor, self.student, **params)
+            query_counts.append(len(queries.captured_queries))
+            seen.extend(m['message'] for m in page['messages'])
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(seen, [f'm{i}' for i in reversed(range(25))])
+        # Later pages skip the read-state writes and look up the cursor instead
+        self.assertEqual(len(set(query_counts[1:])), 1)
+        self.assertEqual(self.history(self.mentor, self.student, before='abc').get('error'), 'Invalid cursor')
+
+    def test_reading_clears_unread_once(self):
+        self.send(self.student, self.mentor, 'Question')
+        self.history(self.mentor, self.student)
+
+        thread = MessageThread.objects.get()
+        self.assertEqual(thread.get_unread_count(self.mentor), 0)
+        self.assertTrue(Message.objects.get().is_read)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.history(self.mentor, self.student)
+        self.assertFalse(any(q['sql'].startswith('UPDATE') for q in queries.captured_queries))
+
+
+class UnreadCounterTests(TestCase):
+
+    def setUp(self):
+        self.mentor = make_user('mentor', 'MENTOR')
+        self.student = make_user('student', 'STUDENT', assigned_mentor=self.mentor)
+        self.client = APIClient()
+
+    def counts(self, user, **params):
+        self.client.force_authenticate(user)
+        return self.client.get('/api/mentor/messages/unread-counts/', params).json()
+
+    def assertMatchesRecount(self, user):
+        counter = UnreadCounter.objects.get(user=user)
+        maintained = [getattr(counter, field) for field in UnreadCounterService.FIELDS]
+        UnreadCounterService.recount([user.id])
+        counter.refresh_from_db()
+        self.assertEqual(maintained, [getattr(counter, field) for field in UnreadCounterService.FIELDS])
+
+    def test_counters_follow_create_read_and_delete(self):
+        self.client.force_authenticate(self.student)
+        self.client.post('/api/mentor/messages/send/', {'recipient_id': self.mentor.id, 'message': 'Hi'})
+        self.client.post('/api/mentor/messages/send/', {'recipient_id': self.mentor.id, 'message': 'Again'})
+        first = self.counts(self.mentor)
+        self.assertEqual((first['notifications'], first['messages'], first['total']), (2, 2, 4))
+
+        self.client.force_authenticate(self.mentor)
+        self.client.get(f'/api/mentor/messages/thread/{self.student.id}/')
+        Notification.objects.filter(recipient=self.mentor).first().mark_as_read()
+        Notification.objects.filter(recipient=self.mentor, is_read=False).get().delete()
+        second = self.counts(self.mentor)
+        self.assertEqual((second['notifications'], second['messages']), (0, 0))
+        self.assertGreater(second['version'], first['version'])
+        self.assertMatchesRecount(self.mentor)
+
+    def test_bulk_paths_are_counted(self):
+        from apps.dashboard.models import Announcement
+        other = make_user('other', 'STUDENT', assigned_mentor=self.mentor)
+        Announcement.objects.create(mentor=self.mentor, title='Exam', description='Tomorrow')
+        Announcement.objects.create(mentor=self.mentor, title='Break', description='Friday')
+
+        self.assertEqual(self.counts(self.student)['notifications'], 2)
+        self.client.force_authenticate(other)
+        self.client.post('/api/mentor/notifications/read-all/')
+        self.assertEqual(self.counts(other)['notifications'], 0)
+        self.assertMatchesRecount(self.student)
+        self.assertMatchesRecount(other)
+
+    def test_counts_are_a_single_lookup(self):
+        Notification.objects.create(recipient=self.student, message='Welcome')
+        self.counts(self.student)
+        self.client.force_authenticate(self.student)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/mentor/messages/unread-counts/')
+        self.assertFalse(any('COUNT(' in q['sql'] for q in queries.captured_queries))
+
+    def test_missing_counter_is_recounted_on_first_read(self):
+        Notification.objects.create(recipient=self.student, message='Welcome')
+        UnreadCounter.objects.all().delete()
+        self.assertEqual(self.counts(self.student)['notifications'], 1)
+
+    @override_settings(UNREAD_LONG_POLL_TIMEOUT=10)
+    def test_long_poll_returns_immediately_when_behind_and_times_out_when_current(self):
+        version = self.counts(self.student)['version']
+        self.assertEqual(self.counts(self.student, since=version - 1)['version'], version)
+
+        started = time.monotonic()
+        self.assertEqual(self.counts(self.student, since=version, timeout=0.2)['version'], version)
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        self.assertEqual(self.counts(self.student, since='x').get('error'), 'since and timeout must be numbers')
+
+    def test_long_poll_is_off_by_default(self):
+        version = self.counts(self.student)['version']
+        started = time.monotonic()
+        self.assertEqual(self.counts(self.student, since=version, timeout=5)['version'], version)
+        self.assertLess(time.monotonic() - started, 1)
+
+
+@override_settings(UNREAD_POLL_INTERVAL=30, UNREAD_LONG_POLL_TIMEOUT=10)
+class UnreadPushTests(TransactionTestCase):
+
+    def test_waiting_request_wakes_on_commit(self):
+        student = make_user('student', 'STUDENT')
+        version = UnreadCounterService.get(student).version
+        result = {}
+
+        def wait():
+            result['counter'] = UnreadCounterService.wait(student.id, version, timeout=10)
+            connection.close()
+
+        waiter = threading.Thread(target=wait)
+        started = time.monotonic()
+        waiter.start()
+        time.sleep(0.2)
+        Notification.objects.create(recipient=student, message='Reviewed')
+        waiter.join(10)
+
+        # Woken by the broker, long before the 30s poll interval
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(result['counter'].notifications, 1)
+        self.assertGreater(result['counter'].version, version)
+
+
+class MonthlyRollupTests(TestCase):
+
+    def setUp(self):
+        self.mentor = make_user('mentor', 'MENTOR')
+        self.student = make_user('student', 'STUDENT', assigned_mentor=self.mentor)
+        self.client = APIClient()
+        self.now = timezone.localtime()
+
+    def rollup_rows(self):
+        return sorted(MonthlyPillarRollup.objects.values_list(
+            'student_id', 'year', 'month', 'model_type', 'total', 'approved', 'pending', 'qualified', 'problems_solved'
+        ))
+
+    def report(self, **params):
+        self.client.force_authenticate(self.student)
+        return self.client.get('/api/dashboard/monthly-report/', params).json()
+
+    def test_report_follows_saves_reviews_and_deletes(self):
+        approved = make_clt(self.student, 'Approved')
+        approved.status = 'approved'
+        approved.save()
+        pending = make_clt(self.student, 'Pending')
+        HackathonSubmission.objects.create(
+            user=self.student, hackathon_name='Smart India', mode='offline', status='approved',
+            registration_date=date(2026, 1, 1), participation_date=date(2026, 1, 2)
+        )
+        LeetCodeProfile.objects.create(user=self.student, leetcode_username='s', total_solved=42, status='approved')
+
+        self.client.force_authenticate(self.mentor)
+        self.client.post('/api/mentor/review/bulk/', {'reviews': [
+            {'submission_type': 'clt', 'submission_id': pending.id, 'action': 'approve'},
+        ]}, format='json')
+
+        report = self.report()
+        pillars = report['pillars']
+        self.assertEqual((pillars['clt']['total'], pillars['clt']['completed'], pillars['clt']['pending']), (2, 2, 0))
+        self.assertEqual(pillars['cfc']['breakdown']['hackathons'], {'total': 1, 'completed': 1})
+        self.assertEqual((pillars['scd']['completed'], pillars['scd']['total_problems_solved']), (1, 42))
+
+        approved.delete()
+        self.assertEqual(self.report()['pillars']['clt']['total'], 1)
+
+        maintained = self.rollup_rows()
+        MonthlyRollupService.rebuild()
+        self.assertEqual(maintained, self.rollup_rows())
+
+    def test_migration_backfills_existing_submissions(self):
+        backfill = import_module('apps.dashboard.migrations.0014_backfill_monthly_rollup').backfill_monthly_rollup
+        make_clt(self.student, 'Approved', status='approved')
+        make_clt(self.student, 'Pending')
+        LeetCodeProfile.objects.create(user=self.student, leetcode_username='s', total_solved=42, status='approved')
+        maintained = self.rollup_rows()
+        MonthlyPillarRollup.objects.all().delete()
+
+        backfill(django_apps, None)
+
+        self.assertEqual(maintained, self.rollup_rows())
+        self.assertEqual(self.report()['pillars']['clt']['total'], 2)
+
+    def test_months_are_indexed_reads(self):
+        older = make_clt(self.student, 'Older')
+        make_clt(self.student, 'Current')
+        CLTSubmission.objects.filter(id=older.id).update(created_at=timezone.make_aware(timezone.datetime(2025, 11, 5)))
+        MonthlyRollupService.rebuild()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.report(month=11, year=2025)
+        self.assertEqual(sum('monthlypillarrollup' in q['sql'] for q in queries.captured_queries), 1)
+        self.assertEqual(self.report(month=11, year=2025)['pillars']['clt']['total'], 1)
+
+        self.client.force_authenticate(self.mentor)
+        picker = self.client.get(f'/api/mentor/student/{self.student.id}/available-months/').json()['months']
+        self.assertEqual(
+            [(m['year'], m['month']) for m in picker],
+            [(self.now.year, self.now.month), (2025, 11)]
+        )
+        mentor_report = self.client.get(
+            f'/api/mentor/student/{self.student.id}/monthly-report/', {'month': 11, 'year': 2025}
+        ).json()
+        self.assertEqual(mentor_report['pillars']['clt']['completed'], 0)
+
+
+# (endpoint, requesting role, max queries, max latency in ms) of the hot read endpoints
+# Latency budgets depend on the machine, so they are only checked with RUN_BENCHMARKS set
+QUERY_BUDGETS = [
+    ('/api/dashboard/stats/', 'student', 40, 500),
+    ('/api/mentor/dashboard/', 'mentor', 16, 500),
+    ('/api/mentor/students/', 'mentor', 10, 500),
+    ('/api/mentor/pillar/all/submissions/', 'mentor', 5, 250),
+    ('/api/mentor/pillar/clt/stats/', 'mentor', 8, 250),
+    ('/api/gamification/leaderboard/full_leaderboard/', 'mentor', 6, 250),
+    ('/api/gamification/leaderboard/mentee_leaderboard/', 'mentor', 7, 250),
+    ('/api/gamification/leaderboard/current_season/', 'student', 5, 250),
+    ('/api/gamification/leaderboard/my_position/', 'student', 8, 250),
+    ('/api/profiles/admin/stats/', 'admin', 13, 500),
+    ('/api/profiles/floor-wing/dashboard/', 'floor_wing', 8, 250),
+    ('/api/profiles/floor-wing/students/', 'floor_wing', 5, 500),
+    ('/api/profiles/floor-wing/mentors/', 'floor_wing', 5, 250),
+]
+
+
+def measure_budgets(cohort):
+    """{endpoint: (status code, queries, ms)} of each budgeted endpoint, after one warm-up request"""
+    users = {
+        'student': cohort.students[0],
+        'mentor': cohort.mentors[0],
+        'admin': cohort.admin,
+        'floor_wing': cohort.floor_wings[0],
+    }
+    results = {}
+    for endpoint, role, max_queries, max_ms in QUERY_BUDGETS:
+        client = APIClient()
+        # A fresh instance, so the profile is loaded the way a real request loads it
+        client.force_authenticate(User.objects.get(pk=users[role].pk))
+        client.get(endpoint)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = client.get(endpoint)
+            elapsed = (time.perf_counter() - started) * 1000
+        results[endpoint] = (response.status_code, len(queries.captured_queries), elapsed)
+    return results
+
+
+class QueryBudgetTests(TestCase):
+    """
+    Hot endpoints stay within their query budgets (and latency budgets with
+    RUN_BENCHMARKS set), and their query count does not grow with the cohort
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # Separate campuses, so floor-wing pages of one cohort do not see the other
+        cls.small = SyntheticCohortGenerator(students=20, seed=20, campus='ARTS', prefix='small').generate()
+        cls.large = SyntheticCohortGenerator(students=200, seed=20, campus='TECH', prefix='large').generate()
+
+    def test_endpoints_stay_within_budget(self):
+        small, large = measure_budgets(self.small), measure_budgets(self.large)
+        for endpoint, role, max_queries, max_ms in QUERY_BUDGETS:
+            with self.subTest(endpoint=endpoint):
+                status_code, queries, elapsed = large[endpoint]
+                self.assertEqual(status_code, 200)
+                self.assertLessEqual(queries, max_queries)
+                if os.getenv('RUN_BENCHMARKS'):
+                    self.assertLessEqual(elapsed, max_ms)
+                self.assertEqual(queries, small[endpoint][1], 'query count grows with the cohort')
+
+    def test_generator_is_reproducible(self):
+        def clt_rows(cohort):
+            return list(
+                CLTSubmission.objects.filter(user__in=cohort.students).order_by('id')
+                .values_list('platform', 'status', 'completion_date')
+            )
+
+        with transaction.atomic():
+            again = SyntheticCohortGenerator(students=20, seed=20, campus='ARTS', prefix='again').generate()
+            self.assertEqual(clt_rows(self.small), clt_rows(again))
+            transaction.set_rollback(True)
+
+        self.assertEqual(self.large.submissions['clt'], 400)
+        self.assertEqual(SubmissionIndex.objects.filter(student__in=self.large.students).count(), 1200)
+        self.assertTrue(all(
+            student.profile.assigned_mentor.profile.floor == student.profile.floor
+            for student in User.objects.filter(id__in=[s.id for s in self.large.students[:20]])
+        ))
+
+
+@skipUnless(os.getenv('RUN_BENCHMARKS'), 'set RUN_BENCHMARKS=1 to run benchmarks')
+class QueryBudgetBenchmark(TestCase):
+    """
+    Queries and latency of the budgeted endpoints as the cohort grows.
+    Run with: RUN_BENCHMARKS=1 python manage.py test apps.dashboard.tests.QueryBudgetBenchmark -v 2
+    """
+
+    SIZES = [100, 1000, 5000]
+
+    def test_budgets_scale_flat(self):
+        measured = {}
+        for size in self.SIZES:
+            # Each cohort is rolled back, so the sizes do not add up
+            with transaction.atomic():
+                cohort = SyntheticCohortGenerator(students=size, seed=size, prefix=f'bench{size}').generate()
+                measured[size] = measure_budgets(cohort)
+                transaction.set_rollback(True)
+
+        print('\n  ' + f"{'endpoint':<50}" + ''.join(f' | {size:>5} q {size:>5} ms' for size in self.SIZES))
+        for endpoint, role, max_queries, max_ms in QUERY_BUDGETS:
+            cells = ''.join(
+                f' | {measured[size][endpoint][1]:>7} {measured[size][endpoint][2]:>8.1f}' for size in self.SIZES
+            )
+            print(f'  {endpoint:<50}{cells}')
+
+        for endpoint, role, max_queries, max_ms in QUERY_BUDGETS:
+            counts = {measured[size][endpoint][1] for size in self.SIZES}
+            with self.subTest(endpoint=endpoint):
+                self.assertLessEqual(max(counts), max_queries)
+                self.assertEqual(len(counts), 1, 'query count grows with the cohort')
+
+
+class BatchSerializerQueryTests(TestCase):
+    """Per-row lookups of list serializers cost one query per field at any page size"""
+
+    def setUp(self):
+        self.cohort = SyntheticCohortGenerator(students=24, mentors=4, submissions_per_pillar=0, seed=5).generate()
+        self.student = self.cohort.students[0]
+        request = APIRequestFactory().get('/')
+        request.user = self.student
+        self.context = {'request': request}
+
+    def render(self, serializer_class, rows):
+        with CaptureQueriesContext(connection) as queries:
+            data = serializer_class(rows, many=True, context=self.context).data
+        return data, len(queries)
+
+    def test_mentor_announcements_read_flags(self):
+        mentor = self.cohort.mentors[0]
+        announcements = Announcement.objects.bulk_create([
+            Announcement(mentor=mentor, title=f'Notice {i}', description='Read me') for i in range(12)
+        ])
+        AnnouncementRead.objects.bulk_create([
+            AnnouncementRead(announcement=announcement, user=self.student) for announcement in announcements[::4]
+        ])
+        rows = Announcement.objects.filter(mentor=mentor).select_related('mentor').order_by('id')
+
+        _, few = self.render(AnnouncementSerializer, rows[:3])
+        data, many = self.render(AnnouncementSerializer, rows)
+
+        self.assertEqual(few, many)
+        self.assertEqual([row['id'] for row in data if row['is_read']], [a.id for a in announcements[::4]])
+
+    def test_floor_announcement_read_counts(self):
+        floor_wing = self.cohort.floor_wings[0]
+        announcements = FloorAnnouncement.objects.bulk_create([
+            FloorAnnouncement(floor_wing=floor_wing, title=f'Floor {i}', message='-', campus='TECH', floor=1)
+            for i in range(10)
+        ])
+        for i, announcement in enumerate(announcements):
+            announcement.read_by.add(*self.cohort.students[:i])
+        rows = FloorAnnouncement.objects.select_related('floor_wing').order_by('id')
+
+        _, few = self.render(FloorAnnouncementSerializer, rows[:2])
+        data, many = self.render(FloorAnnouncementSerializer, rows)
+
+        self.assertEqual(few, many)
+        self.assertEqual([row['read_count'] for row in data], list(range(10)))
+        self.assertEqual([row['is_read'] for row in data], [False] + [True] * 9)
+
+    def test_profile_students_count(self):
+        profiles = UserProfile.objects.filter(role__in=['MENTOR', 'STUDENT']).select_related('user').order_by('id')
+
+        _, few = self.render(UserProfileSerializer, profiles[:6])
+        data, many = self.render(UserProfileSerializer, profiles)
+
+        self.assertEqual(few, many)
+        counts = {row['user']: row['students_count'] for row in data if row['role'] == 'MENTOR'}
+        self.assertEqual(sum(counts.values()), 24)
+        self.assertEqual(counts[self.cohort.mentors[0].id], 6)
+
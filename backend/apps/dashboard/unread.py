@@ -0,0 +1,196 @@
+"""
+Per-user unread counters and the push channel built on them
+
+Every create, read and delete of a counted notification or message adjusts
+the recipient's UnreadCounter row, so reading the counts is a primary-key
+lookup instead of COUNT(*) queries. Single saves and deletes go through the
+signals in apps.dashboard.signals; bulk_create and queryset.update() callers
+report their changes with record_created() and adjust(). Run
+`manage.py recount_unread` to backfill the rows or repair drift.
+
+Each change bumps the row's version and wakes long-polling requests waiting
+in this process. Requests served by other processes notice the new version
+on their next UNREAD_POLL_INTERVAL check.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import UnreadCounter
+
+
+class UnreadBroker:
+    """In-process wake-up channel: one sequence number per user"""
+
+    _condition = threading.Condition()
+    _sequences = defaultdict(int)
+
+    @classmethod
+    def sequence(cls, user_id):
+        with cls._condition:
+            return cls._sequences[user_id]
+
+    @classmethod
+    def publish(cls, user_ids):
+        with cls._condition:
+            for user_id in user_ids:
+                cls._sequences[user_id] += 1
+            cls._condition.notify_all()
+
+    @classmethod
+    def wait(cls, user_id, sequence, timeout):
+        """Block until publish() is called for the user after `sequence` was read, or timeout"""
+        with cls._condition:
+            return cls._condition.wait_for(lambda: cls._sequences[user_id] != sequence, timeout)
+
+
+class UnreadCounterService:
+    """Maintain and read UnreadCounter rows"""
+
+    FIELDS = ['notifications', 'profile_notifications', 'messages']
+
+    @staticmethod
+    def counted_models():
+        """{counter field: model} for every counted model; all have recipient and is_read"""
+        from apps.profiles.notification_models import Notification as ProfileNotification
+        from .models import Message, Notification
+
+        return {
+            'notifications': Notification,
+            'profile_notifications': ProfileNotification,
+            'messages': Message,
+        }
+
+    @staticmethod
+    def field_for(model):
+        for field, model_class in UnreadCounterService.counted_models().items():
+            if model_class is model:
+                return field
+        return None
+
+    @staticmethod
+    def publish_on_commit(user_ids):
+        user_ids = list(user_ids)
+        transaction.on_commit(lambda: UnreadBroker.publish(user_ids))
+
+    @staticmethod
+    def adjust(user_id, create=True, **deltas):
+        """Add deltas (e.g. messages=-3) to one user's counters"""
+        UnreadCounterService.adjust_many({user_id: deltas}, create=create)
+
+    @staticmethod
+    def adjust_many(deltas_by_user, create=True):
+        """
+        Apply {user_id: {field: delta}} with one UPDATE per distinct delta
+        Users without a counter row yet get one from a recount, unless create is False
+        """
+        groups = defaultdict(list)
+        for user_id, deltas in deltas_by_user.items():
+            deltas = tuple(sorted((field, delta) for field, delta in deltas.items() if delta))
+            if deltas:
+                groups[deltas].append(user_id)
+        if not groups:
+            return
+
+        missing = set()
+        now = timezone.now()
+        for deltas, user_ids in groups.items():
+            updates = {field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas}
+            updated = UnreadCounter.objects.filter(user_id__in=user_ids).update(
+                **updates, version=F('version') + 1, updated_at=now
+            )
+            if create and updated < len(user_ids):
+                existing = set(UnreadCounter.objects.filter(user_id__in=user_ids).values_list('user_id', flat=True))
+                missing.update(set(user_ids) - existing)
+
+        if missing:
+            UnreadCounterService.recount(missing)
+        UnreadCounterService.publish_on_commit(deltas_by_user)
+
+    @staticmethod
+    def record_created(model, recipient_ids):
+        """Count unread rows inserted with bulk_create, given their recipient ids"""
+        field = UnreadCounterService.field_for(model)
+        UnreadCounterService.adjust_many({
+            user_id: {field: count} for user_id, count in Counter(recipient_ids).items()
+        })
+
+    @staticmethod
+    def recount(user_ids=None, batch_size=1000):
+        """
+        Recompute counters from the source tables, for the given users or everyone
+        Returns the number of counters written
+        """
+        from django.contrib.auth.models import User
+
+        users = User.objects.order_by('id')
+        if user_ids is not None:
+            users = users.filter(id__in=list(user_ids))
+        user_ids = list(users.values_list('id', flat=True))
+
+        written = 0
+        for start in range(0, len(user_ids), batch_size):
+            chunk = user_ids[start:start + batch_size]
+            counts = defaultdict(dict)
+            for field, model in UnreadCounterService.counted_models().items():
+                rows = (
+                    model.objects.filter(recipient_id__in=chunk, is_read=False)
+                    .values('recipient_id').annotate(total=Count('id')).order_by()
+                )
+                for row in rows:
+                    counts[row['recipient_id']][field] = row['total']
+
+            now = timezone.now()
+            with transaction.atomic():
+                existing = UnreadCounter.objects.select_for_update().in_bulk(chunk)
+                created, changed = [], []
+                for user_id in chunk:
+                    counter = existing.get(user_id)
+                    if counter is None:
+                        counter = UnreadCounter(user_id=user_id)
+                        created.append(counter)
+                    else:
+                        counter.version = F('version') + 1
+                        changed.append(counter)
+                    for field in UnreadCounterService.FIELDS:
+                        setattr(counter, field, counts[user_id].get(field, 0))
+                    counter.updated_at = now
+
+                UnreadCounter.objects.bulk_update(changed, UnreadCounterService.FIELDS + ['version', 'updated_at'])
+                # A concurrent first adjust may have created the row meanwhile; it is counted here too
+                UnreadCounter.objects.bulk_create(created, ignore_conflicts=True)
+            written += len(chunk)
+            UnreadCounterService.publish_on_commit(chunk)
+        return written
+
+    @staticmethod
+    def get(user):
+        """The user's counter, created from a recount on first use"""
+        user_id = getattr(user, 'pk', user)
+        counter = UnreadCounter.objects.filter(user_id=user_id).first()
+        if counter is None:
+            UnreadCounterService.recount([user_id])
+            counter = UnreadCounter.objects.get(user_id=user_id)
+        return counter
+
+    @staticmethod
+    def wait(user, since, timeout):
+        """
+        Long poll: the user's counter once its version differs from `since`,
+        or the unchanged counter after `timeout` seconds
+        """
+        user_id = getattr(user, 'pk', user)
+        deadline = time.monotonic() + max(0, min(timeout, settings.UNREAD_LONG_POLL_TIMEOUT))
+        while True:
+            sequence = UnreadBroker.sequence(user_id)
+            counter = UnreadCounterService.get(user_id)
+            remaining = deadline - time.monotonic()
+            if counter.version != since or remaining <= 0:
+                return counter
+            UnreadBroker.wait(user_id, sequence, min(remaining, settings.UNREAD_POLL_INTERVAL))
@@ -5,8 +5,9 @@ from rest_framework import status
 from django.db.models import Count, Q
 from django.core.cache import cache
 from datetime import datetime
-import traceback
-from .models import Notification
+import logging
+from .models import Notification, SubmissionIndex
+from .search import SearchService
 from .serializers import NotificationSerializer
 from apps.clt.models import CLTSubmission
 # SRI models not yet implemented, so we'll handle it gracefully
@@ -19,6 +20,8 @@ from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipS
 from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
 from apps.scd.models import LeetCodeProfile
 
+logger = logging.getLogger(__name__)
+
 
 class DashboardStatsView(APIView):
     """
@@ -199,9 +202,7 @@ class DashboardStatsView(APIView):
             return Response(data)
             
         except Exception as e:
-            # Log the error for debugging
-            print(f"Dashboard API Error: {str(e)}")
-            print(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Dashboard API error")
             
             # Return error response
             return Response(
@@ -407,8 +408,7 @@ class NotificationMarkReadView(APIView):
         """Mark a specific notification as read"""
         try:
             notification = Notification.objects.get(pk=pk, recipient=request.user)
-            notification.is_read = True
-            notification.save()
+            notification.mark_as_read()
             return Response({'status': 'marked as read'})
         except Notification.DoesNotExist:
             return Response(
@@ -427,3 +427,113 @@ class NotificationMarkReadView(APIView):
                 {'error': 'Notification not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
+
+
+class SearchView(APIView):
+    """
+    Ranked search over submissions and students, scoped to the caller's role
+    Mentors see their assigned students, floor wings their floor, admins everything
+
+    Query params:
+        - q: search text, every word is prefix-matched
+        - type: all, submissions or students (default all)
+        - limit: page size (default 20, max 100)
+        - offset: next_offset from the previous page
+    """
+    permission_classes = [IsAuthenticated]
+
+    PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        search_type = request.query_params.get('type', 'all')
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.PAGE_SIZE)), 1), self.MAX_PAGE_SIZE)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except (TypeError, ValueError):
+            return Response({'error': 'limit and offset must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+        student_scope = self.get_student_scope(request.user)
+        if student_scope is None:
+            return Response(
+                {'error': "You don't have permission to access this resource"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        if not SearchService.terms(query):
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = {'query': query}
+        if search_type in ('all', 'submissions'):
+            rows = SearchService.search_submissions(
+                SubmissionIndex.objects.filter(student_id__in=student_scope.values('user_id')),
+                query
+            ).select_related('student').order_by('-search_rank', '-submitted_at', '-id')
+            data['submissions'] = self.paginate(rows, limit, offset, self.serialize_submission)
+
+        if search_type in ('all', 'students'):
+            students = SearchService.search_users(
+                student_scope.select_related('user'), query
+            ).order_by('-search_rank', 'user__username')
+            data['students'] = self.paginate(students, limit, offset, self.serialize_student)
+
+        return Response(data)
+
+    @staticmethod
+    def get_student_scope(user):
+        """Student profiles the user may search, None if search is not allowed"""
+        from apps.profiles.models import UserProfile
+
+        students = UserProfile.objects.filter(role='STUDENT')
+        profile = getattr(user, 'profile', None)
+        if user.is_superuser or (profile and profile.role == 'ADMIN'):
+            return students
+        if profile and profile.role == 'FLOOR_WING':
+            return students.filter(campus=profile.campus, floor=profile.floor)
+        if profile and profile.role == 'MENTOR':
+            return students.filter(assigned_mentor=user)
+        return None
+
+    @staticmethod
+    def paginate(queryset, limit, offset, serialize):
+        """Count plus one page of ranked results"""
+        page = list(queryset[offset:offset + limit + 1])
+        has_more = len(page) > limit
+        return {
+            'results': [serialize(item) for item in page[:limit]],
+            'total': queryset.count(),
+            'next_offset': offset + limit if has_more else None,
+        }
+
+    @staticmethod
+    def serialize_submission(row):
+        return {
+            'id': row.object_id,
+            'modelType': row.model_type,
+            'pillar': row.pillar,
+            'title': row.title,
+            'description': row.description,
+            'status': row.status,
+            'submittedDate': row.submitted_at.date(),
+            'student': {
+                'id': row.student_id,
+                'name': row.student.get_full_name() or row.student.username,
+                'username': row.student.username,
+            },
+            'rank': row.search_rank,
+        }
+
+    @staticmethod
+    def serialize_student(profile):
+        user = profile.user
+        return {
+            'id': user.id,
+            'username': user.username,
+            'name': user.get_full_name() or user.username,
+            'email': user.email,
+            'campus': profile.campus,
+            'floor': profile.floor,
+            'assigned_mentor_id': profile.assigned_mentor_id,
+            'rank': profile.search_rank,
+        }
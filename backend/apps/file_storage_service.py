@@ -6,11 +6,18 @@ and can be switched to cloud storage via feature flag.
 
 CRITICAL: Existing file uploads continue to work unchanged.
 This module adds a parallel path for future cloud storage.
+
+Submission evidence (CLT, SRI) is saved content-addressed: one copy per
+distinct SHA-256, shared by every upload of the same file and deleted
+with its last reference (see apps/filestore).
 """
 
 from django.core.files.storage import default_storage
 from django.conf import settings
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F
+import hashlib
 import os
 
 
@@ -61,6 +68,85 @@ class FileStorageService:
         
         return url
     
+    def save_content_addressed(self, file_obj, folder):
+        """
+        Save a file once per distinct content
+        
+        Args:
+            file_obj: Uploaded file; the digest computed by HashingFileUploadHandler
+                      is used when present, otherwise the file is hashed here
+            folder: Folder of the stored copy (e.g., 'clt_submissions')
+        
+        Returns:
+            str: Name within storage, for a FileField; the same for duplicates
+        
+        Example:
+            clt_file.file = storage.save_content_addressed(request.FILES['certificate'], 'clt_submissions')
+        
+        Every call adds a reference, to be dropped with release(). A copy saved
+        by a transaction that rolls back stays in storage and is reused by the
+        next upload of the same content.
+        """
+        from apps.filestore.models import StoredBlob
+        
+        digest = getattr(file_obj, 'sha256', None) or self.hash_file(file_obj)
+        if StoredBlob.objects.filter(digest=digest).update(ref_count=F('ref_count') + 1):
+            return StoredBlob.objects.values_list('path', flat=True).get(digest=digest)
+        
+        ext = os.path.splitext(file_obj.name)[1].lower()
+        path = f'{folder}/{digest[:2]}/{digest}{ext}'
+        if not self.storage.exists(path):
+            path = self.storage.save(path, file_obj)
+        blob, created = StoredBlob.objects.get_or_create(
+            digest=digest, defaults={'path': path, 'size': file_obj.size}
+        )
+        if not created:
+            # A concurrent upload of the same content got there first
+            StoredBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+            if path != blob.path:
+                self.storage.delete(path)
+        return blob.path
+    
+    def release(self, path):
+        """
+        Drop a reference taken by save_content_addressed
+        
+        Args:
+            path: Name within storage
+        
+        Returns:
+            bool: True if this was the last reference and the file is deleted
+        
+        Files not saved content-addressed are deleted right away. Storage
+        deletes happen once the current transaction commits.
+        """
+        from apps.filestore.models import StoredBlob
+        
+        blobs = StoredBlob.objects.filter(path=path)
+        if blobs.filter(ref_count__gt=0).update(ref_count=F('ref_count') - 1):
+            deleted, _ = blobs.filter(ref_count=0).delete()
+            if not deleted:
+                return False
+        transaction.on_commit(lambda: self.storage.delete(path))
+        return True
+    
+    @staticmethod
+    def hash_file(file_obj):
+        """
+        SHA-256 of a file, read in chunks
+        
+        Args:
+            file_obj: File object
+        
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.sha256()
+        for chunk in file_obj.chunks():
+            digest.update(chunk)
+        file_obj.seek(0)
+        return digest.hexdigest()
+    
     def get_file(self, path):
         """
         Retrieve a file from storage
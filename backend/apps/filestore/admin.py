@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import StoredBlob
+
+
+@admin.register(StoredBlob)
+class StoredBlobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'path', 'size', 'ref_count', 'created_at']
+    search_fields = ['digest', 'path']
+    readonly_fields = ['digest', 'path', 'size', 'created_at']
+    list_per_page = 50
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class FilestoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.filestore'
+    verbose_name = 'File Store'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-18 04:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="StoredBlob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "digest",
+                    models.CharField(
+                        help_text="SHA-256 of the content, hex",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                (
+                    "path",
+                    models.CharField(
+                        help_text="Name within default storage",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                ("size", models.BigIntegerField(help_text="File size in bytes")),
+                (
+                    "ref_count",
+                    models.PositiveIntegerField(
+                        default=1, help_text="File rows pointing at this blob"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Stored Blob",
+                "verbose_name_plural": "Stored Blobs",
+            },
+        ),
+    ]
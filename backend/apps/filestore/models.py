@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class StoredBlob(models.Model):
+    """
+    One stored copy of an uploaded file, keyed by the SHA-256 of its content
+    FileFields of every upload with the same content point at `path`; the
+    file is deleted when the last of them is released
+    """
+
+    digest = models.CharField(max_length=64, unique=True, help_text="SHA-256 of the content, hex")
+    path = models.CharField(max_length=255, unique=True, help_text="Name within default storage")
+    size = models.BigIntegerField(help_text="File size in bytes")
+    ref_count = models.PositiveIntegerField(default=1, help_text="File rows pointing at this blob")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Stored Blob'
+        verbose_name_plural = 'Stored Blobs'
+
+    def __str__(self):
+        return f"{self.path} ({self.ref_count} refs)"
@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from apps.clt.models import CLTFile
+from apps.sri.models import SRIFile
+from apps.file_storage_service import FileStorageService
+
+
+@receiver(post_delete, sender=CLTFile)
+@receiver(post_delete, sender=SRIFile)
+def release_stored_file(sender, instance, **kwargs):
+    """
+    Drop the file's reference to its stored copy, also when the row goes
+    with its submission, so shared copies are deleted with the last row
+    """
+    if instance.file.name:
+        FileStorageService().release(instance.file.name)
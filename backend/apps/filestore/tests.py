@@ -0,0 +1,195 @@
+import hashlib
+import io
+import shutil
+import tempfile
+import threading
+import tracemalloc
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParser
+from django.test import TestCase, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from rest_framework.test import APIClient
+
+from apps.clt.models import CLTFile, CLTSubmission
+from apps.file_storage_service import FileStorageService
+from apps.sri.models import SRIFile, SRISubmission
+from .models import StoredBlob
+from .upload_handlers import HashedUploadedFile, HashingFileUploadHandler
+
+User = get_user_model()
+
+PDF = b'%PDF-1.4 certificate ' * 4000
+
+
+class ContentAddressedUploadTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.student = User.objects.create_user('student', 'student@example.com', 'x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def clt_submission(self):
+        return CLTSubmission.objects.create(
+            user=self.student, title='Course', description='Notes', platform='Coursera',
+            completion_date=date(2026, 1, 10),
+        )
+
+    def upload(self, submission, *files):
+        response = self.client.post(
+            f'/api/clt/submissions/{submission.id}/upload_files/',
+            {'files': [SimpleUploadedFile(name, content) for name, content in files]},
+            format='multipart',
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def test_duplicates_are_stored_once(self):
+        first, second = self.clt_submission(), self.clt_submission()
+        self.upload(first, ('certificate.pdf', PDF), ('notes.pdf', b'%PDF other'))
+        self.upload(second, ('Certificate.PDF', PDF))
+
+        blob = StoredBlob.objects.get(digest=hashlib.sha256(PDF).hexdigest())
+        self.assertEqual((blob.ref_count, blob.size), (2, len(PDF)))
+        self.assertEqual(StoredBlob.objects.count(), 2)
+        copies = CLTFile.objects.filter(file_name__iexact='certificate.pdf').values_list('file', flat=True)
+        self.assertEqual(set(copies), {blob.path})
+        self.assertEqual(
+            list(CLTFile.objects.filter(submission=second).values_list('file_name', flat=True)), ['Certificate.PDF']
+        )
+        self.assertTrue(blob.path.startswith('clt_submissions/'))
+        with default_storage.open(blob.path) as stored:
+            self.assertEqual(stored.read(), PDF)
+
+    def test_last_reference_deletes_the_copy(self):
+        first, second = self.clt_submission(), self.clt_submission()
+        self.upload(first, ('certificate.pdf', PDF))
+        self.upload(second, ('certificate.pdf', PDF))
+        blob = StoredBlob.objects.get()
+
+        response = self.client.delete(f'/api/clt/submissions/{first.id}/delete_file/?file_id={first.files.get().id}')
+        self.assertEqual(response.status_code, 200)
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(default_storage.exists(blob.path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(default_storage.exists(blob.path))
+
+    def test_deleting_a_submission_keeps_copies_shared_with_others(self):
+        first, second = self.clt_submission(), self.clt_submission()
+        self.upload(first, ('certificate.pdf', PDF))
+        self.upload(second, ('certificate.pdf', PDF))
+        blob = StoredBlob.objects.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/clt/submissions/{first.id}/')
+        self.assertEqual(response.status_code, 204)
+
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(default_storage.exists(blob.path))
+        with second.files.get().file.open() as stored:
+            self.assertEqual(stored.read(), PDF)
+
+    def test_sri_files_share_storage(self):
+        submission = SRISubmission.objects.create(user=self.student, activity_title='Tutoring', description='Helped')
+        storage = FileStorageService()
+        files = [
+            SRIFile.objects.create(
+                submission=submission, file=storage.save_content_addressed(SimpleUploadedFile(name, PDF), 'sri_submissions'),
+                file_name=name, file_size=len(PDF),
+            )
+            for name in ('one.pdf', 'two.pdf')
+        ]
+        self.assertEqual(len({file.file.name for file in files}), 1)
+        self.assertEqual(StoredBlob.objects.get().ref_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            submission.delete()
+        self.assertFalse(StoredBlob.objects.exists())
+        self.assertFalse(default_storage.exists(files[0].file.name))
+
+    def test_files_saved_without_a_blob_are_deleted_on_release(self):
+        storage = FileStorageService()
+        path = default_storage.save('clt_submissions/legacy.pdf', io.BytesIO(PDF))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(storage.release(path))
+        self.assertFalse(default_storage.exists(path))
+
+
+class HashingUploadHandlerTests(TestCase):
+
+    SIZE = 3 * 1024 * 1024
+    UPLOADS = 10
+
+    def parse(self, body, handlers):
+        meta = {'CONTENT_TYPE': MULTIPART_CONTENT, 'CONTENT_LENGTH': str(len(body))}
+        _, files = MultiPartParser(meta, io.BytesIO(body), handlers).parse()
+        return files['file']
+
+    def peak_memory(self, handler_classes):
+        """Peak traced allocations while parsing concurrent uploads"""
+        bodies = [
+            encode_multipart(BOUNDARY, {'file': SimpleUploadedFile('cert.pdf', bytes([i]) * self.SIZE)})
+            for i in range(self.UPLOADS)
+        ]
+        files = []
+
+        def run(body):
+            files.append(self.parse(body, [handler() for handler in handler_classes]))
+
+        threads = [threading.Thread(target=run, args=(body,)) for body in bodies]
+        tracemalloc.start()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        for file in files:
+            file.close()
+        return files, peak
+
+    def test_uploads_are_hashed_while_streaming(self):
+        content = b'certificate' * 10000
+        body = encode_multipart(BOUNDARY, {'file': SimpleUploadedFile('cert.pdf', content)})
+        file = self.parse(body, [HashingFileUploadHandler()])
+
+        self.assertIsInstance(file, HashedUploadedFile)
+        self.assertEqual(file.sha256, hashlib.sha256(content).hexdigest())
+        self.assertEqual(file.read(), content)
+        file.close()
+
+    def test_one_temporary_file_per_upload(self):
+        body = encode_multipart(BOUNDARY, {'file': SimpleUploadedFile('cert.pdf', b'certificate')})
+        with mock.patch('django.core.files.uploadedfile.tempfile.NamedTemporaryFile',
+                        side_effect=tempfile.NamedTemporaryFile) as opened:
+            file = self.parse(body, [HashingFileUploadHandler()])
+        file.close()
+        self.assertEqual(opened.call_count, 1)
+
+    def test_memory_stays_bounded_with_concurrent_uploads(self):
+        files, peak = self.peak_memory([HashingFileUploadHandler])
+        self.assertEqual(len(files), self.UPLOADS)
+        self.assertTrue(all(file.size == self.SIZE for file in files))
+        self.assertLess(peak, self.UPLOADS * self.SIZE / 10)
+
+        # Django's default handlers keep each upload below FILE_UPLOAD_MAX_MEMORY_SIZE in memory
+        _, buffered = self.peak_memory([MemoryFileUploadHandler, TemporaryFileUploadHandler])
+        self.assertGreater(buffered, self.UPLOADS * self.SIZE)
@@ -0,0 +1,38 @@
+"""
+Streaming upload handler
+
+Django buffers uploads up to FILE_UPLOAD_MAX_MEMORY_SIZE in memory. This
+handler writes every chunk straight to a temporary file and feeds it to a
+SHA-256 as it arrives, so an upload holds about one chunk (chunk_size, 64KB)
+in memory whatever its size, and FileStorageService.save_content_addressed
+gets the digest without reading the file again.
+"""
+import hashlib
+
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, TemporaryFileUploadHandler
+
+
+class HashedUploadedFile(TemporaryUploadedFile):
+    """TemporaryUploadedFile that knows the SHA-256 of its content"""
+
+    sha256 = None
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to temporary files, hashing each chunk"""
+
+    def new_file(self, *args, **kwargs):
+        # Only record the metadata: TemporaryFileUploadHandler.new_file would open a temp file of its own
+        FileUploadHandler.new_file(self, *args, **kwargs)
+        self.file = HashedUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hash.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.sha256 = self.hash.hexdigest()
+        return file
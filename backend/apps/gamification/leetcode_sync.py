@@ -0,0 +1,321 @@
+"""
+Concurrent LeetCode streak sync
+Used by LeetCodeSyncService.sync_all_students / sync_leetcode_streaks
+
+LeetCode lookups run on a bounded thread pool that shares one HTTP session
+and one token bucket per host. All database work stays on the calling
+thread, so the ORM is never touched from worker threads. Synced calendars
+are ingested as they arrive and streaks are computed per batch in one query. Progress is
+checkpointed in LeetCodeSyncRun so a crashed run can resume.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.scd.activity import LeetCodeActivityService
+from apps.scd.leetcode_cache import leetcode_cache, USER_NOT_FOUND
+from .models import SCDStreak, LeetCodeSyncRun
+from .services import LeetCodeSyncService
+
+User = get_user_model()
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket
+    Allows `rate` requests per second on average, bursting up to `capacity`
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_host_buckets = {}
+_host_buckets_lock = threading.Lock()
+
+
+def bucket_for(url, rate):
+    """Shared token bucket for the host of `url` (one per host per process)"""
+    host = urlparse(url).netloc
+    with _host_buckets_lock:
+        bucket = _host_buckets.get(host)
+        if bucket is None or bucket.rate != rate:
+            bucket = _host_buckets[host] = TokenBucket(rate)
+        return bucket
+
+
+class LeetCodeSyncEngine:
+    """
+    Sync every student's SCD streak for a season
+
+    Usage:
+        engine = LeetCodeSyncEngine(season, concurrency=8)
+        results = engine.run(resume=True)
+    """
+
+    RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+    REQUEST_TIMEOUT = 10  # seconds
+    CHECKPOINT_EVERY = 25  # completed students between checkpoint writes
+
+    def __init__(self, season, concurrency=None, rate=None, max_retries=4,
+                 backoff_base=1.0, backoff_cap=30.0, url=None):
+        self.season = season
+        self.concurrency = max(1, concurrency or settings.LEETCODE_SYNC_CONCURRENCY)
+        self.rate = rate or settings.LEETCODE_RATE_LIMIT_PER_SECOND
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.url = url or settings.LEETCODE_GRAPHQL_URL
+        self.bucket = bucket_for(self.url, self.rate)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+    def run(self, resume=False):
+        """
+        Sync all students, resuming the last unfinished run if asked
+        Returns: dict with success/failed counts and error messages
+        """
+        run = self._start_run(resume)
+        results = {
+            'success': run.success_count,
+            'failed': run.failed_count,
+            'errors': [],
+            'resumed_from': run.last_student_id,
+        }
+
+        students = list(
+            User.objects.filter(profile__role='STUDENT', id__gt=run.last_student_id)
+            .select_related('profile')
+            .order_by('id')
+        )
+        order = [student.id for student in students]
+        done = set()
+        position = 0
+
+        def finish(student, ok, message=''):
+            nonlocal position
+            if ok:
+                results['success'] += 1
+            else:
+                results['failed'] += 1
+                results['errors'].append(f"{student.username}: {message}")
+            done.add(student.id)
+
+            # Advance the watermark over the contiguous prefix of finished ids
+            while position < len(order) and order[position] in done:
+                run.last_student_id = order[position]
+                position += 1
+            if len(done) % self.CHECKPOINT_EVERY == 0:
+                self._checkpoint(run, results)
+
+        pending = []
+
+        def apply_pending():
+            # One streak query for the whole batch of synced students
+            streak_days = LeetCodeActivityService.streaks([student.id for student, _ in pending])
+            for student, streak in pending:
+                LeetCodeSyncService.apply_streak_sync(student, streak, streak_days.get(student.id, (0, 0, 0)))
+                finish(student, True)
+            pending.clear()
+
+        try:
+            jobs = []
+            prepared, already_synced = self._prepare_streaks(students, run if resume else None)
+            for student, streak, message in prepared:
+                if streak is None:
+                    finish(student, False, message)
+                elif student.id in already_synced:
+                    finish(student, True)
+                else:
+                    jobs.append((student, streak))
+
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                futures = {
+                    pool.submit(self.fetch_matched_user, streak.leetcode_username): (student, streak)
+                    for student, streak in jobs
+                }
+                for future in as_completed(futures):
+                    student, streak = futures[future]
+                    user_data, error = future.result()
+                    if user_data:
+                        LeetCodeSyncService.ingest_calendar(student, streak.leetcode_username, user_data)
+                        pending.append((student, streak))
+                        if len(pending) >= self.CHECKPOINT_EVERY:
+                            apply_pending()
+                    else:
+                        finish(student, False, error)
+            apply_pending()
+        except BaseException:
+            run.status = 'failed'
+            self._checkpoint(run, results)
+            raise
+        finally:
+            self.session.close()
+
+        run.status = 'completed'
+        run.finished_at = timezone.now()
+        self._checkpoint(run, results)
+        return results
+
+    def fetch_matched_user(self, username):
+        """
+        Look up one LeetCode user, answering from the response cache when possible
+        Runs on worker threads - must not touch the database
+        Returns: (matched_user, error_message)
+        """
+        errors = {}
+
+        def fetch():
+            user_data, errors['message'] = self._request_matched_user(username)
+            if user_data:
+                return user_data
+            return USER_NOT_FOUND if errors['message'] == "API Error: 200" else None
+
+        user_data = leetcode_cache.get_or_fetch('streak', username, fetch)
+        if user_data and user_data is not USER_NOT_FOUND:
+            return user_data, None
+        return None, errors.get('message', "API Error: 200")
+
+    def _request_matched_user(self, username):
+        """Call LeetCode with rate limiting and jittered backoff"""
+        error = 'Unknown error'
+        retry_after = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(self._backoff(attempt, retry_after))
+            retry_after = None
+            self.bucket.acquire()
+
+            try:
+                response = self.session.post(
+                    self.url,
+                    json={
+                        'query': LeetCodeSyncService.STREAK_QUERY,
+                        'variables': {'username': username}
+                    },
+                    timeout=self.REQUEST_TIMEOUT
+                )
+            except requests.RequestException as e:
+                error = f"Sync failed: {str(e)}"
+                continue
+
+            if response.status_code == 200:
+                try:
+                    user_data = (response.json().get('data') or {}).get('matchedUser')
+                except ValueError:
+                    return None, "Sync failed: invalid JSON"
+                if user_data:
+                    return user_data, None
+                return None, "API Error: 200"
+
+            error = f"API Error: {response.status_code}"
+            if response.status_code not in self.RETRYABLE_STATUS:
+                return None, error
+            retry_after = response.headers.get('Retry-After')
+
+        return None, error
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, honouring Retry-After when sent"""
+        if retry_after:
+            try:
+                return min(self.backoff_cap, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _start_run(self, resume):
+        if resume:
+            run = LeetCodeSyncRun.objects.filter(
+                season=self.season
+            ).exclude(status='completed').order_by('-started_at').first()
+            if run:
+                run.status = 'running'
+                run.save(update_fields=['status', 'updated_at'])
+                logger.info("Resuming LeetCode sync run %s after student %s", run.id, run.last_student_id)
+                return run
+        return LeetCodeSyncRun.objects.create(season=self.season)
+
+    def _checkpoint(self, run, results):
+        run.success_count = results['success']
+        run.failed_count = results['failed']
+        run.save()
+
+    def _prepare_streaks(self, students, resumed_run=None):
+        """
+        Get or create SCDStreak rows for all students in a few bulk queries
+        Returns: ([(student, streak, message)], ids synced since the resumed run started)
+        streak is None (with a message) when the student cannot be synced
+        """
+        existing = {
+            streak.student_id: streak
+            for streak in SCDStreak.objects.filter(
+                season=self.season,
+                student_id__in=[student.id for student in students]
+            )
+        }
+
+        to_create = []
+        to_rename = []
+        prepared = []
+        already_synced = set()
+        for student in students:
+            profile = getattr(student, 'profile', None)
+            username = getattr(profile, 'leetcode_id', None) if profile else None
+            if not profile:
+                prepared.append((student, None, "Profile not found"))
+                continue
+            if not username:
+                prepared.append((student, None, "No LeetCode username set"))
+                continue
+
+            streak = existing.get(student.id)
+            if streak is None:
+                streak = SCDStreak(student=student, season=self.season, leetcode_username=username)
+                to_create.append(streak)
+            elif streak.leetcode_username != username:
+                streak.leetcode_username = username
+                to_rename.append(streak)
+
+            # A resumed run must not count the same day twice for a student
+            # that was synced after the last checkpoint was written
+            if resumed_run and streak.last_synced_at and streak.last_synced_at >= resumed_run.started_at:
+                already_synced.add(student.id)
+            prepared.append((student, streak, ''))
+
+        if to_create:
+            SCDStreak.objects.bulk_create(to_create)
+        if to_rename:
+            SCDStreak.objects.bulk_update(to_rename, ['leetcode_username'])
+        return prepared, already_synced
@@ -5,7 +5,8 @@ This script recalculates legacy scores from all completed season scores
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
-from apps.gamification.models import LegacyScore, SeasonScore
+from apps.gamification.models import LegacyScore, SeasonScore, Season
+from apps.gamification.services import SeasonScoringService
 
 User = get_user_model()
 
@@ -19,6 +20,11 @@ class Command(BaseCommand):
             type=str,
             help='Recalculate for specific username only',
         )
+        parser.add_argument(
+            '--rescore',
+            action='store_true',
+            help='Batch-rescore active seasons before recalculating legacy scores',
+        )
 
     def handle(self, *args, **options):
         username = options.get('username')
@@ -39,6 +45,15 @@ class Command(BaseCommand):
             ).distinct()
             self.stdout.write(f"Recalculating legacy scores for {users.count()} students...")
         
+        if options.get('rescore'):
+            student_ids = [user.id for user in users] if username else None
+            for season in Season.objects.filter(is_active=True):
+                results = SeasonScoringService.batch_update_season_scores(season, student_ids=student_ids)
+                self.stdout.write(
+                    f"Rescored {results['scored']} students for {season.name} "
+                    f"in {results['elapsed']:.2f}s"
+                )
+        
         updated_count = 0
         for user in users:
             # Get or create legacy score
@@ -0,0 +1,86 @@
+"""
+Management command to recompute season scores for every student in one pass
+Uses the batch scorer (grouped queries + bulk writes) instead of
+calling update_season_score once per student
+
+Usage:
+    python manage.py rescore_season
+    python manage.py rescore_season --season-id 3
+    python manage.py rescore_season --username student1 --batch-size 1000
+"""
+from django.core.management.base import BaseCommand
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from apps.gamification.models import Season
+from apps.gamification.services import SeasonScoringService, LeaderboardService
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Recompute season scores for all students using the batch scorer'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--season-id',
+            type=int,
+            help='Specific season ID to rescore (defaults to current active season)',
+        )
+        parser.add_argument(
+            '--username',
+            type=str,
+            help='Rescore a specific username only',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Students scored per grouped query (default: 500)',
+        )
+
+    def handle(self, *args, **options):
+        season_id = options.get('season_id')
+
+        if season_id:
+            try:
+                season = Season.objects.get(id=season_id)
+            except Season.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f'Season {season_id} not found'))
+                return
+        else:
+            season = Season.objects.filter(
+                is_active=True,
+                start_date__lte=timezone.now().date(),
+                end_date__gte=timezone.now().date()
+            ).first()
+
+        if not season:
+            self.stdout.write(self.style.ERROR('No active season found'))
+            return
+
+        student_ids = None
+        username = options.get('username')
+        if username:
+            try:
+                student_ids = [User.objects.get(username=username).id]
+            except User.DoesNotExist:
+                self.stdout.write(self.style.ERROR(f'User {username} not found'))
+                return
+
+        self.stdout.write(f'Rescoring {season.name}...')
+
+        results = SeasonScoringService.batch_update_season_scores(
+            season,
+            student_ids=student_ids,
+            batch_size=options['batch_size']
+        )
+
+        # Totals of finalized students may have moved, so re-rank the season
+        LeaderboardService.rebuild(season)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rescore completed in {results["elapsed"]:.2f}s\n'
+            f'Scored: {results["scored"]}\n'
+            f'Created: {results["created"]}\n'
+            f'Updated: {results["updated"]}'
+        ))
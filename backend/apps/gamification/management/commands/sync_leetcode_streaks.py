@@ -1,11 +1,18 @@
 """
 Management command to sync LeetCode streaks for all students
 Run daily via cron: python manage.py sync_leetcode_streaks
+
+Options:
+    --concurrency 16   parallel LeetCode requests (rate limit still applies)
+    --resume           continue the last unfinished run for the season
 """
+import time
+
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from apps.gamification.models import Season
-from apps.gamification.services import LeetCodeSyncService
+from apps.gamification.leetcode_sync import LeetCodeSyncEngine
+from apps.scd.leetcode_cache import leetcode_cache
 
 
 class Command(BaseCommand):
@@ -17,6 +24,21 @@ class Command(BaseCommand):
             type=int,
             help='Specific season ID to sync (defaults to current active season)',
         )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Number of concurrent LeetCode requests (default: LEETCODE_SYNC_CONCURRENCY)',
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            help='Max requests per second to LeetCode (default: LEETCODE_RATE_LIMIT_PER_SECOND)',
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Resume the last unfinished sync run for this season',
+        )
 
     def handle(self, *args, **options):
         season_id = options.get('season_id')
@@ -38,16 +60,36 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR('No active season found'))
             return
         
-        self.stdout.write(f'Starting LeetCode sync for {season.name}...')
+        engine = LeetCodeSyncEngine(
+            season,
+            concurrency=options.get('concurrency'),
+            rate=options.get('rate')
+        )
+        self.stdout.write(
+            f'Starting LeetCode sync for {season.name} '
+            f'(concurrency {engine.concurrency}, {engine.rate}/s)...'
+        )
         
-        results = LeetCodeSyncService.sync_all_students(season)
+        started = time.monotonic()
+        results = engine.run(resume=options['resume'])
         
+        if results['resumed_from']:
+            self.stdout.write(f'Resumed after student #{results["resumed_from"]}')
         self.stdout.write(self.style.SUCCESS(
-            f'Sync completed!\n'
+            f'Sync completed in {time.monotonic() - started:.1f}s!\n'
             f'Success: {results["success"]}\n'
             f'Failed: {results["failed"]}'
         ))
         
+        cache_stats = leetcode_cache.stats()
+        self.stdout.write(
+            f'LeetCode cache: {cache_stats.get("hits", 0)} hits, '
+            f'{cache_stats.get("stale_hits", 0)} stale, '
+            f'{cache_stats.get("negative_hits", 0)} negative, '
+            f'{cache_stats.get("misses", 0)} misses '
+            f'(hit rate {cache_stats["hit_rate"]:.0%})'
+        )
+        
         if results['errors']:
             self.stdout.write(self.style.WARNING('Errors:'))
             for error in results['errors'][:10]:  # Show first 10 errors
@@ -10,7 +10,7 @@ from django.shortcuts import get_object_or_404
 from django.contrib.auth import get_user_model
 
 from .models import Season, Episode, EpisodeProgress, SeasonScore
-from .services import EpisodeService, SeasonScoringService
+from .services import EpisodeService, EpisodeProgressService, SeasonScoringService
 from .serializers import EpisodeProgressSerializer, SeasonScoreSerializer
 
 User = get_user_model()
@@ -94,6 +94,7 @@ def student_progress_detail(request, student_id):
         return Response({'error': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
     
     # Get all episode progress for current season
+    EpisodeProgressService.ensure_for_student(student, current_season)
     episode_progress = EpisodeProgress.objects.filter(
         student=student,
         episode__season=current_season
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="seasonscore",
+            index=models.Index(
+                fields=["season", "season_completed", "-total_score", "id"],
+                name="gamificatio_season__7b7b6e_idx",
+            ),
+        ),
+    ]
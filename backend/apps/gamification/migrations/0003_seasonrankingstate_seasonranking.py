@@ -0,0 +1,104 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("gamification", "0002_seasonscore_gamificatio_season__7b7b6e_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SeasonRankingState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("is_stale", models.BooleanField(default=True)),
+                ("total_students", models.PositiveIntegerField(default=0)),
+                ("refreshed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "season",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ranking_state",
+                        to="gamification.season",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SeasonRanking",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveIntegerField()),
+                ("dense_rank", models.PositiveIntegerField()),
+                (
+                    "percentile",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("top_10", "Top 10%"),
+                            ("top_25", "Top 25%"),
+                            ("top_50", "Top 50%"),
+                            ("below_50", "Below 50%"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("total_score", models.PositiveIntegerField()),
+                (
+                    "season",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rankings",
+                        to="gamification.season",
+                    ),
+                ),
+                (
+                    "season_score",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ranking",
+                        to="gamification.seasonscore",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="season_rankings",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["season", "rank"],
+                "indexes": [
+                    models.Index(
+                        fields=["season", "rank"], name="gamificatio_season__5554c6_idx"
+                    )
+                ],
+                "unique_together": {("season", "student")},
+            },
+        ),
+    ]
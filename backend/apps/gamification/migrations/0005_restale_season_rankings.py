@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def mark_rankings_stale(apps, schema_editor):
+    # Ties are now broken by SeasonScore id, as in LeaderboardService; re-rank on next read
+    SeasonRankingState = apps.get_model('gamification', 'SeasonRankingState')
+    SeasonRankingState.objects.update(is_stale=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gamification', '0004_leetcodesyncrun'),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_rankings_stale, migrations.RunPython.noop),
+    ]
@@ -185,6 +185,9 @@ class SeasonScore(models.Model):
     class Meta:
         unique_together = ['student', 'season']
         ordering = ['-season__season_number']
+        indexes = [
+            models.Index(fields=['season', 'season_completed', '-total_score', 'id']),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.season.name} - {self.total_score}/1500"
@@ -395,23 +398,25 @@ class SCDStreak(models.Model):
         Full uninterrupted streak = 100 points
         Partial breaks = reduced points
         """
+        self.streak_score = self.compute_streak_score()
+        self.save()
+        return self.streak_score
+
+    def compute_streak_score(self):
+        """Same thresholds as calculate_streak_score, without saving"""
         season_days = (self.season.end_date - self.season.start_date).days + 1
-        
+
         if self.season_streak_days >= season_days - 2:  # Allow 2 day buffer
-            self.streak_score = 100
+            return 100
         elif self.season_streak_days >= season_days * 0.8:
-            self.streak_score = 80
+            return 80
         elif self.season_streak_days >= season_days * 0.6:
-            self.streak_score = 60
+            return 60
         elif self.season_streak_days >= season_days * 0.4:
-            self.streak_score = 40
+            return 40
         elif self.season_streak_days >= season_days * 0.2:
-            self.streak_score = 20
-        else:
-            self.streak_score = 0
-        
-        self.save()
-        return self.streak_score
+            return 20
+        return 0
 
 
 class LeaderboardEntry(models.Model):
@@ -506,3 +511,77 @@ class PercentileBracket(models.Model):
 
     def __str__(self):
         return f"{self.student.username} - {self.season.name} - {self.percentile}"
+
+
+class SeasonRanking(models.Model):
+    """
+    Materialized real-time ranking of every SeasonScore in a season
+    Refreshed from SeasonScore when scores change (see SeasonRankingState)
+    """
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name='rankings')
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='season_rankings')
+    season_score = models.OneToOneField(SeasonScore, on_delete=models.CASCADE, related_name='ranking')
+
+    # Position ordered by (-total_score, SeasonScore id), as on the podium; ties share dense_rank
+    rank = models.PositiveIntegerField()
+    dense_rank = models.PositiveIntegerField()
+    percentile = models.CharField(max_length=20, blank=True, choices=[
+        ('top_10', 'Top 10%'),
+        ('top_25', 'Top 25%'),
+        ('top_50', 'Top 50%'),
+        ('below_50', 'Below 50%'),
+    ])  # Blank for the top 3
+    total_score = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ['season', 'student']
+        ordering = ['season', 'rank']
+        indexes = [
+            models.Index(fields=['season', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.season.name} - #{self.rank}"
+
+
+class SeasonRankingState(models.Model):
+    """
+    Freshness marker for SeasonRanking rows of a season
+    Any SeasonScore write marks it stale; the next read refreshes once
+    """
+    season = models.OneToOneField(Season, on_delete=models.CASCADE, related_name='ranking_state')
+    is_stale = models.BooleanField(default=True)
+    total_students = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.season.name} - {'stale' if self.is_stale else 'fresh'}"
+
+
+class LeetCodeSyncRun(models.Model):
+    """
+    Checkpoint for the nightly LeetCode streak sync
+    Students are synced in id order; last_student_id is the highest id below
+    which every student has been handled, so a crashed run can resume from it
+    """
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name='leetcode_sync_runs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
+    last_student_id = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.season.name} sync - {self.status} (after #{self.last_student_id})"
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.batch_serializers import BatchListSerializer, BatchMethodField
 from .models import (
     Season, Episode, EpisodeProgress, SeasonScore, LegacyScore,
     VaultWallet, VaultTransaction, SCDStreak, LeaderboardEntry,
@@ -141,47 +142,55 @@ class LeaderboardEntrySerializer(serializers.ModelSerializer):
     student_name = serializers.SerializerMethodField()
     student_username = serializers.CharField(source='student.username', read_only=True)
     student_email = serializers.CharField(source='student.email', read_only=True)
-    equipped_title = serializers.SerializerMethodField()
+    equipped_title = BatchMethodField(key='student_id')
     
     class Meta:
         model = LeaderboardEntry
         fields = ['id', 'rank', 'student', 'student_name', 'student_username', 'student_email',
                   'season_score', 'rank_title', 'equipped_title', 'created_at']
+        list_serializer_class = BatchListSerializer
     
     def get_student_name(self, obj):
         # Use first_name and last_name from User model
         full_name = f"{obj.student.first_name} {obj.student.last_name}".strip()
         return full_name or obj.student.username
     
-    def get_equipped_title(self, obj):
-        user_title = UserTitle.objects.filter(student=obj.student, is_equipped=True).first()
-        if user_title:
-            return user_title.title.name
-        return None
+    def batch_equipped_title(self, student_ids):
+        """Name of each student's equipped title (the first one, if several are equipped)"""
+        titles = {}
+        equipped = UserTitle.objects.filter(
+            student_id__in=student_ids, is_equipped=True
+        ).order_by('pk').values_list('student_id', 'title__name')
+        for student_id, name in equipped:
+            titles.setdefault(student_id, name)
+        return titles
 
 
 class TitleSerializer(serializers.ModelSerializer):
-    is_owned = serializers.SerializerMethodField()
-    is_equipped = serializers.SerializerMethodField()
+    is_owned = BatchMethodField(key='pk', missing=False)
+    is_equipped = BatchMethodField(key='pk', missing=False)
     
     class Meta:
         model = Title
         fields = ['id', 'name', 'description', 'vault_credit_cost', 'icon',
                   'rarity', 'is_active', 'is_owned', 'is_equipped']
+        list_serializer_class = BatchListSerializer
     
-    def get_is_owned(self, obj):
+    def _owned_titles(self, title_ids):
+        """The requesting user's UserTitle rows among these titles"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return UserTitle.objects.filter(student=request.user, title=obj).exists()
-        return False
+            return UserTitle.objects.filter(student=request.user, title_id__in=title_ids)
+        return UserTitle.objects.none()
     
-    def get_is_equipped(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return UserTitle.objects.filter(
-                student=request.user, title=obj, is_equipped=True
-            ).exists()
-        return False
+    def batch_is_owned(self, title_ids):
+        return {title_id: True for title_id in self._owned_titles(title_ids).values_list('title_id', flat=True)}
+    
+    def batch_is_equipped(self, title_ids):
+        return {
+            title_id: True
+            for title_id in self._owned_titles(title_ids).filter(is_equipped=True).values_list('title_id', flat=True)
+        }
 
 
 class UserTitleSerializer(serializers.ModelSerializer):
@@ -190,6 +199,7 @@ class UserTitleSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserTitle
         fields = ['id', 'student', 'title', 'title_details', 'is_equipped', 'unlocked_at']
+        list_serializer_class = BatchListSerializer
 
 
 class PercentileBracketSerializer(serializers.ModelSerializer):
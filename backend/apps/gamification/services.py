@@ -2,12 +2,18 @@
 Service layer for Gamification System
 Handles scoring, episode progression, season finalization
 """
+import time
+
+from django.conf import settings
 from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+from apps.outbox.services import OutboxService
 from .models import (
     Season, Episode, EpisodeProgress, SeasonScore, LegacyScore,
-    VaultWallet, SCDStreak, LeaderboardEntry, PercentileBracket
+    VaultWallet, SCDStreak, LeaderboardEntry, PercentileBracket,
+    SeasonRanking, SeasonRankingState
 )
 
 User = get_user_model()
@@ -24,7 +30,8 @@ class EpisodeService:
         """
         progress, created = EpisodeProgress.objects.get_or_create(
             student=student,
-            episode=episode
+            episode=episode,
+            defaults={'status': EpisodeProgressService.default_status(episode)}
         )
         
         # Update task completion based on type
@@ -50,8 +57,12 @@ class EpisodeService:
             
             progress.save()
             
-            # Update season score incrementally
-            SeasonScoringService.update_season_score(student, episode.season)
+            # Update season score incrementally, outside the request when async tasks are on
+            OutboxService.enqueue(
+                'gamification.update_season_score',
+                {'student_id': student.id, 'season_id': episode.season_id},
+                idempotency_key=f'task-completed:{progress.id}:{task_type}',
+            )
             
             # Check if episode is now complete
             if progress.check_episode_completion():
@@ -63,12 +74,13 @@ class EpisodeService:
     @staticmethod
     def get_current_episode(student, season):
         """Get the current active episode for student"""
+        EpisodeProgressService.ensure_for_student(student, season)
         # Find first non-completed episode
         progress = EpisodeProgress.objects.filter(
             student=student,
             episode__season=season,
             status__in=['unlocked', 'in_progress']
-        ).order_by('episode__episode_number').first()
+        ).select_related('episode').order_by('episode__episode_number').first()
         
         return progress.episode if progress else None
     
@@ -85,6 +97,64 @@ class EpisodeService:
             progress.save()
 
 
+class EpisodeProgressService:
+    """
+    Provision EpisodeProgress rows in bulk
+    A new episode gets rows for every student from an outbox task, in chunks.
+    Read paths call ensure_for_student first, so students who join mid-season,
+    or read before the task ran, get their default rows on first access.
+    """
+    
+    @staticmethod
+    def default_status(episode):
+        """Episode 1 starts unlocked, later episodes locked"""
+        return 'unlocked' if episode.episode_number == 1 else 'locked'
+    
+    @staticmethod
+    def provision_episodes(episodes, batch_size=None):
+        """
+        Create the missing rows of these episodes for every student
+        Returns the number of students covered
+        """
+        episodes = list(episodes)
+        batch_size = batch_size or settings.EPISODE_PROGRESS_BATCH_SIZE
+        students = User.objects.filter(profile__role='STUDENT').order_by('id')
+        covered, last_id = 0, 0
+        while episodes:
+            # Keyset pagination keeps each chunk one indexed range scan
+            chunk = list(students.filter(id__gt=last_id).values_list('id', flat=True)[:batch_size])
+            if not chunk:
+                break
+            EpisodeProgress.objects.bulk_create([
+                EpisodeProgress(
+                    student_id=student_id, episode=episode,
+                    status=EpisodeProgressService.default_status(episode)
+                )
+                for episode in episodes for student_id in chunk
+            ], ignore_conflicts=True)
+            covered += len(chunk)
+            last_id = chunk[-1]
+        return covered
+    
+    @staticmethod
+    def ensure_for_student(student, season):
+        """
+        Create the student's missing rows for a season's episodes
+        Returns the episodes provisioned; one query when nothing is missing
+        """
+        missing = list(Episode.objects.filter(season=season).exclude(student_progress__student=student))
+        if not missing:
+            return []
+        from apps.profiles.models import UserProfile
+        if not UserProfile.objects.filter(user=student, role='STUDENT').exists():
+            return []
+        EpisodeProgress.objects.bulk_create([
+            EpisodeProgress(student=student, episode=episode, status=EpisodeProgressService.default_status(episode))
+            for episode in missing
+        ], ignore_conflicts=True)
+        return missing
+
+
 class SeasonScoringService:
     """Handle season score calculation and finalization"""
     
@@ -160,11 +230,144 @@ class SeasonScoringService:
         wallet, _ = VaultWallet.objects.get_or_create(student=student)
         wallet.add_credits(vault_credits, f"Season {season.season_number} completion")
         
-        # Update leaderboard
-        SeasonScoringService._update_leaderboard(season)
+        # Update leaderboard (only the rows this student displaces)
+        OutboxService.enqueue(
+            'gamification.record_completion',
+            {'season_score_id': season_score.id},
+            idempotency_key=f'season-completed:{season_score.id}',
+        )
         
         return season_score, f"Season finalized! Score: {season_score.total_score}, Ascension: +{ascension_bonus}, Credits: {vault_credits}"
-    
+
+    @staticmethod
+    def batch_update_season_scores(season, student_ids=None, batch_size=500):
+        """
+        Recompute season scores for many students at once
+        Same rules as update_season_score, but each pillar is resolved with
+        one grouped query per chunk instead of one query per student
+        Returns: dict with scored/created/updated counts and elapsed seconds
+        """
+        started = time.monotonic()
+
+        if student_ids is None:
+            student_ids = User.objects.filter(
+                profile__role='STUDENT'
+            ).values_list('id', flat=True)
+        student_ids = sorted(set(student_ids))
+
+        results = {'scored': 0, 'created': 0, 'updated': 0, 'elapsed': 0.0}
+
+        for offset in range(0, len(student_ids), batch_size):
+            chunk = student_ids[offset:offset + batch_size]
+            created, updated = SeasonScoringService._score_chunk(season, chunk)
+            results['scored'] += len(chunk)
+            results['created'] += created
+            results['updated'] += updated
+
+        # bulk writes skip post_save, so flag the materialized ranking here
+        SeasonRankingService.mark_stale(season.id)
+
+        results['elapsed'] = time.monotonic() - started
+        return results
+
+    @staticmethod
+    @transaction.atomic
+    def _score_chunk(season, student_ids):
+        """Score one chunk of students and write SeasonScore rows in bulk"""
+        pillar_scores = SeasonScoringService._batch_pillar_scores(season, student_ids)
+
+        existing = {
+            score.student_id: score
+            for score in SeasonScore.objects.filter(season=season, student_id__in=student_ids)
+        }
+
+        previous_totals = {score.id: score.total_score for score in existing.values()}
+        to_create = []
+        to_update = []
+        for student_id in student_ids:
+            season_score = existing.get(student_id)
+            if season_score is None:
+                season_score = SeasonScore(student_id=student_id, season=season)
+                to_create.append(season_score)
+            else:
+                to_update.append(season_score)
+
+            for field, value in pillar_scores[student_id].items():
+                setattr(season_score, field, value)
+            season_score.calculate_total()
+
+        if to_create:
+            SeasonScore.objects.bulk_create(to_create)
+        if to_update:
+            now = timezone.now()
+            for season_score in to_update:
+                season_score.updated_at = now
+            SeasonScore.objects.bulk_update(to_update, [
+                'clt_score', 'iipc_score', 'scd_score', 'cfc_score',
+                'outcome_score', 'total_score', 'updated_at',
+            ])
+            # bulk_update skips post_save, which moves finalized scores on the leaderboard
+            for season_score in to_update:
+                if season_score.season_completed and season_score.total_score != previous_totals[season_score.id]:
+                    LeaderboardService.enqueue_score_change(season_score)
+
+        return len(to_create), len(to_update)
+
+    @staticmethod
+    def _batch_pillar_scores(season, student_ids):
+        """
+        Pillar scores for a list of students
+        Mirrors _calculate_clt/iipc/scd/cfc/outcome_score
+        """
+        from apps.clt.models import CLTSubmission
+        from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
+        from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, GenAIProjectSubmission, InternshipSubmission
+
+        def approved(model):
+            return set(
+                model.objects.filter(
+                    user_id__in=student_ids,
+                    status='approved'
+                ).values_list('user_id', flat=True).distinct()
+            )
+
+        clt_ids = approved(CLTSubmission)
+        post_ids = approved(LinkedInPostVerification)
+        connection_ids = approved(LinkedInConnectionVerification)
+        cfc_sets = [
+            approved(HackathonSubmission),
+            approved(BMCVideoSubmission),
+            approved(GenAIProjectSubmission),
+            approved(InternshipSubmission),
+        ]
+
+        # SCD streak scores are persisted on the streak row as well
+        scd_scores = {}
+        changed_streaks = []
+        streaks = SCDStreak.objects.filter(
+            season=season,
+            student_id__in=student_ids
+        ).select_related('season')
+        for streak in streaks:
+            streak_score = streak.compute_streak_score()
+            if streak.streak_score != streak_score:
+                streak.streak_score = streak_score
+                changed_streaks.append(streak)
+            scd_scores[streak.student_id] = streak_score
+        if changed_streaks:
+            SCDStreak.objects.bulk_update(changed_streaks, ['streak_score'])
+
+        scores = {}
+        for student_id in student_ids:
+            scores[student_id] = {
+                'clt_score': 100 if student_id in clt_ids else 0,
+                'iipc_score': (100 if student_id in post_ids else 0) + (100 if student_id in connection_ids else 0),
+                'scd_score': scd_scores.get(student_id, 0),
+                'cfc_score': sum(200 for ids in cfc_sets if student_id in ids),
+                'outcome_score': 0,
+            }
+        return scores
+
     @staticmethod
     def _calculate_clt_score(student, season):
         """
@@ -274,50 +477,326 @@ class SeasonScoringService:
         Update Champions Podium - Top 3 only
         Calculate percentile brackets for others
         """
-        # Get all completed season scores
-        completed_scores = SeasonScore.objects.filter(
+        LeaderboardService.rebuild(season)
+
+
+class LeaderboardService:
+    """
+    Maintain Champions Podium and percentile brackets incrementally
+
+    Completed season scores are ranked by (-total_score, id). Finalizing one
+    student only shifts positions by one, so a bracket can only change for
+    rows sitting next to a percentile cutoff; those few rows are read by
+    position and rewritten, everything else is left alone.
+    """
+
+    PODIUM_SIZE = 3
+
+    # (cutoff percent, bracket) - position/total * 100 <= cutoff
+    PERCENTILE_TIERS = [
+        (10, 'top_10'),
+        (25, 'top_25'),
+        (50, 'top_50'),
+    ]
+
+    @staticmethod
+    def _ranked_scores(season):
+        return SeasonScore.objects.filter(
             season=season,
             season_completed=True
-        ).order_by('-total_score')
-        
-        # Clear existing leaderboard
+        ).order_by('-total_score', 'id')
+
+    @staticmethod
+    def percentile_for(position, total):
+        """Bracket for a 1-based position among total completed scores"""
+        for cutoff, percentile in LeaderboardService.PERCENTILE_TIERS:
+            if position * 100 <= cutoff * total:
+                return percentile
+        return 'below_50'
+
+    @staticmethod
+    @transaction.atomic
+    def record_completion(season_score):
+        """
+        Place a newly completed season score on the leaderboard
+        Reads only the podium and the rows around each percentile cutoff.
+        Falls back to a rebuild when other completions are still waiting to
+        be placed (several can commit before the outbox worker drains them)
+        """
+        season = season_score.season
+        ranked = LeaderboardService._ranked_scores(season)
+
+        total = ranked.count()
+        # Every placed score holds either a podium entry or a bracket
+        previous_total = min(
+            LeaderboardEntry.objects.filter(season=season).count()
+            + PercentileBracket.objects.filter(season=season).count(),
+            total
+        )
+        if total <= 1 or previous_total < total - 1:
+            return LeaderboardService.rebuild(season)
+
+        position = LeaderboardService._position_of(ranked, season_score)
+        LeaderboardService._sync_around(
+            season, ranked, position, total, previous_total,
+            podium=position <= LeaderboardService.PODIUM_SIZE
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def record_score_change(season_score):
+        """
+        Move an already placed score after its total changed (rescore, late approval)
+        The number of ranked scores stays the same, so as in record_completion
+        only the moved row and the rows around each cutoff can change bracket.
+        Scores not placed yet are left to record_completion
+        """
+        season = season_score.season
+        placed = list(
+            LeaderboardEntry.objects.filter(season=season, student_id=season_score.student_id)
+            .values_list('season_score', flat=True)
+        ) + list(
+            PercentileBracket.objects.filter(season=season, student_id=season_score.student_id)
+            .values_list('season_score', flat=True)
+        )
+        if not placed or placed == [season_score.total_score]:
+            return
+
+        ranked = LeaderboardService._ranked_scores(season)
+        total = ranked.count()
+        position = LeaderboardService._position_of(ranked, season_score)
+        # The podium may lose or gain this student from any position
+        LeaderboardService._sync_around(season, ranked, position, total, total, podium=True)
+
+    @staticmethod
+    def enqueue_score_change(season_score):
+        """Queue record_score_change for a completed score whose total was rewritten"""
+        OutboxService.enqueue(
+            'gamification.record_score_change',
+            {'season_score_id': season_score.id},
+            idempotency_key=f'season-score-changed:{season_score.id}:{season_score.updated_at.isoformat()}',
+        )
+
+    @staticmethod
+    def _position_of(ranked, season_score):
+        return ranked.filter(
+            Q(total_score__gt=season_score.total_score) |
+            Q(total_score=season_score.total_score, id__lt=season_score.id)
+        ).count() + 1
+
+    @staticmethod
+    def _sync_around(season, ranked, position, total, previous_total, podium):
+        """Rewrite the brackets that can differ after a score moved to `position`"""
+        positions = {position}
+        for cutoff, _ in LeaderboardService.PERCENTILE_TIERS:
+            for boundary in (cutoff * previous_total // 100, cutoff * total // 100):
+                positions.update((boundary, boundary + 1))
+        if podium:
+            positions.update(range(1, LeaderboardService.PODIUM_SIZE + 2))
+        positions = sorted(p for p in positions if 1 <= p <= total)
+
+        rows = {}
+        for first, last in LeaderboardService._position_runs(positions):
+            for offset, row in enumerate(ranked.values('id', 'student_id', 'total_score')[first - 1:last]):
+                rows[first + offset] = row
+
+        if podium:
+            LeaderboardService._sync_podium(season, ranked)
+
+        LeaderboardService._sync_brackets(season, rows, total)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(season):
+        """
+        Recompute the whole leaderboard for a season from scratch
+        Only rows whose bracket or score changed are written
+        """
+        ranked = LeaderboardService._ranked_scores(season)
+        rows = {
+            position: row
+            for position, row in enumerate(ranked.values('id', 'student_id', 'total_score'), start=1)
+        }
+
+        LeaderboardService._sync_podium(season, ranked)
+        LeaderboardService._sync_brackets(season, rows, len(rows))
+
+        # Drop brackets for students no longer ranked at all
+        PercentileBracket.objects.filter(season=season).exclude(
+            student_id__in=[row['student_id'] for row in rows.values()]
+        ).delete()
+
+    @staticmethod
+    def _position_runs(positions):
+        """Group sorted positions into contiguous (first, last) runs"""
+        runs = []
+        for position in positions:
+            if runs and position == runs[-1][1] + 1:
+                runs[-1][1] = position
+            else:
+                runs.append([position, position])
+        return runs
+
+    @staticmethod
+    def _sync_podium(season, ranked):
+        """Rewrite the top 3 entries only when the podium actually changed"""
+        podium = list(ranked.values('student_id', 'total_score')[:LeaderboardService.PODIUM_SIZE])
+        wanted = [
+            (rank, row['student_id'], row['total_score'])
+            for rank, row in enumerate(podium, start=1)
+        ]
+        current = list(
+            LeaderboardEntry.objects.filter(season=season)
+            .order_by('rank')
+            .values_list('rank', 'student_id', 'season_score')
+        )
+        if current == wanted:
+            return
+
         LeaderboardEntry.objects.filter(season=season).delete()
-        PercentileBracket.objects.filter(season=season).delete()
-        
-        # Create top 3 leaderboard
-        for idx, score in enumerate(completed_scores[:3], start=1):
-            rank_title = 'Season Champion' if idx == 1 else 'Elite Runner'
-            LeaderboardEntry.objects.create(
+        LeaderboardEntry.objects.bulk_create([
+            LeaderboardEntry(
                 season=season,
-                student=score.student,
-                rank=idx,
-                season_score=score.total_score,
-                rank_title=rank_title
+                student_id=student_id,
+                rank=rank,
+                season_score=score,
+                rank_title='Season Champion' if rank == 1 else 'Elite Runner'
             )
-        
-        # Calculate percentiles for others
-        total_count = completed_scores.count()
-        if total_count > 3:
-            for score in completed_scores[3:]:
-                # Calculate percentile
-                rank_position = list(completed_scores.values_list('id', flat=True)).index(score.id) + 1
-                percentile_value = (rank_position / total_count) * 100
-                
-                if percentile_value <= 10:
-                    percentile = 'top_10'
-                elif percentile_value <= 25:
-                    percentile = 'top_25'
-                elif percentile_value <= 50:
-                    percentile = 'top_50'
-                else:
-                    percentile = 'below_50'
-                
-                PercentileBracket.objects.create(
-                    student=score.student,
+            for rank, student_id, score in wanted
+        ])
+
+    @staticmethod
+    def _sync_brackets(season, rows, total):
+        """
+        Bring brackets for the given {position: row} map up to date
+        Podium positions must not carry a bracket
+        """
+        student_ids = [row['student_id'] for row in rows.values()]
+        existing = {
+            bracket.student_id: bracket
+            for bracket in PercentileBracket.objects.filter(season=season, student_id__in=student_ids)
+        }
+
+        to_create = []
+        to_update = []
+        to_delete = []
+        for position, row in rows.items():
+            bracket = existing.get(row['student_id'])
+            if position <= LeaderboardService.PODIUM_SIZE:
+                if bracket:
+                    to_delete.append(bracket.id)
+                continue
+
+            percentile = LeaderboardService.percentile_for(position, total)
+            if bracket is None:
+                to_create.append(PercentileBracket(
+                    student_id=row['student_id'],
                     season=season,
                     percentile=percentile,
-                    season_score=score.total_score
-                )
+                    season_score=row['total_score']
+                ))
+            elif bracket.percentile != percentile or bracket.season_score != row['total_score']:
+                bracket.percentile = percentile
+                bracket.season_score = row['total_score']
+                to_update.append(bracket)
+
+        if to_delete:
+            PercentileBracket.objects.filter(id__in=to_delete).delete()
+        if to_update:
+            PercentileBracket.objects.bulk_update(to_update, ['percentile', 'season_score'])
+        if to_create:
+            PercentileBracket.objects.bulk_create(to_create)
+
+
+class SeasonRankingService:
+    """
+    Keep the materialized SeasonRanking table in step with SeasonScore
+    Reads never rank in Python; they hit the (season, rank) index
+    """
+
+    @staticmethod
+    def mark_stale(season_id):
+        """Flag a season's rankings for refresh on the next read"""
+        SeasonRankingState.objects.filter(season_id=season_id, is_stale=False).update(is_stale=True)
+
+    @staticmethod
+    def ensure_fresh(season):
+        """Refresh the season's rankings if any score changed since last time"""
+        state, _ = SeasonRankingState.objects.get_or_create(season=season)
+        if state.is_stale:
+            state = SeasonRankingService.refresh(season)
+        return state
+
+    @staticmethod
+    @transaction.atomic
+    def refresh(season):
+        """
+        Recompute rank, dense rank and percentile for every score in a season
+        One ordered read, then only rows whose ranking changed are written
+        """
+        state, _ = SeasonRankingState.objects.select_for_update().get_or_create(season=season)
+
+        # Clear the flag first so writes racing with this refresh re-mark it
+        state.is_stale = False
+        state.save(update_fields=['is_stale'])
+
+        scores = list(
+            SeasonScore.objects.filter(season=season)
+            .order_by('-total_score', 'id')
+            .values_list('id', 'student_id', 'total_score')
+        )
+        total = len(scores)
+
+        existing = {
+            ranking.student_id: ranking
+            for ranking in SeasonRanking.objects.filter(season=season)
+        }
+
+        to_create = []
+        to_update = []
+        dense_rank = 0
+        previous_total = None
+        for rank, (score_id, student_id, total_score) in enumerate(scores, start=1):
+            if total_score != previous_total:
+                dense_rank += 1
+                previous_total = total_score
+            percentile = (
+                '' if rank <= LeaderboardService.PODIUM_SIZE
+                else LeaderboardService.percentile_for(rank, total)
+            )
+
+            ranking = existing.pop(student_id, None)
+            if ranking is None:
+                to_create.append(SeasonRanking(
+                    season=season,
+                    student_id=student_id,
+                    season_score_id=score_id,
+                    rank=rank,
+                    dense_rank=dense_rank,
+                    percentile=percentile,
+                    total_score=total_score
+                ))
+            elif (ranking.rank, ranking.dense_rank, ranking.percentile, ranking.total_score) != \
+                    (rank, dense_rank, percentile, total_score):
+                ranking.rank = rank
+                ranking.dense_rank = dense_rank
+                ranking.percentile = percentile
+                ranking.total_score = total_score
+                to_update.append(ranking)
+
+        if existing:
+            SeasonRanking.objects.filter(id__in=[ranking.id for ranking in existing.values()]).delete()
+        if to_update:
+            SeasonRanking.objects.bulk_update(
+                to_update, ['rank', 'dense_rank', 'percentile', 'total_score'], batch_size=500
+            )
+        if to_create:
+            SeasonRanking.objects.bulk_create(to_create, batch_size=500)
+
+        state.total_students = total
+        state.refreshed_at = timezone.now()
+        state.save(update_fields=['total_students', 'refreshed_at'])
+        return state
 
 
 class LeetCodeSyncService:
@@ -329,62 +808,46 @@ class LeetCodeSyncService:
     @staticmethod
     def calculate_submission_streak(student):
         """
-        Calculate daily submission streak based on consecutive days with submissions
+        Calculate daily submission streak from the student's LeetCode daily activity
         Returns: (current_streak, longest_streak, total_days_active)
         """
-        from apps.scd.models import LeetCodeSubmission, LeetCodeProfile
-        from datetime import timedelta, date
-        from django.db.models import Count
-        
-        # Get all submissions for this student
-        profiles = LeetCodeProfile.objects.filter(user=student)
-        if not profiles.exists():
-            return 0, 0, 0
-        
-        # Get all submission dates (distinct days)
-        submissions = LeetCodeSubmission.objects.filter(
-            profile__in=profiles,
-            status='Accepted'  # Only count accepted solutions
-        ).values('timestamp__date').annotate(
-            count=Count('id')
-        ).values_list('timestamp__date', flat=True).distinct().order_by('-timestamp__date')
-        
-        if not submissions:
-            return 0, 0, 0
-        
-        submission_dates = sorted(set(submissions), reverse=True)
-        total_days_active = len(submission_dates)
-        
-        # Calculate current streak (from today backwards)
-        today = timezone.now().date()
-        current_streak = 0
-        check_date = today
-        
-        for sub_date in submission_dates:
-            if sub_date == check_date or sub_date == check_date - timedelta(days=1):
-                current_streak += 1
-                check_date = sub_date - timedelta(days=1)
-            elif sub_date < check_date:
-                break
-        
-        # Calculate longest streak
-        longest_streak = 0
-        temp_streak = 1
-        
-        for i in range(len(submission_dates) - 1):
-            current_date = submission_dates[i]
-            next_date = submission_dates[i + 1]
-            
-            if (current_date - next_date).days == 1:
-                temp_streak += 1
-                longest_streak = max(longest_streak, temp_streak)
-            else:
-                longest_streak = max(longest_streak, temp_streak)
-                temp_streak = 1
-        
-        longest_streak = max(longest_streak, temp_streak)
+        from apps.scd.activity import LeetCodeActivityService
         
-        return current_streak, longest_streak, total_days_active
+        return LeetCodeActivityService.streaks([student.id]).get(student.id, (0, 0, 0))
+    
+    @staticmethod
+    def ingest_calendar(student, username, user_data):
+        """Store the submission calendar from a streak lookup on the matching LeetCode profile"""
+        from apps.scd.activity import LeetCodeActivityService
+        from apps.scd.models import LeetCodeProfile
+        
+        calendar = ((user_data or {}).get('userCalendar') or {}).get('submissionCalendar')
+        if calendar is None:
+            return
+        profile = LeetCodeProfile.objects.filter(user=student, leetcode_username=username).first()
+        if profile:
+            LeetCodeActivityService.ingest(profile, calendar)
+    
+    STREAK_QUERY = """
+    query userProfile($username: String!) {
+        matchedUser(username: $username) {
+            submitStats {
+                acSubmissionNum {
+                    difficulty
+                    count
+                }
+            }
+            profile {
+                ranking
+            }
+            userCalendar {
+                streak
+                totalActiveDays
+                submissionCalendar
+            }
+        }
+    }
+    """
     
     @staticmethod
     def sync_student_streak(student, season):
@@ -393,7 +856,53 @@ class LeetCodeSyncService:
         Uses LeetCode GraphQL API
         """
         import requests
-        
+        from apps.scd.leetcode_cache import leetcode_cache, USER_NOT_FOUND
+        
+        streak, message = LeetCodeSyncService.prepare_streak(student, season)
+        if not streak:
+            return None, message
+        
+        errors = {}
+        
+        def fetch():
+            # Call LeetCode GraphQL API
+            try:
+                response = requests.post(
+                    settings.LEETCODE_GRAPHQL_URL,
+                    json={
+                        'query': LeetCodeSyncService.STREAK_QUERY,
+                        'variables': {'username': streak.leetcode_username}
+                    },
+                    timeout=10
+                )
+            except Exception as e:
+                errors['message'] = f"Sync failed: {str(e)}"
+                return None
+            
+            errors['message'] = f"API Error: {response.status_code}"
+            if response.status_code == 200:
+                data = response.json().get('data') or {}
+                if data.get('matchedUser'):
+                    return data['matchedUser']
+                if 'matchedUser' in data:
+                    return USER_NOT_FOUND
+            return None
+        
+        # Recently verified usernames are answered from the response cache
+        user_data = leetcode_cache.get_or_fetch('streak', streak.leetcode_username, fetch)
+        if user_data and user_data is not USER_NOT_FOUND:
+            LeetCodeSyncService.ingest_calendar(student, streak.leetcode_username, user_data)
+            LeetCodeSyncService.apply_streak_sync(student, streak)
+            return streak, "Streak synced successfully"
+        
+        return None, errors.get('message', "API Error: 200")
+    
+    @staticmethod
+    def prepare_streak(student, season):
+        """
+        Get or create the student's streak record with the current LeetCode username
+        Returns: (streak, message) - streak is None when the student cannot be synced
+        """
         # Get student's LeetCode username
         try:
             profile = student.profile
@@ -415,80 +924,37 @@ class LeetCodeSyncService:
             streak.leetcode_username = leetcode_username
             streak.save()
         
-        # Call LeetCode GraphQL API
-        url = "https://leetcode.com/graphql"
-        query = """
-        query userProfile($username: String!) {
-            matchedUser(username: $username) {
-                submitStats {
-                    acSubmissionNum {
-                        difficulty
-                        count
-                    }
-                }
-                profile {
-                    ranking
-                }
-                userCalendar {
-                    streak
-                    totalActiveDays
-                }
-            }
-        }
+        return streak, ""
+    
+    @staticmethod
+    def apply_streak_sync(student, streak, streak_days=None):
         """
-        
-        try:
-            response = requests.post(
-                url,
-                json={
-                    'query': query,
-                    'variables': {'username': leetcode_username}
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                user_data = data.get('data', {}).get('matchedUser', {})
-                
-                if user_data:
-                    # Calculate streak from actual submissions (not LeetCode's calendar)
-                    current_streak, longest_streak, total_active = LeetCodeSyncService.calculate_submission_streak(student)
-                    
-                    # Update streak record
-                    streak.current_streak = current_streak
-                    streak.longest_streak = max(longest_streak, streak.longest_streak)
-                    streak.total_days_active = total_active
-                    streak.season_streak_days += 1  # Increment season days
-                    streak.last_synced_at = timezone.now()
-                    streak.save()
-                    
-                    return streak, "Streak synced successfully"
-            
-            return None, f"API Error: {response.status_code}"
-            
-        except Exception as e:
-            return None, f"Sync failed: {str(e)}"
+        Record a successful LeetCode lookup on the streak
+        streak_days: (current, longest, total active) when already computed for a batch
+        """
+        if streak_days is None:
+            streak_days = LeetCodeSyncService.calculate_submission_streak(student)
+        current_streak, longest_streak, total_active = streak_days
+        
+        # Update streak record
+        streak.current_streak = current_streak
+        streak.longest_streak = max(longest_streak, streak.longest_streak)
+        streak.total_days_active = total_active
+        streak.season_streak_days += 1  # Increment season days
+        streak.last_synced_at = timezone.now()
+        streak.save()
+        return streak
     
     @staticmethod
-    def sync_all_students(season):
-        """Sync all students for a season - called by cron"""
-        students = User.objects.filter(profile__role='STUDENT')
-        results = {
-            'success': 0,
-            'failed': 0,
-            'errors': []
-        }
-        
-        for student in students:
-            streak, message = LeetCodeSyncService.sync_student_streak(student, season)
-            if streak:
-                results['success'] += 1
-            else:
-                results['failed'] += 1
-                results['errors'].append(f"{student.username}: {message}")
+    def sync_all_students(season, concurrency=None, resume=False):
+        """
+        Sync all students for a season - called by cron
+        LeetCode requests run concurrently and rate limited; see leetcode_sync
+        """
+        from .leetcode_sync import LeetCodeSyncEngine
         
-        return results
+        engine = LeetCodeSyncEngine(season, concurrency=concurrency)
+        return engine.run(resume=resume)
 
 
 class TitleService:
@@ -1,7 +1,7 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import LegacyScore, VaultWallet, Season, Episode, EpisodeProgress
+from .models import LegacyScore, VaultWallet, Season, Episode, SeasonScore
 
 User = get_user_model()
 
@@ -42,23 +42,38 @@ def create_episodes_for_season(sender, instance, created, **kwargs):
 
 
 @receiver(post_save, sender=Episode)
-def initialize_student_episode_progress(sender, instance, created, **kwargs):
-    """Create EpisodeProgress for all students when new episode is created"""
-    if created and instance.episode_number == 1:
-        # Only Episode 1 starts unlocked
-        students = User.objects.filter(profile__role='STUDENT')
-        for student in students:
-            EpisodeProgress.objects.create(
-                student=student,
-                episode=instance,
-                status='unlocked'
-            )
-    elif created:
-        # Episodes 2-4 start locked
-        students = User.objects.filter(profile__role='STUDENT')
-        for student in students:
-            EpisodeProgress.objects.create(
-                student=student,
-                episode=instance,
-                status='locked'
-            )
+def provision_student_episode_progress(sender, instance, created, **kwargs):
+    """
+    Queue EpisodeProgress rows for all students when a new episode is created
+    Rows are bulk-inserted by the outbox task; students read before it runs
+    (or who join later) get theirs from EpisodeProgressService.ensure_for_student
+    """
+    if created:
+        from apps.outbox.services import OutboxService
+        OutboxService.enqueue(
+            'gamification.provision_episode_progress',
+            {'episode_id': instance.id},
+            idempotency_key=f'episode-progress:{instance.id}',
+        )
+
+
+@receiver(post_save, sender=SeasonScore)
+def move_finalized_score(sender, instance, created, update_fields=None, **kwargs):
+    """
+    A finalized score saved again (rescore, late approval) may change rank;
+    the first placement on finalize is done by record_completion
+    """
+    if created or not instance.season_completed:
+        return
+    if update_fields is not None and 'total_score' not in update_fields:
+        return
+    from .services import LeaderboardService
+    LeaderboardService.enqueue_score_change(instance)
+
+
+@receiver(post_save, sender=SeasonScore)
+@receiver(post_delete, sender=SeasonScore)
+def mark_season_rankings_stale(sender, instance, **kwargs):
+    """Any score change invalidates the materialized season ranking"""
+    from .services import SeasonRankingService
+    SeasonRankingService.mark_stale(instance.season_id)
@@ -0,0 +1,53 @@
+"""
+Outbox handlers for score, leaderboard and episode progress side effects
+Enqueued by EpisodeService, SeasonScoringService, mentor reviews and the
+episode signals
+"""
+from django.contrib.auth import get_user_model
+
+from apps.outbox.services import OutboxService
+from .models import Episode, Season, SeasonScore
+from .services import EpisodeProgressService, LeaderboardService, SeasonScoringService
+
+User = get_user_model()
+
+
+@OutboxService.register('gamification.update_season_score')
+def update_season_score(payload):
+    student = User.objects.filter(id=payload['student_id']).first()
+    season = Season.objects.filter(id=payload['season_id']).first()
+    if student and season:
+        SeasonScoringService.update_season_score(student, season)
+
+
+@OutboxService.register('gamification.rescore_students')
+def rescore_students(payload):
+    season = Season.objects.filter(id=payload['season_id']).first()
+    if season:
+        SeasonScoringService.batch_update_season_scores(season, student_ids=payload['student_ids'])
+
+
+@OutboxService.register('gamification.record_completion')
+def record_completion(payload):
+    season_score = SeasonScore.objects.filter(id=payload['season_score_id']).first()
+    if season_score is None:
+        return
+    # Incremental leaderboard updates must not interleave within a season
+    Season.objects.select_for_update().get(id=season_score.season_id)
+    LeaderboardService.record_completion(season_score)
+
+
+@OutboxService.register('gamification.record_score_change')
+def record_score_change(payload):
+    season_score = SeasonScore.objects.filter(id=payload['season_score_id']).first()
+    if season_score is None or not season_score.season_completed:
+        return
+    Season.objects.select_for_update().get(id=season_score.season_id)
+    LeaderboardService.record_score_change(season_score)
+
+
+@OutboxService.register('gamification.provision_episode_progress')
+def provision_episode_progress(payload):
+    episode = Episode.objects.filter(id=payload['episode_id']).first()
+    if episode:
+        EpisodeProgressService.provision_episodes([episode])
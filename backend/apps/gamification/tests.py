@@ -0,0 +1,589 @@
+import json
+import os
+import random
+import threading
+import time
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.outbox.models import OutboxTask
+from apps.outbox.services import OutboxService
+from apps.profiles.models import UserProfile
+from apps.scd.leetcode_cache import cached_query, leetcode_cache, USER_NOT_FOUND
+from .leetcode_sync import LeetCodeSyncEngine
+from .models import (
+    Season, SeasonScore, LeaderboardEntry, PercentileBracket, SeasonRanking,
+    SCDStreak, LeetCodeSyncRun, Title, UserTitle, Episode, EpisodeProgress
+)
+from .serializers import LeaderboardEntrySerializer, TitleSerializer, UserTitleSerializer
+from .services import EpisodeService, LeaderboardService, SeasonRankingService, SeasonScoringService
+
+User = get_user_model()
+
+
+def make_completed_scores(season, totals, prefix='student'):
+    """Bulk-create students with completed season scores (signals skipped)"""
+    offset = User.objects.count()
+    users = User.objects.bulk_create([
+        User(username=f'{prefix}{offset + i}') for i in range(len(totals))
+    ])
+    return SeasonScore.objects.bulk_create([
+        SeasonScore(student=user, season=season, total_score=total, season_completed=True)
+        for user, total in zip(users, totals)
+    ])
+
+
+def leaderboard_snapshot(season):
+    podium = list(
+        LeaderboardEntry.objects.filter(season=season)
+        .order_by('rank')
+        .values_list('rank', 'student_id', 'season_score')
+    )
+    brackets = dict(
+        PercentileBracket.objects.filter(season=season)
+        .values_list('student_id', 'percentile')
+    )
+    return podium, brackets
+
+
+class LeaderboardServiceTests(TestCase):
+
+    def setUp(self):
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1,
+            start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)
+        )
+
+    def test_incremental_matches_full_rebuild(self):
+        rng = random.Random(7)
+        incremental = []
+        for total in [rng.randrange(0, 1500, 10) for _ in range(60)]:
+            score, = make_completed_scores(self.season, [total])
+            LeaderboardService.record_completion(score)
+            incremental.append(leaderboard_snapshot(self.season))
+
+            LeaderboardService.rebuild(self.season)
+            self.assertEqual(incremental[-1], leaderboard_snapshot(self.season))
+
+    def test_completions_placed_after_others_committed(self):
+        rng = random.Random(5)
+        for _ in range(40):
+            pending = make_completed_scores(self.season, [rng.randrange(0, 1500, 10) for _ in range(rng.randint(2, 3))])
+            for score in pending:
+                LeaderboardService.record_completion(score)
+            incremental = leaderboard_snapshot(self.season)
+
+            LeaderboardService.rebuild(self.season)
+            self.assertEqual(incremental, leaderboard_snapshot(self.season))
+
+    def test_podium_entrant_gets_bracket_removed(self):
+        scores = make_completed_scores(self.season, [500, 400, 300, 200])
+        LeaderboardService.rebuild(self.season)
+        self.assertTrue(PercentileBracket.objects.filter(student=scores[3].student).exists())
+
+        top, = make_completed_scores(self.season, [1000])
+        LeaderboardService.record_completion(top)
+
+        podium, brackets = leaderboard_snapshot(self.season)
+        self.assertEqual([row[1] for row in podium], [top.student_id, scores[0].student_id, scores[1].student_id])
+        self.assertNotIn(scores[1].student_id, brackets)
+        self.assertIn(scores[2].student_id, brackets)
+
+    def test_score_changes_after_finalize_match_full_rebuild(self):
+        rng = random.Random(11)
+        scores = make_completed_scores(self.season, [rng.randrange(0, 1500, 10) for _ in range(40)])
+        LeaderboardService.rebuild(self.season)
+
+        for _ in range(30):
+            score = rng.choice(scores)
+            score.total_score = rng.randrange(0, 1500, 10)
+            SeasonScore.objects.filter(id=score.id).update(total_score=score.total_score)
+            LeaderboardService.record_score_change(score)
+            incremental = leaderboard_snapshot(self.season)
+
+            LeaderboardService.rebuild(self.season)
+            self.assertEqual(incremental, leaderboard_snapshot(self.season))
+
+    def test_rescored_finalized_student_moves_bracket(self):
+        scores = make_completed_scores(self.season, [900, 800, 700] + [100] * 17)
+        LeaderboardService.rebuild(self.season)
+        last = scores[-1]
+        self.assertEqual(PercentileBracket.objects.get(student=last.student).percentile, 'below_50')
+
+        # A late approval re-saves the finalized score (post_save -> outbox, inline here)
+        last.total_score = 650
+        last.save()
+        self.assertEqual(PercentileBracket.objects.get(student=last.student).percentile, 'top_25')
+        self.assertEqual(PercentileBracket.objects.get(student=last.student).season_score, 650)
+
+        last.total_score = 1000
+        last.save()
+        podium, brackets = leaderboard_snapshot(self.season)
+        self.assertEqual(podium[0][1:], (last.student_id, 1000))
+        self.assertNotIn(last.student_id, brackets)
+        self.assertIn(scores[2].student_id, brackets)
+
+
+SCORE_FIELDS = ['clt_score', 'iipc_score', 'scd_score', 'cfc_score', 'outcome_score', 'total_score']
+
+
+@override_settings(USE_ASYNC_TASKS=True)
+class BatchSeasonScoringTests(TestCase):
+
+    def setUp(self):
+        from apps.dashboard.synthetic_cohort import SyntheticCohortGenerator
+
+        self.cohort = SyntheticCohortGenerator(students=30, submissions_per_pillar=2, seed=13).generate()
+        self.season = self.cohort.season
+        self.students = self.cohort.students
+        rng = random.Random(13)
+        SCDStreak.objects.bulk_create([
+            SCDStreak(
+                student=student, season=self.season, leetcode_username=student.username,
+                season_streak_days=rng.randint(0, 31),
+            )
+            for student in self.students[::2]
+        ])
+        # A third of the cohort is finalized with totals the rescore will change
+        SeasonScore.objects.filter(student__in=self.students[::3]).update(season_completed=True)
+        LeaderboardService.rebuild(self.season)
+
+    def scores(self):
+        return {
+            row[0]: row[1:]
+            for row in SeasonScore.objects.filter(season=self.season).values_list('student_id', *SCORE_FIELDS)
+        }
+
+    def test_batch_matches_per_student_scoring(self):
+        previous = {
+            score.student_id: score
+            for score in SeasonScore.objects.filter(season=self.season, season_completed=True)
+        }
+        OutboxTask.objects.all().delete()
+
+        results = SeasonScoringService.batch_update_season_scores(
+            self.season, [student.id for student in self.students], batch_size=7
+        )
+        batched = self.scores()
+
+        self.assertEqual((results['scored'], results['updated']), (30, 30))
+        # Every scored pillar has students with and without points
+        for index, field in enumerate(SCORE_FIELDS[:4]):
+            self.assertEqual(len({bool(row[index]) for row in batched.values()}), 2, field)
+        changed = {
+            score.id for student_id, score in previous.items() if batched[student_id][-1] != score.total_score
+        }
+        self.assertTrue(changed)
+        self.assertEqual(
+            {task['season_score_id'] for task in OutboxTask.objects.filter(
+                task_type='gamification.record_score_change'
+            ).values_list('payload', flat=True)},
+            changed,
+        )
+
+        for student in self.students:
+            SeasonScoringService.update_season_score(student, self.season)
+        self.assertEqual(batched, self.scores())
+
+
+@skipUnless(os.getenv('RUN_BENCHMARKS'), 'set RUN_BENCHMARKS=1 to run benchmarks')
+class LeaderboardBenchmark(TestCase):
+    """
+    Finalize latency should stay flat as the season fills up.
+    Run with: RUN_BENCHMARKS=1 python manage.py test apps.gamification.tests.LeaderboardBenchmark -v 2
+    """
+
+    SIZES = [100, 1000, 5000]
+
+    def test_record_completion_scales_flat(self):
+        rng = random.Random(42)
+        query_counts = []
+        print('\n  finalized | queries | record_completion')
+        for number, size in enumerate(self.SIZES, start=1):
+            season = Season.objects.create(
+                name=f'Bench {size}', season_number=100 + number,
+                start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)
+            )
+            make_completed_scores(season, [rng.randrange(0, 1500, 10) for _ in range(size - 1)], prefix=f'b{size}_')
+            LeaderboardService.rebuild(season)
+
+            score, = make_completed_scores(season, [rng.randrange(0, 1500, 10)], prefix=f'b{size}_new')
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                LeaderboardService.record_completion(score)
+                elapsed = (time.perf_counter() - started) * 1000
+            query_counts.append(len(queries.captured_queries))
+            print(f'  {size:>9} | {len(queries.captured_queries):>7} | {elapsed:8.2f} ms')
+
+        # Work is bounded by the number of percentile cutoffs, not by season size
+        self.assertLessEqual(max(query_counts), 15)
+        self.assertLessEqual(max(query_counts) - min(query_counts), 2)
+
+
+class SeasonRankingTests(TestCase):
+
+    def setUp(self):
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1, is_active=True,
+            start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)
+        )
+        self.mentor = User.objects.create_user('mentor', password='x')
+        self.mentor.profile.role = 'MENTOR'
+        self.mentor.profile.save()
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def test_dense_rank_and_refresh_on_score_change(self):
+        scores = make_completed_scores(self.season, [300, 300, 200, 100])
+        SeasonRankingService.ensure_fresh(self.season)
+        ranks = list(SeasonRanking.objects.filter(season=self.season).values_list('rank', 'dense_rank'))
+        self.assertEqual(ranks, [(1, 1), (2, 1), (3, 2), (4, 3)])
+
+        last = scores[3]
+        last.total_score = 900
+        last.save()
+        SeasonRankingService.ensure_fresh(self.season)
+        self.assertEqual(SeasonRanking.objects.get(student=last.student).rank, 1)
+
+    def test_full_leaderboard_pages_with_constant_queries(self):
+        make_completed_scores(self.season, [10 * i for i in range(120)])
+        self.client.get('/api/gamification/leaderboard/full_leaderboard/')
+
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get('/api/gamification/leaderboard/full_leaderboard/', {'limit': 50}).json()
+        second = self.client.get(
+            '/api/gamification/leaderboard/full_leaderboard/',
+            {'limit': 50, 'after': first['next_cursor']}
+        ).json()
+
+        self.assertLessEqual(len(queries.captured_queries), 6)
+        self.assertEqual(first['total_students'], 120)
+        self.assertEqual([row['rank'] for row in second['leaderboard']][:2], [51, 52])
+        self.assertEqual(first['leaderboard'][0]['season_score'], 1190)
+
+    def test_full_list_without_paging_params(self):
+        make_completed_scores(self.season, [10 * i for i in range(80)])
+        response = self.client.get('/api/gamification/leaderboard/full_leaderboard/').json()
+        self.assertEqual(len(response['leaderboard']), 80)
+        self.assertIsNone(response['next_cursor'])
+
+    def test_ties_rank_like_the_podium(self):
+        scores = make_completed_scores(self.season, [300, 300, 300, 300, 100], prefix='zz')
+        # Usernames sort against creation order; both rankings break ties by score id
+        for score, name in zip(scores, ['d', 'c', 'b', 'a', 'e']):
+            User.objects.filter(id=score.student_id).update(username=name)
+        SeasonRankingService.ensure_fresh(self.season)
+        LeaderboardService.rebuild(self.season)
+
+        ranked = list(SeasonRanking.objects.filter(season=self.season).order_by('rank').values_list('student_id', flat=True))
+        podium = list(LeaderboardEntry.objects.filter(season=self.season).order_by('rank').values_list('student_id', flat=True))
+        self.assertEqual(ranked[:3], podium)
+        self.assertEqual(ranked, [score.student_id for score in scores])
+
+    def test_my_position_for_any_student(self):
+        scores = make_completed_scores(self.season, [500, 400])
+        response = self.client.get(
+            '/api/gamification/leaderboard/my_position/',
+            {'student_id': scores[1].student_id}
+        ).json()
+        self.assertEqual(response['live_position']['rank'], 2)
+        self.assertEqual(response['live_position']['total_students'], 2)
+
+
+class FakeLeetCodeHandler(BaseHTTPRequestHandler):
+    """Minimal LeetCode GraphQL stand-in: unknown users, one flaky user"""
+
+    calls = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        username = body['variables']['username']
+        with self.lock:
+            self.calls.append(username)
+            attempts = self.calls.count(username)
+
+        if username == 'flaky' and attempts == 1:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+
+        matched = None if username == 'ghost' else {'profile': {'ranking': 1}}
+        payload = json.dumps({'data': {'matchedUser': matched}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class LeetCodeSyncEngineTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeLeetCodeHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f'http://127.0.0.1:{cls.server.server_port}/graphql'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        FakeLeetCodeHandler.calls = []
+        leetcode_cache.clear()
+        self.season = Season.objects.create(
+            name='Season 1', season_number=1,
+            start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)
+        )
+        self.students = []
+        for name in ['alice', 'flaky', 'ghost', 'bob', 'carol']:
+            user = User.objects.create_user(name, password='x')
+            user.profile.leetcode_id = name
+            user.profile.save()
+            self.students.append(user)
+        User.objects.create_user('nolink', password='x')
+
+    def engine(self):
+        return LeetCodeSyncEngine(self.season, concurrency=4, rate=1000, backoff_base=0.01, url=self.url)
+
+    def test_concurrent_sync_with_retry(self):
+        results = self.engine().run()
+
+        self.assertEqual(results['success'], 4)
+        self.assertEqual(results['failed'], 2)  # ghost (unknown user) + nolink (no username)
+        self.assertEqual(FakeLeetCodeHandler.calls.count('flaky'), 2)
+        self.assertEqual(SCDStreak.objects.filter(season=self.season, last_synced_at__isnull=False).count(), 4)
+
+        run = LeetCodeSyncRun.objects.get()
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(run.last_student_id, User.objects.order_by('-id').first().id)
+
+    def test_resume_continues_after_checkpoint(self):
+        LeetCodeSyncRun.objects.create(
+            season=self.season, status='failed',
+            last_student_id=self.students[2].id, success_count=2, failed_count=1
+        )
+
+        results = self.engine().run(resume=True)
+
+        self.assertEqual(sorted(FakeLeetCodeHandler.calls), ['bob', 'carol'])
+        self.assertEqual(results['success'], 4)
+        self.assertEqual(results['failed'], 2)
+        self.assertEqual(LeetCodeSyncRun.objects.get().status, 'completed')
+
+    def test_second_run_is_served_from_cache(self):
+        self.engine().run()
+        FakeLeetCodeHandler.calls = []
+
+        results = self.engine().run()
+
+        self.assertEqual(FakeLeetCodeHandler.calls, [])
+        self.assertEqual(results['failed'], 2)
+        self.assertEqual(results['errors'][-1], 'ghost: API Error: 200')
+
+
+class LeetCodeResponseCacheTests(TestCase):
+
+    def setUp(self):
+        leetcode_cache.clear()
+        self.calls = []
+
+    def fetcher(self, value):
+        def fetch():
+            self.calls.append(value)
+            return value
+        return fetch
+
+    def test_fresh_hit_and_failures_not_cached(self):
+        self.assertIsNone(leetcode_cache.get_or_fetch('profile', 'Alice', self.fetcher(None)))
+        self.assertEqual(leetcode_cache.get_or_fetch('profile', 'alice', self.fetcher({'v': 1})), {'v': 1})
+        self.assertEqual(leetcode_cache.get_or_fetch('profile', 'alice', self.fetcher({'v': 2})), {'v': 1})
+
+        self.assertEqual(len(self.calls), 2)
+        stats = leetcode_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['errors']), (1, 2, 1))
+
+    def test_unknown_user_is_cached_negatively(self):
+        leetcode_cache.get_or_fetch('profile', 'ghost', self.fetcher(USER_NOT_FOUND))
+        self.assertIs(leetcode_cache.get_or_fetch('profile', 'ghost', self.fetcher({'v': 1})), USER_NOT_FOUND)
+        self.assertEqual(len(self.calls), 1)
+
+    @override_settings(LEETCODE_CACHE_TTLS={'default': 0}, LEETCODE_CACHE_STALE_TTL=60)
+    def test_stale_entry_served_while_revalidating(self):
+        leetcode_cache.get_or_fetch('profile', 'alice', self.fetcher({'v': 1}))
+        self.assertEqual(leetcode_cache.get_or_fetch('profile', 'alice', self.fetcher({'v': 2})), {'v': 1})
+
+        deadline = time.monotonic() + 5
+        while leetcode_cache._refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(leetcode_cache.get_or_fetch('profile', 'alice', self.fetcher({'v': 3})), {'v': 2})
+        self.assertEqual(self.calls[:2], [{'v': 1}, {'v': 2}])
+
+    def test_refresh_bypasses_and_replaces_the_cached_entry(self):
+        @cached_query('full_profile')
+        def fetch(username, limit=20):
+            self.calls.append(username)
+            return {'v': len(self.calls)}
+
+        self.assertEqual(fetch('alice', limit=20), {'v': 1})
+        self.assertEqual(fetch('alice', limit=20), {'v': 1})
+        # A manual sync goes to LeetCode even with a fresh entry...
+        self.assertEqual(fetch.refresh('alice', limit=20), {'v': 2})
+        # ...and later cached reads see its result
+        self.assertEqual(fetch('alice', limit=20), {'v': 2})
+        self.assertEqual(len(self.calls), 2)
+
+
+class BatchSerializerTests(TestCase):
+    """List serializers resolve per-row lookups with one query per field"""
+
+    def setUp(self):
+        self.student = User.objects.create(username='collector')
+        self.titles = Title.objects.bulk_create([
+            Title(name=f'Title {i}', description='-', vault_credit_cost=10 * i) for i in range(30)
+        ])
+        UserTitle.objects.bulk_create([
+            UserTitle(student=self.student, title=title, is_equipped=i == 3)
+            for i, title in enumerate(self.titles) if i % 3 == 0
+        ])
+        request = APIRequestFactory().get('/')
+        request.user = self.student
+        self.context = {'request': request}
+
+    def render(self, serializer_class, queryset):
+        with CaptureQueriesContext(connection) as queries:
+            data = serializer_class(queryset, many=True, context=self.context).data
+        return data, len(queries)
+
+    def test_title_flags_match_the_request_user_at_constant_queries(self):
+        data, few = self.render(TitleSerializer, Title.objects.order_by('id')[:5])
+        data, many = self.render(TitleSerializer, Title.objects.order_by('id'))
+
+        self.assertEqual(few, many)
+        self.assertEqual([row['id'] for row in data if row['is_owned']], [t.id for t in self.titles[::3]])
+        self.assertEqual([row['id'] for row in data if row['is_equipped']], [self.titles[3].id])
+
+        anonymous = TitleSerializer(self.titles[:2], many=True).data
+        self.assertEqual([(row['is_owned'], row['is_equipped']) for row in anonymous], [(False, False)] * 2)
+
+    def test_nested_title_flags_are_batched(self):
+        owned = UserTitle.objects.filter(student=self.student).select_related('title')
+        data, queries = self.render(UserTitleSerializer, owned)
+
+        self.assertEqual(len(data), 10)
+        self.assertTrue(all(row['title_details']['is_owned'] for row in data))
+        # user titles, then owned and equipped flags
+        self.assertEqual(queries, 3)
+
+    def test_single_object_loads_on_demand(self):
+        data = TitleSerializer(self.titles[3], context=self.context).data
+        self.assertEqual((data['is_owned'], data['is_equipped']), (True, True))
+
+    def test_leaderboard_equipped_titles(self):
+        seasons = [
+            Season.objects.create(
+                name=f'Season {n}', season_number=n,
+                start_date=date(2026, n, 1), end_date=date(2026, n, 28)
+            )
+            for n in range(1, 5)
+        ]
+        students = [self.student] + User.objects.bulk_create([User(username=f'podium{i}') for i in range(2)])
+        LeaderboardEntry.objects.bulk_create([
+            LeaderboardEntry(season=season, student=student, rank=rank, season_score=100 - rank, rank_title='-')
+            for season in seasons for rank, student in enumerate(students, start=1)
+        ])
+
+        entries = LeaderboardEntry.objects.select_related('student').order_by('season', 'rank')
+        data, queries = self.render(LeaderboardEntrySerializer, entries)
+
+        self.assertEqual(queries, 2)
+        self.assertEqual([row['equipped_title'] for row in data[:3]], ['Title 3', None, None])
+
+
+def make_students(count, prefix='learner'):
+    """Bulk-create users with student profiles (signals skipped)"""
+    offset = User.objects.count()
+    users = User.objects.bulk_create([User(username=f'{prefix}{offset + i}') for i in range(count)])
+    UserProfile.objects.bulk_create([
+        UserProfile(user=user, role='STUDENT', campus='TECH', floor=1) for user in users
+    ])
+    return users
+
+
+class EpisodeProgressProvisioningTests(TestCase):
+
+    def create_season(self, number=1):
+        return Season.objects.create(
+            name=f'Season {number}', season_number=number,
+            start_date=date(2026, number, 1), end_date=date(2026, number, 28), is_active=True
+        )
+
+    @override_settings(EPISODE_PROGRESS_BATCH_SIZE=20)
+    def test_new_season_provisions_every_student_in_chunks(self):
+        make_students(50)
+        with CaptureQueriesContext(connection) as queries:
+            season = self.create_season()
+
+        statuses = dict(
+            EpisodeProgress.objects.filter(episode__season=season)
+            .values_list('episode__episode_number', 'status').distinct()
+        )
+        self.assertEqual(EpisodeProgress.objects.filter(episode__season=season).count(), 200)
+        self.assertEqual(statuses, {1: 'unlocked', 2: 'locked', 3: 'locked', 4: 'locked'})
+        inserts = [q for q in queries if q['sql'].startswith('INSERT') and '"gamification_episodeprogress"' in q['sql']]
+        # Three chunks of students per episode
+        self.assertEqual(len(inserts), 12)
+
+    def test_mid_season_joiner_is_provisioned_on_first_read(self):
+        season = self.create_season()
+        student, = make_students(1)
+        self.assertFalse(EpisodeProgress.objects.filter(student=student).exists())
+
+        current = EpisodeService.get_current_episode(student, season)
+
+        self.assertEqual(current.episode_number, 1)
+        self.assertEqual(
+            list(EpisodeProgress.objects.filter(student=student).values_list('episode__episode_number', 'status')),
+            [(1, 'unlocked'), (2, 'locked'), (3, 'locked'), (4, 'locked')]
+        )
+        # Nothing is missing the second time
+        with CaptureQueriesContext(connection) as queries:
+            EpisodeService.get_current_episode(student, season)
+        self.assertEqual(len(queries), 2)
+
+    @override_settings(USE_ASYNC_TASKS=True)
+    def test_async_provisioning_leaves_season_creation_to_the_worker(self):
+        make_students(30)
+        season = self.create_season()
+
+        self.assertFalse(EpisodeProgress.objects.exists())
+        tasks = OutboxTask.objects.filter(task_type='gamification.provision_episode_progress')
+        self.assertEqual(tasks.count(), 4)
+
+        client = APIClient()
+        reader = User.objects.filter(profile__role='STUDENT').first()
+        client.force_authenticate(reader)
+        response = client.get('/api/gamification/episode-progress/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(EpisodeProgress.objects.filter(student=reader).count(), 4)
+
+        for task in tasks:
+            OutboxService.run(task)
+        self.assertEqual(EpisodeProgress.objects.filter(episode__season=season).count(), 120)
+        self.assertFalse(Episode.objects.filter(season=season).exclude(student_progress__student=reader).exists())
+
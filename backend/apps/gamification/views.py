@@ -11,7 +11,7 @@ User = get_user_model()
 from .models import (
     Season, Episode, EpisodeProgress, SeasonScore, LegacyScore,
     VaultWallet, SCDStreak, LeaderboardEntry, Title, UserTitle,
-    PercentileBracket
+    PercentileBracket, SeasonRanking
 )
 from .serializers import (
     SeasonSerializer, EpisodeSerializer, EpisodeProgressSerializer,
@@ -19,7 +19,10 @@ from .serializers import (
     SCDStreakSerializer, LeaderboardEntrySerializer, TitleSerializer,
     UserTitleSerializer, PercentileBracketSerializer, StudentDashboardSerializer
 )
-from .services import EpisodeService, TitleService, LeetCodeSyncService
+from .services import (
+    EpisodeService, EpisodeProgressService, TitleService, LeetCodeSyncService,
+    LeaderboardService, SeasonRankingService
+)
 from .progress_notifications import ProgressNotificationService
 
 
@@ -71,6 +74,10 @@ class EpisodeProgressViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
+        if self.action == 'list':
+            current_season = Season.objects.filter(is_active=True).first()
+            if current_season:
+                EpisodeProgressService.ensure_for_student(self.request.user, current_season)
         return EpisodeProgress.objects.filter(student=self.request.user)
     
     def perform_create(self, serializer):
@@ -216,7 +223,7 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
     
     def get_queryset(self):
         season_id = self.request.query_params.get('season')
-        queryset = LeaderboardEntry.objects.all()
+        queryset = LeaderboardEntry.objects.select_related('student')
         if season_id:
             queryset = queryset.filter(season_id=season_id)
         return queryset
@@ -231,7 +238,7 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
         # Get top 3 from real-time scores
         top_3 = SeasonScore.objects.filter(
             season=current_season
-        ).select_related('student').order_by('-total_score', 'student__username')[:3]
+        ).select_related('student').order_by('-total_score', 'id')[:3]
         
         leaderboard_data = []
         rank_titles = {1: 'Season Champion', 2: 'Elite Runner', 3: 'Elite Runner'}
@@ -248,77 +255,138 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
         
         return Response(leaderboard_data)
     
+    PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+
+    def _page_params(self, request):
+        """
+        Keyset cursor (?after=<rank>) and page size (?limit=)
+        Without either parameter the whole list is returned (limit None),
+        as the dashboard panels expect
+        """
+        if 'after' not in request.query_params and 'limit' not in request.query_params:
+            return 0, None
+        try:
+            after = max(int(request.query_params.get('after', 0)), 0)
+        except (TypeError, ValueError):
+            after = 0
+        try:
+            limit = int(request.query_params.get('limit', self.PAGE_SIZE))
+        except (TypeError, ValueError):
+            limit = self.PAGE_SIZE
+        return after, min(max(limit, 1), self.MAX_PAGE_SIZE)
+
+    def _page(self, queryset, limit):
+        """Rows of one page plus one extra to tell whether more follow; all rows without a limit"""
+        return list(queryset if limit is None else queryset[:limit + 1])
+
+    def _ranking_row(self, ranking, rank, rank_title, percentile):
+        score = ranking.season_score
+        return {
+            'rank': rank,
+            'dense_rank': ranking.dense_rank,
+            'student_id': ranking.student.id,
+            'student_username': ranking.student.username,
+            'student_first_name': ranking.student.first_name or ranking.student.username,
+            'season_score': ranking.total_score,
+            'clt_score': score.clt_score,
+            'scd_score': score.scd_score,
+            'cfc_score': score.cfc_score,
+            'iipc_score': score.iipc_score,
+            'outcome_score': score.outcome_score,
+            'rank_title': rank_title,
+            'percentile': percentile
+        }
+
+    def _season_data(self, season):
+        return {
+            'id': season.id,
+            'name': season.name,
+            'is_active': season.is_active
+        }
+
     @action(detail=False, methods=['get'])
     def full_leaderboard(self, request):
-        """Get full leaderboard with real-time scores (for mentors and floor wings)"""
+        """
+        Get full leaderboard with real-time scores (for mentors and floor wings)
+        Served from the materialized SeasonRanking table, whole or page by page:
+        ?after=<rank of last row seen>&limit=<page size>
+        """
         current_season = Season.objects.filter(is_active=True).first()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
-        # Get all season scores ordered by total_score (real-time)
-        all_scores = SeasonScore.objects.filter(
-            season=current_season
-        ).select_related('student').order_by('-total_score', 'student__username')
+        state = SeasonRankingService.ensure_fresh(current_season)
+        after, limit = self._page_params(request)
         
-        # Build leaderboard with ranks
-        leaderboard_data = []
-        for rank, score in enumerate(all_scores, start=1):
-            # Determine rank title and percentile
-            if rank == 1:
-                rank_title = 'Season Champion'
-                percentile = None
-            elif rank == 2 or rank == 3:
-                rank_title = 'Elite Runner'
-                percentile = None
-            else:
-                rank_title = None
-                # Calculate percentile
-                percentile_value = (rank / all_scores.count()) * 100
-                if percentile_value <= 10:
-                    percentile = 'Top 10%'
-                elif percentile_value <= 25:
-                    percentile = 'Top 25%'
-                elif percentile_value <= 50:
-                    percentile = 'Top 50%'
-                else:
-                    percentile = 'Below 50%'
-            
-            leaderboard_data.append({
-                'rank': rank,
-                'student_id': score.student.id,
-                'student_username': score.student.username,
-                'student_first_name': score.student.first_name or score.student.username,
-                'season_score': score.total_score,
-                'clt_score': score.clt_score,
-                'scd_score': score.scd_score,
-                'cfc_score': score.cfc_score,
-                'iipc_score': score.iipc_score,
-                'outcome_score': score.outcome_score,
-                'rank_title': rank_title,
-                'percentile': percentile
-            })
+        rankings = self._page(
+            SeasonRanking.objects.filter(
+                season=current_season,
+                rank__gt=after
+            ).select_related('student', 'season_score').order_by('rank'),
+            limit
+        )
+        has_more = len(rankings) > (limit or len(rankings))
+        rankings = rankings[:limit]
+        
+        rank_titles = {1: 'Season Champion', 2: 'Elite Runner', 3: 'Elite Runner'}
+        leaderboard_data = [
+            self._ranking_row(
+                ranking,
+                ranking.rank,
+                rank_titles.get(ranking.rank),
+                ranking.get_percentile_display() or None
+            )
+            for ranking in rankings
+        ]
         
         return Response({
             'leaderboard': leaderboard_data,
-            'total_students': all_scores.count(),
-            'season': {
-                'id': current_season.id,
-                'name': current_season.name,
-                'is_active': current_season.is_active
-            }
+            'total_students': state.total_students,
+            'next_cursor': rankings[-1].rank if has_more else None,
+            'season': self._season_data(current_season)
         })
     
     @action(detail=False, methods=['get'])
     def my_position(self, request):
-        """Get user's position (rank or percentile)"""
+        """
+        Get user's position (rank or percentile)
+        Mentors, floor wings and admins may pass ?student_id= to look up any student
+        """
         current_season = Season.objects.filter(is_active=True).first()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
         
+        student_id = request.user.id
+        if request.query_params.get('student_id'):
+            role = getattr(getattr(request.user, 'profile', None), 'role', 'STUDENT')
+            if role == 'STUDENT':
+                return Response({'detail': 'Students can only view their own position'}, status=status.HTTP_403_FORBIDDEN)
+            try:
+                student_id = int(request.query_params['student_id'])
+            except ValueError:
+                return Response({'detail': 'Invalid student_id'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Real-time standing from the materialized ranking (single indexed lookup)
+        state = SeasonRankingService.ensure_fresh(current_season)
+        ranking = SeasonRanking.objects.filter(
+            season=current_season,
+            student_id=student_id
+        ).first()
+        live_position = None
+        if ranking:
+            live_position = {
+                'rank': ranking.rank,
+                'dense_rank': ranking.dense_rank,
+                'percentile': ranking.get_percentile_display() or None,
+                'season_score': ranking.total_score,
+                'total_students': state.total_students
+            }
+        
         # Check if in top 3
         leaderboard_entry = LeaderboardEntry.objects.filter(
             season=current_season,
-            student=request.user
+            student_id=student_id
         ).first()
         
         if leaderboard_entry:
@@ -326,31 +394,37 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
                 'position_type': 'leaderboard',
                 'rank': leaderboard_entry.rank,
                 'rank_title': leaderboard_entry.rank_title,
-                'season_score': leaderboard_entry.season_score
+                'season_score': leaderboard_entry.season_score,
+                'live_position': live_position
             })
         
         # Check percentile
         percentile = PercentileBracket.objects.filter(
             season=current_season,
-            student=request.user
+            student_id=student_id
         ).first()
         
         if percentile:
             return Response({
                 'position_type': 'percentile',
                 'percentile': percentile.get_percentile_display(),
-                'season_score': percentile.season_score
+                'season_score': percentile.season_score,
+                'live_position': live_position
             })
         
         # Not completed season
         return Response({
             'position_type': 'not_completed',
-            'message': 'Complete all 4 episodes to be ranked'
+            'message': 'Complete all 4 episodes to be ranked',
+            'live_position': live_position
         })
     
     @action(detail=False, methods=['get'])
     def mentee_leaderboard(self, request):
-        """Get real-time leaderboard for mentor's mentees only"""
+        """
+        Get real-time leaderboard for mentor's mentees only
+        Same keyset paging as full_leaderboard; the cursor is the global rank
+        """
         current_season = Season.objects.filter(is_active=True).first()
         if not current_season:
             return Response({'detail': 'No active season'}, status=status.HTTP_404_NOT_FOUND)
@@ -363,73 +437,51 @@ class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
         except:
             return Response({'detail': 'Profile not found'}, status=status.HTTP_403_FORBIDDEN)
         
-        # Get mentor's students (mentees)
-        mentee_users = User.objects.filter(profile__assigned_mentor=request.user)
+        SeasonRankingService.ensure_fresh(current_season)
+        after, limit = self._page_params(request)
         
-        if not mentee_users.exists():
+        mentee_rankings = SeasonRanking.objects.filter(
+            season=current_season,
+            student__profile__assigned_mentor=request.user
+        )
+        total_mentees = mentee_rankings.count()
+        
+        if not total_mentees:
             return Response({
                 'leaderboard': [],
                 'total_students': 0,
-                'season': {
-                    'id': current_season.id,
-                    'name': current_season.name,
-                    'is_active': current_season.is_active
-                },
+                'next_cursor': None,
+                'season': self._season_data(current_season),
                 'message': 'No mentees assigned'
             })
         
-        # Get all season scores for mentees (real-time)
-        mentee_scores = SeasonScore.objects.filter(
-            season=current_season,
-            student__in=mentee_users
-        ).select_related('student').order_by('-total_score', 'student__username')
+        # Mentee-local rank of the first row on this page
+        offset = mentee_rankings.filter(rank__lte=after).count() if after else 0
         
-        # Build leaderboard with ranks
+        rankings = self._page(
+            mentee_rankings.filter(rank__gt=after)
+            .select_related('student', 'season_score').order_by('rank'),
+            limit
+        )
+        has_more = len(rankings) > (limit or len(rankings))
+        rankings = rankings[:limit]
+        
+        rank_titles = {1: 'Top Mentee', 2: 'Elite Performer', 3: 'Elite Performer'}
+        percentile_labels = dict(SeasonRanking._meta.get_field('percentile').choices)
         leaderboard_data = []
-        for rank, score in enumerate(mentee_scores, start=1):
-            # Determine rank title and percentile
-            if rank == 1:
-                rank_title = 'Top Mentee'
-                percentile = None
-            elif rank == 2 or rank == 3:
-                rank_title = 'Elite Performer'
-                percentile = None
-            else:
-                rank_title = None
-                # Calculate percentile
-                percentile_value = (rank / mentee_scores.count()) * 100
-                if percentile_value <= 10:
-                    percentile = 'Top 10%'
-                elif percentile_value <= 25:
-                    percentile = 'Top 25%'
-                elif percentile_value <= 50:
-                    percentile = 'Top 50%'
-                else:
-                    percentile = 'Below 50%'
-            
-            leaderboard_data.append({
-                'rank': rank,
-                'student_id': score.student.id,
-                'student_username': score.student.username,
-                'student_first_name': score.student.first_name or score.student.username,
-                'season_score': score.total_score,
-                'clt_score': score.clt_score,
-                'scd_score': score.scd_score,
-                'cfc_score': score.cfc_score,
-                'iipc_score': score.iipc_score,
-                'outcome_score': score.outcome_score,
-                'rank_title': rank_title,
-                'percentile': percentile
-            })
+        for local_rank, ranking in enumerate(rankings, start=offset + 1):
+            percentile = None
+            if local_rank > 3:
+                percentile = percentile_labels[LeaderboardService.percentile_for(local_rank, total_mentees)]
+            leaderboard_data.append(
+                self._ranking_row(ranking, local_rank, rank_titles.get(local_rank), percentile)
+            )
         
         return Response({
             'leaderboard': leaderboard_data,
-            'total_students': mentee_scores.count(),
-            'season': {
-                'id': current_season.id,
-                'name': current_season.name,
-                'is_active': current_season.is_active
-            }
+            'total_students': total_mentees,
+            'next_cursor': rankings[-1].rank if has_more else None,
+            'season': self._season_data(current_season)
         })
 
 
@@ -472,7 +524,7 @@ class UserTitleViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return UserTitle.objects.filter(student=self.request.user)
+        return UserTitle.objects.filter(student=self.request.user).select_related('title')
     
     def perform_create(self, serializer):
         serializer.save(student=self.request.user)
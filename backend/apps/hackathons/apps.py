@@ -5,3 +5,6 @@ class HackathonsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.hackathons'
     verbose_name = 'Hackathons'
+
+    def ready(self):
+        import apps.hackathons.signals
@@ -0,0 +1,39 @@
+"""
+Management command to rebuild the hackathon and job feed snapshots
+Run on a schedule (e.g. every 30 minutes) so requests never scrape sources
+
+Usage:
+    python manage.py refresh_feeds
+    python manage.py refresh_feeds --feed hackathons
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from apps.hackathons.models import FeedSnapshot
+from apps.hackathons.services import FeedSnapshotService
+
+
+class Command(BaseCommand):
+    help = 'Refresh the stored hackathon and job feed snapshots'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--feed',
+            choices=[feed for feed, _ in FeedSnapshot.FEED_CHOICES],
+            help='Refresh one feed only (defaults to all feeds)',
+        )
+
+    def handle(self, *args, **options):
+        feeds = [options['feed']] if options.get('feed') else [feed for feed, _ in FeedSnapshot.FEED_CHOICES]
+
+        for feed in feeds:
+            started = time.monotonic()
+            snapshot = FeedSnapshotService.refresh(feed)
+            self.stdout.write(self.style.SUCCESS(
+                f'{feed}: {len(snapshot.items)} items in {time.monotonic() - started:.1f}s'
+            ))
+            for source, meta in snapshot.sources.items():
+                line = f'  - {source}: {meta["status"]} ({meta["count"]})'
+                if meta['error']:
+                    line += f' - {meta["error"]}'
+                self.stdout.write(line)
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-18 02:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "feed",
+                    models.CharField(
+                        choices=[
+                            ("hackathons", "Hackathons"),
+                            ("jobs", "Jobs & Internships"),
+                        ],
+                        max_length=20,
+                        unique=True,
+                    ),
+                ),
+                ("items", models.JSONField(default=list)),
+                (
+                    "sources",
+                    models.JSONField(
+                        default=dict,
+                        help_text="Per-source status, item count and last success time",
+                    ),
+                ),
+                ("etag", models.CharField(blank=True, max_length=64)),
+                ("is_stale", models.BooleanField(default=True)),
+                ("refreshed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class FeedSnapshot(models.Model):
+    """
+    Last good normalized list for a public feed (hackathons, jobs)
+    Written by FeedSnapshotService; views only read it
+    """
+    FEED_CHOICES = [
+        ('hackathons', 'Hackathons'),
+        ('jobs', 'Jobs & Internships'),
+    ]
+
+    feed = models.CharField(max_length=20, choices=FEED_CHOICES, unique=True)
+    items = models.JSONField(default=list)
+    sources = models.JSONField(default=dict, help_text="Per-source status, item count and last success time")
+    etag = models.CharField(max_length=64, blank=True)
+    is_stale = models.BooleanField(default=True)
+    refreshed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.feed} - {len(self.items)} items"
@@ -0,0 +1,643 @@
+"""
+Feed services for the hackathon and job listings
+Sources are fetched off the request path and stored as a FeedSnapshot;
+views serve the snapshot with an ETag
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from .models import FeedSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class HackathonFeedService:
+    """Scrape hackathon sources in parallel and merge them into one list"""
+    
+    SOURCES = ['Devpost', 'MLH', 'Devfolio']
+    
+    @staticmethod
+    def fetchers():
+        return {
+            'Devpost': HackathonFeedService.fetch_devpost_hackathons,
+            'MLH': HackathonFeedService.fetch_mlh_hackathons,
+            'Devfolio': HackathonFeedService.fetch_devfolio_hackathons,
+        }
+    
+    @staticmethod
+    def build(snapshot):
+        """
+        Fetch every source at once; a source that fails keeps its items
+        from the previous snapshot
+        Returns: (items, per-source metadata)
+        """
+        previous_sources = snapshot.sources or {}
+        previous_items = snapshot.items or []
+        
+        with ThreadPoolExecutor(max_workers=len(HackathonFeedService.SOURCES)) as pool:
+            futures = {
+                name: pool.submit(fetch)
+                for name, fetch in HackathonFeedService.fetchers().items()
+            }
+        
+        now = timezone.now().isoformat()
+        hackathons = []
+        sources = {}
+        for name, future in futures.items():
+            try:
+                fetched = future.result()
+            except Exception as e:
+                logger.exception("Hackathon source %s failed", name)
+                fetched, error = [], str(e)
+            else:
+                error = '' if fetched else 'No hackathons returned'
+            
+            if fetched:
+                sources[name] = {'status': 'ok', 'count': len(fetched), 'fetched_at': now, 'error': ''}
+            else:
+                # Fall back to the last good items for this source
+                fetched = [
+                    item for item in previous_items
+                    if name in item.get('sources', [item.get('source')])
+                ]
+                sources[name] = {
+                    'status': 'stale' if fetched else 'failed',
+                    'count': len(fetched),
+                    'fetched_at': previous_sources.get(name, {}).get('fetched_at'),
+                    'error': error,
+                }
+            hackathons.extend(fetched)
+        
+        # If no hackathons from any source, add some fallback samples
+        if not hackathons:
+            hackathons = HackathonFeedService.get_sample_hackathons()
+            sources['Sample'] = {'status': 'ok', 'count': len(hackathons), 'fetched_at': now, 'error': ''}
+        
+        # Merge the same event listed by several sources
+        hackathons = HackathonFeedService.remove_duplicates(hackathons)
+        
+        # Sort by start date (upcoming first)
+        try:
+            hackathons.sort(key=lambda x: HackathonFeedService.parse_date(x.get('start_date', '')))
+        except:
+            pass
+        
+        return hackathons, sources
+    
+    @staticmethod
+    def parse_date(date_str):
+        """Parse various date formats to datetime for sorting"""
+        if not date_str or date_str == 'TBA':
+            return datetime.max
+        
+        try:
+            # Try various date formats
+            formats = ['%b %d, %Y', '%Y-%m-%d', '%B %d, %Y', '%d %b %Y']
+            for fmt in formats:
+                try:
+                    return datetime.strptime(date_str, fmt)
+                except:
+                    continue
+            return datetime.max
+        except:
+            return datetime.max
+    
+    # Words that do not tell two events apart
+    NAME_STOPWORDS = {
+        'the', 'a', 'an', 'of', 'and', 'hackathon', 'hackathons',
+        'devpost', 'mlh', 'devfolio', 'edition', 'online',
+    }
+    # Fallback links the scrapers use when an event has no page of its own
+    GENERIC_URL_KEYS = {'devpost.com', 'devpost.com/hackathons', 'mlh.io', 'devfolio.co/hackathons'}
+    PLACEHOLDER_VALUES = {'', 'TBA', 'Online', 'Various Locations', 'India'}
+    
+    @staticmethod
+    def name_signatures(name):
+        """
+        Normalized name keys: the sorted token set (word order) and the
+        joined tokens (spacing, e.g. 'Hack MIT' / 'HackMIT')
+        """
+        tokens = [
+            token for token in re.findall(r'[a-z0-9]+', (name or '').lower())
+            if token not in HackathonFeedService.NAME_STOPWORDS and not re.fullmatch(r'20\d\d', token)
+        ]
+        if not tokens:
+            return []
+        return [('tokens', ' '.join(sorted(set(tokens)))), ('joined', ''.join(tokens))]
+    
+    @staticmethod
+    def url_key(url):
+        """Host + path without scheme, www, query or trailing slash"""
+        if not url:
+            return None
+        parsed = urlparse(url.strip().lower())
+        host = parsed.netloc[4:] if parsed.netloc.startswith('www.') else parsed.netloc
+        key = f"{host}{parsed.path.rstrip('/')}"
+        if not host or key in HackathonFeedService.GENERIC_URL_KEYS:
+            return None
+        return key
+    
+    @staticmethod
+    def event_day(date_str):
+        """Start day when it can be parsed, else None"""
+        parsed = HackathonFeedService.parse_date(date_str)
+        if parsed == datetime.max and date_str:
+            parsed = HackathonFeedService.parse_date(date_str[:10])  # ISO timestamps
+        return None if parsed == datetime.max else parsed.date()
+    
+    @staticmethod
+    def remove_duplicates(hackathons):
+        """
+        Merge the same event listed by several sources
+        Records match on URL, or on a name signature when their start days
+        do not conflict. Each record is looked up in hash buckets, so the
+        pass is linear in the feed size
+        """
+        parent = list(range(len(hackathons)))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        def union(i, j):
+            i, j = find(i), find(j)
+            if i != j:
+                parent[max(i, j)] = min(i, j)
+        
+        url_index = {}
+        name_buckets = {}
+        for i, h in enumerate(hackathons):
+            url = HackathonFeedService.url_key(h.get('url'))
+            if url:
+                if url in url_index:
+                    union(i, url_index[url])
+                else:
+                    url_index[url] = i
+            
+            day = HackathonFeedService.event_day(h.get('start_date', ''))
+            for signature in HackathonFeedService.name_signatures(h.get('name')):
+                bucket = name_buckets.setdefault(signature, [])
+                for j, other_day in bucket:
+                    if day is None or other_day is None or day == other_day:
+                        union(i, j)
+                        break
+                bucket.append((i, day))
+        
+        groups = {}
+        for i, h in enumerate(hackathons):
+            groups.setdefault(find(i), []).append(h)
+        return [HackathonFeedService.merge_records(group) for group in groups.values()]
+    
+    @staticmethod
+    def merge_records(records):
+        """
+        Combine duplicates into the first record, filling empty or
+        placeholder fields from the others and keeping the longest description
+        """
+        merged = dict(records[0])
+        merged['sources'] = [records[0].get('source')]
+        for record in records[1:]:
+            if record.get('source') not in merged['sources']:
+                merged['sources'].append(record.get('source'))
+            for field, value in record.items():
+                if field in ('id', 'source', 'sources') or value in (None, ''):
+                    continue
+                current = merged.get(field)
+                if field == 'description':
+                    if len(str(value)) > len(str(current or '')):
+                        merged[field] = value
+                elif current is None or current in HackathonFeedService.PLACEHOLDER_VALUES:
+                    merged[field] = value
+        return merged
+    
+    @staticmethod
+    def fetch_devpost_hackathons():
+        """
+        Fetch live hackathons from Devpost
+        """
+        hackathons = []
+        try:
+            # Scrape Devpost's public hackathons page
+            response = requests.get(
+                'https://devpost.com/hackathons',
+                params={'status[]': 'open'},
+                timeout=10,
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                }
+            )
+            
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.text, 'lxml')
+                hackathon_tiles = soup.find_all('div', class_='hackathon-tile')
+                
+                for tile in hackathon_tiles[:15]:
+                    try:
+                        title_elem = tile.find('h3')
+                        link_elem = tile.find('a', class_='link-to-hackathon')
+                        date_elem = tile.find('div', class_='submission-period')
+                        location_elem = tile.find('div', class_='info-with-icon')
+                        
+                        name = title_elem.text.strip() if title_elem else 'Devpost Hackathon'
+                        url = link_elem['href'] if link_elem and 'href' in link_elem.attrs else 'https://devpost.com'
+                        date = date_elem.text.strip() if date_elem else 'TBA'
+                        location = location_elem.text.strip() if location_elem else 'Online'
+                        
+                        hackathon = {
+                            'id': f"devpost_{len(hackathons)}",
+                            'name': name,
+                            'start_date': date,
+                            'end_date': '',
+                            'location': location,
+                            'url': url if url.startswith('http') else f"https://devpost.com{url}",
+                            'logo': '',
+                            'source': 'Devpost',
+                            'is_online': 'online' in location.lower() or 'remote' in location.lower(),
+                            'description': f'Join {name} on Devpost and showcase your skills!',
+                        }
+                        hackathons.append(hackathon)
+                    except Exception as e:
+                        print(f"Error parsing Devpost tile: {e}")
+                        continue
+        except Exception as e:
+            print(f"Error fetching Devpost hackathons: {e}")
+        
+        return hackathons
+    
+    @staticmethod
+    def fetch_mlh_hackathons():
+        """
+        Fetch hackathons from MLH (Major League Hacking)
+        """
+        hackathons = []
+        try:
+            # MLH Events page
+            response = requests.get(
+                'https://mlh.io/seasons/2026/events',
+                timeout=10,
+                headers={
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+                }
+            )
+            
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.text, 'lxml')
+                # MLH uses different structure - look for event cards
+                events = soup.find_all('div', class_='event')
+                
+                if not events:
+                    # Try alternative selectors
+                    events = soup.find_all('a', href=lambda x: x and '/events/' in str(x))
+                
+                for event in events[:15]:
+                    try:
+                        # Extract event details based on MLH structure
+                        name_elem = event.find('h3') or event.find('h2') or event.find(['strong', 'b'])
+                        name = name_elem.text.strip() if name_elem else 'MLH Hackathon'
+                        
+                        date_elem = event.find('p', class_='event-date') or event.find('time')
+                        date = date_elem.text.strip() if date_elem else 'TBA'
+                        
+                        location_elem = event.find('p', class_='event-location') or event.find('span', class_='location')
+                        location = location_elem.text.strip() if location_elem else 'Various Locations'
+                        
+                        link = event.get('href', '') if event.name == 'a' else (event.find('a')['href'] if event.find('a') else '')
+                        url = link if link.startswith('http') else f"https://mlh.io{link}" if link else 'https://mlh.io'
+                        
+                        hackathon = {
+                            'id': f"mlh_{len(hackathons)}",
+                            'name': name,
+                            'start_date': date,
+                            'end_date': '',
+                            'location': location,
+                            'url': url,
+                            'logo': '',
+                            'source': 'MLH',
+                            'is_online': 'online' in location.lower() or 'virtual' in location.lower(),
+                            'description': f'MLH Season 2026 event - {name}',
+                        }
+                        hackathons.append(hackathon)
+                    except Exception as e:
+                        print(f"Error parsing MLH event: {e}")
+                        continue
+        except Exception as e:
+            print(f"Error fetching MLH hackathons: {e}")
+        
+        return hackathons
+    
+    @staticmethod
+    def fetch_devfolio_hackathons():
+        """
+        Fetch Indian hackathons from Devfolio
+        """
+        hackathons = []
+        try:
+            # Devfolio public API
+            response = requests.get(
+                'https://api.devfolio.co/api/search/hackathons',
+                params={'status': 'UPCOMING'},
+                timeout=10,
+                headers={'User-Agent': 'Mozilla/5.0'}
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                for event in data.get('hackathons', [])[:15]:
+                    hackathon = {
+                        'id': f"devfolio_{event.get('id', len(hackathons))}",
+                        'name': event.get('name', 'Unnamed Hackathon'),
+                        'start_date': event.get('starts_at', 'TBA'),
+                        'end_date': event.get('ends_at', ''),
+                        'location': event.get('city', 'India'),
+                        'url': f"https://devfolio.co/hackathons/{event.get('slug', '')}",
+                        'logo': event.get('logo', ''),
+                        'source': 'Devfolio',
+                        'is_online': event.get('is_online', False),
+                        'description': event.get('tagline', 'Join this exciting hackathon'),
+                        'prize_amount': event.get('prizes', ''),
+                    }
+                    hackathons.append(hackathon)
+        except Exception as e:
+            print(f"Error fetching Devfolio hackathons: {e}")
+        
+        return hackathons
+    
+    @staticmethod
+    def get_sample_hackathons():
+        """
+        Fallback recent hackathons data (updated with 2025-2026 dates)
+        """
+        return [
+            {
+                'id': 'sample_1',
+                'name': 'Smart India Hackathon 2025',
+                'start_date': 'Dec 20, 2025',
+                'end_date': 'Dec 22, 2025',
+                'location': 'Pan India',
+                'url': 'https://www.sih.gov.in',
+                'logo': '',
+                'source': 'Sample',
+                'is_online': False,
+                'description': 'India\'s biggest hackathon initiative by Govt. of India. Solve real-world problems with innovative solutions.'
+            },
+            {
+                'id': 'sample_2',
+                'name': 'DevPost Winter Hackathon',
+                'start_date': 'Jan 10, 2026',
+                'end_date': 'Jan 17, 2026',
+                'location': 'Online',
+                'url': 'https://devpost.com/hackathons',
+                'logo': '',
+                'source': 'Sample',
+                'is_online': True,
+                'description': 'Week-long online hackathon with prizes. Build anything you want!'
+            },
+            {
+                'id': 'sample_3',
+                'name': 'ETHIndia 2025',
+                'start_date': 'Dec 18, 2025',
+                'end_date': 'Dec 20, 2025',
+                'location': 'Bangalore, India',
+                'url': 'https://ethindia.co',
+                'logo': '',
+                'source': 'Sample',
+                'is_online': False,
+                'description': 'India\'s largest Ethereum hackathon. Build Web3 applications and win crypto prizes.'
+            },
+            {
+                'id': 'sample_4',
+                'name': 'HackMIT 2026',
+                'start_date': 'Feb 14, 2026',
+                'end_date': 'Feb 16, 2026',
+                'location': 'MIT, Cambridge, MA',
+                'url': 'https://hackmit.org',
+                'logo': '',
+                'source': 'Sample',
+                'is_online': False,
+                'description': 'Annual hackathon at MIT with amazing prizes, workshops, and 1000+ hackers.'
+            },
+            {
+                'id': 'sample_5',
+                'name': 'Google Cloud Hackathon',
+                'start_date': 'Jan 25, 2026',
+                'end_date': 'Feb 25, 2026',
+                'location': 'Online',
+                'url': 'https://cloud.google.com',
+                'logo': '',
+                'source': 'Sample',
+                'is_online': True,
+                'description': 'Build with Google Cloud Platform. Monthly online hackathon with $10k in prizes.'
+            },
+            {
+                'id': 'sample_6',
+                'name': 'AWS India Innovate',
+                'start_date': 'Feb 1, 2026',
+                'end_date': 'Feb 28, 2026',
+                'location': 'Online',
+                'url': 'https://aws.amazon.com',
+                'logo': '',
+                'source': 'Sample',
+                'is_online': True,
+                'description': 'Build innovative solutions using AWS services. Open to students and professionals.'
+            },
+            {
+                'id': 'sample_7',
+                'name': 'Microsoft Imagine Cup India',
+                'start_date': 'Jan 15, 2026',
+                'end_date': 'Mar 15, 2026',
+                'location': 'Online + Finals in Delhi',
+                'url': 'https://imaginecup.microsoft.com',
+                'logo': '',
+                'source': 'Sample',
+                'is_online': True,
+                'description': 'Microsoft\'s premier student technology competition. Win up to $100k and mentorship.'
+            },
+            {
+                'id': 'sample_8',
+                'name': 'HackerEarth Sprint',
+                'start_date': 'Dec 23, 2025',
+                'end_date': 'Dec 30, 2025',
+                'location': 'Online',
+                'url': 'https://www.hackerearth.com',
+                'logo': '',
+                'source': 'Sample',
+                'is_online': True,
+                'description': 'Week-long coding sprint with hiring opportunities. Solve challenges and get hired.'
+            },
+        ]
+
+
+class JobFeedService:
+    """Job and internship announcements posted by mentors"""
+    
+    @staticmethod
+    def build(snapshot):
+        """Returns: (items, per-source metadata)"""
+        from apps.dashboard.models import Announcement
+        
+        opportunities = []
+        
+        # Fetch job/internship announcements from database
+        announcements = Announcement.objects.filter(
+            category__in=['job', 'internship']
+        ).select_related('mentor').order_by('-created_at')
+        
+        for announcement in announcements:
+            # Parse skills
+            skills = []
+            if announcement.required_skills:
+                skills = [s.strip() for s in announcement.required_skills.split(',')][:3]
+            
+            opportunity = {
+                'id': f'ann_{announcement.id}',
+                'title': announcement.title,
+                'company': announcement.company_name or 'Company',
+                'location': announcement.job_location or 'Location TBA',
+                'type': announcement.category,  # 'job' or 'internship'
+                'mode': announcement.job_mode or 'on-site',
+                'duration': announcement.job_duration or 'TBA',
+                'stipend': announcement.job_stipend or 'Competitive',
+                'posted_date': announcement.created_at.strftime('%Y-%m-%d'),
+                'deadline': announcement.application_deadline.strftime('%b %d, %Y') if announcement.application_deadline else 'Open',
+                'url': announcement.application_url or '#',
+                'logo': 'https://via.placeholder.com/100x100?text=' + (announcement.company_name[:1] if announcement.company_name else 'C'),
+                'description': announcement.description,
+                'skills': skills,
+                'experience': 'Freshers',
+                'posted_by': f"{announcement.mentor.first_name} {announcement.mentor.last_name}".strip() or announcement.mentor.username
+            }
+            opportunities.append(opportunity)
+        
+        sources = {
+            'Announcements': {
+                'status': 'ok',
+                'count': len(opportunities),
+                'fetched_at': timezone.now().isoformat(),
+                'error': '',
+            }
+        }
+        return opportunities, sources
+
+
+class FeedSnapshotService:
+    """
+    Build, store and serve FeedSnapshot rows
+
+    hackathons: refreshed by `manage.py refresh_feeds` on a schedule; a
+        snapshot older than HACKATHON_FEED_MAX_AGE is still served while
+        it is rebuilt in the background, and a missing one is answered
+        with an empty 202 until then
+    jobs: marked stale when an announcement changes, rebuilt on next read
+    """
+    
+    _refreshing = set()
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def builders():
+        return {
+            'hackathons': HackathonFeedService.build,
+            'jobs': JobFeedService.build,
+        }
+    
+    @staticmethod
+    def compute_etag(items):
+        payload = json.dumps(items, sort_keys=True, default=str).encode()
+        return hashlib.sha256(payload).hexdigest()[:32]
+    
+    @staticmethod
+    def refresh(feed):
+        """Rebuild a feed and persist it as the new snapshot"""
+        snapshot, _ = FeedSnapshot.objects.get_or_create(feed=feed)
+        
+        # Clear the flag first so changes racing with this refresh re-mark it
+        FeedSnapshot.objects.filter(pk=snapshot.pk).update(is_stale=False)
+        
+        items, sources = FeedSnapshotService.builders()[feed](snapshot)
+        snapshot.items = items
+        snapshot.sources = sources
+        snapshot.etag = FeedSnapshotService.compute_etag(items)
+        snapshot.refreshed_at = timezone.now()
+        snapshot.save(update_fields=['items', 'sources', 'etag', 'refreshed_at'])
+        snapshot.is_stale = False
+        return snapshot
+    
+    @staticmethod
+    def mark_stale(feed):
+        """Flag a feed for rebuild on the next read"""
+        FeedSnapshot.objects.filter(feed=feed, is_stale=False).update(is_stale=True)
+    
+    @staticmethod
+    def get(feed):
+        """
+        Current snapshot for a feed
+        The jobs feed (a database query) is built on the spot when missing or
+        stale. The hackathon feed scrapes external sites, so a request never
+        waits for it: None is returned until the scheduled rebuild has run
+        """
+        snapshot = FeedSnapshot.objects.filter(feed=feed).first()
+        missing = snapshot is None or snapshot.refreshed_at is None
+        
+        if feed == 'jobs':
+            if missing or snapshot.is_stale:
+                snapshot = FeedSnapshotService.refresh(feed)
+            return snapshot
+        
+        if missing:
+            FeedSnapshotService.schedule_refresh(feed)
+            return None
+        
+        age = (timezone.now() - snapshot.refreshed_at).total_seconds()
+        if snapshot.is_stale or age > settings.HACKATHON_FEED_MAX_AGE:
+            FeedSnapshotService.schedule_refresh(feed)
+        return snapshot
+    
+    @staticmethod
+    def schedule_refresh(feed):
+        """
+        Rebuild a feed off the request path: on the outbox when a worker
+        drains it (USE_ASYNC_TASKS), else on a background thread
+        """
+        if not settings.USE_ASYNC_TASKS:
+            return FeedSnapshotService.refresh_in_background(feed)
+        from apps.outbox.services import OutboxService
+        # At most one queued rebuild per feed per minute
+        OutboxService.enqueue(
+            'hackathons.refresh_feed',
+            {'feed': feed},
+            idempotency_key=f"feed-refresh:{feed}:{timezone.now():%Y%m%d%H%M}",
+        )
+    
+    @staticmethod
+    def refresh_in_background(feed):
+        """Rebuild a feed on a daemon thread, at most one per feed per process"""
+        with FeedSnapshotService._lock:
+            if feed in FeedSnapshotService._refreshing:
+                return
+            FeedSnapshotService._refreshing.add(feed)
+        
+        def run():
+            try:
+                FeedSnapshotService.refresh(feed)
+            except Exception:
+                logger.exception("Background refresh of %s feed failed", feed)
+            finally:
+                with FeedSnapshotService._lock:
+                    FeedSnapshotService._refreshing.discard(feed)
+                connection.close()
+        
+        threading.Thread(target=run, daemon=True).start()
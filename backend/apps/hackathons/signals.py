@@ -0,0 +1,11 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.dashboard.models import Announcement
+from .services import FeedSnapshotService
+
+
+@receiver([post_save, post_delete], sender=Announcement)
+def mark_jobs_feed_stale(sender, instance, **kwargs):
+    """Any announcement change may add, edit or remove a job posting"""
+    FeedSnapshotService.mark_stale('jobs')
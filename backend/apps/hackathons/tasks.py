@@ -0,0 +1,11 @@
+"""
+Outbox handlers for feed snapshots
+Enqueued by FeedSnapshotService.schedule_refresh
+"""
+from apps.outbox.services import OutboxService
+from .services import FeedSnapshotService
+
+
+@OutboxService.register('hackathons.refresh_feed')
+def refresh_feed(payload):
+    FeedSnapshotService.refresh(payload['feed'])
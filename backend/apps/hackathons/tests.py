@@ -0,0 +1,166 @@
+import os
+import random
+import time
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.dashboard.models import Announcement
+from apps.outbox.services import OutboxService
+from .models import FeedSnapshot
+from .services import HackathonFeedService, FeedSnapshotService
+
+User = get_user_model()
+
+
+def hackathon(name, source, start_date='Jan 10, 2026'):
+    return {'id': f'{source}_{name}', 'name': name, 'start_date': start_date, 'source': source}
+
+
+class HackathonFeedTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.sources = {
+            'Devpost': [hackathon('Winter Hack', 'Devpost')],
+            'MLH': [hackathon('HackMIT', 'MLH', 'Feb 14, 2026')],
+            'Devfolio': [hackathon('ETHIndia', 'Devfolio', 'Dec 18, 2025')],
+        }
+        self.calls = []
+
+    def fetchers(self):
+        def fetcher(name):
+            def fetch():
+                self.calls.append(name)
+                return list(self.sources[name])
+            return fetch
+        return {name: fetcher(name) for name in self.sources}
+
+    def test_failed_source_keeps_last_good_items(self):
+        with mock.patch.object(HackathonFeedService, 'fetchers', self.fetchers):
+            FeedSnapshotService.refresh('hackathons')
+            self.sources['Devpost'] = []
+            snapshot = FeedSnapshotService.refresh('hackathons')
+
+        self.assertEqual([item['name'] for item in snapshot.items], ['ETHIndia', 'Winter Hack', 'HackMIT'])
+        self.assertEqual(snapshot.sources['Devpost']['status'], 'stale')
+        self.assertEqual(snapshot.sources['MLH']['status'], 'ok')
+
+    @override_settings(USE_ASYNC_TASKS=True)
+    def test_served_from_snapshot_with_conditional_get(self):
+        with mock.patch.object(HackathonFeedService, 'fetchers', self.fetchers):
+            pending = self.client.get('/api/hackathons/list/')
+            self.assertEqual(self.calls, [])  # no scraping on the request path
+            OutboxService.drain()
+            first = self.client.get('/api/hackathons/list/')
+            second = self.client.get('/api/hackathons/list/')
+            cached = self.client.get('/api/hackathons/list/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+        self.assertEqual(pending.status_code, 202)
+        self.assertEqual((pending['Retry-After'], pending.json()['hackathons']), ('30', []))
+        self.assertEqual(len(self.calls), 3)  # one build, one call per source
+        self.assertEqual(first.json()['count'], 3)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+
+class RemoveDuplicatesTests(TestCase):
+
+    def test_merges_across_sources_and_keeps_richest_fields(self):
+        feed = [
+            {'id': 'devpost_0', 'name': 'HackMIT 2026', 'start_date': 'Feb 14, 2026', 'location': 'Online',
+             'url': 'https://hackmit.devpost.com/', 'logo': '', 'source': 'Devpost', 'description': 'Join'},
+            {'id': 'mlh_0', 'name': 'Hack MIT', 'start_date': 'TBA', 'location': 'Cambridge, MA',
+             'url': 'https://mlh.io/events/hackmit', 'logo': 'mit.png', 'source': 'MLH',
+             'description': 'Annual hackathon at MIT'},
+            {'id': 'devfolio_1', 'name': 'ETHIndia', 'start_date': '2025-12-18T09:00:00Z', 'location': 'India',
+             'url': 'https://devfolio.co/hackathons/ethindia', 'logo': '', 'source': 'Devfolio',
+             'description': '', 'prize_amount': '$50k'},
+            {'id': 'devpost_1', 'name': 'ETH India Hackathon', 'start_date': 'Dec 18, 2025',
+             'location': 'Bangalore', 'url': 'https://ethindia.devpost.com', 'logo': '', 'source': 'Devpost',
+             'description': 'Web3'},
+            {'id': 'devpost_2', 'name': 'ETHIndia', 'start_date': 'Dec 1, 2026', 'location': 'Online',
+             'url': 'https://devpost.com', 'logo': '', 'source': 'Devpost', 'description': ''},
+        ]
+
+        unique = HackathonFeedService.remove_duplicates(feed)
+
+        self.assertEqual(len(unique), 3)
+        hackmit, ethindia, next_year = unique
+        self.assertEqual(hackmit['sources'], ['Devpost', 'MLH'])
+        self.assertEqual(hackmit['location'], 'Cambridge, MA')
+        self.assertEqual(hackmit['logo'], 'mit.png')
+        self.assertEqual(hackmit['description'], 'Annual hackathon at MIT')
+        self.assertEqual(ethindia['location'], 'Bangalore')
+        self.assertEqual(ethindia['prize_amount'], '$50k')
+        self.assertEqual(next_year['start_date'], 'Dec 1, 2026')
+
+
+@skipUnless(os.getenv('RUN_BENCHMARKS'), 'set RUN_BENCHMARKS=1 to run benchmarks')
+class RemoveDuplicatesBenchmark(TestCase):
+    """
+    De-duplication of a synthetic 10k-event feed from three sources.
+    Run with: RUN_BENCHMARKS=1 python manage.py test apps.hackathons.tests.RemoveDuplicatesBenchmark -v 2
+    """
+
+    def synthetic_feed(self, events, rng):
+        feed = []
+        for n in range(events):
+            name = f"Code Sprint N{n}"
+            day = f"Jan {n % 28 + 1}, 2026"
+            slug = f"code-sprint-{n}"
+            feed.append({'id': f'devpost_{n}', 'name': name, 'start_date': day, 'location': 'Online',
+                         'url': f'https://{slug}.devpost.com/', 'source': 'Devpost', 'description': ''})
+            if rng.random() < 0.5:
+                feed.append({'id': f'mlh_{n}', 'name': name.replace(' ', '').upper(), 'start_date': 'TBA',
+                             'location': 'Various Locations', 'url': f'https://mlh.io/events/{slug}',
+                             'source': 'MLH', 'description': 'MLH event'})
+            if rng.random() < 0.3:
+                feed.append({'id': f'devfolio_{n}', 'name': f"{name} Hackathon 2026", 'start_date': day,
+                             'location': 'India', 'url': f'https://{slug}.devpost.com?ref=devfolio',
+                             'source': 'Devfolio', 'description': 'Longer devfolio description'})
+        rng.shuffle(feed)
+        return feed
+
+    def test_10k_feed_dedups_in_near_linear_time(self):
+        rng = random.Random(11)
+        timings = {}
+        print('\n    events |  records | remove_duplicates')
+        for events in [2500, 5000, 10000]:
+            feed = self.synthetic_feed(events, rng)
+            started = time.perf_counter()
+            unique = HackathonFeedService.remove_duplicates(feed)
+            timings[events] = time.perf_counter() - started
+            print(f'  {events:>8} | {len(feed):>8} | {timings[events] * 1000:8.1f} ms')
+            self.assertEqual(len(unique), events)
+
+        # Quadrupling the feed should cost roughly four times as much, not sixteen
+        self.assertLess(timings[10000], timings[2500] * 8)
+        self.assertLess(timings[10000], 5.0)
+
+
+class JobFeedTests(TestCase):
+
+    def setUp(self):
+        self.mentor = User.objects.create_user('mentor', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.mentor)
+
+    def post_job(self, title):
+        return Announcement.objects.create(
+            mentor=self.mentor, title=title, description='Apply now', category='job'
+        )
+
+    def test_announcement_change_invalidates_snapshot(self):
+        self.post_job('Backend Intern')
+        first = self.client.get('/api/hackathons/jobs/')
+        self.assertEqual(self.client.get('/api/hackathons/jobs/', HTTP_IF_NONE_MATCH=first['ETag']).status_code, 304)
+
+        self.post_job('Frontend Intern')
+        self.assertTrue(FeedSnapshot.objects.get(feed='jobs').is_stale)
+
+        second = self.client.get('/api/hackathons/jobs/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json()['count'], 2)
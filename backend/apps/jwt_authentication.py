@@ -0,0 +1,138 @@
+"""
+Claims-hydrated JWT authentication
+
+EmailTokenObtainPairSerializer signs the user's account fields and profile
+(role, campus, floor, profile id, assigned mentor) into every token.
+ClaimsJWTAuthentication builds request.user and request.user.profile from
+those claims instead of loading them, so authenticating costs no queries.
+The instances are real User / UserProfile rows with the remaining fields
+deferred: reading one (password, leetcode_id, ...) loads it, and save()
+only writes the loaded fields.
+
+Claims go stale when a role, floor or account changes. The fingerprint of a
+token's claims is compared with the fingerprint of the user's current rows,
+which is cached per user for JWT_CLAIMS_CHECK_TTL seconds in the
+JWT_CLAIMS_CACHE cache and dropped whenever the user or profile is saved
+(bulk .update() calls are covered by the TTL). A token whose claims no
+longer match is authenticated like simplejwt's JWTAuthentication, by
+loading the user. Refreshing a token re-reads its claims.
+
+With a shared cache (Redis) a save reaches every worker at once. With the
+in-process fallback it only clears the worker that handled it, so another
+worker may accept a deactivated student's token for up to
+JWT_CLAIMS_CHECK_TTL seconds. Tokens carrying privileges (staff, superuser
+or any role but STUDENT) are never taken from claims, so a demotion or
+role change always applies on the next request.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import router
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+# Token claim holding the hydrated fields
+CLAIMS_CLAIM = 'cs'
+
+
+class UserClaims:
+    """Build, fingerprint and hydrate the user claims carried by tokens"""
+
+    USER_FIELDS = ['id', 'username', 'email', 'first_name', 'last_name', 'is_staff', 'is_superuser', 'is_active']
+    PROFILE_FIELDS = ['id', 'user_id', 'role', 'campus', 'floor', 'assigned_mentor_id']
+
+    # Claims of a user without privileges; anything else is checked against the database
+    UNPRIVILEGED_ROLE = 'STUDENT'
+
+    @staticmethod
+    def for_user(user):
+        """Claims of a user and its profile; None for a user without a profile"""
+        try:
+            profile = user.profile
+        except User.profile.RelatedObjectDoesNotExist:
+            profile = None
+        return {
+            'user': {field: getattr(user, field) for field in UserClaims.USER_FIELDS},
+            'profile': {field: getattr(profile, field) for field in UserClaims.PROFILE_FIELDS} if profile else None,
+        }
+
+    @staticmethod
+    def privileged(claims):
+        """Whether the claims grant more than a plain student account"""
+        user, profile = claims['user'], claims['profile']
+        return bool(
+            user.get('is_staff') or user.get('is_superuser')
+            or (profile is not None and profile.get('role') != UserClaims.UNPRIVILEGED_ROLE)
+        )
+
+    @staticmethod
+    def fingerprint(claims):
+        return hashlib.sha1(json.dumps(claims, sort_keys=True).encode()).hexdigest()[:20]
+
+    @staticmethod
+    def cache():
+        return caches[settings.JWT_CLAIMS_CACHE]
+
+    @staticmethod
+    def cache_key(user_id):
+        return f'jwt-claims:{user_id}'
+
+    @staticmethod
+    def current_fingerprint(user_id):
+        """Fingerprint of the user's rows as stored now; '' for a missing user"""
+        key = UserClaims.cache_key(user_id)
+        fingerprint = UserClaims.cache().get(key)
+        if fingerprint is None:
+            user = User.objects.select_related('profile').filter(id=user_id).first()
+            fingerprint = UserClaims.fingerprint(UserClaims.for_user(user)) if user else ''
+            UserClaims.cache().set(key, fingerprint, settings.JWT_CLAIMS_CHECK_TTL)
+        return fingerprint
+
+    @staticmethod
+    def invalidate(*user_ids):
+        """Make the next request of these users re-check their claims against the database"""
+        UserClaims.cache().delete_many([UserClaims.cache_key(user_id) for user_id in user_ids])
+
+    @staticmethod
+    def hydrate(claims):
+        """User with its profile cached, built from claims without queries"""
+        from apps.profiles.models import UserProfile
+
+        def build(model, fields, values):
+            # Fields missing from the claims are deferred and load on access
+            names = [f.attname for f in model._meta.concrete_fields if f.attname in fields]
+            return model.from_db(router.db_for_read(model), names, [values[name] for name in names])
+
+        user = build(User, UserClaims.USER_FIELDS, claims['user'])
+        profile = None
+        if claims['profile'] is not None:
+            profile = build(UserProfile, UserClaims.PROFILE_FIELDS, claims['profile'])
+            UserProfile.user.field.set_cached_value(profile, user)
+        User.profile.related.set_cached_value(user, profile)
+        return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that takes the user from the token's claims
+    Loads the user instead for tokens without claims, with stale or
+    privileged ones, with JWT_CLAIMS_AUTH off, and when simplejwt's
+    CHECK_REVOKE_TOKEN is on
+    """
+
+    def get_user(self, validated_token):
+        claims = validated_token.get(CLAIMS_CLAIM)
+        if not settings.JWT_CLAIMS_AUTH or not claims or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if claims['user'].get('id') != user_id or not claims['user'].get('is_active'):
+            return super().get_user(validated_token)
+        if UserClaims.privileged(claims):
+            return super().get_user(validated_token)
+        if UserClaims.fingerprint(claims) != UserClaims.current_fingerprint(user_id):
+            return super().get_user(validated_token)
+        return UserClaims.hydrate(claims)
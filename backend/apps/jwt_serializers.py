@@ -1,6 +1,9 @@
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
+from .jwt_authentication import CLAIMS_CLAIM, UserClaims
 
 
 class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
@@ -9,6 +12,13 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     username_field = 'username'  # This will accept the field name as 'username' but can contain email
     
+    @classmethod
+    def get_token(cls, user):
+        """Token signed with the user's account and profile claims (see ClaimsJWTAuthentication)"""
+        token = super().get_token(user)
+        token[CLAIMS_CLAIM] = UserClaims.for_user(user)
+        return token
+    
     def validate(self, attrs):
         # Get the username field (which might contain email)
         username_or_email = attrs.get('username')
@@ -61,3 +71,23 @@ class EmailTokenObtainPairSerializer(TokenObtainPairSerializer):
         }
         
         return data
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh serializer re-reading the user's claims, so a refreshed access
+    token carries the current role, campus and floor
+    """
+    
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        user_id = self.token_class(attrs['refresh'])[api_settings.USER_ID_CLAIM]
+        user = User.objects.select_related('profile').filter(id=user_id, is_active=True).first()
+        if user is None:
+            from rest_framework_simplejwt.exceptions import AuthenticationFailed
+            raise AuthenticationFailed('No active account found for this token')
+        
+        access = AccessToken(data['access'])
+        access[CLAIMS_CLAIM] = UserClaims.for_user(user)
+        data['access'] = str(access)
+        return data
@@ -20,6 +20,7 @@ urlpatterns = [
     
     # Submission review
     path('review/', mentor_views.review_submission, name='review-submission'),
+    path('review/bulk/', mentor_views.bulk_review_submissions, name='bulk-review-submissions'),
     
     # Submission detail
     path('submission/<str:pillar>/<str:submission_type>/<int:submission_id>/', 
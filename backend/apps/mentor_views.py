@@ -3,9 +3,13 @@ Mentor-specific views for reviewing student submissions across all pillars
 This file consolidates mentor review APIs for: CFC, CLT, SRI, IIPC, SCD
 """
 
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Q, Count, Case, When, Value, IntegerField
+from django.db import transaction
+from django.db.models import F, Q, Count, Case, When, Value, IntegerField
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -24,7 +28,10 @@ from apps.iipc.models import LinkedInPostVerification
 from apps.iipc.serializers import LinkedInPostVerificationSerializer
 from apps.scd.models import LeetCodeProfile
 from apps.scd.serializers import LeetCodeProfileSerializer
-from apps.dashboard.models import Notification, Message, MessageThread
+from apps.dashboard.models import Notification, Message, MessageThread, SubmissionIndex
+from apps.dashboard.reviews import SubmissionReviewService
+from apps.dashboard.search import SearchService
+from apps.dashboard.unread import UnreadCounterService
 from apps.dashboard.notifications_serializers import (
     NotificationSerializer, MessageSerializer, MessageThreadSerializer, MessageCreateSerializer
 )
@@ -88,62 +95,43 @@ def get_mentor_dashboard(request):
             'created_at': sub.created_at,
         }
     
-    # Get submissions from each pillar (only assigned students)
-    hackathons = HackathonSubmission.objects.filter(user_id__in=assigned_students).select_related('user')
-    for sub in hackathons:
-        recent_submissions.append(add_submission(sub, 'cfc', 'hackathon', lambda s: s.hackathon_name))
-    
-    bmc_videos = BMCVideoSubmission.objects.filter(user_id__in=assigned_students).select_related('user')
-    for sub in bmc_videos:
-        recent_submissions.append(add_submission(sub, 'cfc', 'bmc', lambda s: "BMC Video Submission"))
-    
-    internships = InternshipSubmission.objects.filter(user_id__in=assigned_students).select_related('user')
-    for sub in internships:
-        recent_submissions.append(add_submission(sub, 'cfc', 'internship', lambda s: f"Internship at {s.company}"))
-    
-    genai = GenAIProjectSubmission.objects.filter(user_id__in=assigned_students).select_related('user')
-    for sub in genai:
-        recent_submissions.append(add_submission(sub, 'cfc', 'genai', lambda s: "GenAI Project"))
-    
-    clt = CLTSubmission.objects.filter(user_id__in=assigned_students).select_related('user')
-    for sub in clt:
-        recent_submissions.append(add_submission(sub, 'clt', 'clt', lambda s: s.title))
-    
-    linkedin = LinkedInPostVerification.objects.filter(user_id__in=assigned_students).select_related('user')
-    for sub in linkedin:
-        recent_submissions.append(add_submission(sub, 'iipc', 'linkedin', lambda s: "LinkedIn Post"))
+    # Get submissions from each pillar (only assigned students):
+    # the 20 most recent of each model and one aggregate per model
+    today = timezone.now().date()
+    pending_statuses = ['draft', 'submitted', 'under_review', 'pending']
+    sources = [
+        (HackathonSubmission, 'cfc', 'hackathon', lambda s: s.hackathon_name),
+        (BMCVideoSubmission, 'cfc', 'bmc', lambda s: "BMC Video Submission"),
+        (InternshipSubmission, 'cfc', 'internship', lambda s: f"Internship at {s.company}"),
+        (GenAIProjectSubmission, 'cfc', 'genai', lambda s: "GenAI Project"),
+        (CLTSubmission, 'clt', 'clt', lambda s: s.title),
+        (LinkedInPostVerification, 'iipc', 'linkedin', lambda s: "LinkedIn Post"),
+    ]
+    
+    total_submissions = pending_reviews = approved_today = 0
+    for model_class, pillar_type, model_type, title_getter in sources:
+        submissions = model_class.objects.filter(user_id__in=assigned_students)
+        recent = (
+            submissions.select_related('user')
+            .annotate(sort_at=Coalesce('submitted_at', 'created_at'))
+            .order_by('-sort_at')[:20]
+        )
+        for sub in recent:
+            recent_submissions.append(add_submission(sub, pillar_type, model_type, title_getter))
+        
+        counts = submissions.aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status__in=pending_statuses)),
+            approved_today=Count('id', filter=Q(status='approved', reviewed_at__date=today)),
+        )
+        total_submissions += counts['total']
+        pending_reviews += counts['pending']
+        approved_today += counts['approved_today']
     
     # Sort by submission date (most recent first) and limit to 20
     recent_submissions.sort(key=lambda x: x['submitted_at'], reverse=True)
     recent_submissions = recent_submissions[:20]
     
-    # Calculate stats
-    today = timezone.now().date()
-    pending_statuses = ['draft', 'submitted', 'under_review', 'pending']
-    
-    total_submissions = (
-        hackathons.count() + bmc_videos.count() + internships.count() + 
-        genai.count() + clt.count() + linkedin.count()
-    )
-    
-    pending_reviews = (
-        hackathons.filter(status__in=pending_statuses).count() +
-        bmc_videos.filter(status__in=pending_statuses).count() +
-        internships.filter(status__in=pending_statuses).count() +
-        genai.filter(status__in=pending_statuses).count() +
-        clt.filter(status__in=pending_statuses).count() +
-        linkedin.filter(status__in=pending_statuses).count()
-    )
-    
-    approved_today = (
-        hackathons.filter(status='approved', reviewed_at__date=today).count() +
-        bmc_videos.filter(status='approved', reviewed_at__date=today).count() +
-        internships.filter(status='approved', reviewed_at__date=today).count() +
-        genai.filter(status='approved', reviewed_at__date=today).count() +
-        clt.filter(status='approved', reviewed_at__date=today).count() +
-        linkedin.filter(status='verified', verified_at__date=today).count()
-    )
-    
     return Response({
         'recent_submissions': recent_submissions,
         'stats': {
@@ -155,11 +143,30 @@ def get_mentor_dashboard(request):
     })
 
 
+SUBMISSIONS_PAGE_SIZE = 50
+SUBMISSIONS_MAX_PAGE_SIZE = 200
+
+
+def _submission_cursor(row):
+    return f"{row.submitted_at.isoformat()}|{row.id}"
+
+
+def _parse_submission_cursor(cursor):
+    """(submitted_at, id) from an `after` cursor, or None if malformed"""
+    try:
+        submitted_at, row_id = cursor.rsplit('|', 1)
+        parsed = parse_datetime(submitted_at)
+        return (parsed, int(row_id)) if parsed else None
+    except (AttributeError, ValueError):
+        return None
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_pillar_submissions(request, pillar):
     """
-    Get all submissions for a specific pillar for mentor review
+    Get submissions for a specific pillar for mentor review
+    Served from SubmissionIndex in one keyset-paginated query
     
     Pillars: cfc, clt, iipc, scd, all (sri not implemented yet)
     Query params:
@@ -167,6 +174,10 @@ def get_pillar_submissions(request, pillar):
         - search: search by student name or title
         - year: filter by student year
         - sort: latest or oldest
+        - student_id: only this assigned student's submissions
+        - limit: page size (default 50, max 200)
+        - after: next_cursor from the previous page
+    Without limit or after the whole queue is returned, as the review pages expect
     """
     # Check if user is mentor
     if not is_mentor(request.user):
@@ -178,246 +189,87 @@ def get_pillar_submissions(request, pillar):
     # Get query parameters
     status_filter = request.GET.get('status', 'all')
     search_query = request.GET.get('search', '')
-    year_filter = request.GET.get('year', 'all')
     sort_order = request.GET.get('sort', 'latest')
-    student_id = request.GET.get('student_id', None)  # NEW: Filter by specific student
+    student_id = request.GET.get('student_id', None)  # Filter by specific student
     
-    submissions = []
-    
-    # Map status filters
-    status_map = {
-        'pending': ['draft', 'submitted', 'under_review', 'pending'],
-        'approved': ['approved'],
-        'rejected': ['rejected'],
-        'all': None
-    }
-    
-    status_values = status_map.get(status_filter, None)
-    
-    print(f"\n=== BACKEND: Fetching submissions for pillar='{pillar}', status='{status_filter}', student_id='{student_id}' ===")
+    if 'limit' not in request.GET and 'after' not in request.GET:
+        limit = None
+    else:
+        try:
+            limit = min(max(int(request.GET.get('limit', SUBMISSIONS_PAGE_SIZE)), 1), SUBMISSIONS_MAX_PAGE_SIZE)
+        except (TypeError, ValueError):
+            limit = SUBMISSIONS_PAGE_SIZE
     
-    # Get mentor's assigned students
-    assigned_students = request.user.mentored_students.all().values_list('user_id', flat=True)
-    if not assigned_students:
-        print(f"⚠️ Mentor {request.user.username} has no assigned students")
-        return Response({'submissions': [], 'total': 0})
+    # Only submissions from the mentor's assigned students
+    rows = SubmissionIndex.objects.filter(
+        student__profile__assigned_mentor=request.user
+    ).select_related('student')
     
-    # If student_id is provided, only show that student's submissions
     if student_id:
         try:
-            student_id = int(student_id)
-            if student_id not in assigned_students:
-                print(f"⚠️ Student {student_id} is not assigned to mentor {request.user.username}")
-                return Response({'submissions': [], 'total': 0})
-            assigned_students = [student_id]
-            print(f"🎯 Filtering for specific student: {student_id}")
+            rows = rows.filter(student_id=int(student_id))
         except (ValueError, TypeError):
             pass
     
-    print(f"👥 Showing submissions for {len(assigned_students)} student(s)")
-    
-    # Helper function to format submission data
-    def format_submission(sub, pillar_type, model_type):
-        # Get user profile info
-        user_profile = {
-            'name': sub.user.get_full_name() or sub.user.username,
-            'avatar': sub.user.first_name[0].upper() if sub.user.first_name else sub.user.username[0].upper(),
-            'email': sub.user.email,
-            'username': sub.user.username,
-        }
-        
-        # Map status to frontend format - ensure we're checking the ACTUAL database status
-        actual_status = sub.status  # Get the actual status from DB
-        if actual_status in ['draft', 'submitted', 'under_review', 'pending']:
-            frontend_status = 'pending'
-        elif actual_status == 'approved':
-            frontend_status = 'approved'
-        elif actual_status == 'rejected':
-            frontend_status = 'rejected'
-        else:
-            frontend_status = 'pending'
-        
-        print(f"   📊 {model_type} #{sub.id}: DB status='{actual_status}' → frontend='{frontend_status}'")
-        
-        # Get title based on model type
-        title = ''
-        description = ''
-        if model_type == 'hackathon':
-            title = sub.hackathon_name
-            description = f"{sub.mode.title()} hackathon participation"
-        elif model_type == 'bmc':
-            title = "Business Model Canvas Video"
-            description = sub.description or "BMC video submission"
-        elif model_type == 'internship':
-            title = f"Internship at {sub.company}"
-            description = sub.role
-        elif model_type == 'genai':
-            title = "GenAI Project"
-            description = sub.problem_statement[:100] if len(sub.problem_statement) > 100 else sub.problem_statement
-        elif model_type == 'clt':
-            title = sub.title
-            description = sub.description
-        elif model_type == 'linkedin':
-            title = "LinkedIn Post Verification"
-            description = f"Post from {sub.post_date}"
-        elif model_type == 'leetcode':
-            title = f"LeetCode Profile - {sub.leetcode_username}"
-            description = f"Total solved: {sub.total_solved}"
-        
-        # Count evidence and get primary evidence URL
-        evidence_count = {'images': 0, 'links': 0}
-        evidence_url = None
-        
-        # Determine primary evidence URL based on submission type
-        if hasattr(sub, 'certificate_link') and sub.certificate_link:
-            evidence_count['links'] += 1
-            if not evidence_url:
-                evidence_url = sub.certificate_link
-        if hasattr(sub, 'drive_link') and sub.drive_link:
-            evidence_count['links'] += 1
-            if not evidence_url:
-                evidence_url = sub.drive_link
-        if hasattr(sub, 'github_repo') and sub.github_repo:
-            evidence_count['links'] += 1
-            if not evidence_url:
-                evidence_url = sub.github_repo
-        if hasattr(sub, 'video_url') and sub.video_url:
-            evidence_count['links'] += 1
-            if not evidence_url:
-                evidence_url = sub.video_url
-        if hasattr(sub, 'post_url') and sub.post_url:
-            evidence_count['links'] += 1
-            if not evidence_url:
-                evidence_url = sub.post_url
-        if hasattr(sub, 'screenshot_url') and sub.screenshot_url:
-            evidence_count['links'] += 1
-            if not evidence_url:
-                evidence_url = sub.screenshot_url
-        if hasattr(sub, 'profile_url') and sub.profile_url:
-            evidence_count['links'] += 1
-            if not evidence_url:
-                evidence_url = sub.profile_url
-        
-        return {
-            'id': f"{pillar_type}_{model_type}_{sub.id}",  # Unique composite key
-            'dbId': sub.id,  # Original DB ID for updates
-            'modelType': model_type,  # For backend operations
-            'student': user_profile,
-            'title': title,
-            'description': description,
-            'submittedDate': sub.submitted_at.date() if sub.submitted_at else sub.created_at.date(),
-            'status': frontend_status,
-            'pillar': pillar_type,
-            'evidenceLinks': evidence_count,
-            'evidence': evidence_url,  # Add the actual evidence URL
-            'reviewerComments': getattr(sub, 'reviewer_comments', None) or getattr(sub, 'review_comments', '') or '',
-            'reviewedAt': getattr(sub, 'reviewed_at', None),
-        }
-    
-    # Get submissions based on pillar - FIXED: Use if-elif-else for proper isolation
-    # FILTER BY ASSIGNED STUDENTS ONLY
-    if pillar == 'all':
-        # Get ALL submissions from all pillars (only from assigned students)
-        cfc_qs = HackathonSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        bmc_qs = BMCVideoSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        internship_qs = InternshipSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        genai_qs = GenAIProjectSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        
-        if status_values:
-            cfc_qs = cfc_qs.filter(status__in=status_values)
-            bmc_qs = bmc_qs.filter(status__in=status_values)
-            internship_qs = internship_qs.filter(status__in=status_values)
-            genai_qs = genai_qs.filter(status__in=status_values)
-        
-        submissions.extend([format_submission(s, 'cfc', 'hackathon') for s in cfc_qs])
-        submissions.extend([format_submission(s, 'cfc', 'bmc') for s in bmc_qs])
-        submissions.extend([format_submission(s, 'cfc', 'internship') for s in internship_qs])
-        submissions.extend([format_submission(s, 'cfc', 'genai') for s in genai_qs])
-        
-        clt_qs = CLTSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        if status_values:
-            clt_qs = clt_qs.filter(status__in=status_values)
-        submissions.extend([format_submission(s, 'clt', 'clt') for s in clt_qs])
-        
-        iipc_qs = LinkedInPostVerification.objects.select_related('user').filter(user_id__in=assigned_students)
-        if status_values:
-            iipc_qs = iipc_qs.filter(status__in=status_values)
-        submissions.extend([format_submission(s, 'iipc', 'linkedin') for s in iipc_qs])
-        
-        scd_qs = LeetCodeProfile.objects.select_related('user').filter(user_id__in=assigned_students)
-        if status_values:
-            scd_qs = scd_qs.filter(status__in=status_values)
-        submissions.extend([format_submission(s, 'scd', 'leetcode') for s in scd_qs])
-    
-    elif pillar == 'cfc':
-        # Get ONLY CFC submissions (from assigned students)
-        cfc_qs = HackathonSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        bmc_qs = BMCVideoSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        internship_qs = InternshipSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        genai_qs = GenAIProjectSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        
-        if status_values:
-            cfc_qs = cfc_qs.filter(status__in=status_values)
-            bmc_qs = bmc_qs.filter(status__in=status_values)
-            internship_qs = internship_qs.filter(status__in=status_values)
-            genai_qs = genai_qs.filter(status__in=status_values)
-        
-        submissions.extend([format_submission(s, 'cfc', 'hackathon') for s in cfc_qs])
-        submissions.extend([format_submission(s, 'cfc', 'bmc') for s in bmc_qs])
-        submissions.extend([format_submission(s, 'cfc', 'internship') for s in internship_qs])
-        submissions.extend([format_submission(s, 'cfc', 'genai') for s in genai_qs])
-    
-    elif pillar == 'clt':
-        # Get ONLY CLT submissions (from assigned students)
-        clt_qs = CLTSubmission.objects.select_related('user').filter(user_id__in=assigned_students)
-        if status_values:
-            clt_qs = clt_qs.filter(status__in=status_values)
-        submissions.extend([format_submission(s, 'clt', 'clt') for s in clt_qs])
-    
-    elif pillar == 'iipc':
-        # Get ONLY IIPC submissions (from assigned students)
-        iipc_qs = LinkedInPostVerification.objects.select_related('user').filter(user_id__in=assigned_students)
-        if status_values:
-            iipc_qs = iipc_qs.filter(status__in=status_values)
-        submissions.extend([format_submission(s, 'iipc', 'linkedin') for s in iipc_qs])
-    
-    elif pillar == 'scd':
-        # Get ONLY SCD submissions (from assigned students)
-        scd_qs = LeetCodeProfile.objects.select_related('user').filter(user_id__in=assigned_students)
-        if status_values:
-            scd_qs = scd_qs.filter(status__in=status_values)
-        submissions.extend([format_submission(s, 'scd', 'leetcode') for s in scd_qs])
+    if pillar != 'all':
+        rows = rows.filter(pillar=pillar)
     
-    # SRI not implemented yet
+    if status_filter in ('pending', 'approved', 'rejected'):
+        rows = rows.filter(status=status_filter)
     
     # Apply search filter
     if search_query:
-        search_lower = search_query.lower()
-        submissions = [
-            s for s in submissions 
-            if search_lower in s['student']['name'].lower() 
-            or search_lower in s['title'].lower()
-            or search_lower in s['description'].lower()
-        ]
+        rows = SearchService.search_submissions(rows, search_query)
+    
+    total = rows.count()
     
-    # Sort submissions
+    # Keyset pagination on (submitted_at, id)
+    cursor = _parse_submission_cursor(request.GET.get('after'))
     if sort_order == 'latest':
-        submissions.sort(key=lambda x: x['submittedDate'], reverse=True)
+        if cursor:
+            rows = rows.filter(
+                Q(submitted_at__lt=cursor[0]) | Q(submitted_at=cursor[0], id__lt=cursor[1])
+            )
+        rows = rows.order_by('-submitted_at', '-id')
     else:
-        submissions.sort(key=lambda x: x['submittedDate'])
+        if cursor:
+            rows = rows.filter(
+                Q(submitted_at__gt=cursor[0]) | Q(submitted_at=cursor[0], id__gt=cursor[1])
+            )
+        rows = rows.order_by('submitted_at', 'id')
     
-    # Debug logging
-    print(f"\n=== BACKEND: Returning {len(submissions)} submissions for pillar '{pillar}' ===")
-    if submissions:
-        pillar_counts = {}
-        for s in submissions:
-            p = s['pillar']
-            pillar_counts[p] = pillar_counts.get(p, 0) + 1
-        print(f"Pillar breakdown: {pillar_counts}")
+    page = list(rows if limit is None else rows[:limit + 1])
+    has_more = limit is not None and len(page) > limit
+    page = page[:limit]
+    
+    submissions = []
+    for row in page:
+        student = row.student
+        submissions.append({
+            'id': f"{row.pillar}_{row.model_type}_{row.object_id}",  # Unique composite key
+            'dbId': row.object_id,  # Original DB ID for updates
+            'modelType': row.model_type,  # For backend operations
+            'student': {
+                'name': student.get_full_name() or student.username,
+                'avatar': student.first_name[0].upper() if student.first_name else student.username[0].upper(),
+                'email': student.email,
+                'username': student.username,
+            },
+            'title': row.title,
+            'description': row.description,
+            'submittedDate': row.submitted_at.date(),
+            'status': row.status,
+            'pillar': row.pillar,
+            'evidenceLinks': {'images': 0, 'links': row.evidence_links},
+            'evidence': row.evidence_url or None,
+            'reviewerComments': row.reviewer_comments,
+            'reviewedAt': row.reviewed_at,
+        })
     
     return Response({
         'submissions': submissions,
-        'total': len(submissions)
+        'total': total,
+        'next_cursor': _submission_cursor(page[-1]) if has_more else None,
     })
 
 
@@ -507,118 +359,73 @@ def review_submission(request):
     action = request.data.get('action')  # 'approve', 'reject', or 'resubmit'
     comment = request.data.get('comment', '')
     
-    if not all([pillar, submission_id, submission_type, action]):
+    if not pillar:
         return Response(
             {"error": "Missing required fields"},
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    if action in ['reject', 'resubmit'] and not comment:
+    results, tasks = SubmissionReviewService.review_many(request.user, [{
+        'pillar': pillar,
+        'submission_id': submission_id,
+        'submission_type': submission_type,
+        'action': action,
+        'comment': comment,
+    }])
+    result = results[0]
+    
+    if not result['ok']:
         return Response(
-            {"error": "Comment is required for rejection or resubmission request"},
-            status=status.HTTP_400_BAD_REQUEST
+            {"error": result['error']},
+            status=status.HTTP_404_NOT_FOUND if result['code'] == 'not_found' else status.HTTP_400_BAD_REQUEST
         )
     
-    # Get the submission model based on type
-    model_map = {
-        'hackathon': HackathonSubmission,
-        'bmc': BMCVideoSubmission,
-        'internship': InternshipSubmission,
-        'genai': GenAIProjectSubmission,
-        'clt': CLTSubmission,
-        'linkedin': LinkedInPostVerification,
-        'leetcode': LeetCodeProfile,
-    }
+    return Response({
+        'message': f'Submission {action}ed successfully',
+        'submission_id': submission_id,
+        'status': result['status'],
+        'task_ids': [task.id for task in tasks]
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_review_submissions(request):
+    """
+    Review many submissions in one request
+    All reviews are written in one transaction; invalid or missing items are
+    reported per item and do not block the others. Notifications and score
+    updates are queued in the outbox (task_ids)
     
-    model_class = model_map.get(submission_type)
-    if not model_class:
+    Body:
+        - reviews: list of {submission_type, submission_id, action, comment, pillar (optional)}
+    """
+    if not is_mentor(request.user):
         return Response(
-            {"error": "Invalid submission type"},
-            status=status.HTTP_400_BAD_REQUEST
+            {"error": "You don't have permission to access this resource"},
+            status=status.HTTP_403_FORBIDDEN
         )
     
-    try:
-        submission = model_class.objects.get(id=submission_id)
-    except model_class.DoesNotExist:
+    reviews = request.data.get('reviews')
+    if not isinstance(reviews, list) or not reviews:
         return Response(
-            {"error": "Submission not found"},
-            status=status.HTTP_404_NOT_FOUND
+            {"error": "reviews must be a non-empty list"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(reviews) > SubmissionReviewService.MAX_ITEMS:
+        return Response(
+            {"error": f"At most {SubmissionReviewService.MAX_ITEMS} reviews per request"},
+            status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Map action to status
-    status_map = {
-        'approve': 'approved',
-        'reject': 'rejected',
-        'resubmit': 'under_review'  # or 'resubmit' if model supports it
-    }
-    
-    # Update submission
-    new_status = status_map.get(action, 'under_review')
-    print(f"\n🔄 REVIEW: Updating {submission_type} submission #{submission_id}")
-    print(f"   Old status: {submission.status}")
-    print(f"   New status: {new_status}")
-    print(f"   Action: {action}")
-    
-    submission.status = new_status
-    
-    # Handle different field names for comments
-    if hasattr(submission, 'reviewer_comments'):
-        submission.reviewer_comments = comment
-    elif hasattr(submission, 'review_comments'):
-        submission.review_comments = comment
-    
-    # Handle different field names for reviewer
-    if hasattr(submission, 'reviewed_by'):
-        submission.reviewed_by = request.user
-    elif hasattr(submission, 'reviewer'):
-        submission.reviewer = request.user
-    
-    if hasattr(submission, 'reviewed_at'):
-        submission.reviewed_at = timezone.now()
-    
-    submission.save()
-    
-    # Verify the save
-    submission.refresh_from_db()
-    print(f"   ✅ Status after save: {submission.status}")
-    
-    # Create notification for student
-    notification_type_map = {
-        'approve': 'submission_approved',
-        'reject': 'submission_rejected',
-        'resubmit': 'submission_resubmit'
-    }
-    
-    title_map = {
-        'approve': f'✅ Submission Approved - {pillar.upper()}',
-        'reject': f'❌ Submission Rejected - {pillar.upper()}',
-        'resubmit': f'🔄 Resubmission Requested - {pillar.upper()}'
-    }
-    
-    message_map = {
-        'approve': f'Your {submission_type} submission has been approved by your mentor!',
-        'reject': f'Your {submission_type} submission needs revision. Please review the feedback.',
-        'resubmit': f'Your mentor has requested a resubmission for your {submission_type}.'
-    }
-    
-    notification = Notification.objects.create(
-        recipient=submission.user,
-        sender=request.user,
-        notification_type=notification_type_map.get(action, 'general'),
-        priority='high' if action == 'reject' else 'normal',
-        title=title_map.get(action, 'Submission Updated'),
-        message=f"{message_map.get(action, 'Your submission has been reviewed.')} {comment}",
-        related_pillar=pillar,
-        related_submission_type=submission_type,
-        related_submission_id=submission_id,
-        action_url=f"/{pillar}"
-    )
+    results, tasks = SubmissionReviewService.review_many(request.user, reviews)
+    reviewed = sum(1 for result in results if result['ok'])
     
     return Response({
-        'message': f'Submission {action}ed successfully',
-        'submission_id': submission_id,
-        'status': submission.status,
-        'notification_id': notification.id
+        'results': results,
+        'reviewed': reviewed,
+        'failed': len(results) - reviewed,
+        'task_ids': [task.id for task in tasks],
     })
 
 
@@ -839,7 +646,7 @@ def get_notifications(request):
     
     return Response({
         'notifications': serializer.data,
-        'unread_count': Notification.objects.filter(recipient=request.user, is_read=False).count(),
+        'unread_count': UnreadCounterService.get(request.user).notifications,
         'total': notifications.count()
     })
 
@@ -870,6 +677,7 @@ def mark_all_notifications_read(request):
         is_read=True,
         read_at=timezone.now()
     )
+    UnreadCounterService.adjust(request.user.id, notifications=-updated)
     
     return Response({
         'message': f'{updated} notifications marked as read',
@@ -894,6 +702,10 @@ def delete_notification(request, notification_id):
 
 # ============= MESSAGING ENDPOINTS =============
 
+MESSAGES_PAGE_SIZE = 50
+MESSAGES_MAX_PAGE_SIZE = 200
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_message_threads(request):
@@ -914,57 +726,58 @@ def get_message_threads(request):
 @permission_classes([IsAuthenticated])
 def get_thread_messages(request, user_id):
     """
-    Get all messages in a thread with a specific user
+    Get messages in the thread with a specific user, newest first
     Query params:
-        - limit: number of messages to return (default: 50)
-        - offset: offset for pagination (default: 0)
+        - limit: number of messages to return (default: 50, max 200)
+        - before: next_cursor from the previous page (a message id)
     """
-    limit = int(request.GET.get('limit', 50))
-    offset = int(request.GET.get('offset', 0))
-    
     try:
-        other_user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
+        limit = min(max(int(request.GET.get('limit', MESSAGES_PAGE_SIZE)), 1), MESSAGES_MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = MESSAGES_PAGE_SIZE
+    
+    if not User.objects.filter(id=user_id).exists():
         return Response(
             {'error': 'User not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    # Get or create thread
-    thread = MessageThread.objects.filter(
-        (Q(participant1=request.user) & Q(participant2=other_user)) |
-        (Q(participant1=other_user) & Q(participant2=request.user))
-    ).first()
-    
-    if not thread:
-        # Create new thread
-        thread = MessageThread.objects.create(
-            participant1=request.user,
-            participant2=other_user
-        )
+    thread = MessageThread.for_users(request.user, user_id)
     
-    # Get messages
-    messages = Message.objects.filter(
-        (Q(sender=request.user) & Q(recipient=other_user)) |
-        (Q(sender=other_user) & Q(recipient=request.user))
-    ).order_by('-created_at')[offset:offset+limit]
+    # Keyset pagination on the (thread, created_at, id) index
+    messages = thread.messages.select_related('sender', 'recipient').order_by('-created_at', '-id')
+    before = request.GET.get('before')
+    if before:
+        cursor = thread.messages.filter(id=before).values('id', 'created_at').first() if before.isdigit() else None
+        if cursor is None:
+            return Response(
+                {'error': 'Invalid cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        messages = messages.filter(
+            Q(created_at__lt=cursor['created_at']) | Q(created_at=cursor['created_at'], id__lt=cursor['id'])
+        )
     
-    # Mark messages as read
-    Message.objects.filter(
-        sender=other_user,
-        recipient=request.user,
-        is_read=False
-    ).update(is_read=True, read_at=timezone.now(), status='read')
+    page = list(messages[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
     
-    # Reset unread count for current user
-    thread.reset_unread(request.user)
+    # Opening the latest page reads the thread; skip the writes when nothing is unread
+    if not before and thread.get_unread_count(request.user):
+        read = thread.messages.filter(
+            recipient=request.user,
+            is_read=False
+        ).update(is_read=True, read_at=timezone.now(), status='read')
+        thread.reset_unread(request.user)
+        UnreadCounterService.adjust(request.user.id, messages=-read)
     
-    serializer = MessageSerializer(messages, many=True)
+    serializer = MessageSerializer(page, many=True)
     
     return Response({
         'messages': serializer.data,
         'thread_id': thread.id,
-        'total': messages.count()
+        'total': len(page),
+        'next_cursor': page[-1].id if has_more else None,
     })
 
 
@@ -993,35 +806,29 @@ def send_message(request):
     data = serializer.validated_data
     recipient = User.objects.get(id=data['recipient_id'])
     
-    # Create message
-    message = Message.objects.create(
-        sender=request.user,
-        recipient=recipient,
-        subject=data.get('subject', ''),
-        message=data['message'],
-        related_pillar=data.get('related_pillar'),
-        related_submission_type=data.get('related_submission_type'),
-        related_submission_id=data.get('related_submission_id'),
-        parent_message=Message.objects.get(id=data['parent_message_id']) if data.get('parent_message_id') else None
-    )
-    
-    # Get or create thread
-    thread = MessageThread.objects.filter(
-        (Q(participant1=request.user) & Q(participant2=recipient)) |
-        (Q(participant1=recipient) & Q(participant2=request.user))
-    ).first()
-    
-    if not thread:
-        thread = MessageThread.objects.create(
-            participant1=request.user,
-            participant2=recipient
+    with transaction.atomic():
+        thread = MessageThread.for_users(request.user, recipient)
+        
+        message = Message.objects.create(
+            thread=thread,
+            sender=request.user,
+            recipient=recipient,
+            subject=data.get('subject', ''),
+            message=data['message'],
+            related_pillar=data.get('related_pillar'),
+            related_submission_type=data.get('related_submission_type'),
+            related_submission_id=data.get('related_submission_id'),
+            parent_message_id=data.get('parent_message_id'),
         )
-    
-    # Update thread
-    thread.last_message = message
-    thread.last_message_at = timezone.now()
-    thread.increment_unread(recipient)  # Increment unread for recipient
-    thread.save()
+        
+        # Update thread in one statement; the counter increment is atomic
+        unread_field = thread.unread_field(recipient)
+        MessageThread.objects.filter(pk=thread.pk).update(**{
+            'last_message': message,
+            'last_message_at': message.created_at,
+            'updated_at': message.created_at,
+            unread_field: F(unread_field) + 1,
+        })
     
     # Create notification for recipient
     Notification.objects.create(
@@ -1043,21 +850,32 @@ def send_message(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_unread_counts(request):
-    """Get unread counts for notifications and messages"""
-    notifications_count = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).count()
-    
-    messages_count = Message.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).count()
+    """
+    Get unread counts for notifications and messages
+    Query params:
+        - since: version from the previous response; the request then waits
+          until the counts change (long poll, only when UNREAD_LONG_POLL_TIMEOUT is set)
+        - timeout: seconds to wait, capped at UNREAD_LONG_POLL_TIMEOUT
+    """
+    since = request.GET.get('since')
+    if since is None:
+        counter = UnreadCounterService.get(request.user)
+    else:
+        try:
+            since = int(since)
+            timeout = float(request.GET.get('timeout', settings.UNREAD_LONG_POLL_TIMEOUT))
+        except ValueError:
+            return Response(
+                {'error': 'since and timeout must be numbers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        counter = UnreadCounterService.wait(request.user, since, timeout)
     
     return Response({
-        'notifications': notifications_count,
-        'messages': messages_count,
-        'total': notifications_count + messages_count
+        'notifications': counter.notifications,
+        'messages': counter.messages,
+        'total': counter.notifications + counter.messages,
+        'version': counter.version,
     })
 
 
@@ -1081,7 +899,7 @@ def announcements(request):
     
     if request.method == 'GET':
         # Get all announcements by this mentor
-        announcements_list = Announcement.objects.filter(mentor=request.user)
+        announcements_list = Announcement.objects.filter(mentor=request.user).select_related('mentor')
         serializer = AnnouncementSerializer(announcements_list, many=True)
         return Response({
             'announcements': serializer.data,
@@ -1180,7 +998,9 @@ def student_announcements(request):
                 'unread_count': 0
             })
         
-        announcements_list = Announcement.objects.filter(mentor=student_profile.assigned_mentor).order_by('-created_at')
+        announcements_list = Announcement.objects.filter(
+            mentor=student_profile.assigned_mentor
+        ).select_related('mentor').order_by('-created_at')
         serializer = AnnouncementSerializer(announcements_list, many=True, context={'request': request})
         
         # Count unread announcements
@@ -1235,10 +1055,8 @@ def mark_announcement_read(request, announcement_id):
 @permission_classes([IsAuthenticated])
 def get_student_monthly_report(request, student_id):
     """Get monthly report for a specific student (Mentor view)"""
-    from datetime import datetime
-    from apps.clt.models import CLTSubmission
-    from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
-    from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
+    from apps.dashboard.monthly_rollup import MonthlyRollupService
+    from apps.scd.activity import LeetCodeActivityService
     from apps.scd.models import LeetCodeProfile
     
     # Check if user is mentor
@@ -1262,13 +1080,6 @@ def get_student_monthly_report(request, student_id):
         year = int(year)
         student = User.objects.get(id=student_id)
         
-        # Create date range
-        start_date = datetime(year, month, 1)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1)
-        else:
-            end_date = datetime(year, month + 1, 1)
-        
         # Monthly task requirements
         MONTHLY_REQUIREMENTS = {
             'clt': 1,
@@ -1278,38 +1089,26 @@ def get_student_monthly_report(request, student_id):
             'scd': 1,
         }
         
+        # Approved submissions per model for the month, from one rollup read
+        approved = {
+            model_type: row.approved
+            for model_type, row in MonthlyRollupService.month(student, year, month).items()
+        }
+        
         # Calculate CLT stats
-        clt_submissions = CLTSubmission.objects.filter(
-            user=student,
-            created_at__gte=start_date,
-            created_at__lt=end_date
-        )
-        clt_completed = clt_submissions.filter(status='approved').count()
+        clt_completed = approved.get('clt', 0)
         
-        # Calculate CFC stats
-        cfc_hackathons = HackathonSubmission.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        cfc_bmc = BMCVideoSubmission.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        cfc_genai = GenAIProjectSubmission.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        cfc_completed = cfc_hackathons + cfc_bmc + cfc_genai
+        # Calculate CFC stats (internships are optional)
+        cfc_completed = sum(approved.get(t, 0) for t in ['hackathon', 'bmc', 'genai'])
         
         # Calculate IIPC stats
-        iipc_posts = LinkedInPostVerification.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        iipc_connections = LinkedInConnectionVerification.objects.filter(
-            user=student, created_at__gte=start_date, created_at__lt=end_date, status='approved'
-        ).count()
-        iipc_completed = iipc_posts + iipc_connections
+        iipc_completed = sum(approved.get(t, 0) for t in ['linkedin', 'linkedin_connection'])
         
-        # Calculate SCD stats
-        scd_profile = LeetCodeProfile.objects.filter(user=student).first()
-        scd_completed = 1 if (scd_profile and scd_profile.monthly_problems_count >= 10) else 0
+        # Calculate SCD stats: problems solved in the requested month
+        scd_problems = LeetCodeActivityService.month_total(
+            LeetCodeProfile.objects.filter(user=student), year, month
+        )['total']
+        scd_completed = 1 if scd_problems >= LeetCodeActivityService.MONTHLY_TARGET else 0
         
         report_data = {
             'month': month,
@@ -1366,7 +1165,7 @@ def get_student_monthly_report(request, student_id):
 def get_student_available_months(request, student_id):
     """Get available months for a student's monthly reports (Mentor view)"""
     from datetime import datetime
-    from apps.clt.models import CLTSubmission
+    from apps.dashboard.monthly_rollup import MonthlyRollupService
     
     # Check if user is mentor
     if not is_mentor(request.user):
@@ -1378,10 +1177,10 @@ def get_student_available_months(request, student_id):
     try:
         student = User.objects.get(id=student_id)
         
-        # Get all months where student has any submissions
-        submissions = CLTSubmission.objects.filter(user=student).order_by('created_at')
+        # Months where the student has any pillar submission, most recent first
+        months_sorted = MonthlyRollupService.available_months(student)
         
-        if not submissions.exists():
+        if not months_sorted:
             # Default to current month if no submissions
             now = datetime.now()
             return Response({
@@ -1392,13 +1191,6 @@ def get_student_available_months(request, student_id):
                 }]
             })
         
-        # Get unique year-month combinations
-        months_set = set()
-        for sub in submissions:
-            months_set.add((sub.created_at.year, sub.created_at.month))
-        
-        # Sort and format
-        months_sorted = sorted(months_set, reverse=True)
         available_months = [
             {
                 'month': month,
@@ -1431,7 +1223,7 @@ def get_student_leetcode_profile(request, student_id):
     
     try:
         from datetime import datetime
-        from collections import defaultdict
+        from apps.scd.activity import LeetCodeActivityService
         
         student = User.objects.get(id=student_id)
         
@@ -1448,31 +1240,16 @@ def get_student_leetcode_profile(request, student_id):
         serializer = LeetCodeProfileSerializer(leetcode_profile)
         profile_data = serializer.data
         
-        # Calculate monthly breakdown from submission_calendar
-        submission_calendar = leetcode_profile.submission_calendar or {}
-        current_month = datetime.now().month
-        current_year = datetime.now().year
-        
+        # Calculate monthly breakdown from the daily activity table
+        activity = LeetCodeActivityService.month_total(leetcode_profile)
         monthly_stats = {
-            'total': 0,
+            'total': activity['total'],
             'easy': 0,
             'medium': 0,
             'hard': 0,
-            'days_active': 0
+            'days_active': activity['days_active']
         }
         
-        # Parse submission calendar and count problems for current month
-        for timestamp_str, count in submission_calendar.items():
-            try:
-                timestamp = int(timestamp_str)
-                date = datetime.fromtimestamp(timestamp)
-                
-                if date.month == current_month and date.year == current_year:
-                    monthly_stats['total'] += count
-                    monthly_stats['days_active'] += 1
-            except (ValueError, OSError):
-                continue
-        
         # Estimate difficulty breakdown based on overall ratio
         if leetcode_profile.total_solved > 0:
             easy_ratio = leetcode_profile.easy_solved / leetcode_profile.total_solved
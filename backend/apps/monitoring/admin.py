@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import EndpointMetric
+
+
+@admin.register(EndpointMetric)
+class EndpointMetricAdmin(admin.ModelAdmin):
+    list_display = ['endpoint', 'method', 'requests', 'errors', 'duration_seconds', 'db_queries', 'n_plus_one', 'updated_at']
+    list_filter = ['method']
+    search_fields = ['endpoint', 'n_plus_one_sql']
+    readonly_fields = ['first_seen', 'updated_at']
+    list_per_page = 50
@@ -0,0 +1,120 @@
+"""
+Management command to print the request profiles collected by RequestProfilingMiddleware
+
+Usage:
+    python manage.py dump_metrics                         # table, slowest endpoints first
+    python manage.py dump_metrics --sort queries --limit 20
+    python manage.py dump_metrics --n-plus-one            # only endpoints with N+1 requests
+    python manage.py dump_metrics --format prometheus     # same text as /metrics
+    python manage.py dump_metrics --format json
+    python manage.py dump_metrics --reset                 # clear the totals after dumping
+"""
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.monitoring.models import EndpointMetric
+from apps.monitoring.profiler import RequestProfiler
+
+
+class Command(BaseCommand):
+    help = 'Print per-endpoint latency, query and N+1 totals'
+
+    SORT_KEYS = {
+        'total': lambda row: row.duration_seconds,
+        'avg': lambda row: row.duration_seconds / row.requests if row.requests else 0,
+        'p95': lambda row: RequestProfiler.percentile(row, 0.95),
+        'queries': lambda row: row.db_queries / row.requests if row.requests else 0,
+        'requests': lambda row: row.requests,
+        'n_plus_one': lambda row: row.n_plus_one,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=['table', 'json', 'prometheus'],
+            default='table',
+        )
+        parser.add_argument(
+            '--sort',
+            choices=sorted(self.SORT_KEYS),
+            default='total',
+            help='Table and JSON order, largest first (default: total time)',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Only the first N endpoints',
+        )
+        parser.add_argument(
+            '--n-plus-one',
+            action='store_true',
+            help='Only endpoints with N+1 requests',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Delete the collected totals after dumping',
+        )
+
+    def handle(self, *args, **options):
+        rows = EndpointMetric.objects.all()
+        if options['n_plus_one']:
+            rows = rows.filter(n_plus_one__gt=0)
+        rows = sorted(rows, key=self.SORT_KEYS[options['sort']], reverse=True)
+        if options['limit']:
+            rows = rows[:options['limit']]
+
+        if options['format'] == 'prometheus':
+            self.stdout.write(RequestProfiler.render(rows), ending='')
+        elif options['format'] == 'json':
+            self.stdout.write(json.dumps([self.as_dict(row) for row in rows], indent=2))
+        else:
+            self.write_table(rows)
+
+        if options['reset']:
+            deleted, _ = EndpointMetric.objects.all().delete()
+            self.stdout.write(self.style.SUCCESS(f'Cleared {deleted} endpoint metrics'))
+
+    def as_dict(self, row):
+        requests = row.requests or 1
+        return {
+            'endpoint': row.endpoint,
+            'method': row.method,
+            'requests': row.requests,
+            'errors': row.errors,
+            'avg_ms': round(row.duration_seconds / requests * 1000, 2),
+            'p95_ms': round(RequestProfiler.percentile(row, 0.95) * 1000, 2),
+            'max_ms': round(row.max_duration_seconds * 1000, 2),
+            'queries_per_request': round(row.db_queries / requests, 2),
+            'db_ms_per_request': round(row.db_seconds / requests * 1000, 2),
+            'n_plus_one': row.n_plus_one,
+            'n_plus_one_sql': row.n_plus_one_sql,
+            'n_plus_one_repeats': row.n_plus_one_repeats,
+            'updated_at': row.updated_at.isoformat(),
+        }
+
+    def write_table(self, rows):
+        if not rows:
+            self.stdout.write('No request metrics recorded (is PROFILING_ENABLED on?)')
+            return
+
+        self.stdout.write(
+            f"{'endpoint':<60} {'method':<7} {'requests':>9} {'avg ms':>9} {'p95 ms':>9} "
+            f"{'max ms':>9} {'q/req':>7} {'db ms/req':>10} {'n+1':>6}"
+        )
+        for row in rows:
+            data = self.as_dict(row)
+            self.stdout.write(
+                f"{data['endpoint'][:60]:<60} {data['method']:<7} {data['requests']:>9} {data['avg_ms']:>9.1f} "
+                f"{data['p95_ms']:>9.1f} {data['max_ms']:>9.1f} {data['queries_per_request']:>7.1f} "
+                f"{data['db_ms_per_request']:>10.1f} {data['n_plus_one']:>6}"
+            )
+
+        flagged = [row for row in rows if row.n_plus_one]
+        if flagged:
+            self.stdout.write('\nRepeated SQL shapes:')
+            for row in flagged:
+                self.stdout.write(self.style.WARNING(
+                    f'  {row.method} {row.endpoint}: {row.n_plus_one_repeats} x {row.n_plus_one_sql[:300]}'
+                ))
@@ -0,0 +1,52 @@
+"""
+Request Profiling Middleware
+
+Times a PROFILING_SAMPLE_RATE share of requests and records their SQL
+queries (see apps/monitoring/profiler.py). Turned on with PROFILING_ENABLED;
+LOG_QUERY_TIMES alone only logs slow queries.
+"""
+import random
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from .profiler import QueryRecorder, RequestProfiler
+
+
+class RequestProfilingMiddleware:
+    """
+    Middleware recording latency, query count and query time per endpoint.
+
+    Place it early in MIDDLEWARE so the time spent in later middleware is
+    counted too. Requests to the metrics and health endpoints are not profiled.
+    """
+
+    SKIPPED_PREFIXES = ('/metrics', '/health', '/api/health')
+
+    # Anything else is reported as OTHER to keep the metric labels bounded
+    METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'}
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profiling = settings.PROFILING_ENABLED and random.random() < settings.PROFILING_SAMPLE_RATE
+        log_queries = settings.LOG_QUERY_TIMES
+        if not (profiling or log_queries) or request.path.startswith(self.SKIPPED_PREFIXES):
+            return self.get_response(request)
+
+        recorder = QueryRecorder(slow_query_ms=settings.SLOW_QUERY_MS if log_queries else None)
+        start = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        if profiling:
+            # Route patterns, not raw paths, so ids do not create new series
+            match = getattr(request, 'resolver_match', None)
+            endpoint = '/' + match.route if match is not None else 'unmatched'
+            method = request.method if request.method in self.METHODS else 'OTHER'
+            if RequestProfiler.record(endpoint, method, response.status_code, duration, recorder):
+                RequestProfiler.flush()
+        return response
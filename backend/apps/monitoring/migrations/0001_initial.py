@@ -0,0 +1,72 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="EndpointMetric",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "endpoint",
+                    models.CharField(
+                        help_text="URL route pattern, not the raw path", max_length=255
+                    ),
+                ),
+                ("method", models.CharField(max_length=10)),
+                ("requests", models.BigIntegerField(default=0)),
+                (
+                    "errors",
+                    models.BigIntegerField(
+                        default=0, help_text="Responses with a 5xx status"
+                    ),
+                ),
+                ("duration_seconds", models.FloatField(default=0)),
+                ("max_duration_seconds", models.FloatField(default=0)),
+                (
+                    "duration_buckets",
+                    models.JSONField(
+                        default=list,
+                        help_text="Request counts per PROFILING_LATENCY_BUCKETS bound, then +Inf",
+                    ),
+                ),
+                ("db_queries", models.BigIntegerField(default=0)),
+                ("db_seconds", models.FloatField(default=0)),
+                (
+                    "n_plus_one",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Requests repeating one SQL shape too often",
+                    ),
+                ),
+                (
+                    "n_plus_one_sql",
+                    models.TextField(
+                        blank=True, help_text="Most recent repeated SQL shape"
+                    ),
+                ),
+                ("n_plus_one_repeats", models.PositiveIntegerField(default=0)),
+                ("first_seen", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["endpoint", "method"],
+                "unique_together": {("endpoint", "method")},
+            },
+        ),
+    ]
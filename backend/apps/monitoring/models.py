@@ -0,0 +1,36 @@
+from django.db import models
+
+
+class EndpointMetric(models.Model):
+    """
+    Request profile totals of one endpoint, summed over every process
+    Written by RequestProfilingMiddleware; read by /metrics and `manage.py dump_metrics`
+    """
+
+    endpoint = models.CharField(max_length=255, help_text="URL route pattern, not the raw path")
+    method = models.CharField(max_length=10)
+
+    requests = models.BigIntegerField(default=0)
+    errors = models.BigIntegerField(default=0, help_text="Responses with a 5xx status")
+    duration_seconds = models.FloatField(default=0)
+    max_duration_seconds = models.FloatField(default=0)
+    duration_buckets = models.JSONField(
+        default=list, help_text="Request counts per PROFILING_LATENCY_BUCKETS bound, then +Inf"
+    )
+
+    db_queries = models.BigIntegerField(default=0)
+    db_seconds = models.FloatField(default=0)
+
+    n_plus_one = models.BigIntegerField(default=0, help_text="Requests repeating one SQL shape too often")
+    n_plus_one_sql = models.TextField(blank=True, help_text="Most recent repeated SQL shape")
+    n_plus_one_repeats = models.PositiveIntegerField(default=0)
+
+    first_seen = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['endpoint', 'method']
+        unique_together = ['endpoint', 'method']
+
+    def __str__(self):
+        return f"{self.method} {self.endpoint} ({self.requests} requests)"
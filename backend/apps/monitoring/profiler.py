@@ -0,0 +1,247 @@
+"""
+Request profiling
+
+RequestProfilingMiddleware times a sample of requests (PROFILING_SAMPLE_RATE)
+and sees every SQL query they run through connection.execute_wrapper, so it
+works with DEBUG off. Each process sums its samples in memory per
+(route, method) and adds them to the EndpointMetric table every
+PROFILING_FLUSH_INTERVAL seconds. /metrics and `manage.py dump_metrics` read
+that table, so they cover every worker process.
+
+A request that runs one SQL shape (the statement with literals and
+placeholder lists collapsed) more than PROFILING_N_PLUS_ONE_THRESHOLD times
+is counted as an N+1 and logged. With LOG_QUERY_TIMES on, queries slower
+than SLOW_QUERY_MS are logged as well.
+"""
+import bisect
+import functools
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EndpointMetric
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    """execute_wrapper counting, timing and grouping the queries of one request"""
+
+    def __init__(self, slow_query_ms=None):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+        self.slow_query_ms = slow_query_ms
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.seconds += elapsed
+            self.shapes[RequestProfiler.sql_shape(sql)] += 1
+            if self.slow_query_ms is not None and elapsed * 1000 >= self.slow_query_ms:
+                logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, sql)
+
+    def most_repeated(self):
+        """(sql shape, times run) of the most repeated shape, or (None, 0)"""
+        if not self.shapes:
+            return None, 0
+        return self.shapes.most_common(1)[0]
+
+
+class RequestProfiler:
+    """Collect per-endpoint request profiles and publish them from EndpointMetric"""
+
+    # Counters summed into EndpointMetric on flush
+    SUM_FIELDS = ['requests', 'errors', 'duration_seconds', 'db_queries', 'db_seconds', 'n_plus_one']
+
+    STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+    NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+    VALUE_LIST = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+    REPEATED_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+    WHITESPACE = re.compile(r"\s+")
+
+    _lock = threading.Lock()
+    _pending = {}
+    _last_flush = time.monotonic()
+
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def sql_shape(sql):
+        """SQL with literals replaced and IN / VALUES lists of any length collapsed"""
+        shape = RequestProfiler.STRING_LITERAL.sub('?', sql)
+        shape = RequestProfiler.NUMBER_LITERAL.sub('?', shape)
+        shape = RequestProfiler.VALUE_LIST.sub('(...)', shape)
+        shape = RequestProfiler.REPEATED_LISTS.sub('(...)', shape)
+        return RequestProfiler.WHITESPACE.sub(' ', shape).strip()
+
+    @staticmethod
+    def empty_entry():
+        entry = {field: 0 for field in RequestProfiler.SUM_FIELDS}
+        entry.update({
+            'max_duration_seconds': 0.0,
+            'duration_buckets': [0] * (len(settings.PROFILING_LATENCY_BUCKETS) + 1),
+            'n_plus_one_sql': '',
+            'n_plus_one_repeats': 0,
+        })
+        return entry
+
+    @classmethod
+    def record(cls, endpoint, method, status_code, duration, recorder):
+        """
+        Add one profiled request to this process's totals
+        Returns True once the totals are due to be flushed
+        """
+        shape, repeats = recorder.most_repeated()
+        n_plus_one = repeats > settings.PROFILING_N_PLUS_ONE_THRESHOLD
+        bucket = bisect.bisect_left(settings.PROFILING_LATENCY_BUCKETS, duration)
+
+        with cls._lock:
+            entry = cls._pending.get((endpoint, method))
+            if entry is None:
+                entry = cls._pending[(endpoint, method)] = cls.empty_entry()
+            entry['requests'] += 1
+            entry['errors'] += status_code >= 500
+            entry['duration_seconds'] += duration
+            entry['max_duration_seconds'] = max(entry['max_duration_seconds'], duration)
+            entry['duration_buckets'][bucket] += 1
+            entry['db_queries'] += recorder.count
+            entry['db_seconds'] += recorder.seconds
+            if n_plus_one:
+                entry['n_plus_one'] += 1
+                entry['n_plus_one_sql'] = shape
+                entry['n_plus_one_repeats'] = repeats
+            due = time.monotonic() - cls._last_flush >= settings.PROFILING_FLUSH_INTERVAL
+
+        if n_plus_one:
+            logger.warning("Possible N+1 on %s %s: %d x %s", method, endpoint, repeats, shape)
+        return due
+
+    @classmethod
+    def reset(cls):
+        """Drop totals not flushed yet"""
+        with cls._lock:
+            cls._pending = {}
+            cls._last_flush = time.monotonic()
+
+    @classmethod
+    def flush(cls):
+        """
+        Add this process's totals to EndpointMetric
+        Returns the number of endpoints written; totals are dropped if the write fails
+        """
+        with cls._lock:
+            pending, cls._pending = cls._pending, {}
+            cls._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        try:
+            with transaction.atomic():
+                # Create missing rows first so concurrent flushes only ever update
+                EndpointMetric.objects.bulk_create(
+                    [EndpointMetric(endpoint=endpoint, method=method) for endpoint, method in pending],
+                    ignore_conflicts=True,
+                )
+                keys = Q()
+                for endpoint, method in pending:
+                    keys |= Q(endpoint=endpoint, method=method)
+                rows = list(EndpointMetric.objects.select_for_update().filter(keys))
+
+                now = timezone.now()
+                for row in rows:
+                    entry = pending[(row.endpoint, row.method)]
+                    for field in RequestProfiler.SUM_FIELDS:
+                        setattr(row, field, getattr(row, field) + entry[field])
+                    row.max_duration_seconds = max(row.max_duration_seconds, entry['max_duration_seconds'])
+                    if len(row.duration_buckets) == len(entry['duration_buckets']):
+                        row.duration_buckets = [a + b for a, b in zip(row.duration_buckets, entry['duration_buckets'])]
+                    else:
+                        # PROFILING_LATENCY_BUCKETS changed: the histogram starts over
+                        row.duration_buckets = entry['duration_buckets']
+                    if entry['n_plus_one']:
+                        row.n_plus_one_sql = entry['n_plus_one_sql']
+                        row.n_plus_one_repeats = entry['n_plus_one_repeats']
+                    row.updated_at = now
+
+                EndpointMetric.objects.bulk_update(rows, RequestProfiler.SUM_FIELDS + [
+                    'max_duration_seconds', 'duration_buckets', 'n_plus_one_sql', 'n_plus_one_repeats', 'updated_at',
+                ])
+        except DatabaseError:
+            logger.exception("Could not flush request metrics for %d endpoints", len(pending))
+            return 0
+        return len(rows)
+
+    @staticmethod
+    def cumulative_buckets(row):
+        """[(upper bound, requests at or below it)] ending with +Inf, for the row's histogram"""
+        bounds = settings.PROFILING_LATENCY_BUCKETS
+        if len(row.duration_buckets) != len(bounds) + 1:
+            return [(float('inf'), row.requests)]
+        pairs, running = [], 0
+        for bound, count in zip(list(bounds) + [float('inf')], row.duration_buckets):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    @staticmethod
+    def percentile(row, fraction):
+        """Upper bound of the histogram bucket holding the given fraction of requests"""
+        if not row.requests:
+            return 0.0
+        for bound, running in RequestProfiler.cumulative_buckets(row):
+            if running >= fraction * row.requests:
+                return bound if bound != float('inf') else row.max_duration_seconds
+        return row.max_duration_seconds
+
+    @staticmethod
+    def render(rows=None):
+        """EndpointMetric rows in the Prometheus text exposition format"""
+        rows = list(EndpointMetric.objects.all() if rows is None else rows)
+
+        def labels(row, **extra):
+            pairs = {'endpoint': row.endpoint, 'method': row.method, **extra}
+            escaped = (
+                f'{key}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+                for key, value in pairs.items()
+            )
+            return '{' + ','.join(escaped) + '}'
+
+        def family(name, kind, description, samples):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(samples)
+
+        lines = []
+        histogram = []
+        for row in rows:
+            for bound, running in RequestProfiler.cumulative_buckets(row):
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                histogram.append(f'cohort_http_request_duration_seconds_bucket{labels(row, le=le)} {running}')
+            histogram.append(f'cohort_http_request_duration_seconds_sum{labels(row)} {row.duration_seconds}')
+            histogram.append(f'cohort_http_request_duration_seconds_count{labels(row)} {row.requests}')
+        family('cohort_http_request_duration_seconds', 'histogram', 'Latency of profiled requests', histogram)
+
+        counters = [
+            ('cohort_http_request_errors_total', 'Profiled requests answered with a 5xx status', 'errors'),
+            ('cohort_http_db_queries_total', 'SQL queries run by profiled requests', 'db_queries'),
+            ('cohort_http_db_query_seconds_total', 'Time spent in SQL by profiled requests', 'db_seconds'),
+            ('cohort_http_n_plus_one_total', 'Profiled requests repeating one SQL shape too often', 'n_plus_one'),
+        ]
+        for name, description, field in counters:
+            family(name, 'counter', description, [f'{name}{labels(row)} {getattr(row, field)}' for row in rows])
+        family(
+            'cohort_http_request_max_duration_seconds', 'gauge', 'Slowest profiled request',
+            [f'cohort_http_request_max_duration_seconds{labels(row)} {row.max_duration_seconds}' for row in rows],
+        )
+        return '\n'.join(lines) + '\n'
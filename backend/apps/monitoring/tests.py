@@ -0,0 +1,132 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.http import JsonResponse
+from django.test import TestCase, override_settings
+from django.urls import path
+
+from .models import EndpointMetric
+from .profiler import RequestProfiler
+from .views import metrics
+
+User = get_user_model()
+
+
+def users_one_by_one(request):
+    """Deliberate N+1: one query per user"""
+    ids = list(User.objects.values_list('id', flat=True))
+    return JsonResponse({'names': [User.objects.get(id=user_id).username for user_id in ids]})
+
+
+def users_batched(request, group):
+    return JsonResponse({'names': list(User.objects.values_list('username', flat=True))})
+
+
+urlpatterns = [
+    path('metrics', metrics),
+    path('users/one-by-one/', users_one_by_one),
+    path('users/<str:group>/', users_batched),
+]
+
+
+@override_settings(
+    ROOT_URLCONF='apps.monitoring.tests',
+    PROFILING_ENABLED=True,
+    PROFILING_SAMPLE_RATE=1.0,
+    PROFILING_FLUSH_INTERVAL=0,
+    PROFILING_N_PLUS_ONE_THRESHOLD=5,
+    PROFILING_LATENCY_BUCKETS=(0.05, 0.5, 5.0),
+    METRICS_TOKEN='secret',
+)
+class RequestProfilingTests(TestCase):
+
+    def setUp(self):
+        RequestProfiler.reset()
+        User.objects.bulk_create([User(username=f'user{i}') for i in range(8)])
+
+    def test_records_route_latency_and_queries_per_endpoint(self):
+        for group in ['a', 'b', 'c']:
+            self.assertEqual(self.client.get(f'/users/{group}/').status_code, 200)
+
+        row = EndpointMetric.objects.get()
+        self.assertEqual((row.endpoint, row.method), ('/users/<str:group>/', 'GET'))
+        self.assertEqual(row.requests, 3)
+        self.assertEqual(row.db_queries, 3)
+        self.assertEqual(sum(row.duration_buckets), 3)
+        self.assertEqual(len(row.duration_buckets), 4)
+        self.assertEqual(row.n_plus_one, 0)
+
+    def test_flags_repeated_sql_shapes(self):
+        with self.assertLogs('apps.monitoring.profiler', 'WARNING') as logs:
+            self.client.get('/users/one-by-one/')
+        self.assertIn('Possible N+1 on GET /users/one-by-one/: 8 x', logs.output[0])
+
+        row = EndpointMetric.objects.get(endpoint='/users/one-by-one/')
+        self.assertEqual(row.n_plus_one, 1)
+        self.assertEqual(row.n_plus_one_repeats, 8)
+        self.assertIn('WHERE "auth_user"."id" = %s', row.n_plus_one_sql)
+
+    def test_sampling_and_disabled_profiling_record_nothing(self):
+        with self.settings(PROFILING_SAMPLE_RATE=0.0):
+            self.client.get('/users/a/')
+        with self.settings(PROFILING_ENABLED=False):
+            self.client.get('/users/a/')
+        self.assertFalse(EndpointMetric.objects.exists())
+
+    def test_totals_are_buffered_until_the_flush_interval(self):
+        with self.settings(PROFILING_FLUSH_INTERVAL=3600):
+            self.client.get('/users/a/')
+            self.client.get('/users/b/')
+            self.assertFalse(EndpointMetric.objects.exists())
+            self.assertEqual(RequestProfiler.flush(), 1)
+        self.client.get('/users/c/')
+
+        self.assertEqual(EndpointMetric.objects.get().requests, 3)
+
+    def test_sql_shape_collapses_literals_and_lists(self):
+        self.assertEqual(
+            RequestProfiler.sql_shape("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'"),
+            RequestProfiler.sql_shape("SELECT * FROM t WHERE id IN (%s) AND name = 'y'"),
+        )
+        self.assertEqual(
+            RequestProfiler.sql_shape('INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO t (a, b) VALUES (...)',
+        )
+
+    def test_metrics_endpoint_needs_the_token_and_serves_histograms(self):
+        self.client.get('/users/a/')
+        with self.assertLogs('apps.monitoring.profiler', 'WARNING'):
+            self.client.get('/users/one-by-one/')
+
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+        body = response.content.decode()
+        labels = 'endpoint="/users/<str:group>/",method="GET"'
+        self.assertIn('# TYPE cohort_http_request_duration_seconds histogram', body)
+        self.assertIn(f'cohort_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', body)
+        self.assertIn(f'cohort_http_request_duration_seconds_count{{{labels}}} 1', body)
+        self.assertIn(f'cohort_http_db_queries_total{{{labels}}} 1', body)
+        self.assertIn('cohort_http_n_plus_one_total{endpoint="/users/one-by-one/",method="GET"} 1', body)
+        # The scrape itself is not profiled
+        self.assertFalse(EndpointMetric.objects.filter(endpoint='/metrics').exists())
+
+    def test_dump_command_formats_and_reset(self):
+        self.client.get('/users/a/')
+        with self.assertLogs('apps.monitoring.profiler', 'WARNING'):
+            self.client.get('/users/one-by-one/')
+
+        out = StringIO()
+        call_command('dump_metrics', '--format', 'json', '--sort', 'queries', stdout=out)
+        dumped = json.loads(out.getvalue())
+        self.assertEqual([row['endpoint'] for row in dumped], ['/users/one-by-one/', '/users/<str:group>/'])
+        self.assertEqual(dumped[0]['queries_per_request'], 9)
+
+        out = StringIO()
+        call_command('dump_metrics', '--n-plus-one', '--reset', stdout=out)
+        self.assertIn('/users/one-by-one/', out.getvalue())
+        self.assertNotIn('/users/<str:group>/', out.getvalue())
+        self.assertFalse(EndpointMetric.objects.exists())
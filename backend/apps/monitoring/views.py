@@ -0,0 +1,27 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from .profiler import RequestProfiler
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint: /metrics
+
+    Needs `Authorization: Bearer <METRICS_TOKEN>`. Without a token configured
+    it is only served with DEBUG on.
+    """
+    token = settings.METRICS_TOKEN
+    if token:
+        supplied = request.META.get('HTTP_AUTHORIZATION', '').encode()
+        if not hmac.compare_digest(supplied, f'Bearer {token}'.encode()):
+            return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    elif not settings.DEBUG:
+        raise Http404
+
+    RequestProfiler.flush()
+    return HttpResponse(RequestProfiler.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
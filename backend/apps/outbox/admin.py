@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import OutboxTask
+
+
+@admin.register(OutboxTask)
+class OutboxTaskAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task_type', 'status', 'attempts', 'available_at', 'created_at', 'completed_at']
+    list_filter = ['status', 'task_type']
+    search_fields = ['idempotency_key', 'last_error']
+    readonly_fields = ['created_at', 'completed_at', 'locked_by', 'locked_at']
+    list_per_page = 50
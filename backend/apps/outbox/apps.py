@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class OutboxConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.outbox'
+    verbose_name = 'Outbox'
+
+    def ready(self):
+        # Each app registers its task handlers in its own tasks.py
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules('tasks')
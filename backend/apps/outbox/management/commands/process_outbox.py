@@ -0,0 +1,109 @@
+"""
+Management command to drain the outbox
+Run as a long-lived worker next to the web process when USE_ASYNC_TASKS is on
+
+Usage:
+    python manage.py process_outbox                  # poll forever
+    python manage.py process_outbox --once           # drain due tasks and exit (cron)
+    python manage.py process_outbox --concurrency 8
+    python manage.py process_outbox --requeue-dead   # retry dead-lettered tasks
+
+Done tasks older than OUTBOX_DONE_RETENTION_DAYS are purged when the worker
+starts; schedule `manage.py purge_outbox` for workers that run for weeks.
+"""
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from apps.outbox.services import OutboxService
+
+
+class Command(BaseCommand):
+    help = 'Run pending outbox tasks (notifications, score recomputation, leaderboard updates)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Worker threads (default: OUTBOX_WORKER_CONCURRENCY)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10,
+            help='Tasks claimed per round trip',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when the outbox is empty',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no task is due',
+        )
+        parser.add_argument(
+            '--requeue-dead',
+            action='store_true',
+            help='Move dead tasks back to pending before running',
+        )
+
+    def handle(self, *args, **options):
+        concurrency = max(options.get('concurrency') or settings.OUTBOX_WORKER_CONCURRENCY, 1)
+        worker_prefix = f'{socket.gethostname()}:{os.getpid()}'
+        self.stop = threading.Event()
+
+        if options['requeue_dead']:
+            requeued = OutboxService.requeue_dead()
+            self.stdout.write(f'Requeued {requeued} dead tasks')
+
+        if not options['once']:
+            purged = OutboxService.purge_done()
+            if purged:
+                self.stdout.write(f'Purged {purged} done tasks')
+
+        self.stdout.write(self.style.SUCCESS(f'Outbox worker started with {concurrency} threads'))
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [
+                pool.submit(self.work, f'{worker_prefix}:{index}', options)
+                for index in range(concurrency)
+            ]
+            totals = {'done': 0, 'pending': 0, 'dead': 0}
+            try:
+                for future in futures:
+                    for status, count in future.result().items():
+                        totals[status] += count
+            finally:
+                # Leaving the with block joins the threads, so tell them to stop first (Ctrl-C)
+                self.stop.set()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Outbox drained in {time.monotonic() - started:.1f}s: {totals['done']} done, "
+            f"{totals['pending']} to retry, {totals['dead']} dead"
+        ))
+
+    def work(self, worker_id, options):
+        """One worker thread: drain, then sleep or exit"""
+        totals = {'done': 0, 'pending': 0, 'dead': 0}
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                counts = OutboxService.drain(worker_id, batch_size=options['batch_size'])
+                for status, count in counts.items():
+                    totals[status] += count
+                if options['once']:
+                    break
+                if not any(counts.values()):
+                    self.stop.wait(options['poll_interval'])
+        finally:
+            connection.close()
+        return totals
@@ -0,0 +1,26 @@
+"""
+Management command to delete finished outbox tasks
+Schedule daily; done tasks are only kept for auditing
+
+Usage:
+    python manage.py purge_outbox              # older than OUTBOX_DONE_RETENTION_DAYS
+    python manage.py purge_outbox --days 1
+"""
+from django.core.management.base import BaseCommand
+
+from apps.outbox.services import OutboxService
+
+
+class Command(BaseCommand):
+    help = 'Delete done outbox tasks older than the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Keep done tasks newer than this (default: OUTBOX_DONE_RETENTION_DAYS)',
+        )
+
+    def handle(self, *args, **options):
+        deleted = OutboxService.purge_done(options.get('days'))
+        self.stdout.write(self.style.SUCCESS(f'Purged {deleted} done tasks'))
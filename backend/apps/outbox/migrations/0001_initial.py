@@ -0,0 +1,83 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:03
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "task_type",
+                    models.CharField(
+                        help_text="Registered handler name", max_length=100
+                    ),
+                ),
+                (
+                    "idempotency_key",
+                    models.CharField(
+                        help_text="Enqueueing the same key twice creates one task",
+                        max_length=255,
+                        unique=True,
+                    ),
+                ),
+                ("payload", models.JSONField(default=dict)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("running", "Running"),
+                            ("done", "Done"),
+                            ("dead", "Dead"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("max_attempts", models.PositiveIntegerField(default=5)),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Not claimed before this time",
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True)),
+                ("locked_by", models.CharField(blank=True, max_length=64)),
+                ("locked_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["available_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "available_at"],
+                        name="outbox_outb_status_a81d3f_idx",
+                    ),
+                    models.Index(
+                        fields=["task_type", "status"],
+                        name="outbox_outb_task_ty_2e76a8_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxTask(models.Model):
+    """
+    Side effect recorded in the same transaction as the change that caused it
+    Drained by `manage.py process_outbox`
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('dead', 'Dead'),
+    ]
+
+    task_type = models.CharField(max_length=100, help_text="Registered handler name")
+    idempotency_key = models.CharField(max_length=255, unique=True,
+                                       help_text="Enqueueing the same key twice creates one task")
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    available_at = models.DateTimeField(default=timezone.now, help_text="Not claimed before this time")
+    last_error = models.TextField(blank=True)
+
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['available_at', 'id']
+        indexes = [
+            models.Index(fields=['status', 'available_at']),
+            models.Index(fields=['task_type', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.task_type} #{self.id} ({self.status})"
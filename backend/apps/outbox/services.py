@@ -0,0 +1,176 @@
+"""
+Transactional outbox
+
+Callers enqueue side effects inside their own transaction. With
+USE_ASYNC_TASKS on, `manage.py process_outbox` claims and runs them later.
+With it off, enqueue runs the task immediately, which keeps the
+synchronous development behavior. Failed tasks are retried with
+exponential backoff and end up 'dead' after max_attempts.
+"""
+import logging
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutboxTask
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+
+
+class OutboxService:
+    """Enqueue, claim and run outbox tasks"""
+
+    @staticmethod
+    def register(task_type):
+        """Decorator registering `handler(payload)` for a task type"""
+        def decorator(handler):
+            _handlers[task_type] = handler
+            return handler
+        return decorator
+
+    @staticmethod
+    def handler_for(task_type):
+        return _handlers.get(task_type)
+
+    @staticmethod
+    def enqueue(task_type, payload, idempotency_key, max_attempts=None):
+        """
+        Record a task in the caller's transaction
+        Returns the existing task when the key was already enqueued
+        """
+        try:
+            with transaction.atomic():
+                task = OutboxTask.objects.create(
+                    task_type=task_type,
+                    idempotency_key=idempotency_key,
+                    payload=payload,
+                    max_attempts=max_attempts or settings.OUTBOX_MAX_ATTEMPTS,
+                )
+        except IntegrityError:
+            return OutboxTask.objects.get(idempotency_key=idempotency_key)
+
+        if not settings.USE_ASYNC_TASKS:
+            OutboxService.run(task)
+        return task
+
+    @staticmethod
+    def claim(worker_id, batch_size=10):
+        """
+        Mark up to batch_size due tasks as running for this worker
+        The conditional UPDATE is the lock, so concurrent workers never share a
+        task on any database. Tasks left running past OUTBOX_LOCK_TIMEOUT
+        (a crashed worker) are claimed again.
+        """
+        now = timezone.now()
+        stale = now - timedelta(seconds=settings.OUTBOX_LOCK_TIMEOUT)
+        claimable = (
+            Q(status='pending', available_at__lte=now)
+            | Q(status='running', locked_at__lt=stale)
+        )
+        token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+
+        candidates = list(
+            OutboxTask.objects.filter(claimable).order_by('available_at', 'id').values_list('id', flat=True)[:batch_size]
+        )
+        if not candidates:
+            return []
+
+        OutboxTask.objects.filter(claimable, id__in=candidates).update(
+            status='running', locked_by=token, locked_at=now
+        )
+        return list(OutboxTask.objects.filter(locked_by=token, status='running').order_by('id'))
+
+    @staticmethod
+    def backoff(attempts):
+        """Seconds before retry number `attempts`"""
+        return min(
+            settings.OUTBOX_RETRY_BASE_SECONDS * (2 ** (attempts - 1)),
+            settings.OUTBOX_RETRY_MAX_SECONDS,
+        )
+
+    @staticmethod
+    def run(task):
+        """
+        Run one task; the handler's writes and the 'done' mark commit together
+        Returns the task's new status
+        """
+        now = timezone.now()
+        attempts = task.attempts + 1
+        handler = OutboxService.handler_for(task.task_type)
+
+        if handler is None:
+            status, error = 'dead', f"No handler registered for {task.task_type}"
+        else:
+            try:
+                with transaction.atomic():
+                    handler(task.payload)
+                    OutboxTask.objects.filter(id=task.id).update(
+                        status='done', attempts=attempts, completed_at=timezone.now(),
+                        last_error='', locked_by='', locked_at=None,
+                    )
+                task.status, task.attempts = 'done', attempts
+                return 'done'
+            except Exception:
+                error = traceback.format_exc(limit=5)
+                status = 'dead' if attempts >= task.max_attempts else 'pending'
+                logger.warning("Outbox task %s (%s) failed, attempt %s", task.id, task.task_type, attempts)
+
+        available_at = now + timedelta(seconds=OutboxService.backoff(attempts)) if status == 'pending' else now
+        OutboxTask.objects.filter(id=task.id).update(
+            status=status, attempts=attempts, available_at=available_at,
+            last_error=error, locked_by='', locked_at=None,
+        )
+        task.status, task.attempts, task.last_error = status, attempts, error
+        return status
+
+    @staticmethod
+    def drain(worker_id='inline', batch_size=10, limit=None):
+        """
+        Claim and run due tasks until none are left (or `limit` have run)
+        Returns: {status: count}
+        """
+        counts = {'done': 0, 'pending': 0, 'dead': 0}
+        processed = 0
+        while limit is None or processed < limit:
+            tasks = OutboxService.claim(worker_id, batch_size)
+            if not tasks:
+                break
+            for task in tasks:
+                counts[OutboxService.run(task)] += 1
+                processed += 1
+        return counts
+
+    @staticmethod
+    def requeue_dead(task_type=None):
+        """Give dead tasks a fresh set of attempts; returns how many were requeued"""
+        tasks = OutboxTask.objects.filter(status='dead')
+        if task_type:
+            tasks = tasks.filter(task_type=task_type)
+        return tasks.update(status='pending', attempts=0, available_at=timezone.now())
+
+    @staticmethod
+    def purge_done(older_than_days=None, batch_size=5000):
+        """
+        Delete tasks that finished more than `older_than_days` ago
+        (default OUTBOX_DONE_RETENTION_DAYS); returns how many were deleted
+        Their idempotency keys are released, so keys must not be reused
+        for longer than the retention window
+        """
+        days = settings.OUTBOX_DONE_RETENTION_DAYS if older_than_days is None else older_than_days
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted = 0
+        while True:
+            ids = list(
+                OutboxTask.objects.filter(status='done', completed_at__lt=cutoff)
+                .order_by().values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return deleted
+            deleted += OutboxTask.objects.filter(id__in=ids).delete()[0]
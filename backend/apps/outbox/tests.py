@@ -0,0 +1,167 @@
+import threading
+from concurrent.futures import Future
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.clt.models import CLTSubmission
+from apps.dashboard.models import Notification
+from .models import OutboxTask
+from .services import OutboxService
+
+User = get_user_model()
+
+calls = []
+
+
+@OutboxService.register('tests.record')
+def record(payload):
+    calls.append(payload['value'])
+
+
+@OutboxService.register('tests.fail')
+def fail(payload):
+    raise RuntimeError('boom')
+
+
+@override_settings(USE_ASYNC_TASKS=True)
+class OutboxServiceTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_is_idempotent_and_deferred(self):
+        first = OutboxService.enqueue('tests.record', {'value': 1}, idempotency_key='k1')
+        second = OutboxService.enqueue('tests.record', {'value': 2}, idempotency_key='k1')
+
+        self.assertEqual(first.id, second.id)
+        self.assertEqual(calls, [])
+        self.assertEqual(OutboxService.drain(), {'done': 1, 'pending': 0, 'dead': 0})
+        self.assertEqual(calls, [1])
+        self.assertEqual(OutboxService.drain()['done'], 0)
+
+    @override_settings(USE_ASYNC_TASKS=False)
+    def test_synchronous_mode_runs_on_enqueue(self):
+        task = OutboxService.enqueue('tests.record', {'value': 3}, idempotency_key='k2')
+        self.assertEqual((task.status, calls), ('done', [3]))
+
+    def test_failures_back_off_then_dead_letter(self):
+        task = OutboxService.enqueue('tests.fail', {}, idempotency_key='k3', max_attempts=2)
+
+        self.assertEqual(OutboxService.drain()['pending'], 1)
+        task.refresh_from_db()
+        self.assertEqual(task.attempts, 1)
+        self.assertGreater(task.available_at, timezone.now())
+        self.assertIn('boom', task.last_error)
+        # Not due yet
+        self.assertEqual(OutboxService.drain()['pending'], 0)
+
+        OutboxTask.objects.filter(id=task.id).update(available_at=timezone.now())
+        self.assertEqual(OutboxService.drain()['dead'], 1)
+
+        self.assertEqual(OutboxService.requeue_dead(), 1)
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('pending', 0))
+
+    def test_unknown_task_type_is_dead_lettered(self):
+        OutboxService.enqueue('tests.missing', {}, idempotency_key='k4')
+        self.assertEqual(OutboxService.drain()['dead'], 1)
+
+    @override_settings(OUTBOX_DONE_RETENTION_DAYS=7)
+    def test_purge_removes_only_old_done_tasks(self):
+        for key in ('old', 'recent', 'old-dead'):
+            OutboxService.enqueue('tests.record', {'value': 1}, idempotency_key=key)
+        OutboxService.drain()
+        OutboxTask.objects.filter(idempotency_key__startswith='old').update(
+            completed_at=timezone.now() - timedelta(days=8)
+        )
+        OutboxTask.objects.filter(idempotency_key='old-dead').update(status='dead')
+
+        out = StringIO()
+        call_command('purge_outbox', stdout=out)
+
+        self.assertIn('Purged 1 done tasks', out.getvalue())
+        self.assertEqual(
+            sorted(OutboxTask.objects.values_list('idempotency_key', flat=True)), ['old-dead', 'recent']
+        )
+        self.assertEqual(OutboxService.purge_done(older_than_days=0), 1)
+
+    def test_claims_do_not_overlap_and_stale_locks_expire(self):
+        for i in range(5):
+            OutboxService.enqueue('tests.record', {'value': i}, idempotency_key=f'c{i}')
+
+        first = OutboxService.claim('a', batch_size=3)
+        second = OutboxService.claim('b', batch_size=3)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(len(second), 2)
+        self.assertFalse({t.id for t in first} & {t.id for t in second})
+        self.assertEqual(OutboxService.claim('c'), [])
+
+        OutboxTask.objects.filter(id=first[0].id).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual([t.id for t in OutboxService.claim('c')], [first[0].id])
+
+
+@override_settings(USE_ASYNC_TASKS=True)
+class ReviewOutboxTests(TestCase):
+
+    def test_review_only_enqueues(self):
+        mentor = User.objects.create_user('mentor', password='x')
+        mentor.profile.role = 'MENTOR'
+        mentor.profile.save()
+        student = User.objects.create_user('student', password='x')
+        submission = CLTSubmission.objects.create(
+            user=student, title='Course', description='d', platform='Udemy',
+            completion_date=date(2026, 1, 1), status='submitted'
+        )
+        client = APIClient()
+        client.force_authenticate(mentor)
+
+        response = client.post('/api/mentor/review/', {
+            'pillar': 'clt', 'submission_id': submission.id, 'submission_type': 'clt', 'action': 'approve'
+        }).json()
+
+        self.assertEqual(response['status'], 'approved')
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(OutboxTask.objects.get(id__in=response['task_ids']).status, 'pending')
+
+        OutboxService.drain()
+        self.assertEqual(Notification.objects.get().recipient, student)
+
+
+@override_settings(USE_ASYNC_TASKS=True)
+class ProcessOutboxCommandTests(TransactionTestCase):
+
+    def test_worker_threads_drain_the_outbox(self):
+        calls.clear()
+        for i in range(20):
+            OutboxService.enqueue('tests.record', {'value': i}, idempotency_key=f'w{i}')
+
+        out = StringIO()
+        call_command('process_outbox', '--once', '--concurrency', '2', '--batch-size', '3', stdout=out)
+
+        self.assertEqual(sorted(calls), list(range(20)))
+        self.assertEqual(OutboxTask.objects.filter(status='done').count(), 20)
+        self.assertIn('20 done', out.getvalue())
+
+    def test_interrupt_stops_worker_threads(self):
+        outcome = []
+
+        def run():
+            with mock.patch.object(Future, 'result', side_effect=KeyboardInterrupt):
+                try:
+                    call_command('process_outbox', '--poll-interval', '30', stdout=StringIO())
+                except KeyboardInterrupt:
+                    outcome.append('interrupted')
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join(timeout=10)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(outcome, ['interrupted'])
@@ -1,3 +1,5 @@
+import logging
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -10,6 +12,9 @@ from apps.clt.models import CLTSubmission
 from apps.cfc.models import HackathonSubmission, BMCVideoSubmission, InternshipSubmission, GenAIProjectSubmission
 from apps.iipc.models import LinkedInPostVerification, LinkedInConnectionVerification
 from apps.scd.models import LeetCodeProfile
+from apps.analytics_summary.services import AdminStatsService, CampusStatsService
+
+logger = logging.getLogger(__name__)
 
 
 class AdminCampusOverviewView(APIView):
@@ -33,34 +38,18 @@ class AdminCampusOverviewView(APIView):
             floors = []
             campus_name = ''
         
+        # Headcounts, floor wings and submission stats for every floor at once
+        floor_stats = CampusStatsService.campus_floors(campus, floors)
+        
         floor_data = []
         for floor_num in floors:
-            # Get counts for this floor
-            students_count = UserProfile.objects.filter(
-                role='STUDENT',
-                campus=campus,
-                floor=floor_num
-            ).count()
-            
-            mentors_count = UserProfile.objects.filter(
-                role='MENTOR',
-                campus=campus,
-                floor=floor_num
-            ).count()
-            
-            floor_wing = UserProfile.objects.filter(
-                role='FLOOR_WING',
-                campus=campus,
-                floor=floor_num
-            ).select_related('user').first()
+            stats = floor_stats[floor_num]
+            floor_wing = stats['floor_wing']
             
             floor_wing_name = None
             if floor_wing:
                 floor_wing_name = f"{floor_wing.user.first_name} {floor_wing.user.last_name}"
             
-            # Calculate submission stats (placeholder - implement based on your models)
-            submission_stats = self._get_floor_submission_stats(campus, floor_num)
-            
             # Floor name logic: TECH = Floor X, ARTS = Xst/nd/rd Year
             if campus == 'TECH':
                 floor_name = f"Floor {floor_num}"
@@ -76,11 +65,11 @@ class AdminCampusOverviewView(APIView):
             floor_data.append({
                 'floor': floor_num,
                 'floor_name': floor_name,
-                'total_students': students_count,
-                'total_mentors': mentors_count,
+                'total_students': stats['total_students'],
+                'total_mentors': stats['total_mentors'],
                 'floor_wing': floor_wing_name,
                 'floor_wing_id': floor_wing.user.id if floor_wing else None,
-                'submissions': submission_stats
+                'submissions': stats['submissions']
             })
         
         return Response({
@@ -88,102 +77,6 @@ class AdminCampusOverviewView(APIView):
             'campus_name': campus_name,
             'floors': floor_data
         }, status=status.HTTP_200_OK)
-    
-    def _get_floor_submission_stats(self, campus, floor):
-        """Get submission statistics for a floor - real implementation"""
-        # Get all students on this floor
-        students = UserProfile.objects.filter(
-            role='STUDENT',
-            campus=campus,
-            floor=floor
-        ).select_related('user')
-        
-        user_ids = [s.user.id for s in students]
-        
-        total = pending = approved = rejected = 0
-        
-        # CLT
-        try:
-            clt_qs = CLTSubmission.objects.filter(user_id__in=user_ids)
-            total += clt_qs.count()
-            pending += clt_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += clt_qs.filter(status='approved').count()
-            rejected += clt_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # CFC - Hackathon
-        try:
-            hack_qs = HackathonSubmission.objects.filter(user_id__in=user_ids)
-            total += hack_qs.count()
-            pending += hack_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += hack_qs.filter(status='approved').count()
-            rejected += hack_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # CFC - BMC
-        try:
-            bmc_qs = BMCVideoSubmission.objects.filter(user_id__in=user_ids)
-            total += bmc_qs.count()
-            pending += bmc_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += bmc_qs.filter(status='approved').count()
-            rejected += bmc_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # CFC - Internship
-        try:
-            intern_qs = InternshipSubmission.objects.filter(user_id__in=user_ids)
-            total += intern_qs.count()
-            pending += intern_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += intern_qs.filter(status='approved').count()
-            rejected += intern_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # CFC - GenAI
-        try:
-            genai_qs = GenAIProjectSubmission.objects.filter(user_id__in=user_ids)
-            total += genai_qs.count()
-            pending += genai_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += genai_qs.filter(status='approved').count()
-            rejected += genai_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # IIPC - LinkedIn Post
-        try:
-            post_qs = LinkedInPostVerification.objects.filter(user_id__in=user_ids)
-            total += post_qs.count()
-            pending += post_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += post_qs.filter(status='approved').count()
-            rejected += post_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # IIPC - LinkedIn Connection
-        try:
-            conn_qs = LinkedInConnectionVerification.objects.filter(user_id__in=user_ids)
-            total += conn_qs.count()
-            pending += conn_qs.filter(status__in=['draft', 'submitted', 'under_review']).count()
-            approved += conn_qs.filter(status='approved').count()
-            rejected += conn_qs.filter(status='rejected').count()
-        except Exception:
-            pass
-        
-        # Calculate progress percentage
-        progress_percentage = 0
-        if total > 0:
-            progress_percentage = int((approved / total) * 100)
-        
-        return {
-            'total': total,
-            'pending': pending,
-            'approved': approved,
-            'rejected': rejected,
-            'progress_percentage': progress_percentage
-        }
 
 
 class AdminFloorDetailView(APIView):
@@ -220,15 +113,21 @@ class AdminFloorDetailView(APIView):
             floor=floor
         ).select_related('user')
         
-        mentor_data = []
-        for mentor_profile in mentors:
-            # Count students assigned to this mentor on this floor
-            student_count = UserProfile.objects.filter(
+        # Students assigned to each mentor on this floor, in one grouped query
+        assigned_counts = dict(
+            UserProfile.objects.filter(
                 role='STUDENT',
                 campus=campus,
                 floor=floor,
-                assigned_mentor=mentor_profile.user
-            ).count()
+                assigned_mentor__isnull=False
+            ).order_by().values('assigned_mentor').annotate(
+                count=Count('id')
+            ).values_list('assigned_mentor', 'count')
+        )
+        
+        mentor_data = []
+        for mentor_profile in mentors:
+            student_count = assigned_counts.get(mentor_profile.user_id, 0)
             
             mentor_data.append({
                 'id': mentor_profile.user.id,
@@ -244,6 +143,9 @@ class AdminFloorDetailView(APIView):
             floor=floor
         ).select_related('user', 'assigned_mentor')
         
+        # Submission totals across all pillars for every student on the floor
+        submission_totals = CampusStatsService.student_submission_totals(campus, floor)
+        
         student_data = []
         for student_profile in students:
             mentor_name = None
@@ -251,8 +153,7 @@ class AdminFloorDetailView(APIView):
                 mentor = student_profile.assigned_mentor
                 mentor_name = f"{mentor.first_name} {mentor.last_name}"
             
-            # Get real submission count for this student
-            submission_count = self._get_student_submission_count(student_profile.user)
+            submission_count = submission_totals.get(student_profile.user_id, 0)
             
             student_data.append({
                 'id': student_profile.user.id,
@@ -283,47 +184,6 @@ class AdminFloorDetailView(APIView):
                 'unassigned_students': sum(1 for s in student_data if not s['mentor_id'])
             }
         }, status=status.HTTP_200_OK)
-    
-    def _get_student_submission_count(self, user):
-        """Get total submission count for a student across all pillars"""
-        count = 0
-        
-        try:
-            count += CLTSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += HackathonSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += BMCVideoSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += InternshipSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += GenAIProjectSubmission.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += LinkedInPostVerification.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        try:
-            count += LinkedInConnectionVerification.objects.filter(user=user).count()
-        except Exception:
-            pass
-        
-        return count
 
 
 class AdminAssignFloorWingView(APIView):
@@ -643,125 +503,24 @@ class AdminStatsView(APIView):
     
     def get(self, request):
         try:
-            # Get all students count
-            total_students = UserProfile.objects.filter(role='STUDENT').count()
-            
-            # Get all mentors count
-            total_mentors = UserProfile.objects.filter(role='MENTOR').count()
-            
-            # Get all floor wings count (total floors with floor wings)
-            total_floors = UserProfile.objects.filter(role='FLOOR_WING').values('campus', 'floor').distinct().count()
-            
-            # Get submission stats from all pillars - use try/except for each to handle missing models
-            clt_pending = clt_approved = clt_rejected = 0
-            try:
-                clt_pending = CLTSubmission.objects.filter(status__in=['draft', 'submitted', 'under_review']).count()
-                clt_approved = CLTSubmission.objects.filter(status='approved').count()
-                clt_rejected = CLTSubmission.objects.filter(status='rejected').count()
-            except Exception:
-                pass
-            
-            # CFC Submissions
-            hackathon_pending = hackathon_approved = hackathon_rejected = 0
-            bmc_pending = bmc_approved = bmc_rejected = 0
-            internship_pending = internship_approved = internship_rejected = 0
-            genai_pending = genai_approved = genai_rejected = 0
-            
-            try:
-                hackathon_pending = HackathonSubmission.objects.filter(status__in=['draft', 'submitted', 'under_review']).count()
-                hackathon_approved = HackathonSubmission.objects.filter(status='approved').count()
-                hackathon_rejected = HackathonSubmission.objects.filter(status='rejected').count()
-            except Exception:
-                pass
-            
-            try:
-                bmc_pending = BMCVideoSubmission.objects.filter(status__in=['draft', 'submitted', 'under_review']).count()
-                bmc_approved = BMCVideoSubmission.objects.filter(status='approved').count()
-                bmc_rejected = BMCVideoSubmission.objects.filter(status='rejected').count()
-            except Exception:
-                pass
-            
-            try:
-                internship_pending = InternshipSubmission.objects.filter(status__in=['draft', 'submitted', 'under_review']).count()
-                internship_approved = InternshipSubmission.objects.filter(status='approved').count()
-                internship_rejected = InternshipSubmission.objects.filter(status='rejected').count()
-            except Exception:
-                pass
-            
-            try:
-                genai_pending = GenAIProjectSubmission.objects.filter(status__in=['draft', 'submitted', 'under_review']).count()
-                genai_approved = GenAIProjectSubmission.objects.filter(status='approved').count()
-                genai_rejected = GenAIProjectSubmission.objects.filter(status='rejected').count()
-            except Exception:
-                pass
-            
-            # IIPC Submissions
-            linkedin_post_pending = linkedin_post_approved = linkedin_post_rejected = 0
-            linkedin_conn_pending = linkedin_conn_approved = linkedin_conn_rejected = 0
-            
-            try:
-                linkedin_post_pending = LinkedInPostVerification.objects.filter(status__in=['draft', 'submitted', 'under_review']).count()
-                linkedin_post_approved = LinkedInPostVerification.objects.filter(status='approved').count()
-                linkedin_post_rejected = LinkedInPostVerification.objects.filter(status='rejected').count()
-            except Exception:
-                pass
-            
-            try:
-                linkedin_conn_pending = LinkedInConnectionVerification.objects.filter(status__in=['draft', 'submitted', 'under_review']).count()
-                linkedin_conn_approved = LinkedInConnectionVerification.objects.filter(status='approved').count()
-                linkedin_conn_rejected = LinkedInConnectionVerification.objects.filter(status='rejected').count()
-            except Exception:
-                pass
-            
-            # Aggregate totals
-            total_pending = (clt_pending + hackathon_pending + bmc_pending + internship_pending + 
-                           genai_pending + linkedin_post_pending + linkedin_conn_pending)
-            total_approved = (clt_approved + hackathon_approved + bmc_approved + internship_approved + 
-                            genai_approved + linkedin_post_approved + linkedin_conn_approved)
-            total_rejected = (clt_rejected + hackathon_rejected + bmc_rejected + internship_rejected + 
-                            genai_rejected + linkedin_post_rejected + linkedin_conn_rejected)
-            
-            # Simple active users count - students with any submissions
-            active_users = 0
-            try:
-                # Get unique user IDs with any submission activity
-                active_user_ids = set()
-                
-                for submission_qs in [
-                    CLTSubmission.objects.values_list('user_id', flat=True),
-                    HackathonSubmission.objects.values_list('user_id', flat=True),
-                    BMCVideoSubmission.objects.values_list('user_id', flat=True),
-                    InternshipSubmission.objects.values_list('user_id', flat=True),
-                    GenAIProjectSubmission.objects.values_list('user_id', flat=True),
-                    LinkedInPostVerification.objects.values_list('user_id', flat=True),
-                    LinkedInConnectionVerification.objects.values_list('user_id', flat=True),
-                ]:
-                    try:
-                        active_user_ids.update(submission_qs)
-                    except Exception:
-                        pass
-                
-                active_users = len(active_user_ids)
-            except Exception:
-                active_users = total_students  # Fallback
+            stats = AdminStatsService.current()
+            total_submissions = stats['pending'] + stats['approved'] + stats['rejected']
             
             return Response({
-                'totalStudents': total_students,
-                'totalMentors': total_mentors,
-                'totalFloors': total_floors,
-                'pendingSubmissions': total_pending,
-                'approvedSubmissions': total_approved,
-                'rejectedSubmissions': total_rejected,
-                'activeUsers': active_users,
-                'submissionsThisWeek': total_pending + total_approved + total_rejected,
+                'totalStudents': stats['total_students'],
+                'totalMentors': stats['total_mentors'],
+                'totalFloors': stats['floor_wing_floors'],
+                'pendingSubmissions': stats['pending'],
+                'approvedSubmissions': stats['approved'],
+                'rejectedSubmissions': stats['rejected'],
+                'activeUsers': stats['active_users'],
+                'submissionsThisWeek': total_submissions,
                 'xpGivenThisMonth': 0,
                 'floorPerformanceScore': 0,
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            import traceback
-            print(f"AdminStatsView Error: {str(e)}")
-            print(traceback.format_exc())
+            logger.exception("AdminStatsView error")
             
             # Return default values on error
             return Response({
@@ -1,14 +1,25 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db.models import Count
+from apps.batch_serializers import BatchListSerializer, BatchMethodField
 from .models import FloorAnnouncement
 
 
+def announcements_read_by_request_user(serializer, announcement_ids):
+    """{announcement id: True} for the announcements the requesting user has read"""
+    request = serializer.context.get('request')
+    if not (request and request.user.is_authenticated):
+        return {}
+    read = FloorAnnouncement.objects.filter(id__in=announcement_ids, read_by=request.user)
+    return {announcement_id: True for announcement_id in read.values_list('id', flat=True)}
+
+
 class FloorAnnouncementSerializer(serializers.ModelSerializer):
     """Serializer for Floor Announcements"""
     floor_wing_name = serializers.SerializerMethodField()
     is_expired = serializers.BooleanField(read_only=True)
-    read_count = serializers.IntegerField(read_only=True)
-    is_read = serializers.SerializerMethodField()
+    read_count = BatchMethodField(missing=0)
+    is_read = BatchMethodField(missing=False)
     expires_at = serializers.DateTimeField(required=False, allow_null=True)
     
     class Meta:
@@ -21,17 +32,22 @@ class FloorAnnouncementSerializer(serializers.ModelSerializer):
             'is_expired', 'read_count', 'is_read'
         ]
         read_only_fields = ['floor_wing', 'created_at', 'updated_at', 'campus', 'floor']
+        list_serializer_class = BatchListSerializer
     
     def get_floor_wing_name(self, obj):
         """Get floor wing name"""
         return obj.floor_wing.get_full_name() or obj.floor_wing.username
     
-    def get_is_read(self, obj):
-        """Check if current user has read this announcement"""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.is_read_by(request.user)
-        return False
+    def batch_read_count(self, announcement_ids):
+        """Number of readers of each announcement"""
+        return dict(
+            FloorAnnouncement.objects.filter(id__in=announcement_ids).order_by()
+            .annotate(total=Count('read_by')).values_list('id', 'total')
+        )
+    
+    def batch_is_read(self, announcement_ids):
+        """Check which of these announcements the current user has read"""
+        return announcements_read_by_request_user(self, announcement_ids)
     
     def validate_expires_at(self, value):
         """Convert empty string to None"""
@@ -55,7 +71,7 @@ class FloorAnnouncementSerializer(serializers.ModelSerializer):
 class FloorAnnouncementListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing announcements"""
     floor_wing_name = serializers.SerializerMethodField()
-    is_read = serializers.SerializerMethodField()
+    is_read = BatchMethodField(missing=False)
     
     class Meta:
         model = FloorAnnouncement
@@ -63,12 +79,10 @@ class FloorAnnouncementListSerializer(serializers.ModelSerializer):
             'id', 'title', 'priority', 'status',
             'floor_wing_name', 'created_at', 'is_read'
         ]
+        list_serializer_class = BatchListSerializer
     
     def get_floor_wing_name(self, obj):
         return obj.floor_wing.get_full_name() or obj.floor_wing.username
     
-    def get_is_read(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.is_read_by(request.user)
-        return False
+    def batch_is_read(self, announcement_ids):
+        return announcements_read_by_request_user(self, announcement_ids)
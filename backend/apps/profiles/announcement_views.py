@@ -6,6 +6,7 @@ from django.utils import timezone
 from django.db.models import Q, Count, Avg
 from django.contrib.auth.models import User
 from .models import FloorAnnouncement, UserProfile
+from apps.dashboard.unread import UnreadCounterService
 from .notification_models import Notification
 from .announcement_serializers import FloorAnnouncementSerializer, FloorAnnouncementListSerializer
 from .permissions import IsFloorWing
@@ -75,6 +76,7 @@ class FloorAnnouncementViewSet(viewsets.ModelViewSet):
         # Bulk create all notifications at once
         if notifications:
             Notification.objects.bulk_create(notifications)
+            UnreadCounterService.record_created(Notification, [n.recipient_id for n in notifications])
             print(f"Created {len(notifications)} notifications for announcement: {announcement.title}")
     
     @action(detail=False, methods=['get'])
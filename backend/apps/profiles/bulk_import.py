@@ -0,0 +1,423 @@
+"""
+Bulk user import
+
+UserImportEngine streams rows from a CSV or XLSX file (or any iterable of
+dicts), validates them and writes them in batches of USER_IMPORT_BATCH_SIZE:
+passwords are hashed across a process pool of USER_IMPORT_HASH_WORKERS, then
+users, profiles, LegacyScores and VaultWallets are written with bulk_create.
+bulk_create sends no post_save, so the per-user signals never run; the engine
+writes what they would have. Episode progress is provisioned on first read
+(EpisodeProgressService.ensure_for_student).
+
+Existing accounts are matched by email (or username) and updated in place;
+their mentor assignment only changes when the row names a mentor. A bad
+row is recorded in the ImportReport with its row number and the rest of
+the file carries on.
+
+Used by `manage.py import_users`, the other account-creating commands and
+the admin import endpoint.
+"""
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Case, Q, Value, When
+from django.utils import timezone
+
+from .models import UserProfile
+
+
+class UserImportError(Exception):
+    """The import source cannot be read at all"""
+
+
+def _column(name):
+    return str(name or '').strip().lower().replace(' ', '_')
+
+
+def read_rows(source, file_format=None):
+    """
+    Yield (row number, {column: value}) from a CSV or XLSX file, one row at a time
+    source: path or binary file object; the format comes from its name unless given
+    Column names are lower-cased with spaces as underscores; empty rows are skipped
+    """
+    name = source if isinstance(source, str) else getattr(source, 'name', '') or ''
+    file_format = (file_format or os.path.splitext(name)[1].lstrip('.') or 'csv').lower()
+    if file_format == 'csv':
+        yield from _read_csv(source)
+    elif file_format in ('xlsx', 'xlsm'):
+        yield from _read_xlsx(source)
+    else:
+        raise UserImportError(f'Unsupported import format: {file_format}')
+
+
+def _read_csv(source):
+    if isinstance(source, str):
+        file = open(source, encoding='utf-8-sig', newline='')
+    else:
+        file = io.TextIOWrapper(getattr(source, 'file', source), encoding='utf-8-sig', newline='')
+    with file:
+        reader = csv.reader(file)
+        try:
+            header = [_column(cell) for cell in next(reader, [])]
+            for number, values in enumerate(reader, start=2):
+                if any(value.strip() for value in values):
+                    yield number, {column: value for column, value in zip(header, values) if column}
+        except (csv.Error, UnicodeDecodeError) as e:
+            raise UserImportError(f'Unreadable CSV: {e}')
+
+
+def _read_xlsx(source):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise UserImportError('Reading XLSX files needs openpyxl (pip install openpyxl)')
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [_column(cell) for cell in next(rows, ())]
+        for number, values in enumerate(rows, start=2):
+            if any(value not in (None, '') for value in values):
+                yield number, {
+                    column: '' if value is None else str(value)
+                    for column, value in zip(header, values) if column
+                }
+    finally:
+        workbook.close()
+
+
+class ImportReport:
+    """Counts and per-row outcomes of one import"""
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        # [(row number, message)]
+        self.errors = []
+        # [{'row', 'username', 'email', 'status'}]
+        self.rows = []
+
+    @property
+    def processed(self):
+        return self.created + self.updated + self.skipped + len(self.errors)
+
+    def add(self, number, row, status):
+        setattr(self, status, getattr(self, status) + 1)
+        self.rows.append({'row': number, 'username': row['username'], 'email': row['email'], 'status': status})
+
+    def error(self, number, data, message):
+        self.errors.append((number, message))
+        self.rows.append({
+            'row': number, 'username': data.get('username', ''), 'email': data.get('email', ''),
+            'status': 'error', 'error': message,
+        })
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'skipped': self.skipped,
+            'errors': [{'row': number, 'error': message} for number, message in self.errors],
+            'total': self.processed,
+        }
+
+    def __str__(self):
+        return (
+            f'{self.processed} rows: {self.created} created, {self.updated} updated, '
+            f'{self.skipped} skipped, {len(self.errors)} errors'
+        )
+
+
+class UserImportEngine:
+    """
+    Create or update accounts from rows of user data
+
+    Recognised columns: email, username (defaults to the email), password,
+    first_name, last_name, name (split into first and last names when those
+    are empty), role, campus, floor, mentor (the email or username of an
+    existing mentor, or of a MENTOR row in the same batch or an earlier one),
+    is_staff, is_superuser. Missing role, campus, floor and password fall
+    back to the engine's defaults. The is_staff and is_superuser columns are
+    ignored unless a trusted caller passes allow_privileges=True.
+    """
+
+    TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+
+    def __init__(self, role='STUDENT', campus=None, floor=None, default_password=None, match_on='email',
+                 update_existing=True, reset_passwords=True, workers=None, batch_size=None, progress=None,
+                 allow_privileges=False, roles=None):
+        if match_on not in ('email', 'username'):
+            raise ValueError('match_on must be email or username')
+        self.role = role
+        self.campus = campus
+        self.floor = floor
+        # None leaves new accounts without a usable password
+        self.default_password = default_password
+        self.match_on = match_on
+        # Off: existing accounts are reported as skipped and left untouched
+        self.update_existing = update_existing
+        # Off: existing accounts keep their passwords
+        self.reset_passwords = reset_passwords
+        self.workers = workers if workers is not None else settings.USER_IMPORT_HASH_WORKERS
+        self.batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+        # Called with the ImportReport after every batch
+        self.progress = progress
+        # Off: is_staff and is_superuser columns are ignored (files from untrusted uploads)
+        self.allow_privileges = allow_privileges
+        # Roles rows may ask for; None allows every role
+        self.roles = set(roles) if roles is not None else None
+        self._mentors = {}
+
+    def run(self, rows):
+        """
+        Import rows: dicts, or (row number, dict) pairs as yielded by read_rows
+        Returns an ImportReport
+        """
+        report = ImportReport()
+        seen = {'email': set(), 'username': set()}
+        numbered = (row if isinstance(row, tuple) else (number, row) for number, row in enumerate(rows, start=1))
+        pool = ProcessPoolExecutor(self.workers, initializer=django.setup) if self.workers > 1 else None
+        try:
+            while True:
+                batch = list(islice(numbered, self.batch_size))
+                if not batch:
+                    break
+                self._import_batch(batch, report, seen, pool)
+                if self.progress:
+                    self.progress(report)
+        finally:
+            if pool:
+                pool.shutdown()
+        # Rows failing validation are reported before the database checks of their batch
+        report.errors.sort()
+        report.rows.sort(key=lambda row: row['row'])
+        return report
+
+    def parse(self, data):
+        """Validated values of one row; raises ValidationError"""
+        data = {_column(key): str(value).strip() for key, value in data.items() if value is not None}
+        errors = []
+
+        email = data.get('email', '').lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors.append(f"Invalid email '{email}'")
+        username = data.get('username') or email
+        if len(username) > 150:
+            errors.append('Username is longer than 150 characters')
+
+        role = (data.get('role') or self.role or '').upper().replace(' ', '_')
+        if role not in dict(UserProfile.ROLE_CHOICES):
+            errors.append(f"Unknown role '{role}'")
+        elif self.roles is not None and role not in self.roles:
+            errors.append(f"Role '{role}' cannot be imported here")
+        campus = (data.get('campus') or self.campus or '').upper() or None
+        if campus is not None and campus not in dict(UserProfile.CAMPUS_CHOICES):
+            errors.append(f"Unknown campus '{campus}'")
+        floor = data.get('floor') or self.floor
+        if floor not in (None, ''):
+            try:
+                floor = int(float(floor))
+            except ValueError:
+                floor = None
+            if floor not in dict(UserProfile.FLOOR_CHOICES):
+                errors.append(f"Floor must be one of {', '.join(str(f) for f, _ in UserProfile.FLOOR_CHOICES)}")
+        else:
+            floor = None
+        if role == 'STUDENT' and not (campus and floor):
+            errors.append('Students must be assigned to a campus and floor')
+        if errors:
+            raise ValidationError(errors)
+
+        first_name, last_name = data.get('first_name', ''), data.get('last_name', '')
+        if not first_name and not last_name:
+            first_name, _, last_name = (data.get('name') or username.split('@')[0]).partition(' ')
+
+        def flag(column):
+            if not self.allow_privileges or not data.get(column):
+                return None
+            return data[column].lower() in self.TRUE_VALUES
+
+        return {
+            'email': email,
+            'username': username,
+            'password': data.get('password') or self.default_password,
+            'first_name': first_name[:150],
+            'last_name': last_name.strip()[:150],
+            'role': role,
+            'campus': campus,
+            'floor': floor,
+            'mentor': data.get('mentor', ''),
+            'is_staff': flag('is_staff'),
+            'is_superuser': flag('is_superuser'),
+        }
+
+    def hash_passwords(self, passwords, pool=None):
+        """make_password for each password, spread over the pool when there is one"""
+        if pool is None or len(passwords) < 2:
+            return [make_password(password) for password in passwords]
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (self.workers * 4))))
+
+    def resolve_mentors(self, identifiers):
+        """{email or username: mentor user}, cached for the whole run"""
+        missing = [identifier for identifier in identifiers if identifier not in self._mentors]
+        if missing:
+            mentors = User.objects.filter(
+                Q(email__in=missing) | Q(username__in=missing), profile__role='MENTOR'
+            )
+            for mentor in mentors:
+                self._mentors[mentor.email] = self._mentors[mentor.username] = mentor
+        return self._mentors
+
+    def _import_batch(self, batch, report, seen, pool):
+        parsed = []
+        for number, data in batch:
+            try:
+                row = self.parse(data)
+            except ValidationError as error:
+                report.error(number, data, '; '.join(error.messages))
+                continue
+            duplicate = next((field for field in ('email', 'username') if row[field] in seen[field]), None)
+            if duplicate:
+                report.error(number, data, f"Duplicate {duplicate} '{row[duplicate]}' earlier in the file")
+                continue
+            seen['email'].add(row['email'])
+            seen['username'].add(row['username'])
+            parsed.append((number, row))
+        if not parsed:
+            return
+
+        keys = [row[self.match_on] for _, row in parsed]
+        existing = {getattr(user, self.match_on): user for user in User.objects.filter(**{f'{self.match_on}__in': keys})}
+        new_usernames = [row['username'] for _, row in parsed if row[self.match_on] not in existing]
+        taken = set(User.objects.filter(username__in=new_usernames).values_list('username', flat=True))
+        mentors = self.resolve_mentors({row['mentor'] for _, row in parsed if row['mentor']})
+        # Students may name a mentor whose own row is in this batch
+        batch_mentors = {row[field] for _, row in parsed if row['role'] == 'MENTOR' for field in ('email', 'username')}
+
+        to_create, to_update = [], []
+        for number, row in parsed:
+            if row['mentor'] and row['mentor'] not in mentors and (
+                row['role'] == 'MENTOR' or row['mentor'] not in batch_mentors
+            ):
+                report.error(number, row, f"Unknown mentor '{row['mentor']}'")
+            elif row[self.match_on] in existing:
+                if self.update_existing:
+                    to_update.append((number, row, existing[row[self.match_on]]))
+                else:
+                    report.add(number, row, 'skipped')
+            elif row['username'] in taken:
+                report.error(number, row, f"Username '{row['username']}' belongs to another account")
+            else:
+                to_create.append((number, row))
+
+        # Rows naming a batch mentor whose own row failed have no mentor to point at
+        batch_mentors = {
+            row[field] for _, row, *_ in to_create + to_update if row['role'] == 'MENTOR' for field in ('email', 'username')
+        }
+
+        def mentor_missing(number, row, *_):
+            if row['mentor'] and row['mentor'] not in mentors and row['mentor'] not in batch_mentors:
+                report.error(number, row, f"Unknown mentor '{row['mentor']}'")
+                return True
+            return False
+
+        to_create = [entry for entry in to_create if not mentor_missing(*entry)]
+        to_update = [entry for entry in to_update if not mentor_missing(*entry)]
+
+        rehash = [(number, row, user) for number, row, user in to_update if self.reset_passwords and row['password']]
+        hashes = iter(self.hash_passwords(
+            [row['password'] for _, row in to_create] + [row['password'] for _, row, _ in rehash], pool
+        ))
+
+        with transaction.atomic():
+            created = User.objects.bulk_create([
+                User(
+                    username=row['username'], email=row['email'], password=next(hashes),
+                    first_name=row['first_name'], last_name=row['last_name'],
+                    is_staff=bool(row['is_staff'] or row['is_superuser']), is_superuser=bool(row['is_superuser']),
+                )
+                for _, row in to_create
+            ])
+            for _, row, user in rehash:
+                user.password = next(hashes)
+            self._update_users(to_update, bool(rehash))
+
+            written = [(row, user) for (_, row), user in zip(to_create, created)]
+            written += [(row, user) for _, row, user in to_update]
+            # The run's mentor cache, so this batch and later ones can point at new mentors
+            for row, user in written:
+                if row['role'] == 'MENTOR':
+                    mentors.setdefault(row['email'], user)
+                    mentors.setdefault(row['username'], user)
+            # assigned_mentor is only inserted here; existing profiles get it below
+            UserProfile.objects.bulk_create(
+                [
+                    UserProfile(
+                        user=user, role=row['role'], campus=row['campus'], floor=row['floor'],
+                        assigned_mentor=mentors.get(row['mentor']),
+                    )
+                    for row, user in written
+                ],
+                update_conflicts=True,
+                unique_fields=['user'],
+                update_fields=['role', 'campus', 'floor', 'updated_at'],
+            )
+            self._assign_mentors(
+                {user.id: mentors[row['mentor']].id for _, row, user in to_update if row['mentor']}
+            )
+            self._create_gamification_records([user for _, user in written])
+
+        if to_update:
+            # bulk writes skip post_save, which drops the claims cache of saved users
+            from apps.jwt_authentication import UserClaims
+            UserClaims.invalidate(*[user.id for _, _, user in to_update])
+
+        for (number, row), user in zip(to_create, created):
+            report.add(number, row, 'created')
+        for number, row, user in to_update:
+            report.add(number, row, 'updated')
+
+    def _update_users(self, to_update, passwords_changed):
+        if not to_update:
+            return
+        fields = ['first_name', 'last_name']
+        fields += ['email'] if self.match_on == 'username' else []
+        fields += ['password'] if passwords_changed else []
+        flags = False
+        for _, row, user in to_update:
+            user.first_name, user.last_name = row['first_name'], row['last_name']
+            user.email = row['email']
+            if row['is_superuser'] is not None or row['is_staff'] is not None:
+                flags = True
+                user.is_superuser = bool(row['is_superuser'])
+                user.is_staff = bool(row['is_staff'] or row['is_superuser'])
+        fields += ['is_staff', 'is_superuser'] if flags else []
+        User.objects.bulk_update([user for _, _, user in to_update], fields)
+
+    def _assign_mentors(self, mentor_ids):
+        """Point existing profiles at new mentors, {user id: mentor id}, in one UPDATE"""
+        if not mentor_ids:
+            return
+        UserProfile.objects.filter(user_id__in=mentor_ids).update(
+            assigned_mentor_id=Case(*[When(user_id=user_id, then=Value(mentor_id)) for user_id, mentor_id in mentor_ids.items()]),
+            updated_at=timezone.now(),
+        )
+
+    def _create_gamification_records(self, users):
+        """What the User post_save signal would create"""
+        from apps.gamification.models import LegacyScore, VaultWallet
+        LegacyScore.objects.bulk_create([LegacyScore(student=user) for user in users], ignore_conflicts=True)
+        VaultWallet.objects.bulk_create([VaultWallet(student=user) for user in users], ignore_conflicts=True)
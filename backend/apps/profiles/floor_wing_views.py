@@ -7,6 +7,7 @@ from django.db.models import Count, Q, Avg
 from apps.profiles.models import UserProfile
 from apps.profiles.permissions import IsFloorWing
 from apps.profiles.serializers import UserProfileSerializer
+from apps.dashboard.search import SearchService
 
 
 class FloorWingDashboardView(APIView):
@@ -37,11 +38,17 @@ class FloorWingDashboardView(APIView):
             floor=floor
         ).select_related('user')
         
+        # Students per mentor in one grouped query
+        assigned_counts = dict(
+            students.filter(assigned_mentor__isnull=False).order_by()
+            .values('assigned_mentor').annotate(total=Count('id'))
+            .values_list('assigned_mentor', 'total')
+        )
+        
         # Calculate mentor workload with detailed stats
         mentor_stats = []
         for mentor_profile in mentors:
-            assigned_students = students.filter(assigned_mentor=mentor_profile.user)
-            assigned_count = assigned_students.count()
+            assigned_count = assigned_counts.get(mentor_profile.user_id, 0)
             
             # Get submission stats for this mentor's students
             # This is a simplified version - expand based on your submission models
@@ -127,6 +134,7 @@ class FloorWingStudentsView(APIView):
         
         # Get filter parameters
         filter_type = request.query_params.get('filter', 'all')  # all, unassigned, at_risk, low_progress
+        search_query = request.query_params.get('search', '')
         
         students = UserProfile.objects.filter(
             role='STUDENT',
@@ -144,6 +152,9 @@ class FloorWingStudentsView(APIView):
             # Students below certain completion threshold
             pass
         
+        if search_query:
+            students = SearchService.search_users(students, search_query).order_by('-search_rank', 'user__username')
+        
         student_data = []
         for student_profile in students:
             mentor_name = None
@@ -231,10 +242,16 @@ class FloorWingMentorsView(APIView):
             floor=floor
         ).select_related('user')
         
+        # Students per mentor in one grouped query
+        assigned_counts = dict(
+            students.filter(assigned_mentor__isnull=False).order_by()
+            .values('assigned_mentor').annotate(total=Count('id'))
+            .values_list('assigned_mentor', 'total')
+        )
+        
         mentor_data = []
         for mentor_profile in mentors:
-            assigned_students = students.filter(assigned_mentor=mentor_profile.user)
-            assigned_count = assigned_students.count()
+            assigned_count = assigned_counts.get(mentor_profile.user_id, 0)
             
             # Get submission stats for this mentor's students
             pending_reviews = 0  # Implement based on submission model
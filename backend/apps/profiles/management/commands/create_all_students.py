@@ -5,6 +5,7 @@ Runs automatically during Render build
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from apps.profiles.bulk_import import UserImportEngine
 from apps.profiles.models import UserProfile
 
 # Student data: (username, email, first_name, second_name, mentor_name)
@@ -169,107 +170,61 @@ class Command(BaseCommand):
         self.stdout.write(f'📊 Total student records to process: {len(STUDENTS_DATA)}')
         self.stdout.write('========================================\n')
         
+        # Existing accounts keep their passwords; their profiles are updated
+        def engine(role, password):
+            return UserImportEngine(role=role, campus='TECH', floor=2, default_password=password, reset_passwords=False)
+        
         # Create mentors first
-        mentor_users = {}
         mentors_to_create = ['GOPI KRISHNAN', 'RESHMA RAJ', 'TULSI KRISHNA']
+        mentor_emails = {
+            mentor_name: f"{mentor_name.lower().replace(' ', '_')}@cohortsummit.com"
+            for mentor_name in mentors_to_create
+        }
         
         self.stdout.write('Creating mentors...')
-        for mentor_name in mentors_to_create:
-            mentor_username = mentor_name.lower().replace(' ', '_')
-            mentor_email = f'{mentor_username}@cohortsummit.com'
-            
-            # Use email as username
-            mentor_user, created = User.objects.get_or_create(
-                email=mentor_email,
-                defaults={
-                    'username': mentor_email,
-                    'first_name': mentor_name.split()[0],
-                    'last_name': ' '.join(mentor_name.split()[1:]) if len(mentor_name.split()) > 1 else '',
-                }
-            )
-            if created:
-                mentor_user.set_password('mentor123')
-                mentor_user.save()
-                self.stdout.write(f'✅ Created mentor: {mentor_name} (login: {mentor_email})')
-            
-            # Ensure mentor profile exists
-            mentor_profile, _ = UserProfile.objects.get_or_create(user=mentor_user)
-            mentor_profile.role = 'MENTOR'
-            mentor_profile.campus = 'TECH'
-            mentor_profile.floor = 2
-            mentor_profile.save()
-            
-            mentor_users[mentor_name] = mentor_user
+        # Use email as username
+        mentor_report = engine('MENTOR', 'mentor123').run(
+            {'email': email, 'name': mentor_name} for mentor_name, email in mentor_emails.items()
+        )
+        for row in mentor_report.rows:
+            if row['status'] == 'created':
+                self.stdout.write(f"✅ Created mentor: {row['email']} (login: {row['email']})")
         
         self.stdout.write('\n' + '=' * 60)
         self.stdout.write('Creating students...')
         self.stdout.write('=' * 60 + '\n')
         
-        # Create students
-        created_count = 0
-        updated_count = 0
-        error_count = 0
+        def progress(report):
+            self.stdout.write(f'Processing student {report.processed}/{len(STUDENTS_DATA)}...')
         
-        for idx, (username, email, first_name, second_name, mentor_name) in enumerate(STUDENTS_DATA, 1):
-            try:
-                # Progress indicator every 20 students
-                if idx % 20 == 0:
-                    self.stdout.write(f'Processing student {idx}/{len(STUDENTS_DATA)}...')
-                
-                # Parse name
-                full_name = f"{first_name} {second_name}".strip() if first_name or second_name else username
-                name_parts = full_name.split(' ', 1) if full_name else username.split(' ', 1)
-                first = name_parts[0]
-                last = name_parts[1] if len(name_parts) > 1 else ''
-                
-                # Use email as username for login
-                login_username = email
-                
-                # Check if user exists
-                existing_user = User.objects.filter(email=email).first()
-                if existing_user:
-                    user = existing_user
-                    updated_count += 1
-                else:
-                    # Create new user
-                    user = User.objects.create_user(
-                        username=login_username,
-                        email=email,
-                        password='student123',
-                        first_name=first,
-                        last_name=last,
-                    )
-                    created_count += 1
-                
-                # Create or update profile
-                profile, _ = UserProfile.objects.get_or_create(user=user)
-                profile.role = 'STUDENT'
-                profile.campus = 'TECH'
-                profile.floor = 2
-                
-                # Assign mentor
-                if mentor_name in mentor_users:
-                    profile.assigned_mentor = mentor_users[mentor_name]
-                
-                profile.save()
-                
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(self.style.ERROR(f'❌ Error creating {username} ({email}): {str(e)[:100]}'))
-                import traceback
-                self.stdout.write(self.style.ERROR(f'Traceback: {traceback.format_exc()[:200]}'))
+        # Use email as username for login
+        student_engine = engine('STUDENT', 'student123')
+        student_engine.progress = progress
+        report = student_engine.run(
+            {
+                'email': email,
+                'first_name': first_name,
+                'last_name': second_name,
+                'name': username,
+                'mentor': mentor_emails.get(mentor_name, ''),
+            }
+            for username, email, first_name, second_name, mentor_name in STUDENTS_DATA
+        )
+        for number, message in report.errors:
+            username, email = STUDENTS_DATA[number - 1][:2]
+            self.stdout.write(self.style.ERROR(f'❌ Error creating {username} ({email}): {message[:100]}'))
         
         # Summary
         self.stdout.write('\n' + '=' * 60)
         self.stdout.write(self.style.SUCCESS('✅ Student creation complete!'))
-        self.stdout.write(f'   Created: {created_count} students')
-        self.stdout.write(f'   Updated: {updated_count} students')
-        if error_count > 0:
-            self.stdout.write(self.style.WARNING(f'   Errors: {error_count}'))
+        self.stdout.write(f'   Created: {report.created} students')
+        self.stdout.write(f'   Updated: {report.updated} students')
+        if report.errors:
+            self.stdout.write(self.style.WARNING(f'   Errors: {len(report.errors)}'))
         self.stdout.write(f'\n📊 Total students: {User.objects.filter(profile__role="STUDENT").count()}')
         self.stdout.write(f'📊 Total mentors: {User.objects.filter(profile__role="MENTOR").count()}')
         self.stdout.write('\nMentor distribution:')
-        for mentor_name, mentor_user in mentor_users.items():
-            count = UserProfile.objects.filter(assigned_mentor=mentor_user).count()
+        for mentor_name, email in mentor_emails.items():
+            count = UserProfile.objects.filter(assigned_mentor__email=email).count()
             self.stdout.write(f'   {mentor_name}: {count} students')
         self.stdout.write('=' * 60 + '\n')
@@ -4,85 +4,39 @@ Run this on Render after deployment: python manage.py create_production_users
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
-from django.db.utils import IntegrityError
-from apps.profiles.models import UserProfile
+from apps.profiles.bulk_import import UserImportEngine
 
 
 class Command(BaseCommand):
     help = 'Creates default users for production (admin, student, mentor, floorwing)'
 
-    def create_or_update_user(self, username, email, password, first_name, last_name, is_superuser=False, role=None, campus='TECH', floor=2):
-        """Helper to create or update a user and ensure it's properly configured"""
-        created = False
-        updated = False
-        
-        try:
-            user = User.objects.get(username=username)
-            self.stdout.write(f'Found existing user: {username}')
-            
-            # Ensure user is active and has correct email
-            if not user.is_active:
-                user.is_active = True
-                updated = True
-            if user.email != email:
-                user.email = email
-                updated = True
-            if user.first_name != first_name:
-                user.first_name = first_name
-                updated = True
-            if user.last_name != last_name:
-                user.last_name = last_name
-                updated = True
-            
-            # Reset password to ensure it's correct
-            user.set_password(password)
-            updated = True
-            
-            if updated:
-                user.save()
-                self.stdout.write(self.style.WARNING(f'⚠️  Updated existing user: {username}'))
+    # (username, email, password, first_name, last_name, role, is_superuser)
+    PRODUCTION_USERS = [
+        ('admin', 'admin@cohortsummit.com', 'admin123', 'Admin', 'User', 'ADMIN', True),
+        ('student', 'student@cohortsummit.com', 'student123', 'Test', 'Student', 'STUDENT', False),
+        ('mentor', 'mentor@cohortsummit.com', 'mentor123', 'Test', 'Mentor', 'MENTOR', False),
+        ('floorwing', 'floorwing@cohortsummit.com', 'floorwing123', 'Floor', 'Wing', 'FLOOR_WING', False),
+    ]
+
+    def create_or_update_users(self):
+        """Create the production users, or update them (matched by username) and reset their passwords"""
+        engine = UserImportEngine(campus='TECH', floor=2, match_on='username', allow_privileges=True)
+        report = engine.run(
+            {
+                'username': username, 'email': email, 'password': password,
+                'first_name': first_name, 'last_name': last_name, 'role': role,
+                'is_superuser': is_superuser,
+            }
+            for username, email, password, first_name, last_name, role, is_superuser in self.PRODUCTION_USERS
+        )
+        for row in report.rows:
+            if row['status'] == 'created':
+                self.stdout.write(self.style.SUCCESS(f"✅ Created new user: {row['username']}"))
+            elif row['status'] == 'updated':
+                self.stdout.write(self.style.WARNING(f"⚠️  Updated existing user: {row['username']}"))
             else:
-                self.stdout.write(self.style.WARNING(f'⚠️  User already exists and is configured: {username}'))
-                
-        except User.DoesNotExist:
-            # Create new user
-            try:
-                if is_superuser:
-                    user = User.objects.create_superuser(
-                        username=username,
-                        email=email,
-                        password=password,
-                        first_name=first_name,
-                        last_name=last_name
-                    )
-                else:
-                    user = User.objects.create_user(
-                        username=username,
-                        email=email,
-                        password=password,
-                        first_name=first_name,
-                        last_name=last_name
-                    )
-                created = True
-                self.stdout.write(self.style.SUCCESS(f'✅ Created new user: {username}'))
-            except IntegrityError as e:
-                self.stdout.write(self.style.ERROR(f'❌ Failed to create {username}: {e}'))
-                return
-        
-        # Ensure profile exists and is configured
-        if hasattr(user, 'profile'):
-            profile = user.profile
-        else:
-            profile = UserProfile.objects.create(user=user)
-            self.stdout.write(f'Created profile for {username}')
-        
-        if role:
-            profile.role = role
-            profile.campus = campus
-            profile.floor = floor
-            profile.save()
-        
-        return user
+                self.stdout.write(self.style.ERROR(f"❌ Failed to create {row['username']}: {row['error']}"))
+        return report
 
     def handle(self, *args, **options):
         from django.db import connection
@@ -111,52 +65,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f'⚠️  Could not delete all users: {e}'))
             self.stdout.write(self.style.WARNING('Will update existing users instead\n'))
         
-        # Create/Update Admin User
-        self.create_or_update_user(
-            username='admin',
-            email='admin@cohortsummit.com',
-            password='admin123',
-            first_name='Admin',
-            last_name='User',
-            is_superuser=True,
-            role='ADMIN'
-        )
-
-        # Create/Update Student User
-        self.create_or_update_user(
-            username='student',
-            email='student@cohortsummit.com',
-            password='student123',
-            first_name='Test',
-            last_name='Student',
-            role='STUDENT',
-            campus='TECH',
-            floor=2
-        )
-
-        # Create/Update Mentor User
-        self.create_or_update_user(
-            username='mentor',
-            email='mentor@cohortsummit.com',
-            password='mentor123',
-            first_name='Test',
-            last_name='Mentor',
-            role='MENTOR',
-            campus='TECH',
-            floor=2
-        )
-
-        # Create/Update Floor Wing User
-        self.create_or_update_user(
-            username='floorwing',
-            email='floorwing@cohortsummit.com',
-            password='floorwing123',
-            first_name='Floor',
-            last_name='Wing',
-            role='FLOOR_WING',
-            campus='TECH',
-            floor=2
-        )
+        self.create_or_update_users()
 
         self.stdout.write('\n========================================')
         self.stdout.write(self.style.SUCCESS('🎉 Production users setup complete!'))
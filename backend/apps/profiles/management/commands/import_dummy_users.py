@@ -2,9 +2,7 @@
 Import dummy users from CSV and create them as students on Floor 2, SNS College of Technology
 """
 from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
-from apps.profiles.models import UserProfile
-import csv
+from apps.profiles.bulk_import import UserImportEngine, read_rows
 import os
 
 
@@ -31,62 +29,29 @@ class Command(BaseCommand):
             self.stdout.write(self.style.ERROR(f'CSV file not found at: {csv_path}'))
             return
         
-        created_count = 0
-        updated_count = 0
+        # Existing users (matched by email) get the test password and student profile again
+        engine = UserImportEngine(
+            role='STUDENT',
+            campus=campus,
+            floor=floor,
+            default_password=get_test_password('student'),  # Using configured test password
+        )
+        report = engine.run(read_rows(csv_path))
         
-        with open(csv_path, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            for row in reader:
-                email = row['email'].strip()
-                username = row['username'].strip()
-                password = get_test_password('student')  # Using configured test password
-                
-                # Create or update user
-                user, created = User.objects.get_or_create(
-                    email=email,
-                    defaults={
-                        'username': username,
-                        'first_name': username.split()[0] if username else '',
-                        'last_name': ' '.join(username.split()[1:]) if len(username.split()) > 1 else ''
-                    }
-                )
-                
-                if created:
-                    user.set_password(password)
-                    user.save()
-                    created_count += 1
-                    status = "✅ CREATED"
-                else:
-                    # Update password for existing user
-                    user.set_password(password)
-                    user.save()
-                    updated_count += 1
-                    status = "🔄 UPDATED"
-                
-                # Create or update profile
-                profile, profile_created = UserProfile.objects.get_or_create(
-                    user=user,
-                    defaults={
-                        'role': 'STUDENT',
-                        'campus': campus,
-                        'floor': floor,
-                    }
-                )
-                
-                if not profile_created:
-                    # Update existing profile
-                    profile.role = 'STUDENT'
-                    profile.campus = campus
-                    profile.floor = floor
-                    profile.save()
-                
-                self.stdout.write(f"{status} | {username:30} | {email:40} | Floor {floor}")
+        status_labels = {'created': "✅ CREATED", 'updated': "🔄 UPDATED", 'error': "❌ ERROR"}
+        for row in report.rows:
+            line = f"{status_labels[row['status']]} | {row['username']:30} | {row['email']:40} | Floor {floor}"
+            if row['status'] == 'error':
+                self.stdout.write(self.style.ERROR(f"{line} | {row['error']}"))
+            else:
+                self.stdout.write(line)
         
         self.stdout.write("\n" + "="*60)
-        self.stdout.write(self.style.SUCCESS(f"✅ Total Created: {created_count}"))
-        self.stdout.write(self.style.SUCCESS(f"🔄 Total Updated: {updated_count}"))
-        self.stdout.write(self.style.SUCCESS(f"📊 Total Processed: {created_count + updated_count}"))
+        self.stdout.write(self.style.SUCCESS(f"✅ Total Created: {report.created}"))
+        self.stdout.write(self.style.SUCCESS(f"🔄 Total Updated: {report.updated}"))
+        self.stdout.write(self.style.SUCCESS(f"📊 Total Processed: {report.created + report.updated}"))
+        if report.errors:
+            self.stdout.write(self.style.WARNING(f"❌ Rows with errors: {len(report.errors)}"))
         self.stdout.write("\n🔑 All passwords set to: pass123#")
         self.stdout.write(f"🏢 Campus: SNS College of Technology")
         self.stdout.write(f"🏢 Floor: 2")
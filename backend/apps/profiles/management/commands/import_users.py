@@ -0,0 +1,63 @@
+"""
+Management command to import accounts from a CSV or XLSX file with UserImportEngine
+Columns: email (required), username, password, first_name, last_name, name,
+role, campus, floor, mentor, is_staff, is_superuser
+
+Usage:
+    python manage.py import_users intake.csv --campus TECH --floor 1 --password 'welcome123#'
+    python manage.py import_users intake.xlsx --workers 8 --batch-size 1000
+    python manage.py import_users mentors.csv --role MENTOR --keep-passwords
+    python manage.py import_users students.csv --skip-existing     # only create new accounts
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.profiles.bulk_import import UserImportEngine, UserImportError, read_rows
+from apps.profiles.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create or update users, profiles and gamification records from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'xlsx'], help='Default: from the file extension')
+        parser.add_argument('--role', choices=[role for role, _ in UserProfile.ROLE_CHOICES], default='STUDENT')
+        parser.add_argument('--campus', choices=[campus for campus, _ in UserProfile.CAMPUS_CHOICES])
+        parser.add_argument('--floor', type=int, choices=[floor for floor, _ in UserProfile.FLOOR_CHOICES])
+        parser.add_argument('--password', help='Password of rows without one (default: unusable)')
+        parser.add_argument('--match-on', choices=['email', 'username'], default='email')
+        parser.add_argument('--skip-existing', action='store_true', help='Leave existing accounts untouched')
+        parser.add_argument('--keep-passwords', action='store_true', help='Do not reset passwords of existing accounts')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (default: USER_IMPORT_HASH_WORKERS)')
+        parser.add_argument('--batch-size', type=int, help='Rows per transaction (default: USER_IMPORT_BATCH_SIZE)')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def progress(report):
+            self.stdout.write(f'  {report} ({time.monotonic() - started:.1f}s)')
+
+        engine = UserImportEngine(
+            role=options['role'],
+            campus=options['campus'],
+            floor=options['floor'],
+            default_password=options['password'],
+            match_on=options['match_on'],
+            update_existing=not options['skip_existing'],
+            reset_passwords=not options['keep_passwords'],
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            progress=progress,
+            allow_privileges=True,
+        )
+        try:
+            report = engine.run(read_rows(options['path'], options['format']))
+        except (OSError, UserImportError) as e:
+            raise CommandError(str(e))
+
+        for number, message in report.errors:
+            self.stdout.write(self.style.ERROR(f'  row {number}: {message}'))
+        style = self.style.WARNING if report.errors else self.style.SUCCESS
+        self.stdout.write(style(f'Imported {report} in {time.monotonic() - started:.2f}s'))
@@ -4,9 +4,9 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from django.db.models import Q
-from django.core.cache import cache
 from django.conf import settings
 from apps.dashboard.models import Notification as DashboardNotification
+from apps.dashboard.unread import UnreadCounterService
 from .notification_models import Notification as ProfileNotification
 from apps.dashboard.serializers import NotificationSerializer
 from .notification_serializers import NotificationSerializer as ProfileNotificationSerializer
@@ -61,58 +61,39 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """
         Get count of unread notifications from both sources
         
-        OPTIMIZED: Uses caching when USE_NOTIFICATION_CACHE=True
-        Cache TTL: 30 seconds (good balance between freshness and performance)
+        Read from the user's maintained UnreadCounter row. Pass `since` (the
+        previous response's version) to wait until the count changes, up to
+        `timeout` seconds (long poll, only when UNREAD_LONG_POLL_TIMEOUT is set)
         """
-        user_id = request.user.id
-        cache_key = f'notification_count_{user_id}'
-        
-        # Try cache first if enabled
-        if settings.USE_NOTIFICATION_CACHE:
-            cached_count = cache.get(cache_key)
-            if cached_count is not None:
-                return Response({
-                    'unread_count': cached_count,
-                    'cached': True
-                })
-        
-        # Compute from database (existing logic preserved)
-        dashboard_count = DashboardNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        
-        profile_count = ProfileNotification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
-        
-        total_count = dashboard_count + profile_count
-        
-        # Cache for 30 seconds if caching enabled
-        if settings.USE_NOTIFICATION_CACHE:
-            cache.set(cache_key, total_count, 30)
+        since = request.query_params.get('since')
+        if since is None:
+            counter = UnreadCounterService.get(request.user)
+        else:
+            try:
+                since = int(since)
+                timeout = float(request.query_params.get('timeout', settings.UNREAD_LONG_POLL_TIMEOUT))
+            except ValueError:
+                return Response(
+                    {'error': 'since and timeout must be numbers'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            counter = UnreadCounterService.wait(request.user, since, timeout)
         
         return Response({
-            'unread_count': total_count,
-            'cached': False
+            'unread_count': counter.notifications + counter.profile_notifications,
+            'version': counter.version
         })
     
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
-        """
-        Mark a single notification as read
-        
-        OPTIMIZED: Invalidates cache when notifications change
-        """
+        """Mark a single notification as read"""
         notification = self.get_object()
-        notification.is_read = True
-        notification.save()
-        
-        # Invalidate cache for this user
-        if settings.USE_NOTIFICATION_CACHE:
-            cache_key = f'notification_count_{request.user.id}'
-            cache.delete(cache_key)
+        if not notification.is_read:
+            notification.is_read = True
+            notification.save()
+            UnreadCounterService.adjust(
+                request.user.id, **{UnreadCounterService.field_for(type(notification)): -1}
+            )
         
         return Response({
             'status': 'success',
@@ -121,11 +102,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
     
     @action(detail=False, methods=['post'])
     def mark_all_read(self, request):
-        """
-        Mark all user's notifications as read
-        
-        OPTIMIZED: Invalidates cache after bulk update
-        """
+        """Mark all user's notifications as read"""
         dashboard_updated = DashboardNotification.objects.filter(
             recipient=request.user,
             is_read=False
@@ -137,11 +114,9 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         ).update(is_read=True)
         
         total_updated = dashboard_updated + profile_updated
-        
-        # Invalidate cache for this user
-        if settings.USE_NOTIFICATION_CACHE:
-            cache_key = f'notification_count_{request.user.id}'
-            cache.delete(cache_key)
+        UnreadCounterService.adjust(
+            request.user.id, notifications=-dashboard_updated, profile_notifications=-profile_updated
+        )
         
         return Response({
             'status': 'success',
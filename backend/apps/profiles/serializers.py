@@ -1,6 +1,8 @@
 from rest_framework import serializers
-from .models import UserProfile
 from django.contrib.auth.models import User
+from django.db.models import Count
+from apps.batch_serializers import BatchListSerializer, BatchMethodField
+from .models import UserProfile
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
@@ -13,13 +15,17 @@ class UserProfileSerializer(serializers.ModelSerializer):
     role_display = serializers.CharField(source='get_role_display', read_only=True)
     campus_display = serializers.CharField(source='get_campus_display', read_only=True)
     floor_display = serializers.CharField(source='get_floor_display', read_only=True)
-    students_count = serializers.SerializerMethodField()
+    students_count = BatchMethodField(
+        key=lambda profile: profile.user_id if profile.role == 'MENTOR' else None, missing=0
+    )
     
-    def get_students_count(self, obj):
-        """Get count of students assigned to this mentor"""
-        if obj.role == 'MENTOR':
-            return UserProfile.objects.filter(assigned_mentor=obj.user, role='STUDENT').count()
-        return 0
+    def batch_students_count(self, mentor_ids):
+        """Get count of students assigned to each mentor"""
+        return dict(
+            UserProfile.objects.filter(assigned_mentor_id__in=mentor_ids, role='STUDENT').order_by()
+            .values('assigned_mentor').annotate(total=Count('id'))
+            .values_list('assigned_mentor', 'total')
+        )
     
     class Meta:
         model = UserProfile
@@ -30,6 +36,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'assigned_mentor', 'students_count', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        list_serializer_class = BatchListSerializer
 
 
 class UserProfileUpdateSerializer(serializers.ModelSerializer):
@@ -1,7 +1,9 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
+from django.contrib.auth.models import User
 from .models import FloorAnnouncement, UserProfile
 from apps.dashboard.models import Notification
+from apps.dashboard.unread import UnreadCounterService
 
 
 @receiver(post_save, sender=FloorAnnouncement)
@@ -53,4 +55,18 @@ def create_announcement_notifications(sender, instance, created, **kwargs):
         # Bulk create for performance
         if notifications:
             Notification.objects.bulk_create(notifications)
+            UnreadCounterService.record_created(Notification, [n.recipient_id for n in notifications])
             print(f"✅ Created {len(notifications)} notifications for announcement: {instance.title}")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserProfile)
+def invalidate_jwt_claims(sender, instance, created, **kwargs):
+    """
+    Re-check the token claims of a user whose account or profile changed,
+    so stale role / floor claims stop authenticating on the next request
+    """
+    if created:
+        return
+    from apps.jwt_authentication import UserClaims
+    UserClaims.invalidate(instance.pk if sender is User else instance.user_id)
@@ -0,0 +1,387 @@
+import importlib.util
+import io
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.gamification.models import LegacyScore, VaultWallet
+from apps.jwt_authentication import CLAIMS_CLAIM, ClaimsJWTAuthentication, UserClaims
+from apps.jwt_serializers import EmailTokenObtainPairSerializer
+from .bulk_import import UserImportEngine, UserImportError, read_rows
+from .models import UserProfile
+
+User = get_user_model()
+
+
+def csv_file(text):
+    file = io.BytesIO(text.encode())
+    file.name = 'intake.csv'
+    return file
+
+
+def intake(count, start=0):
+    lines = ['Email,Name,Floor']
+    lines += [f'student{i}@example.com,Student {i},{i % 4 + 1}' for i in range(start, start + count)]
+    return '\n'.join(lines) + '\n'
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class UserImportEngineTests(TestCase):
+
+    def setUp(self):
+        self.mentor = User.objects.create_user('mentor@example.com', 'mentor@example.com', 'x')
+        UserProfile.objects.filter(user=self.mentor).update(role='MENTOR')
+
+    def engine(self, **kwargs):
+        kwargs.setdefault('campus', 'TECH')
+        kwargs.setdefault('default_password', 'welcome123#')
+        kwargs.setdefault('workers', 1)
+        return UserImportEngine(**kwargs)
+
+    def test_creates_users_profiles_and_gamification_records(self):
+        report = self.engine().run(read_rows(csv_file(intake(6))))
+
+        self.assertEqual((report.created, report.updated, report.errors), (6, 0, []))
+        user = User.objects.get(email='student3@example.com')
+        self.assertEqual((user.username, user.first_name, user.last_name), ('student3@example.com', 'Student', '3'))
+        self.assertTrue(user.check_password('welcome123#'))
+        self.assertEqual((user.profile.role, user.profile.campus, user.profile.floor), ('STUDENT', 'TECH', 4))
+        students = User.objects.filter(profile__role='STUDENT')
+        self.assertEqual(LegacyScore.objects.filter(student__in=students).count(), 6)
+        self.assertEqual(VaultWallet.objects.filter(student__in=students).count(), 6)
+
+    def test_queries_do_not_grow_with_the_batch(self):
+        with CaptureQueriesContext(connection) as few:
+            self.engine().run(read_rows(csv_file(intake(5))))
+        with CaptureQueriesContext(connection) as many:
+            self.engine().run(read_rows(csv_file(intake(50, start=100))))
+        self.assertEqual(len(few), len(many))
+
+    def test_bad_rows_are_reported_and_the_rest_imported(self):
+        text = (
+            'email,username,floor,mentor,role\n'
+            'good@example.com,good,1,mentor@example.com,\n'
+            'not-an-email,,1,,\n'
+            'nofloor@example.com,,,,\n'
+            'good@example.com,again,1,,\n'
+            'lost@example.com,,1,nobody@example.com,\n'
+            'boss@example.com,,,,MANAGER\n'
+            'taken@example.com,mentor@example.com,1,,\n'
+        )
+        report = self.engine().run(read_rows(csv_file(text)))
+
+        self.assertEqual(report.created, 1)
+        self.assertEqual([number for number, _ in report.errors], [3, 4, 5, 6, 7, 8])
+        messages = dict(report.errors)
+        self.assertIn("Invalid email 'not-an-email'", messages[3])
+        self.assertIn('Students must be assigned to a campus and floor', messages[4])
+        self.assertIn("Duplicate email 'good@example.com'", messages[5])
+        self.assertIn("Unknown mentor 'nobody@example.com'", messages[6])
+        self.assertIn("Unknown role 'MANAGER'", messages[7])
+        self.assertIn('belongs to another account', messages[8])
+        self.assertEqual(UserProfile.objects.get(user__email='good@example.com').assigned_mentor, self.mentor)
+
+    def test_existing_accounts_are_updated_in_place(self):
+        self.engine().run(read_rows(csv_file(intake(3))))
+        user = User.objects.get(email='student1@example.com')
+
+        text = 'email,first_name,last_name,floor,password\nstudent1@example.com,New,Name,3,changed123#\n'
+        report = self.engine(reset_passwords=False).run(read_rows(csv_file(text)))
+
+        user.refresh_from_db()
+        self.assertEqual((report.created, report.updated), (0, 1))
+        self.assertEqual((user.first_name, user.last_name, user.profile.floor), ('New', 'Name', 3))
+        self.assertTrue(user.check_password('welcome123#'))
+
+        report = self.engine(update_existing=False).run(read_rows(csv_file(text)))
+        self.assertEqual(report.skipped, 1)
+
+        self.engine().run(read_rows(csv_file(text)))
+        user.refresh_from_db()
+        self.assertTrue(user.check_password('changed123#'))
+        self.assertEqual(User.objects.filter(email='student1@example.com').count(), 1)
+
+    def test_reimport_without_mentor_column_keeps_assignments(self):
+        other = User.objects.create_user('other@example.com', 'other@example.com', 'x')
+        UserProfile.objects.filter(user=other).update(role='MENTOR')
+        text = 'email,floor,mentor\nkept@example.com,1,mentor@example.com\nmoved@example.com,1,mentor@example.com\n'
+        self.engine().run(read_rows(csv_file(text)))
+
+        text = 'email,floor,mentor\nkept@example.com,2,\nmoved@example.com,2,other@example.com\n'
+        report = self.engine().run(read_rows(csv_file(text)))
+
+        self.assertEqual(report.updated, 2)
+        kept, moved = (UserProfile.objects.get(user__email=email) for email in ('kept@example.com', 'moved@example.com'))
+        self.assertEqual((kept.floor, kept.assigned_mentor), (2, self.mentor))
+        self.assertEqual((moved.floor, moved.assigned_mentor), (2, other))
+
+    def test_students_can_name_mentors_from_the_same_file(self):
+        text = (
+            'email,username,floor,mentor,role\n'
+            'early@example.com,,1,new-mentor@example.com,\n'
+            'new-mentor@example.com,coach,,,MENTOR\n'
+            'orphan@example.com,,1,broken@example.com,\n'
+            'broken@example.com,mentor@example.com,,,MENTOR\n'
+            'late@example.com,,1,coach,\n'
+        )
+        report = self.engine(batch_size=4).run(read_rows(csv_file(text)))
+
+        self.assertEqual(report.created, 3)
+        coach = User.objects.get(username='coach')
+        self.assertEqual(UserProfile.objects.get(user__email='early@example.com').assigned_mentor, coach)
+        self.assertEqual(UserProfile.objects.get(user__email='late@example.com').assigned_mentor, coach)
+        messages = dict(report.errors)
+        self.assertIn("Unknown mentor 'broken@example.com'", messages[4])
+        self.assertIn('belongs to another account', messages[5])
+
+    def test_process_pool_hashes_across_batches(self):
+        progress = []
+        engine = self.engine(workers=2, batch_size=8, progress=lambda report: progress.append(report.processed))
+        report = engine.run(read_rows(csv_file(intake(20))))
+
+        self.assertEqual(report.created, 20)
+        self.assertEqual(progress, [8, 16, 20])
+        hashes = set(User.objects.filter(email__startswith='student').values_list('password', flat=True))
+        self.assertEqual(len(hashes), 20)
+        self.assertTrue(User.objects.get(email='student19@example.com').check_password('welcome123#'))
+
+    def test_unsupported_and_missing_xlsx_support(self):
+        with self.assertRaises(UserImportError):
+            list(read_rows('intake.json'))
+        if importlib.util.find_spec('openpyxl') is None:
+            with self.assertRaises(UserImportError):
+                list(read_rows(io.BytesIO(b''), 'xlsx'))
+
+    def test_import_users_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as file:
+            file.write(intake(4) + 'broken,Broken,1\n')
+        self.addCleanup(os.remove, file.name)
+
+        out = StringIO()
+        call_command(
+            'import_users', file.name, '--campus', 'ARTS', '--password', 'welcome123#', '--workers', '1', stdout=out
+        )
+
+        self.assertIn('row 6: Invalid email', out.getvalue())
+        self.assertIn('5 rows: 4 created, 0 updated, 0 skipped, 1 errors', out.getvalue())
+        self.assertEqual(UserProfile.objects.filter(campus='ARTS', role='STUDENT').count(), 4)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ImportUploadTests(TestCase):
+    """A staff account must not escalate itself or take over accounts through the import endpoint"""
+
+    ESCALATION = (
+        'email,username,password,role,is_staff,is_superuser\n'
+        'staff@example.com,staff@example.com,owned123#,ADMIN,true,true\n'
+        'root@example.com,root@example.com,owned123#,STUDENT,,\n'
+    )
+
+    def setUp(self):
+        self.staff = User.objects.create_user('staff@example.com', 'staff@example.com', 'staff123#', is_staff=True)
+        self.root = User.objects.create_superuser('root@example.com', 'root@example.com', 'root123#')
+
+    def upload(self, user, text):
+        client = APIClient()
+        client.force_authenticate(user)
+        file = SimpleUploadedFile('intake.csv', text.encode(), content_type='text/csv')
+        return client.post('/api/profiles/admin/import-users/', {'file': file}, format='multipart')
+
+    def assert_untouched(self):
+        staff, root = User.objects.get(pk=self.staff.pk), User.objects.get(pk=self.root.pk)
+        self.assertEqual((staff.is_staff, staff.is_superuser, staff.profile.role), (True, False, 'STUDENT'))
+        self.assertTrue(staff.check_password('staff123#'))
+        self.assertTrue(root.check_password('root123#'))
+        self.assertTrue(root.is_superuser)
+
+    def test_staff_cannot_upload(self):
+        self.assertEqual(self.upload(self.staff, self.ESCALATION).status_code, 403)
+        self.assert_untouched()
+
+    def test_uploads_only_create_students_and_mentors(self):
+        text = self.ESCALATION + 'new@example.com,new@example.com,,MENTOR,true,true\n'
+        response = self.upload(self.root, text)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['created'], response.json()['skipped']), (1, 1))
+        self.assertIn("Role 'ADMIN' cannot be imported here", response.json()['errors'][0]['error'])
+        self.assert_untouched()
+        new = User.objects.get(email='new@example.com')
+        self.assertEqual((new.is_staff, new.is_superuser, new.profile.role), (False, False, 'MENTOR'))
+
+
+class AdminStatsViewTests(TestCase):
+
+    def test_errors_fall_back_to_default_values(self):
+        admin = User.objects.create_user('admin@example.com', 'admin@example.com', 'x')
+        UserProfile.objects.filter(user=admin).update(role='ADMIN')
+        client = APIClient()
+        client.force_authenticate(User.objects.get(pk=admin.pk))
+
+        with mock.patch('apps.profiles.admin_views.AdminStatsService.current', side_effect=RuntimeError('boom')), \
+                self.assertLogs('apps.profiles.admin_views', 'ERROR'):
+            response = client.get('/api/profiles/admin/stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['totalStudents'], response.json()['error']), (0, 'boom'))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class ClaimsJWTAuthenticationTests(TestCase):
+
+    def setUp(self):
+        UserClaims.cache().clear()
+        self.user = User.objects.create_user('student@example.com', 'student@example.com', 'secret123#')
+        UserProfile.objects.filter(user=self.user).update(role='STUDENT', campus='TECH', floor=2)
+
+    def obtain(self):
+        response = APIClient().post('/api/auth/token/', {'username': 'student@example.com', 'password': 'secret123#'})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def authenticate(self, token, authentication=ClaimsJWTAuthentication):
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        with CaptureQueriesContext(connection) as queries:
+            user, _ = authentication().authenticate(request)
+            profile = user.profile
+        return user, profile, len(queries)
+
+    def test_token_carries_claims(self):
+        claims = AccessToken(self.obtain()['access'])[CLAIMS_CLAIM]
+        self.assertEqual(claims['user']['email'], 'student@example.com')
+        self.assertEqual(
+            {key: claims['profile'][key] for key in ('role', 'campus', 'floor')},
+            {'role': 'STUDENT', 'campus': 'TECH', 'floor': 2},
+        )
+
+    def test_authenticating_costs_no_queries_once_checked(self):
+        token = self.obtain()['access']
+        self.authenticate(token)
+
+        user, profile, queries = self.authenticate(token)
+        self.assertEqual(queries, 0)
+        self.assertEqual((user.pk, user.email, profile.role, profile.floor), (self.user.pk, 'student@example.com', 'STUDENT', 2))
+        self.assertIs(profile.user, user)
+        self.assertEqual(self.authenticate(token, JWTAuthentication)[2], 2)
+
+    def test_deferred_fields_load_on_access_and_saves_are_partial(self):
+        user, profile, _ = self.authenticate(self.obtain()['access'])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertTrue(user.check_password('secret123#'))
+        self.assertEqual(len(queries), 1)
+
+        profile.floor = 3
+        profile.save()
+        self.assertEqual(UserProfile.objects.get(user=self.user).floor, 3)
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('secret123#'))
+
+    def test_stale_claims_fall_back_to_the_database(self):
+        tokens = self.obtain()
+        self.authenticate(tokens['access'])
+
+        profile = self.user.profile
+        profile.floor = 3
+        profile.save()
+        _, profile, queries = self.authenticate(tokens['access'])
+        self.assertEqual(profile.floor, 3)
+        self.assertGreater(queries, 0)
+
+        refreshed = APIClient().post('/api/auth/token/refresh/', {'refresh': tokens['refresh']}).json()['access']
+        self.assertEqual(AccessToken(refreshed)[CLAIMS_CLAIM]['profile']['floor'], 3)
+        self.authenticate(refreshed)
+        self.assertEqual(self.authenticate(refreshed)[2], 0)
+
+    def test_privileged_tokens_are_always_checked_against_the_database(self):
+        UserProfile.objects.filter(user=self.user).update(role='MENTOR')
+        token = self.obtain()['access']
+        self.authenticate(token)
+        self.assertGreater(self.authenticate(token)[2], 0)
+
+        # A fingerprint cached by another worker before the demotion does not keep the role
+        fingerprint = UserClaims.current_fingerprint(self.user.pk)
+        UserProfile.objects.filter(user=self.user).update(role='STUDENT')
+        UserClaims.cache().set(UserClaims.cache_key(self.user.pk), fingerprint)
+        self.assertEqual(self.authenticate(token)[1].role, 'STUDENT')
+
+    def test_bulk_changes_and_deactivation(self):
+        token = self.obtain()['access']
+        self.authenticate(token)
+
+        UserImportEngine(campus='TECH', floor=4, workers=1).run(read_rows(csv_file('email\nstudent@example.com\n')))
+        self.assertEqual(self.authenticate(token)[1].floor, 4)
+
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        UserClaims.invalidate(self.user.pk)
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        with self.assertRaises(AuthenticationFailed):
+            ClaimsJWTAuthentication().authenticate(request)
+
+    @override_settings(JWT_CLAIMS_AUTH=False)
+    def test_can_be_switched_off(self):
+        token = self.obtain()['access']
+        self.authenticate(token)
+        self.assertEqual(self.authenticate(token)[2], 2)
+
+
+@skipUnless(os.getenv('RUN_BENCHMARKS'), 'set RUN_BENCHMARKS=1 to run benchmarks')
+class ClaimsJWTAuthenticationBenchmark(TestCase):
+    """
+    Per-request queries and latency of read endpoints behind a real Bearer
+    token, with simplejwt's JWTAuthentication and with ClaimsJWTAuthentication.
+    Run with: RUN_BENCHMARKS=1 python manage.py test apps.profiles.tests.ClaimsJWTAuthenticationBenchmark -v 2
+    """
+
+    ENDPOINTS = [
+        ('/api/auth/user/', 'student'),
+        ('/api/profiles/me/', 'student'),
+        ('/api/gamification/leaderboard/current_season/', 'student'),
+        ('/api/mentor/messages/unread-counts/', 'student'),
+        ('/api/gamification/leaderboard/mentee_leaderboard/', 'mentor'),
+        ('/api/profiles/floor-wing/dashboard/', 'floor_wing'),
+    ]
+    REQUESTS = 20
+
+    def test_auth_query_floor(self):
+        from apps.dashboard.synthetic_cohort import SyntheticCohortGenerator
+
+        cohort = SyntheticCohortGenerator(students=50, seed=24).generate()
+        users = {'student': cohort.students[0], 'mentor': cohort.mentors[0], 'floor_wing': cohort.floor_wings[0]}
+        tokens = {
+            role: str(EmailTokenObtainPairSerializer.get_token(User.objects.get(pk=user.pk)).access_token)
+            for role, user in users.items()
+        }
+        UserClaims.cache().clear()
+
+        def measure(endpoint, role, claims_auth):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens[role]}')
+            # With JWT_CLAIMS_AUTH off every request authenticates like JWTAuthentication
+            with override_settings(JWT_CLAIMS_AUTH=claims_auth):
+                client.get(endpoint)
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(self.REQUESTS):
+                        response = client.get(endpoint)
+                    elapsed = (time.perf_counter() - started) * 1000 / self.REQUESTS
+            self.assertEqual(response.status_code, 200, endpoint)
+            return len(queries) / self.REQUESTS, elapsed
+
+        print(f"\n  {'endpoint':<52} | {'jwt q':>6} {'ms':>6} | {'claims q':>8} {'ms':>6}")
+        for endpoint, role in self.ENDPOINTS:
+            plain, claims = measure(endpoint, role, False), measure(endpoint, role, True)
+            print(f'  {endpoint:<52} | {plain[0]:>6.1f} {plain[1]:>6.1f} | {claims[0]:>8.1f} {claims[1]:>6.1f}')
+            with self.subTest(endpoint=endpoint):
+                self.assertLess(claims[0], plain[0])
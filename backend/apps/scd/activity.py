@@ -0,0 +1,163 @@
+"""
+LeetCode daily activity
+
+The submission calendar LeetCode returns on every sync is stored as one
+LeetCodeDailyActivity row per (profile, day). Monthly totals are range
+reads on that table, and streaks for any number of students are computed
+in one gaps-and-islands window query: consecutive active days share the
+same (day number - row number), so each group is one streak.
+"""
+import json
+import logging
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+from .models import LeetCodeDailyActivity, LeetCodeProfile
+
+logger = logging.getLogger(__name__)
+
+
+class LeetCodeActivityService:
+    """Ingest submission calendars and read activity, monthly totals and streaks"""
+
+    # Problems per month a student needs for the SCD monthly target
+    MONTHLY_TARGET = 10
+
+    # LeetCode returns the last year of the calendar; older rows are kept as history
+    CALENDAR_WINDOW_DAYS = 365
+
+    # Integer day number of the `a.day` column per database vendor
+    DAY_NUMBER_SQL = {
+        'postgresql': "(a.day - DATE '1970-01-01')",
+        'sqlite': "CAST(julianday(a.day) AS INTEGER)",
+        'mysql': "TO_DAYS(a.day)",
+    }
+
+    @staticmethod
+    def today():
+        """Current UTC day; calendar days are UTC"""
+        return timezone.now().astimezone(dt_timezone.utc).date()
+
+    @staticmethod
+    def parse_calendar(calendar):
+        """
+        {day: count} from a submission calendar: a JSON string or a mapping of
+        UTC midnight epoch seconds to submission counts. Empty days are dropped
+        """
+        if isinstance(calendar, str):
+            try:
+                calendar = json.loads(calendar)
+            except ValueError:
+                return {}
+        days = {}
+        for timestamp, count in (calendar or {}).items():
+            try:
+                day = datetime.fromtimestamp(int(timestamp), tz=dt_timezone.utc).date()
+                count = int(count)
+            except (ValueError, TypeError, OverflowError, OSError):
+                continue
+            if count > 0:
+                days[day] = days.get(day, 0) + count
+        return days
+
+    @staticmethod
+    def ingest(profile, calendar):
+        """
+        Store a synced calendar: upsert its days and drop days inside the
+        calendar window that LeetCode no longer reports
+        Returns the number of active days written
+        """
+        days = LeetCodeActivityService.parse_calendar(calendar)
+        window_start = LeetCodeActivityService.today() - timedelta(days=LeetCodeActivityService.CALENDAR_WINDOW_DAYS)
+
+        LeetCodeDailyActivity.objects.filter(
+            profile=profile, day__gte=window_start
+        ).exclude(day__in=list(days)).delete()
+
+        if days:
+            LeetCodeDailyActivity.objects.bulk_create(
+                [LeetCodeDailyActivity(profile=profile, day=day, count=count) for day, count in days.items()],
+                update_conflicts=True,
+                unique_fields=['profile', 'day'],
+                update_fields=['count'],
+            )
+        return len(days)
+
+    @staticmethod
+    def month_total(profiles, year=None, month=None):
+        """
+        {'total': problems, 'days_active': days} for one profile (or a
+        queryset of profiles) in a UTC calendar month, the current one by default
+        """
+        if year is None or month is None:
+            today = LeetCodeActivityService.today()
+            year, month = today.year, today.month
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+        activity = LeetCodeDailyActivity.objects.filter(day__gte=start, day__lt=end)
+        if isinstance(profiles, LeetCodeProfile):
+            activity = activity.filter(profile=profiles)
+        else:
+            activity = activity.filter(profile__in=profiles)
+
+        totals = activity.aggregate(total=Sum('count'), days_active=Count('day', distinct=True))
+        return {'total': totals['total'] or 0, 'days_active': totals['days_active']}
+
+    @staticmethod
+    def streaks(user_ids=None, today=None):
+        """
+        Streaks of many students in one query
+        Returns: {user_id: (current_streak, longest_streak, total_days_active)}
+            for students with any activity; current_streak counts a run that
+            ends today or yesterday. Empty on databases without a
+            DAY_NUMBER_SQL entry
+        """
+        today = today or LeetCodeActivityService.today()
+        day_number = LeetCodeActivityService.DAY_NUMBER_SQL.get(connection.vendor)
+        if day_number is None:
+            logger.warning("LeetCode streaks are not supported on %s; reporting no streaks", connection.vendor)
+            return {}
+
+        params = [today]
+        user_filter = ''
+        if user_ids is not None:
+            user_ids = list(user_ids)
+            if not user_ids:
+                return {}
+            user_filter = f"AND p.user_id IN ({', '.join(['%s'] * len(user_ids))})"
+            params.extend(user_ids)
+        params.append(today - timedelta(days=1))
+
+        sql = f"""
+            WITH active AS (
+                SELECT DISTINCT p.user_id AS user_id, a.day AS day, {day_number} AS day_number
+                FROM {LeetCodeDailyActivity._meta.db_table} a
+                JOIN {LeetCodeProfile._meta.db_table} p ON p.id = a.profile_id
+                WHERE a.count > 0 AND a.day <= %s {user_filter}
+            ),
+            islands AS (
+                SELECT user_id, MAX(day) AS last_day, COUNT(*) AS length
+                FROM (
+                    SELECT user_id, day,
+                           day_number - ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY day) AS island
+                    FROM active
+                ) numbered
+                GROUP BY user_id, island
+            )
+            SELECT user_id,
+                   MAX(CASE WHEN last_day >= %s THEN length ELSE 0 END),
+                   MAX(length),
+                   SUM(length)
+            FROM islands
+            GROUP BY user_id
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return {
+                user_id: (int(current), int(longest), int(total))
+                for user_id, current, longest, total in cursor.fetchall()
+            }
@@ -4,11 +4,17 @@ LeetCode API Integration Utility
 This module handles fetching data from LeetCode's GraphQL API.
 """
 
+import json
+import logging
 import requests
 import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+from .leetcode_cache import USER_NOT_FOUND, cached_query
+
+logger = logging.getLogger(__name__)
+
 
 class LeetCodeAPI:
     """Handler for LeetCode GraphQL API requests"""
@@ -85,7 +91,144 @@ class LeetCodeAPI:
     }
     """
     
+    # Everything the profile sync needs in one round trip
+    FULL_PROFILE_QUERY = """
+    query getFullProfile($username: String!, $limit: Int!, $year: Int!) {
+        matchedUser(username: $username) {
+            username
+            profile {
+                ranking
+                userAvatar
+                realName
+                aboutMe
+                reputation
+            }
+            submitStats {
+                acSubmissionNum {
+                    difficulty
+                    count
+                }
+            }
+            userCalendar(year: $year) {
+                streak
+                totalActiveDays
+                submissionCalendar
+            }
+        }
+        userContestRanking(username: $username) {
+            attendedContestsCount
+            rating
+            globalRanking
+            totalParticipants
+            topPercentage
+        }
+        recentAcSubmissionList(username: $username, limit: $limit) {
+            title
+            titleSlug
+            timestamp
+            statusDisplay
+            lang
+        }
+    }
+    """
+    
+    FULL_PROFILE_DEADLINE = 20  # seconds for the whole combined fetch, retries included
+    
     @staticmethod
+    @cached_query('full_profile')
+    def fetch_full_profile(username: str, submissions_limit: int = 20,
+                           deadline: float = FULL_PROFILE_DEADLINE) -> Optional[Dict]:
+        """
+        Fetch profile, contest, calendar and recent submissions in one request
+        
+        Retries stay inside an overall deadline so a slow LeetCode cannot
+        hold a web worker for longer than `deadline` seconds.
+        
+        Args:
+            username: LeetCode username
+            submissions_limit: Number of recent submissions to fetch
+            deadline: Overall time budget in seconds
+            
+        Returns:
+            Dictionary with profile, contest_info, calendar_data,
+            recent_submissions and warnings, or None if the profile itself
+            could not be fetched
+        """
+        give_up_at = time.monotonic() + deadline
+        data = None
+        
+        for attempt in range(LeetCodeAPI.MAX_RETRIES):
+            remaining = give_up_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                response = requests.post(
+                    LeetCodeAPI.GRAPHQL_URL,
+                    json={
+                        'query': LeetCodeAPI.FULL_PROFILE_QUERY,
+                        'variables': {
+                            'username': username,
+                            'limit': submissions_limit,
+                            'year': datetime.now().year
+                        }
+                    },
+                    headers=LeetCodeAPI.HEADERS,
+                    timeout=remaining
+                )
+                
+                if response.status_code == 200:
+                    # GraphQL returns partial data alongside per-field errors
+                    data = response.json().get('data') or {}
+                    break
+                
+                logger.warning("LeetCode API returned status %s for %s: %s",
+                               response.status_code, username, response.text[:200])
+                if response.status_code not in (429, 500, 502, 503, 504):
+                    return None
+                
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                logger.warning("Error fetching full profile for %s: %s (attempt %s/%s)",
+                               username, e, attempt + 1, LeetCodeAPI.MAX_RETRIES)
+            except Exception:
+                logger.exception("Error fetching full profile for %s", username)
+                return None
+            
+            if attempt == LeetCodeAPI.MAX_RETRIES - 1 or give_up_at - time.monotonic() <= LeetCodeAPI.RETRY_DELAY:
+                break
+            time.sleep(LeetCodeAPI.RETRY_DELAY)
+        
+        if data and 'matchedUser' in data and data['matchedUser'] is None:
+            return USER_NOT_FOUND
+        if not data or not data.get('matchedUser'):
+            return None
+        
+        matched_user = data['matchedUser']
+        warnings = []
+        
+        contest_info = LeetCodeAPI._parse_contest_data(data.get('userContestRanking'))
+        if not contest_info:
+            warnings.append('Contest data unavailable - LeetCode API timeout or no contest history')
+        
+        calendar_data = None
+        if matched_user.get('userCalendar'):
+            calendar_data = LeetCodeAPI._parse_calendar_data(matched_user['userCalendar'])
+        if not calendar_data:
+            warnings.append('Calendar data unavailable - LeetCode API timeout')
+        
+        recent_submissions = LeetCodeAPI._parse_submissions(data.get('recentAcSubmissionList') or [])
+        if not recent_submissions:
+            warnings.append('Recent submissions unavailable - LeetCode API timeout')
+        
+        return {
+            'profile': LeetCodeAPI._parse_profile_data(matched_user),
+            'contest_info': contest_info,
+            'calendar_data': calendar_data,
+            'recent_submissions': recent_submissions,
+            'warnings': warnings
+        }
+    
+    @staticmethod
+    @cached_query('profile')
     def fetch_user_profile(username: str) -> Optional[Dict]:
         """
         Fetch user profile data from LeetCode
@@ -112,6 +255,8 @@ class LeetCodeAPI:
                     data = response.json()
                     if data.get('data') and data['data'].get('matchedUser'):
                         return LeetCodeAPI._parse_profile_data(data['data']['matchedUser'])
+                    if data.get('data') and data['data'].get('matchedUser', False) is None:
+                        return USER_NOT_FOUND
                 else:
                     print(f"LeetCode API returned status {response.status_code}: {response.text[:200]}")
                 
@@ -173,6 +318,75 @@ class LeetCodeAPI:
         }
     
     @staticmethod
+    def _parse_submissions(submissions: List[Dict]) -> List[Dict]:
+        """Parse recentAcSubmissionList entries into LeetCodeSubmission fields"""
+        return [{
+            'problem_title': sub.get('title'),
+            'problem_slug': sub.get('titleSlug'),
+            'status': sub.get('statusDisplay'),
+            'language': sub.get('lang'),
+            'timestamp': datetime.fromtimestamp(int(sub.get('timestamp', 0)))
+        } for sub in submissions]
+    
+    @staticmethod
+    def _parse_contest_data(contest_data: Optional[Dict]) -> Optional[Dict]:
+        """Parse userContestRanking into a clean format"""
+        if not contest_data:
+            return None
+        return {
+            'rating': int(contest_data.get('rating', 0)),
+            'global_ranking': contest_data.get('globalRanking'),
+            'contests_attended': contest_data.get('attendedContestsCount'),
+            'top_percentage': contest_data.get('topPercentage')
+        }
+    
+    @staticmethod
+    def _parse_calendar_data(calendar_data: Dict) -> Dict:
+        """Parse userCalendar: keep the last 12 months and count this month's problems"""
+        submission_calendar_str = calendar_data.get('submissionCalendar', '{}')
+        
+        # Parse submission calendar JSON string
+        try:
+            submission_calendar = json.loads(submission_calendar_str) if isinstance(submission_calendar_str, str) else submission_calendar_str
+        except:
+            submission_calendar = {}
+        
+        # Convert to proper format and filter last 12 months
+        now = datetime.now()
+        twelve_months_ago = now - timedelta(days=365)
+        twelve_months_ago_timestamp = int(twelve_months_ago.timestamp())
+        
+        # Filter and convert calendar data
+        filtered_calendar = {}
+        for timestamp_str, count in submission_calendar.items():
+            try:
+                timestamp = int(timestamp_str)
+                if timestamp >= twelve_months_ago_timestamp:
+                    # Store as string key for JSON compatibility
+                    filtered_calendar[str(timestamp)] = int(count)
+            except (ValueError, TypeError):
+                continue
+        
+        # Calculate current month's problems
+        current_month_start = datetime(now.year, now.month, 1).timestamp()
+        next_month = now.month + 1 if now.month < 12 else 1
+        next_month_year = now.year if now.month < 12 else now.year + 1
+        current_month_end = datetime(next_month_year, next_month, 1).timestamp()
+        
+        monthly_problems = sum(
+            int(count) for timestamp_str, count in filtered_calendar.items()
+            if current_month_start <= int(timestamp_str) < current_month_end
+        )
+        
+        return {
+            'streak': calendar_data.get('streak', 0),
+            'total_active_days': calendar_data.get('totalActiveDays', 0),
+            'monthly_problems': monthly_problems,
+            'submission_calendar': filtered_calendar
+        }
+    
+    @staticmethod
+    @cached_query('submissions', not_found_result=[])
     def fetch_recent_submissions(username: str, limit: int = 10) -> List[Dict]:
         """
         Fetch recent accepted submissions
@@ -200,13 +414,7 @@ class LeetCodeAPI:
                     data = response.json()
                     submissions = data.get('data', {}).get('recentAcSubmissionList', [])
                     
-                    return [{
-                        'problem_title': sub.get('title'),
-                        'problem_slug': sub.get('titleSlug'),
-                        'status': sub.get('statusDisplay'),
-                        'language': sub.get('lang'),
-                        'timestamp': datetime.fromtimestamp(int(sub.get('timestamp', 0)))
-                    } for sub in submissions]
+                    return LeetCodeAPI._parse_submissions(submissions)
                 
                 return []
                 
@@ -223,6 +431,7 @@ class LeetCodeAPI:
                 return []
     
     @staticmethod
+    @cached_query('contest')
     def fetch_contest_info(username: str) -> Optional[Dict]:
         """
         Fetch user contest information
@@ -250,12 +459,7 @@ class LeetCodeAPI:
                     contest_data = data.get('data', {}).get('userContestRanking')
                     
                     if contest_data:
-                        return {
-                            'rating': int(contest_data.get('rating', 0)),
-                            'global_ranking': contest_data.get('globalRanking'),
-                            'contests_attended': contest_data.get('attendedContestsCount'),
-                            'top_percentage': contest_data.get('topPercentage')
-                        }
+                        return LeetCodeAPI._parse_contest_data(contest_data)
                 
                 return None
                 
@@ -272,6 +476,7 @@ class LeetCodeAPI:
                 return None
     
     @staticmethod
+    @cached_query('calendar')
     def fetch_calendar_data(username: str) -> Optional[Dict]:
         """
         Fetch user calendar data including streak and monthly submissions
@@ -284,7 +489,6 @@ class LeetCodeAPI:
         """
         for attempt in range(LeetCodeAPI.MAX_RETRIES):
             try:
-                from datetime import datetime
                 current_year = datetime.now().year
                 
                 response = requests.post(
@@ -302,50 +506,9 @@ class LeetCodeAPI:
                     matched_user = data.get('data', {}).get('matchedUser')
                     
                     if matched_user and matched_user.get('userCalendar'):
-                        calendar_data = matched_user['userCalendar']
-                        submission_calendar_str = calendar_data.get('submissionCalendar', '{}')
-                        
-                        # Parse submission calendar JSON string
-                        import json
-                        try:
-                            submission_calendar = json.loads(submission_calendar_str) if isinstance(submission_calendar_str, str) else submission_calendar_str
-                        except:
-                            submission_calendar = {}
-                        
-                        # Convert to proper format and filter last 12 months
-                        from datetime import datetime, timedelta
-                        now = datetime.now()
-                        twelve_months_ago = now - timedelta(days=365)
-                        twelve_months_ago_timestamp = int(twelve_months_ago.timestamp())
-                        
-                        # Filter and convert calendar data
-                        filtered_calendar = {}
-                        for timestamp_str, count in submission_calendar.items():
-                            try:
-                                timestamp = int(timestamp_str)
-                                if timestamp >= twelve_months_ago_timestamp:
-                                    # Store as string key for JSON compatibility
-                                    filtered_calendar[str(timestamp)] = int(count)
-                            except (ValueError, TypeError):
-                                continue
-                        
-                        # Calculate current month's problems
-                        current_month_start = datetime(now.year, now.month, 1).timestamp()
-                        next_month = now.month + 1 if now.month < 12 else 1
-                        next_month_year = now.year if now.month < 12 else now.year + 1
-                        current_month_end = datetime(next_month_year, next_month, 1).timestamp()
-                        
-                        monthly_problems = sum(
-                            int(count) for timestamp_str, count in filtered_calendar.items()
-                            if current_month_start <= int(timestamp_str) < current_month_end
-                        )
-                        
-                        return {
-                            'streak': calendar_data.get('streak', 0),
-                            'total_active_days': calendar_data.get('totalActiveDays', 0),
-                            'monthly_problems': monthly_problems,
-                            'submission_calendar': filtered_calendar
-                        }
+                        return LeetCodeAPI._parse_calendar_data(matched_user['userCalendar'])
+                    if 'matchedUser' in (data.get('data') or {}) and matched_user is None:
+                        return USER_NOT_FOUND
                 
                 return None
                 
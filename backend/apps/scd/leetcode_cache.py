@@ -0,0 +1,173 @@
+"""
+Response cache for LeetCode GraphQL lookups
+
+Keyed by (query type, username, params). Fresh entries are served
+directly; once an entry is older than its TTL it is still served for the
+stale window while one background thread refreshes it. Unknown users are
+cached negatively for a shorter time. Entries live in the 'leetcode' cache
+alias (see CACHES in settings).
+"""
+import functools
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+
+class _UserNotFound:
+    """Marker returned by fetchers when LeetCode says the user does not exist"""
+
+    def __repr__(self):
+        return 'USER_NOT_FOUND'
+
+
+USER_NOT_FOUND = _UserNotFound()
+
+
+class LeetCodeResponseCache:
+    """TTL + stale-while-revalidate cache with negative caching and counters"""
+
+    def __init__(self, alias='leetcode'):
+        self.alias = alias
+        self._counters = Counter()
+        self._lock = threading.Lock()
+        self._refreshing = set()
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def ttl_for(self, query_type):
+        ttls = settings.LEETCODE_CACHE_TTLS
+        return ttls.get(query_type, ttls['default'])
+
+    def make_key(self, query_type, username, params=()):
+        suffix = ':'.join(str(param) for param in params)
+        return f"leetcode:{query_type}:{username.strip().lower()}:{suffix}"
+
+    def get_or_fetch(self, query_type, username, fetch, params=()):
+        """
+        Return the cached response for this query, calling fetch() on a miss
+        fetch() returns the value, USER_NOT_FOUND, or a falsy value on failure
+        (failures are never cached)
+        """
+        key = self.make_key(query_type, username, params)
+        entry = self.cache.get(key)
+
+        if entry is not None:
+            if entry['not_found']:
+                self._count('negative_hits')
+                return USER_NOT_FOUND
+
+            age = time.time() - entry['fetched_at']
+            if age < self.ttl_for(query_type):
+                self._count('hits')
+            else:
+                self._count('stale_hits')
+                self._refresh_in_background(key, query_type, fetch)
+            return entry['value']
+
+        self._count('misses')
+        return self._fetch_and_store(key, query_type, fetch)
+
+    def refresh(self, query_type, username, fetch, params=()):
+        """
+        Call fetch() now, bypassing any cached entry, and cache its result
+        For user-initiated syncs, which must not be answered with stale data
+        """
+        self._count('forced')
+        return self._fetch_and_store(self.make_key(query_type, username, params), query_type, fetch)
+
+    def invalidate(self, query_type, username, params=()):
+        self.cache.delete(self.make_key(query_type, username, params))
+
+    def clear(self):
+        self.cache.clear()
+        with self._lock:
+            self._counters.clear()
+
+    def stats(self):
+        """Counter snapshot plus the overall hit rate"""
+        with self._lock:
+            stats = dict(self._counters)
+        served = stats.get('hits', 0) + stats.get('stale_hits', 0) + stats.get('negative_hits', 0)
+        lookups = served + stats.get('misses', 0)
+        stats['hit_rate'] = round(served / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def _fetch_and_store(self, key, query_type, fetch):
+        self._count('fetches')
+        value = fetch()
+
+        if value is USER_NOT_FOUND:
+            self.cache.set(
+                key,
+                {'value': None, 'not_found': True, 'fetched_at': time.time()},
+                settings.LEETCODE_CACHE_NEGATIVE_TTL
+            )
+        elif value:
+            self.cache.set(
+                key,
+                {'value': value, 'not_found': False, 'fetched_at': time.time()},
+                self.ttl_for(query_type) + settings.LEETCODE_CACHE_STALE_TTL
+            )
+        else:
+            self._count('errors')
+        return value
+
+    def _refresh_in_background(self, key, query_type, fetch):
+        """Refresh a stale entry once; concurrent stale hits keep the old value"""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._count('refreshes')
+                self._fetch_and_store(key, query_type, fetch)
+            except Exception:
+                logger.exception("Background LeetCode refresh failed for %s", key)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+leetcode_cache = LeetCodeResponseCache()
+
+
+def cached_query(query_type, not_found_result=None):
+    """
+    Cache a LeetCodeAPI fetcher taking (username, *args, **kwargs)
+    USER_NOT_FOUND from the fetcher is returned to callers as not_found_result;
+    the raw fetcher stays reachable as `.uncached`, and `.refresh` fetches
+    fresh data and replaces the cached entry
+    """
+    def decorator(func):
+        def call(lookup, username, args, kwargs):
+            params = list(args) + [f"{name}={value}" for name, value in sorted(kwargs.items())]
+            value = lookup(query_type, username, lambda: func(username, *args, **kwargs), params)
+            return not_found_result if value is USER_NOT_FOUND else value
+
+        @functools.wraps(func)
+        def wrapper(username, *args, **kwargs):
+            return call(leetcode_cache.get_or_fetch, username, args, kwargs)
+
+        def refresh(username, *args, **kwargs):
+            return call(leetcode_cache.refresh, username, args, kwargs)
+
+        wrapper.uncached = func
+        wrapper.refresh = refresh
+        return wrapper
+    return decorator
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-18 03:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("scd", "0003_leetcodeprofile_submission_calendar"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeetCodeDailyActivity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(help_text="UTC day, as LeetCode reports it")),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_activity",
+                        to="scd.leetcodeprofile",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-day"],
+                "unique_together": {("profile", "day")},
+            },
+        ),
+    ]
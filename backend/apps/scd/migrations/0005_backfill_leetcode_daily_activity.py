@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def backfill_daily_activity(apps, schema_editor):
+    # Streaks and monthly totals read LeetCodeDailyActivity; fill it from the calendars already synced
+    from apps.scd.activity import LeetCodeActivityService
+
+    LeetCodeProfile = apps.get_model('scd', 'LeetCodeProfile')
+    LeetCodeDailyActivity = apps.get_model('scd', 'LeetCodeDailyActivity')
+    rows = []
+    calendars = LeetCodeProfile.objects.values_list('id', 'submission_calendar')
+    for profile_id, calendar in calendars.iterator():
+        rows.extend(
+            LeetCodeDailyActivity(profile_id=profile_id, day=day, count=count)
+            for day, count in LeetCodeActivityService.parse_calendar(calendar).items()
+        )
+    LeetCodeDailyActivity.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scd', '0004_leetcodedailyactivity'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_daily_activity, migrations.RunPython.noop),
+    ]
@@ -87,6 +87,29 @@ class LeetCodeSubmission(models.Model):
         return f"{self.problem_title} - {self.status}"
 
 
+class LeetCodeDailyActivity(models.Model):
+    """
+    Submissions per day from the LeetCode submission calendar
+    Written on every profile sync; streaks and monthly totals are computed from it
+    """
+    profile = models.ForeignKey(
+        LeetCodeProfile,
+        on_delete=models.CASCADE,
+        related_name='daily_activity'
+    )
+    
+    day = models.DateField(help_text="UTC day, as LeetCode reports it")
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-day']
+        # The unique index also serves per-profile day range reads
+        unique_together = ['profile', 'day']
+    
+    def __str__(self):
+        return f"{self.profile.leetcode_username} - {self.day}: {self.count}"
+
+
 class ProgressSnapshot(models.Model):
     """
     Stores periodic snapshots of progress for tracking over time
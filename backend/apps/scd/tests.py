@@ -0,0 +1,263 @@
+import json
+import random
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from importlib import import_module
+from unittest import mock
+
+import requests
+from django.apps import apps as django_apps
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from .activity import LeetCodeActivityService
+from .leetcode_api import LeetCodeAPI
+from .leetcode_cache import USER_NOT_FOUND
+from .models import LeetCodeDailyActivity, LeetCodeProfile
+
+User = get_user_model()
+
+
+def calendar_for(days):
+    """Submission calendar in LeetCode's format: {epoch seconds: count}"""
+    return json.dumps({
+        str(int(datetime.combine(day, time(), tzinfo=dt_timezone.utc).timestamp())): count
+        for day, count in days.items()
+    })
+
+
+def walk_streaks(days, today):
+    """Reference (current, longest, total) from a plain walk over the active days"""
+    days = sorted(day for day in days if day <= today)
+    if not days:
+        return None
+    runs, length = [], 1
+    for previous, day in zip(days, days[1:]):
+        if day - previous == timedelta(days=1):
+            length += 1
+        else:
+            runs.append((previous, length))
+            length = 1
+    runs.append((days[-1], length))
+    last_day, last_length = runs[-1]
+    current = last_length if last_day >= today - timedelta(days=1) else 0
+    return current, max(length for _, length in runs), len(days)
+
+
+class LeetCodeActivityTests(TestCase):
+    today = date(2026, 3, 15)
+
+    def make_profile(self, username):
+        user = User.objects.create_user(username=username, password='pass')
+        return LeetCodeProfile.objects.create(user=user, leetcode_username=username)
+
+    def test_ingest_upserts_and_drops_days_no_longer_reported(self):
+        profile = self.make_profile('alice')
+        today = LeetCodeActivityService.today()
+        first = {today: 2, today - timedelta(days=1): 3, today - timedelta(days=5): 1}
+
+        self.assertEqual(LeetCodeActivityService.ingest(profile, calendar_for(first)), 3)
+        self.assertEqual(LeetCodeActivityService.ingest(profile, calendar_for({today: 4, today - timedelta(days=1): 3})), 2)
+
+        self.assertEqual(
+            dict(profile.daily_activity.values_list('day', 'count')),
+            {today: 4, today - timedelta(days=1): 3},
+        )
+
+    def test_parse_calendar_skips_bad_and_empty_entries(self):
+        day = date(2026, 3, 1)
+        calendar = json.loads(calendar_for({day: 2}))
+        calendar.update({'not-a-timestamp': 3, '0': 0})
+
+        self.assertEqual(LeetCodeActivityService.parse_calendar(calendar), {day: 2})
+        self.assertEqual(LeetCodeActivityService.parse_calendar('not json'), {})
+
+    def test_month_total_sums_one_month_across_profiles(self):
+        first, second = self.make_profile('alice'), self.make_profile('bob')
+        LeetCodeDailyActivity.objects.bulk_create([
+            LeetCodeDailyActivity(profile=first, day=date(2026, 2, 28), count=5),
+            LeetCodeDailyActivity(profile=first, day=date(2026, 3, 1), count=4),
+            LeetCodeDailyActivity(profile=first, day=date(2026, 3, 31), count=2),
+            LeetCodeDailyActivity(profile=second, day=date(2026, 3, 1), count=6),
+        ])
+
+        self.assertEqual(LeetCodeActivityService.month_total(first, 2026, 3), {'total': 6, 'days_active': 2})
+        self.assertEqual(
+            LeetCodeActivityService.month_total(LeetCodeProfile.objects.all(), 2026, 3),
+            {'total': 12, 'days_active': 2},
+        )
+        self.assertEqual(LeetCodeActivityService.month_total(second, 2026, 4), {'total': 0, 'days_active': 0})
+
+    def test_streaks_match_a_plain_walk_for_many_students(self):
+        rng = random.Random(18)
+        expected, activity = {}, []
+        for index in range(12):
+            profile = self.make_profile(f'student{index}')
+            days = {
+                self.today - timedelta(days=offset)
+                for offset in range(-2, 90) if rng.random() < 0.6
+            }
+            activity.extend(LeetCodeDailyActivity(profile=profile, day=day, count=1) for day in days)
+            walked = walk_streaks(days, self.today)
+            if walked:
+                expected[profile.user_id] = walked
+        LeetCodeDailyActivity.objects.bulk_create(activity)
+
+        with self.assertNumQueries(1):
+            streaks = LeetCodeActivityService.streaks(today=self.today)
+        self.assertEqual(streaks, expected)
+
+    def test_current_streak_counts_a_run_ending_yesterday_and_merges_profiles(self):
+        profile = self.make_profile('alice')
+        other = LeetCodeProfile.objects.create(user=profile.user, leetcode_username='alice-alt')
+        LeetCodeDailyActivity.objects.bulk_create([
+            LeetCodeDailyActivity(profile=profile, day=self.today - timedelta(days=1), count=1),
+            LeetCodeDailyActivity(profile=other, day=self.today - timedelta(days=1), count=2),
+            LeetCodeDailyActivity(profile=other, day=self.today - timedelta(days=2), count=1),
+            LeetCodeDailyActivity(profile=profile, day=self.today - timedelta(days=10), count=1),
+        ])
+
+        self.assertEqual(
+            LeetCodeActivityService.streaks([profile.user_id], today=self.today),
+            {profile.user_id: (2, 2, 3)},
+        )
+        self.assertEqual(LeetCodeActivityService.streaks([], today=self.today), {})
+
+    def test_streaks_are_empty_on_unsupported_databases(self):
+        profile = self.make_profile('alice')
+        LeetCodeDailyActivity.objects.create(profile=profile, day=self.today, count=1)
+        with mock.patch.dict(LeetCodeActivityService.DAY_NUMBER_SQL, clear=True), \
+                self.assertLogs('apps.scd.activity', 'WARNING'):
+            self.assertEqual(LeetCodeActivityService.streaks([profile.user_id], today=self.today), {})
+
+    def test_migration_backfills_synced_calendars(self):
+        backfill = import_module('apps.scd.migrations.0005_backfill_leetcode_daily_activity').backfill_daily_activity
+        days = {self.today: 2, self.today - timedelta(days=3): 1}
+        profile = self.make_profile('alice')
+        profile.submission_calendar = calendar_for(days)
+        profile.save()
+        self.make_profile('bob')
+
+        backfill(django_apps, None)
+
+        self.assertEqual(dict(profile.daily_activity.values_list('day', 'count')), days)
+        self.assertEqual(LeetCodeDailyActivity.objects.count(), 2)
+
+
+def graphql_response(status_code=200, data=None):
+    response = mock.Mock(status_code=status_code, text=json.dumps({'data': data}))
+    response.json.return_value = {'data': data}
+    return response
+
+
+FULL_PROFILE_DATA = {
+    'matchedUser': {
+        'username': 'coder',
+        'profile': {'ranking': 1200, 'userAvatar': None, 'realName': 'Coder', 'reputation': 3},
+        'submitStats': {'acSubmissionNum': [{'difficulty': 'All', 'count': 40}, {'difficulty': 'Easy', 'count': 30}]},
+        'userCalendar': {'streak': 4, 'totalActiveDays': 9, 'submissionCalendar': '{"1767225600": 2}'},
+    },
+    'userContestRanking': {
+        'attendedContestsCount': 2, 'rating': 1500.5, 'globalRanking': 9000,
+        'totalParticipants': 20000, 'topPercentage': 40.1,
+    },
+    'recentAcSubmissionList': [
+        {'title': 'Two Sum', 'titleSlug': 'two-sum', 'timestamp': '1767225600', 'statusDisplay': 'Accepted', 'lang': 'python3'},
+    ],
+}
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping and timed-out requests advance it"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FetchFullProfileTests(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch('apps.scd.leetcode_api.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        post = mock.patch('apps.scd.leetcode_api.requests.post')
+        self.post = post.start()
+        self.addCleanup(post.stop)
+
+    def fetch(self, **kwargs):
+        return LeetCodeAPI.fetch_full_profile.uncached('coder', **kwargs)
+
+    def test_complete_profile_in_one_request(self):
+        self.post.return_value = graphql_response(data=FULL_PROFILE_DATA)
+        result = self.fetch()
+
+        self.assertEqual(self.post.call_count, 1)
+        self.assertEqual(result['warnings'], [])
+        self.assertEqual((result['profile']['total_solved'], result['profile']['ranking']), (40, 1200))
+        self.assertEqual(result['contest_info']['rating'], 1500)
+        self.assertEqual(result['recent_submissions'][0]['problem_slug'], 'two-sum')
+        self.assertIsNotNone(result['calendar_data'])
+
+    def test_partial_data_keeps_the_profile_and_warns(self):
+        data = dict(FULL_PROFILE_DATA, userContestRanking=None, recentAcSubmissionList=None)
+        data['matchedUser'] = dict(FULL_PROFILE_DATA['matchedUser'], userCalendar=None)
+        self.post.return_value = graphql_response(data=data)
+        result = self.fetch()
+
+        self.assertEqual(result['profile']['username'], 'coder')
+        self.assertEqual((result['contest_info'], result['calendar_data'], result['recent_submissions']), (None, None, []))
+        self.assertEqual(len(result['warnings']), 3)
+        self.assertTrue(any('Contest data unavailable' in warning for warning in result['warnings']))
+
+    def test_unknown_user(self):
+        self.post.return_value = graphql_response(data={'matchedUser': None, 'recentAcSubmissionList': None})
+        self.assertIs(self.fetch(), USER_NOT_FOUND)
+
+    def test_retries_server_errors_and_logs_them(self):
+        self.post.side_effect = [graphql_response(status_code=503), graphql_response(data=FULL_PROFILE_DATA)]
+        with self.assertLogs('apps.scd.leetcode_api', 'WARNING') as logs:
+            result = self.fetch()
+
+        self.assertEqual(self.post.call_count, 2)
+        self.assertEqual(result['profile']['username'], 'coder')
+        self.assertIn('status 503', logs.output[0])
+        self.assertEqual(self.clock.now, LeetCodeAPI.RETRY_DELAY)
+
+    def test_client_errors_are_not_retried(self):
+        self.post.return_value = graphql_response(status_code=400)
+        with self.assertLogs('apps.scd.leetcode_api', 'WARNING'):
+            self.assertIsNone(self.fetch())
+        self.assertEqual(self.post.call_count, 1)
+
+    def test_retries_stay_inside_the_deadline(self):
+        def time_out(*args, timeout, **kwargs):
+            self.clock.now += timeout
+            raise requests.exceptions.Timeout('read timed out')
+
+        self.post.side_effect = time_out
+        with self.assertLogs('apps.scd.leetcode_api', 'WARNING') as logs:
+            self.assertIsNone(self.fetch(deadline=5))
+
+        self.assertEqual(self.post.call_count, 1)
+        self.assertEqual(self.post.call_args.kwargs['timeout'], 5)
+        self.assertLessEqual(self.clock.now, 5)
+        self.assertIn('attempt 1/3', logs.output[0])
+
+    def test_timeouts_retry_while_time_remains(self):
+        self.post.side_effect = [requests.exceptions.ConnectionError('reset'), graphql_response(data=FULL_PROFILE_DATA)]
+        with self.assertLogs('apps.scd.leetcode_api', 'WARNING'):
+            result = self.fetch(deadline=10)
+
+        self.assertEqual(result['warnings'], [])
+        timeouts = [call.kwargs['timeout'] for call in self.post.call_args_list]
+        self.assertEqual(timeouts, [10, 10 - LeetCodeAPI.RETRY_DELAY])
+
+    def test_no_time_left_means_no_request(self):
+        self.assertIsNone(self.fetch(deadline=0))
+        self.post.assert_not_called()
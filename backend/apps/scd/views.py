@@ -14,6 +14,7 @@ from .serializers import (
     LeetCodeSyncSerializer
 )
 from .leetcode_api import LeetCodeAPI
+from .activity import LeetCodeActivityService
 
 
 class LeetCodeProfileViewSet(viewsets.ModelViewSet):
@@ -70,25 +71,22 @@ class LeetCodeProfileViewSet(viewsets.ModelViewSet):
         
         username = serializer.validated_data['leetcode_username']
         
-        # Fetch data from LeetCode API
-        profile_data = LeetCodeAPI.fetch_user_profile(username)
+        # Fetch profile, contest, calendar and submissions in one round trip.
+        # A user-initiated sync always goes to LeetCode (and refreshes the cache)
+        full_profile = LeetCodeAPI.fetch_full_profile.refresh(username, submissions_limit=20)
         
-        if not profile_data:
+        if not full_profile:
             return Response(
                 {'error': 'Failed to fetch LeetCode profile. Please check the username and try again.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Fetch additional data (non-critical, can timeout)
-        warnings = []
-        
-        contest_info = LeetCodeAPI.fetch_contest_info(username)
-        if not contest_info:
-            warnings.append('Contest data unavailable - LeetCode API timeout or no contest history')
-        
-        calendar_data = LeetCodeAPI.fetch_calendar_data(username)
-        if not calendar_data:
-            warnings.append('Calendar data unavailable - LeetCode API timeout')
+        # Additional data is non-critical; missing parts come back as warnings
+        profile_data = full_profile['profile']
+        contest_info = full_profile['contest_info']
+        calendar_data = full_profile['calendar_data']
+        recent_submissions = full_profile['recent_submissions']
+        warnings = full_profile['warnings']
         
         try:
             with transaction.atomic():
@@ -126,8 +124,17 @@ class LeetCodeProfileViewSet(viewsets.ModelViewSet):
                         profile.submission_calendar = calendar_data['submission_calendar']
                     profile.save()
                 
+                # Daily activity backs streaks and the monthly target
+                monthly_problems = 0
+                if calendar_data:
+                    LeetCodeActivityService.ingest(profile, calendar_data['submission_calendar'])
+                    monthly_problems = LeetCodeActivityService.month_total(profile)['total']
+                    if profile.monthly_problems_count != monthly_problems:
+                        profile.monthly_problems_count = monthly_problems
+                        profile.save(update_fields=['monthly_problems_count'])
+                
                 # Check if monthly target is met (minimum 10 problems)
-                monthly_target_met = (calendar_data and calendar_data['monthly_problems'] >= 10) if calendar_data else False
+                monthly_target_met = bool(calendar_data) and monthly_problems >= LeetCodeActivityService.MONTHLY_TARGET
                 
                 # If target not met, create notification for mentor
                 if not monthly_target_met and hasattr(request.user, 'profile') and request.user.profile.assigned_mentor:
@@ -144,11 +151,10 @@ class LeetCodeProfileViewSet(viewsets.ModelViewSet):
                     ).exists()
                     
                     if not existing_notif:
-                        problems_count = calendar_data['monthly_problems'] if calendar_data else 0
                         student_name = request.user.get_full_name() or request.user.username
                         Notification.objects.create(
                             recipient=request.user.profile.assigned_mentor,
-                            message=f"{student_name} has only solved {problems_count}/10 problems this month on LeetCode (monthly target ({current_month}))",
+                            message=f"{student_name} has only solved {monthly_problems}/10 problems this month on LeetCode (monthly target ({current_month}))",
                             notification_type='warning'
                         )
                 
@@ -162,19 +168,13 @@ class LeetCodeProfileViewSet(viewsets.ModelViewSet):
                     ranking=profile_data['ranking']
                 )
                 
-                # Fetch and save recent submissions (non-critical)
-                recent_submissions = LeetCodeAPI.fetch_recent_submissions(username, limit=20)
-                if not recent_submissions:
-                    warnings.append('Recent submissions unavailable - LeetCode API timeout')
-                
                 # Clear old submissions and add new ones
                 if recent_submissions:
                     profile.submissions.all().delete()
-                    for sub_data in recent_submissions:
-                        LeetCodeSubmission.objects.create(
-                            profile=profile,
-                            **sub_data
-                        )
+                    LeetCodeSubmission.objects.bulk_create([
+                        LeetCodeSubmission(profile=profile, **sub_data)
+                        for sub_data in recent_submissions
+                    ])
                 
                 # Return updated profile with warnings
                 output_serializer = LeetCodeProfileSerializer(profile)
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Sum, Count, Q
 from django.utils import timezone
+from apps.file_storage_service import FileStorageService
 from datetime import datetime, timedelta
 from .models import SRISubmission, SRIFile
 from .serializers import (
@@ -223,3 +224,20 @@ class SRIFileViewSet(viewsets.ModelViewSet):
         
         # Students can only see their own files
         return SRIFile.objects.filter(submission__user=user).select_related('submission')
+    
+    def perform_create(self, serializer):
+        """Store the validated upload content-addressed (one copy per distinct file)"""
+        file = serializer.validated_data['file']
+        serializer.save(file=FileStorageService().save_content_addressed(file, 'sri_submissions'))
+    
+    def perform_update(self, serializer):
+        """Store a replacement upload content-addressed and release the one it replaces"""
+        file = serializer.validated_data.get('file')
+        if file is None:
+            serializer.save()
+            return
+        storage = FileStorageService()
+        previous = serializer.instance.file.name
+        serializer.save(file=storage.save_content_addressed(file, 'sri_submissions'))
+        if previous:
+            storage.release(previous)
@@ -17,6 +17,26 @@ ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', 'localhost,127.0.0.1').split(',')
 # GitHub API Token (optional - increases rate limit from 60/hr to 5000/hr)
 GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
 
+# LeetCode GraphQL sync (nightly sync_leetcode_streaks)
+LEETCODE_GRAPHQL_URL = os.getenv('LEETCODE_GRAPHQL_URL', 'https://leetcode.com/graphql')
+LEETCODE_SYNC_CONCURRENCY = int(os.getenv('LEETCODE_SYNC_CONCURRENCY', 8))
+LEETCODE_RATE_LIMIT_PER_SECOND = float(os.getenv('LEETCODE_RATE_LIMIT_PER_SECOND', 4))
+
+# Hackathon feed snapshot (refresh_feeds); older snapshots are served while
+# they are rebuilt in the background (outbox task with USE_ASYNC_TASKS, else a thread)
+HACKATHON_FEED_MAX_AGE = int(os.getenv('HACKATHON_FEED_MAX_AGE', 1800))
+
+# LeetCode response cache (apps/scd/leetcode_cache.py), all values in seconds
+# Entries are served fresh for their TTL, then stale for LEETCODE_CACHE_STALE_TTL
+# while refreshed in the background; unknown users are cached for NEGATIVE_TTL
+LEETCODE_CACHE_TTLS = {
+    'default': int(os.getenv('LEETCODE_CACHE_TTL', 900)),
+    'contest': int(os.getenv('LEETCODE_CACHE_CONTEST_TTL', 3600)),
+    'streak': int(os.getenv('LEETCODE_CACHE_STREAK_TTL', 6 * 3600)),
+}
+LEETCODE_CACHE_STALE_TTL = int(os.getenv('LEETCODE_CACHE_STALE_TTL', 3600))
+LEETCODE_CACHE_NEGATIVE_TTL = int(os.getenv('LEETCODE_CACHE_NEGATIVE_TTL', 600))
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -40,19 +60,29 @@ INSTALLED_APPS = [
     'apps.scd',
     'apps.profiles',
     'apps.dashboard',
-    'hackathons',
+    'apps.hackathons',
     
     # Gamification System
     'apps.gamification',
     
     # Analytics & Scaling (NEW - for 2000+ students)
     'apps.analytics_summary',
+
+    # Background side effects (transactional outbox)
+    'apps.outbox',
+
+    # Request profiling and /metrics
+    'apps.monitoring',
+
+    # Content-addressed storage of uploaded evidence files
+    'apps.filestore',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Static files
     'apps.health_check_middleware.HealthCheckMiddleware',  # Allow health checks
+    'apps.monitoring.middleware.RequestProfilingMiddleware',  # Latency and query profiles
     'corsheaders.middleware.CorsMiddleware',  # CORS
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -198,7 +228,7 @@ CORS_ALLOW_HEADERS = ['accept', 'accept-encoding', 'authorization', 'content-typ
 # Django REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.jwt_authentication.ClaimsJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -220,8 +250,18 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': os.getenv('JWT_ALGORITHM', 'HS256'),
     'SIGNING_KEY': os.getenv('JWT_SECRET_KEY', SECRET_KEY),
+    'TOKEN_REFRESH_SERIALIZER': 'apps.jwt_serializers.ClaimsTokenRefreshSerializer',
 }
 
+# Claims-hydrated authentication (apps/jwt_authentication.py): request.user and
+# its profile are built from signed token claims instead of two queries
+JWT_CLAIMS_AUTH = os.getenv('JWT_CLAIMS_AUTH', 'True') == 'True'
+# Seconds a user's claims fingerprint is trusted before the database is checked again;
+# floor changes made with bulk updates (and, without Redis, deactivations saved by
+# another worker) reach live tokens within this window
+JWT_CLAIMS_CHECK_TTL = int(os.getenv('JWT_CLAIMS_CHECK_TTL', '60'))
+JWT_CLAIMS_CACHE = 'jwt-claims'
+
 # Swagger/OpenAPI Settings
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
@@ -235,6 +275,9 @@ SWAGGER_SETTINGS = {
 }
 
 # File Upload Settings
+# Uploads stream to temporary files in 64KB chunks and are hashed on the way
+# (apps/filestore/upload_handlers.py), so no upload is buffered in memory
+FILE_UPLOAD_HANDLERS = ['apps.filestore.upload_handlers.HashingFileUploadHandler']
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 
@@ -251,8 +294,9 @@ USE_ANALYTICS_SUMMARY = os.getenv('USE_ANALYTICS_SUMMARY', 'False') == 'True'
 
 # Notification Optimization
 USE_NOTIFICATION_CACHE = os.getenv('USE_NOTIFICATION_CACHE', 'False') == 'True'
-# When True: Caches notification counts for 30 seconds
-# When False: Always computes counts live (current behavior)
+# When True: Enables the cache backend for notification data
+# When False: No cache (current behavior)
+# Unread counts are maintained per user instead (see UNREAD COUNTERS below)
 
 # File Storage
 USE_CLOUD_STORAGE = os.getenv('USE_CLOUD_STORAGE', 'False') == 'True'
@@ -261,13 +305,14 @@ USE_CLOUD_STORAGE = os.getenv('USE_CLOUD_STORAGE', 'False') == 'True'
 
 # Background Tasks
 USE_ASYNC_TASKS = os.getenv('USE_ASYNC_TASKS', 'False') == 'True'
-# When True: Uses Celery/Redis for background tasks (production)
-# When False: Tasks run synchronously (current behavior, development)
+# When True: Side effects are queued in the outbox table and run by `manage.py process_outbox`
+# When False: Outbox tasks run synchronously as they are enqueued (current behavior, development)
 
 # Database Query Logging (Debug only)
 LOG_QUERY_TIMES = DEBUG and os.getenv('LOG_QUERY_TIMES', 'False') == 'True'
-# When True: Logs slow queries to console (helpful for optimization)
+# When True: Logs queries slower than SLOW_QUERY_MS to console (helpful for optimization)
 # When False: No query logging (default)
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '200'))
 
 # ============================================================================
 # CACHING CONFIGURATION (LOCAL SAFE, REDIS READY)
@@ -304,6 +349,25 @@ else:
         }
     }
 
+# Claims fingerprints of authenticated users (JWT_CLAIMS_CHECK_TTL). Shared through
+# Redis when it is configured, so a save invalidates them in every worker;
+# otherwise in-process (see apps/jwt_authentication.py for the window that leaves)
+if CACHES['default']['BACKEND'] == 'django.core.cache.backends.redis.RedisCache':
+    CACHES['jwt-claims'] = {**CACHES['default'], 'KEY_PREFIX': 'cohort-jwt'}
+else:
+    CACHES['jwt-claims'] = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'jwt-claims',
+        'OPTIONS': {'MAX_ENTRIES': 50000},
+    }
+
+# LeetCode responses are always cached in-process, independent of the flags above
+CACHES['leetcode'] = {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'leetcode-responses',
+    'OPTIONS': {'MAX_ENTRIES': 20000},
+}
+
 # ============================================================================
 # AWS/CLOUD STORAGE CONFIGURATION (OPTIONAL)
 # ============================================================================
@@ -326,18 +390,61 @@ if USE_CLOUD_STORAGE:
     pass
 
 # ============================================================================
-# CELERY CONFIGURATION (PLACEHOLDER FOR FUTURE)
+# OUTBOX WORKER CONFIGURATION
 # ============================================================================
-if USE_ASYNC_TASKS:
-    # TODO: Add celery and redis to requirements.txt when needed
-    # pip install celery redis
-    #
-    # CELERY_BROKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-    # CELERY_RESULT_BACKEND = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
-    # CELERY_ACCEPT_CONTENT = ['json']
-    # CELERY_TASK_SERIALIZER = 'json'
-    # CELERY_RESULT_SERIALIZER = 'json'
-    # CELERY_TIMEZONE = TIME_ZONE
-    # CELERY_TASK_TRACK_STARTED = True
-    # CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
-    pass
+# Database-backed task queue, no broker required (see apps/outbox)
+OUTBOX_WORKER_CONCURRENCY = int(os.getenv('OUTBOX_WORKER_CONCURRENCY', '4'))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '5'))
+OUTBOX_RETRY_BASE_SECONDS = int(os.getenv('OUTBOX_RETRY_BASE_SECONDS', '30'))
+OUTBOX_RETRY_MAX_SECONDS = int(os.getenv('OUTBOX_RETRY_MAX_SECONDS', '3600'))
+# Running tasks older than this belong to a crashed worker and are claimed again
+OUTBOX_LOCK_TIMEOUT = int(os.getenv('OUTBOX_LOCK_TIMEOUT', '300'))
+# Done tasks are kept this long for auditing, then removed by `manage.py purge_outbox`
+OUTBOX_DONE_RETENTION_DAYS = int(os.getenv('OUTBOX_DONE_RETENTION_DAYS', '7'))
+
+# ============================================================================
+# EPISODE PROGRESS PROVISIONING
+# ============================================================================
+# New episodes get an EpisodeProgress row per student from an outbox task, this
+# many students per INSERT (see EpisodeProgressService in apps/gamification/services.py)
+EPISODE_PROGRESS_BATCH_SIZE = int(os.getenv('EPISODE_PROGRESS_BATCH_SIZE', '1000'))
+
+# ============================================================================
+# BULK USER IMPORT
+# ============================================================================
+# Rows written per transaction by UserImportEngine (apps/profiles/bulk_import.py)
+USER_IMPORT_BATCH_SIZE = int(os.getenv('USER_IMPORT_BATCH_SIZE', '500'))
+# Processes hashing passwords during a command-line import; 1 hashes in the calling
+# process, as the web import endpoints always do
+USER_IMPORT_HASH_WORKERS = int(os.getenv('USER_IMPORT_HASH_WORKERS', str(os.cpu_count() or 1)))
+
+# ============================================================================
+# UNREAD COUNTERS
+# ============================================================================
+# Per-user counters behind messages/unread-counts/ and notifications/unread_count/
+# (see apps/dashboard/unread.py). With ?since=<version> those endpoints long poll
+# for up to this many seconds. Off (0) by default: a waiting request holds its
+# worker, and the default deployment runs sync gunicorn workers. Only enable it
+# with threaded or gevent workers, and keep it well below the worker timeout.
+UNREAD_LONG_POLL_TIMEOUT = int(os.getenv('UNREAD_LONG_POLL_TIMEOUT', '0'))
+# Waiting requests re-read their counter this often to see changes made by other processes
+UNREAD_POLL_INTERVAL = float(os.getenv('UNREAD_POLL_INTERVAL', '5'))
+
+# ============================================================================
+# REQUEST PROFILING
+# ============================================================================
+# Per-endpoint latency histograms, query counts and N+1 detection
+# (see apps/monitoring/profiler.py), served at /metrics and by `manage.py dump_metrics`
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+# Share of requests profiled, 0.0 - 1.0
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '1.0'))
+# A request running one SQL shape more often than this is flagged as an N+1
+PROFILING_N_PLUS_ONE_THRESHOLD = int(os.getenv('PROFILING_N_PLUS_ONE_THRESHOLD', '10'))
+# Seconds between writes of each process's totals to the database
+PROFILING_FLUSH_INTERVAL = int(os.getenv('PROFILING_FLUSH_INTERVAL', '30'))
+# Latency histogram bucket upper bounds in seconds
+PROFILING_LATENCY_BUCKETS = tuple(
+    float(bound) for bound in os.getenv('PROFILING_LATENCY_BUCKETS', '0.05,0.1,0.25,0.5,1,2.5,5,10').split(',')
+)
+# Bearer token Prometheus sends to /metrics; without one /metrics is DEBUG-only
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
@@ -10,6 +10,7 @@ from apps.users_views import UserProfileView
 from apps.setup_view import setup_database
 from apps.create_users_endpoint import create_production_users_endpoint
 from apps.health_check_views import health_check, readiness_check, liveness_check
+from apps.monitoring.views import metrics
 # Temporarily disabled - Python 3.13 pkg_resources issue
 # from drf_yasg.views import get_schema_view
 # from drf_yasg import openapi
@@ -43,6 +44,9 @@ urlpatterns = [
     path('health/ready/', readiness_check, name='readiness_check'),
     path('health/live/', liveness_check, name='liveness_check'),
     
+    # Prometheus metrics (request profiles)
+    path('metrics', metrics, name='metrics'),
+    
     # One-time database setup endpoint
     path('api/setup-database/', setup_database, name='setup_database'),
     
@@ -1,10 +1,24 @@
 #!/usr/bin/env python3
-"""Create test data for gamification system"""
+"""
+Create test data for gamification system
+
+Usage:
+    python create_test_data.py
+    python create_test_data.py --cohort 500          # plus a synthetic cohort of 500 students
+    python create_test_data.py --cohort 500 --seed 3
+"""
+import argparse
 import os
 import sys
 import django
 
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument('--cohort', type=int, default=0, help='Students in a synthetic cohort (default: none)')
+parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic cohort')
+args = parser.parse_args()
+
 # Setup Django environment
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
 sys.path.insert(0, '/Users/user/cohort/cohort/backend')
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 django.setup()
@@ -28,6 +42,19 @@ for username, email in [
     user.save()
     print(f'✓ User {username} ready')
 
+# Optional synthetic cohort (same generator as the query-budget tests)
+if args.cohort:
+    from apps.dashboard.synthetic_cohort import SyntheticCohortGenerator
+
+    prefix = f'cohort{args.seed}'
+    if User.objects.filter(username__startswith=f'{prefix}_').exists():
+        print(f'✓ Synthetic cohort "{prefix}" exists')
+    else:
+        cohort = SyntheticCohortGenerator(
+            students=args.cohort, seed=args.seed, prefix=prefix, password='password'
+        ).generate()
+        print(f'✓ Synthetic cohort created: {cohort}')
+
 # Create test season
 print("\nCreating test season...")
 season, created = Season.objects.get_or_create(
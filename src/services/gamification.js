@@ -31,8 +31,8 @@ const gamificationAPI = {
   // Leaderboard
   getCurrentLeaderboard: () => api.get('/gamification/leaderboard/current_season/'),
   getCurrentSeasonLeaderboard: () => api.get('/gamification/leaderboard/current_season/'),
-  getFullLeaderboard: () => api.get('/gamification/leaderboard/full_leaderboard/'),
-  getMenteeLeaderboard: () => api.get('/gamification/leaderboard/mentee_leaderboard/'),
+  getFullLeaderboard: (params) => api.get('/gamification/leaderboard/full_leaderboard/', { params }),
+  getMenteeLeaderboard: (params) => api.get('/gamification/leaderboard/mentee_leaderboard/', { params }),
   getMyPosition: () => api.get('/gamification/leaderboard/my_position/'),
   
   // Titles
@@ -28,8 +28,8 @@ const handleResponse = async (response) => {
 /**
  * Get all submissions for a specific pillar
  * @param {string} pillar - Pillar ID (cfc, clt, sri, iipc, scd, all)
- * @param {object} filters - Filter options
- * @returns {Promise<object>} Submissions and total count
+ * @param {object} filters - Filter options (limit/after page through next_cursor)
+ * @returns {Promise<object>} Submissions, total count and next_cursor
  */
 export const getPillarSubmissions = async (pillar, filters = {}) => {
     const params = new URLSearchParams();
@@ -49,6 +49,12 @@ export const getPillarSubmissions = async (pillar, filters = {}) => {
     if (filters.student_id) {
         params.append('student_id', filters.student_id);
     }
+    if (filters.limit) {
+        params.append('limit', filters.limit);
+    }
+    if (filters.after) {
+        params.append('after', filters.after);
+    }
 
     const url = `${API_BASE_URL}/mentor/pillar/${pillar}/submissions/?${params.toString()}`;
     
@@ -105,6 +111,27 @@ export const reviewSubmission = async (reviewData) => {
     }
 };
 
+/**
+ * Review many submissions in one request
+ * @param {Array<object>} reviews - [{ submission_type, submission_id, action, comment }]
+ * @returns {Promise<object>} Per-item results with reviewed and failed counts
+ */
+export const bulkReviewSubmissions = async (reviews) => {
+    const url = `${API_BASE_URL}/mentor/review/bulk/`;
+
+    try {
+        const response = await fetch(url, {
+            method: 'POST',
+            headers: getAuthHeaders(),
+            body: JSON.stringify({ reviews }),
+        });
+        return await handleResponse(response);
+    } catch (error) {
+        console.error('Error bulk reviewing submissions:', error);
+        throw error;
+    }
+};
+
 /**
  * Get detailed information about a specific submission
  * @param {string} pillar - Pillar ID